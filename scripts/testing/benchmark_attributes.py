@@ -0,0 +1,96 @@
+"""
+Micro-benchmark for the memoized key paths used by `unflatten`. Measures spans/sec for
+`decode_otlp_span` and `_flatten_semantic_conventions` with the key-path cache warm, and
+with the cache cleared before every span, which approximates the behavior before memoization.
+
+Usage: python scripts/testing/benchmark_attributes.py [--num-spans N]
+"""
+
+import argparse
+from collections.abc import Callable
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Any
+
+from openinference.semconv.trace import (
+    DocumentAttributes,
+    MessageAttributes,
+    OpenInferenceSpanKindValues,
+    SpanAttributes,
+)
+
+from phoenix.trace.attributes import _get_key_path_compiler, unflatten
+from phoenix.trace.dsl.query import _flatten_semantic_conventions
+from phoenix.trace.otel import decode_otlp_span, encode_span_to_otlp
+from phoenix.trace.schemas import Span, SpanContext, SpanKind, SpanStatusCode
+
+
+def _attributes() -> dict[str, Any]:
+    key_value_pairs: list[tuple[str, Any]] = [
+        (SpanAttributes.OPENINFERENCE_SPAN_KIND, OpenInferenceSpanKindValues.LLM.value),
+        (SpanAttributes.INPUT_VALUE, "What is the capital of France?"),
+        (SpanAttributes.OUTPUT_VALUE, "Paris"),
+        (SpanAttributes.LLM_MODEL_NAME, "gpt-4o"),
+        (SpanAttributes.LLM_TOKEN_COUNT_PROMPT, 123),
+        (SpanAttributes.LLM_TOKEN_COUNT_COMPLETION, 45),
+        (SpanAttributes.LLM_TOKEN_COUNT_TOTAL, 168),
+    ]
+    for i in range(4):
+        prefix = f"{SpanAttributes.LLM_INPUT_MESSAGES}.{i}"
+        key_value_pairs.append((f"{prefix}.{MessageAttributes.MESSAGE_ROLE}", "user"))
+        key_value_pairs.append((f"{prefix}.{MessageAttributes.MESSAGE_CONTENT}", "hello"))
+    for i in range(4):
+        prefix = f"{SpanAttributes.RETRIEVAL_DOCUMENTS}.{i}"
+        key_value_pairs.append((f"{prefix}.{DocumentAttributes.DOCUMENT_ID}", str(i)))
+        key_value_pairs.append((f"{prefix}.{DocumentAttributes.DOCUMENT_CONTENT}", "text"))
+        key_value_pairs.append((f"{prefix}.{DocumentAttributes.DOCUMENT_SCORE}", 0.5))
+    return unflatten(key_value_pairs)
+
+
+def _span() -> Span:
+    now = datetime.now(timezone.utc)
+    return Span(
+        name="llm",
+        context=SpanContext(trace_id="0" * 32, span_id="0" * 16),
+        span_kind=SpanKind.LLM,
+        parent_id=None,
+        start_time=now,
+        end_time=now,
+        status_code=SpanStatusCode.OK,
+        status_message="",
+        attributes=_attributes(),
+        events=[],
+        conversation=None,
+    )
+
+
+def _spans_per_second(fn: Callable[[], Any], num_spans: int, cold: bool) -> float:
+    start = perf_counter()
+    for _ in range(num_spans):
+        if cold:
+            _get_key_path_compiler.cache_clear()
+        fn()
+    return num_spans / (perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-spans", type=int, default=20_000)
+    args = parser.parse_args()
+    span = _span()
+    otlp_span = encode_span_to_otlp(span)
+    benchmarks: dict[str, Callable[[], Any]] = {
+        "decode_otlp_span": lambda: decode_otlp_span(otlp_span),
+        "_flatten_semantic_conventions": lambda: _flatten_semantic_conventions(span.attributes),
+    }
+    for name, fn in benchmarks.items():
+        before = _spans_per_second(fn, args.num_spans, cold=True)
+        after = _spans_per_second(fn, args.num_spans, cold=False)
+        print(
+            f"{name}: {before:,.0f} spans/sec uncached, {after:,.0f} spans/sec cached "
+            f"({after / before:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
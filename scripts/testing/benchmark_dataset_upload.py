@@ -0,0 +1,157 @@
+"""
+Benchmark for dataset uploads. Measures examples/sec for `add_dataset_examples` with
+examples parsed from a CSV file and from a pyarrow table the same way `upload_dataset`
+parses them, and for comparison, with each example and its revision inserted one row at a
+time, which approximates the behavior before multi-row inserts.
+
+SQLite is benchmarked on a temporary file. PostgreSQL is benchmarked too if a connection
+string is given; the tables are created if needed, so it should point to a scratch database.
+
+Usage: python scripts/testing/benchmark_dataset_upload.py [--num-examples N] [--postgres URL]
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import tempfile
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Optional
+from uuid import uuid4
+
+import pyarrow as pa
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from phoenix.db import models
+from phoenix.db.engines import create_engine
+from phoenix.db.insertion.dataset import (
+    ExampleContent,
+    add_dataset_examples,
+    insert_dataset,
+    insert_dataset_example,
+    insert_dataset_example_revision,
+    insert_dataset_version,
+)
+from phoenix.server.api.routers.v1.datasets import (
+    FileContentEncoding,
+    _process_csv,
+    _process_pyarrow,
+)
+
+_INPUT_KEYS = frozenset(["question", "context"])
+_OUTPUT_KEYS = frozenset(["answer"])
+_METADATA_KEYS = frozenset(["source"])
+
+
+def _rows(num_examples: int) -> list[dict[str, str]]:
+    return [
+        {
+            "question": f"What is the answer to question {i}?",
+            "context": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4,
+            "answer": f"The answer is {i}.",
+            "source": "benchmark",
+        }
+        for i in range(num_examples)
+    ]
+
+
+def _csv_content(rows: list[dict[str, str]]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def _pyarrow_content(rows: list[dict[str, str]]) -> bytes:
+    table = pa.Table.from_pylist(rows)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+async def _parse_csv(content: bytes) -> list[ExampleContent]:
+    examples = await _process_csv(
+        io.BytesIO(content), FileContentEncoding.NONE, _INPUT_KEYS, _OUTPUT_KEYS, _METADATA_KEYS
+    )
+    return list(examples)
+
+
+async def _parse_pyarrow(content: bytes) -> list[ExampleContent]:
+    examples = await _process_pyarrow(
+        io.BytesIO(content), _INPUT_KEYS, _OUTPUT_KEYS, _METADATA_KEYS
+    )
+    return list(examples)
+
+
+async def _insert_one_row_at_a_time(session: AsyncSession, examples: list[ExampleContent]) -> None:
+    created_at = datetime.now(timezone.utc)
+    dataset_id = await insert_dataset(session, f"benchmark-{uuid4()}", created_at=created_at)
+    version_id = await insert_dataset_version(session, dataset_id, created_at=created_at)
+    for example in examples:
+        example_id = await insert_dataset_example(session, dataset_id, created_at=created_at)
+        await insert_dataset_example_revision(
+            session,
+            version_id,
+            example_id,
+            input=example.input,
+            output=example.output,
+            metadata=example.metadata,
+            created_at=created_at,
+        )
+
+
+async def _insert_in_bulk(session: AsyncSession, examples: list[ExampleContent]) -> None:
+    await add_dataset_examples(session, f"benchmark-{uuid4()}", examples)
+
+
+async def _examples_per_second(
+    engine: AsyncEngine,
+    parse: Callable[[bytes], Awaitable[list[ExampleContent]]],
+    content: bytes,
+    insert: Callable[[AsyncSession, list[ExampleContent]], Awaitable[None]],
+) -> float:
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    start = perf_counter()
+    examples = await parse(content)
+    async with session_factory.begin() as session:
+        await insert(session, examples)
+    return len(examples) / (perf_counter() - start)
+
+
+async def _benchmark(name: str, engine: AsyncEngine, num_examples: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+    rows = _rows(num_examples)
+    formats: dict[str, tuple[Callable[[bytes], Awaitable[list[ExampleContent]]], bytes]] = {
+        "csv": (_parse_csv, _csv_content(rows)),
+        "pyarrow": (_parse_pyarrow, _pyarrow_content(rows)),
+    }
+    for format_name, (parse, content) in formats.items():
+        before = await _examples_per_second(engine, parse, content, _insert_one_row_at_a_time)
+        after = await _examples_per_second(engine, parse, content, _insert_in_bulk)
+        print(
+            f"{name} {format_name}: {before:,.0f} examples/sec one row at a time, "
+            f"{after:,.0f} examples/sec in bulk ({after / before:.2f}x)"
+        )
+    await engine.dispose()
+
+
+async def main(num_examples: int, postgres: Optional[str]) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        sqlite = f"sqlite:///{Path(temp_dir) / 'benchmark.db'}"
+        await _benchmark("sqlite", create_engine(sqlite, migrate=False), num_examples)
+    if postgres:
+        await _benchmark("postgresql", create_engine(postgres, migrate=False), num_examples)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-examples", type=int, default=20_000)
+    parser.add_argument("--postgres", help="connection string of a scratch PostgreSQL database")
+    args = parser.parse_args()
+    asyncio.run(main(args.num_examples, args.postgres))
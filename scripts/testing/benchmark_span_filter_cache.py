@@ -0,0 +1,95 @@
+"""
+Benchmark for the cache of compiled span filters. Simulates the filters built for UI page
+loads of a project, where the spans table and each of the dataloaders behind the project
+summary (record counts, latency quantiles, token counts and annotation summaries) build a
+filter for the same condition, and measures page loads/sec with a fresh `SpanFilter` built
+for every use, which is the behavior before the cache, and with `get_span_filter`.
+
+Only the construction of the filters and their application to a statement are measured,
+so the results don't depend on the database.
+
+Usage: python scripts/testing/benchmark_span_filter_cache.py [--num-page-loads N]
+"""
+
+import argparse
+import random
+from collections.abc import Callable, Sequence
+from time import perf_counter
+from typing import Optional
+
+from sqlalchemy import func, select
+
+from phoenix.db import models
+from phoenix.trace.dsl.filter import SpanFilter, get_cache_info, get_span_filter
+
+_ANNOTATION_NAMES = ("Hallucination", "Q&A Correctness", "Toxicity")
+
+# conditions typed or picked from the suggestions in the UI, each of which is used for
+# several page loads in a row, e.g. while paging through spans or refreshing
+_CONDITIONS = (
+    "",
+    "span_kind == 'LLM'",
+    "span_kind == 'RETRIEVER'",
+    "status_code == 'ERROR'",
+    "latency_ms > 1000",
+    "llm.token_count.total > 1000",
+    "'error' in input.value",
+    "span_kind == 'LLM' and llm.model_name == 'gpt-4o'",
+    "evals['Hallucination'].label == 'hallucinated'",
+    "evals['Q&A Correctness'].score < 0.5",
+    "annotations['Toxicity'].label == 'toxic' and span_kind == 'LLM'",
+    "metadata['user_id'] == '12345' or metadata['session_id'] == 'abc'",
+)
+_PAGE_LOADS_PER_CONDITION = 5
+
+# the number of times a filter is built for each page load of the project page
+_NUM_FILTERS_PER_PAGE_LOAD = (
+    1  # spans table
+    + 2  # record counts of spans and traces
+    + 2  # latency quantiles p50 and p99
+    + 3  # prompt, completion and total token counts
+    + len(_ANNOTATION_NAMES)  # annotation summaries
+)
+
+_SpanFilterFactory = Callable[[str, Optional[Sequence[str]]], SpanFilter]
+
+
+def _page_loads(num_page_loads: int) -> list[str]:
+    rng = random.Random(42)
+    conditions: list[str] = []
+    while len(conditions) < num_page_loads:
+        conditions.extend([rng.choice(_CONDITIONS)] * _PAGE_LOADS_PER_CONDITION)
+    return conditions[:num_page_loads]
+
+
+def _load_page(condition: str, span_filter: _SpanFilterFactory) -> None:
+    stmt = select(func.count(models.Span.id))
+    span_filter(condition, _ANNOTATION_NAMES)(select(models.Span))
+    for _ in range(_NUM_FILTERS_PER_PAGE_LOAD - 1):
+        span_filter(condition, None)(stmt)
+
+
+def _page_loads_per_second(conditions: list[str], span_filter: _SpanFilterFactory) -> float:
+    start = perf_counter()
+    for condition in conditions:
+        _load_page(condition, span_filter)
+    return len(conditions) / (perf_counter() - start)
+
+
+def main(num_page_loads: int) -> None:
+    conditions = _page_loads(num_page_loads)
+    before = _page_loads_per_second(conditions, SpanFilter)
+    after = _page_loads_per_second(conditions, get_span_filter)
+    info = get_cache_info()["span_filter"]
+    print(
+        f"{before:,.0f} page loads/sec without the cache, "
+        f"{after:,.0f} page loads/sec with the cache ({after / before:.2f}x), "
+        f"{info.hits:,} hits, {info.misses:,} misses"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-page-loads", type=int, default=2_000)
+    args = parser.parse_args()
+    main(args.num_page_loads)
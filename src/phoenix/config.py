@@ -62,6 +62,29 @@ ENV_PHOENIX_ENABLE_PROMETHEUS = "PHOENIX_ENABLE_PROMETHEUS"
 """
 Whether to enable Prometheus. Defaults to false.
 """
+ENV_PHOENIX_MAX_SPANS_QUEUE_SIZE = "PHOENIX_MAX_SPANS_QUEUE_SIZE"
+"""
+The maximum number of spans and evaluations held in memory while waiting to be inserted
+into the database. When the limit is reached, new spans and evaluations are rejected until
+the backlog drains. Defaults to 20,000.
+"""
+ENV_PHOENIX_SPAN_SPOOL_DIR = "PHOENIX_SPAN_SPOOL_DIR"
+"""
+The directory in which to spool spans and evaluations to disk while they wait to be inserted
+into the database. Spooled spans survive restarts and don't need to fit in memory, so bursts of
+ingestion can be absorbed at the pace of the database. Spooling is disabled if this is not set.
+"""
+ENV_PHOENIX_NUM_SPAN_INSERTION_WORKERS = "PHOENIX_NUM_SPAN_INSERTION_WORKERS"
+"""
+The number of database connections used concurrently to insert spans, which are partitioned
+among them by trace. This only applies to PostgreSQL, since SQLite serializes writes.
+Defaults to 1.
+"""
+ENV_PHOENIX_MAX_IN_FLIGHT_EVALUATION_BATCHES = "PHOENIX_MAX_IN_FLIGHT_EVALUATION_BATCHES"
+"""
+The maximum number of Arrow record batches of an evaluation upload that are decoded ahead of
+their insertion into the database, which bounds the memory used by each upload. Defaults to 4.
+"""
 ENV_LOGGING_MODE = "PHOENIX_LOGGING_MODE"
 """
 The logging mode (either 'default' or 'structured').
@@ -592,6 +615,43 @@ def get_env_enable_prometheus() -> bool:
     )
 
 
+def get_env_max_spans_queue_size() -> int:
+    max_size = _int_val(ENV_PHOENIX_MAX_SPANS_QUEUE_SIZE, 20_000)
+    if max_size <= 0:
+        raise ValueError(
+            f"Invalid value for environment variable {ENV_PHOENIX_MAX_SPANS_QUEUE_SIZE}: "
+            f"{max_size}. Value must be a positive integer."
+        )
+    return max_size
+
+
+def get_env_num_span_insertion_workers() -> int:
+    num_workers = _int_val(ENV_PHOENIX_NUM_SPAN_INSERTION_WORKERS, 1)
+    if num_workers <= 0:
+        raise ValueError(
+            f"Invalid value for environment variable {ENV_PHOENIX_NUM_SPAN_INSERTION_WORKERS}: "
+            f"{num_workers}. Value must be a positive integer."
+        )
+    return num_workers
+
+
+def get_env_max_in_flight_evaluation_batches() -> int:
+    max_in_flight = _int_val(ENV_PHOENIX_MAX_IN_FLIGHT_EVALUATION_BATCHES, 4)
+    if max_in_flight <= 0:
+        raise ValueError(
+            "Invalid value for environment variable "
+            f"{ENV_PHOENIX_MAX_IN_FLIGHT_EVALUATION_BATCHES}: {max_in_flight}. "
+            "Value must be a positive integer."
+        )
+    return max_in_flight
+
+
+def get_env_span_spool_dir() -> Optional[Path]:
+    if not (spool_dir := os.getenv(ENV_PHOENIX_SPAN_SPOOL_DIR)):
+        return None
+    return Path(spool_dir)
+
+
 def get_env_client_headers() -> Optional[dict[str, str]]:
     if headers_str := os.getenv(ENV_PHOENIX_CLIENT_HEADERS):
         return parse_env_headers(headers_str)
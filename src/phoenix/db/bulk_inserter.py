@@ -4,13 +4,17 @@ from asyncio import Queue, as_completed
 from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
 from dataclasses import dataclass, field
 from functools import singledispatchmethod
-from itertools import islice
+from itertools import chain, islice
+from pathlib import Path
 from time import perf_counter
-from typing import Any, Optional, cast
+from typing import Any, Literal, Optional, cast
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import TypeAlias
 
 import phoenix.trace.v1 as pb
+from phoenix.db.helpers import SupportedSQLDialect
+from phoenix.db.insertion.cache import RowIdCache
 from phoenix.db.insertion.constants import DEFAULT_RETRY_ALLOWANCE, DEFAULT_RETRY_DELAY_SEC
 from phoenix.db.insertion.document_annotation import DocumentAnnotationQueueInserter
 from phoenix.db.insertion.evaluation import (
@@ -18,8 +22,9 @@ from phoenix.db.insertion.evaluation import (
     insert_evaluation,
 )
 from phoenix.db.insertion.helpers import DataManipulation, DataManipulationEvent
-from phoenix.db.insertion.span import SpanInsertionEvent, insert_span
+from phoenix.db.insertion.span import SpanInsertionEvent, insert_span, insert_spans
 from phoenix.db.insertion.span_annotation import SpanAnnotationQueueInserter
+from phoenix.db.insertion.spool import SpanSpool, SpoolPosition
 from phoenix.db.insertion.trace_annotation import TraceAnnotationQueueInserter
 from phoenix.db.insertion.types import Insertables, Precursors
 from phoenix.server.dml_event import DmlEvent, SpanInsertEvent
@@ -29,6 +34,7 @@ from phoenix.trace.schemas import Span
 logger = logging.getLogger(__name__)
 
 ProjectRowId: TypeAlias = int
+FlushReason: TypeAlias = Literal["size", "latency", "backlog"]
 
 
 @dataclass(frozen=True)
@@ -45,27 +51,63 @@ class BulkInserter:
         initial_batch_of_spans: Optional[Iterable[tuple[Span, str]]] = None,
         initial_batch_of_evaluations: Optional[Iterable[pb.Evaluation]] = None,
         sleep: float = 0.1,
+        max_latency: float = 0.05,
         max_ops_per_transaction: int = 1000,
+        target_transaction_sec: float = 0.5,
         max_queue_size: int = 1000,
+        max_spans_queue_size: int = 20_000,
         enable_prometheus: bool = False,
         retry_delay_sec: float = DEFAULT_RETRY_DELAY_SEC,
         retry_allowance: int = DEFAULT_RETRY_ALLOWANCE,
+        row_id_cache: Optional[RowIdCache] = None,
+        spool_dir: Optional[Path] = None,
+        max_spooled_items_per_read: int = 10_000,
+        num_workers: int = 1,
     ) -> None:
         """
         :param db: A function to initiate a new database session.
         :param initial_batch_of_spans: Initial batch of spans to insert.
-        :param sleep: The time to sleep between bulk insertions
+        :param sleep: The time to sleep between bulk insertions when no spans or evaluations
+        are buffered.
+        :param max_latency: The maximum time a span or evaluation waits in the buffer before
+        it's flushed. The buffers are flushed sooner if they fill up to the batch size.
         :param max_ops_per_transaction: The maximum number of operations to dequeue from
-        the operations queue for each transaction.
+        the operations queue for each transaction. This is also the initial batch size for
+        spans, which is then tuned between a tenth and ten times this value, depending on
+        how long the transactions take.
+        :param target_transaction_sec: The duration of span insertion transactions that the
+        batch size is tuned for.
         :param max_queue_size: The maximum length of the operations queue.
+        :param max_spans_queue_size: The number of buffered spans and evaluations at which
+        new ones should be rejected, until the buffers drain below it.
         :param enable_prometheus: Whether Prometheus is enabled.
+        :param row_id_cache: Cache of project and trace row ids for span insertion. It should
+        be shared with the DML event handler so that deletions can invalidate it.
+        :param spool_dir: If provided, spans and evaluations are spooled to files in this
+        directory before being inserted, and any left over from a previous run are inserted
+        on startup. This bounds memory usage when the database can't keep up with ingestion.
+        The initial batches of spans and evaluations are not spooled.
+        :param max_spooled_items_per_read: The maximum number of spooled spans and evaluations
+        to read from disk for each bulk insertion.
+        :param num_workers: The number of concurrent database sessions used to insert spans.
+        Spans are partitioned among them by trace. This is ignored for SQLite.
         """
         self._db = db
         self._running = False
         self._sleep = sleep
+        self._max_latency = max_latency
         self._max_ops_per_transaction = max_ops_per_transaction
+        self._batch_size = _AdaptiveBatchSize(
+            max_ops_per_transaction,
+            min_size=max(1, max_ops_per_transaction // 10),
+            max_size=max_ops_per_transaction * 10,
+            target_sec=target_transaction_sec,
+        )
+        self._flush_event: Optional[asyncio.Event] = None
+        self._first_buffered_at: Optional[float] = None
         self._operations: Optional[Queue[DataManipulation]] = None
         self._max_queue_size = max_queue_size
+        self._max_spans_queue_size = max_spans_queue_size
         self._spans: list[tuple[Span, str]] = (
             [] if initial_batch_of_spans is None else list(initial_batch_of_spans)
         )
@@ -73,11 +115,20 @@ class BulkInserter:
             [] if initial_batch_of_evaluations is None else list(initial_batch_of_evaluations)
         )
         self._task: Optional[asyncio.Task[None]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._event_queue = event_queue
         self._enable_prometheus = enable_prometheus
         self._retry_delay_sec = retry_delay_sec
         self._retry_allowance = retry_allowance
         self._queue_inserters = _QueueInserters(db, self._retry_delay_sec, self._retry_allowance)
+        self._row_id_cache = RowIdCache() if row_id_cache is None else row_id_cache
+        self._spool = None if spool_dir is None else SpanSpool(spool_dir)
+        self._spool_task: Optional[asyncio.Task[None]] = None
+        self._max_spooled_items_per_read = max_spooled_items_per_read
+        # SQLite serializes writes, and its sessions can't be interleaved safely.
+        self._num_workers = (
+            max(1, num_workers) if db.dialect is SupportedSQLDialect.POSTGRESQL else 1
+        )
 
     async def __aenter__(
         self,
@@ -88,8 +139,12 @@ class BulkInserter:
         Callable[[DataManipulation], None],
     ]:
         self._running = True
+        self._loop = asyncio.get_running_loop()
+        self._flush_event = asyncio.Event()
         self._operations = Queue(maxsize=self._max_queue_size)
         self._task = asyncio.create_task(self._bulk_insert())
+        if self._spool is not None:
+            self._spool_task = asyncio.create_task(self._flush_spool(self._spool))
         return (
             self._enqueue,
             self._queue_span,
@@ -99,9 +154,57 @@ class BulkInserter:
 
     async def __aexit__(self, *args: Any) -> None:
         self._running = False
+        self._loop = None
         if self._task:
             self._task.cancel()
             self._task = None
+        if self._spool_task:
+            self._spool_task.cancel()
+            self._spool_task = None
+        if self._spool is not None:
+            self._spool.flush()
+            self._spool.close()
+
+    @property
+    def is_full(self) -> bool:
+        num_buffered = len(self._spans) + len(self._evaluations)
+        if self._spool is not None:
+            num_buffered += self._spool.num_pending
+        return num_buffered >= self._max_spans_queue_size
+
+    def span_queue_is_full(self) -> bool:
+        """
+        Checks whether incoming spans and evaluations should be rejected. Each check that
+        returns True is counted as a rejection, so callers are expected to reject.
+        """
+        if not self.is_full:
+            return False
+        if self._enable_prometheus:
+            from phoenix.server.prometheus import BULK_LOADER_REJECTIONS
+
+            BULK_LOADER_REJECTIONS.inc()
+        return True
+
+    def queue_spans_threadsafe(
+        self,
+        spans: Iterable[tuple[Span, str]],
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """
+        Queues spans from a thread other than the one running the inserter, e.g. spans
+        created in the same process as a server running in a background thread, and waits
+        for them to be queued. Returns False if the inserter isn't running or the spans
+        should be rejected because the queue is full.
+        """
+        if not self._running or (loop := self._loop) is None or self.span_queue_is_full():
+            return False
+
+        async def queue_spans() -> None:
+            for span, project_name in spans:
+                await self._queue_span(span, project_name)
+
+        asyncio.run_coroutine_threadsafe(queue_spans(), loop).result(timeout)
+        return True
 
     async def _enqueue(self, *items: Any) -> None:
         await self._queue_inserters.enqueue(*items)
@@ -110,10 +213,91 @@ class BulkInserter:
         cast("Queue[DataManipulation]", self._operations).put_nowait(operation)
 
     async def _queue_span(self, span: Span, project_name: str) -> None:
-        self._spans.append((span, project_name))
+        if self._spool is not None:
+            self._spool.put_span(span, project_name)
+        else:
+            self._spans.append((span, project_name))
+        self._on_buffered()
 
     async def _queue_evaluation(self, evaluation: pb.Evaluation) -> None:
-        self._evaluations.append(evaluation)
+        if self._spool is not None:
+            self._spool.put_evaluation(evaluation)
+        else:
+            self._evaluations.append(evaluation)
+        self._on_buffered()
+
+    def _on_buffered(self) -> None:
+        if self._first_buffered_at is None:
+            self._first_buffered_at = perf_counter()
+        elif not self._buffers_are_full:
+            return
+        # The event is created when the inserter starts, since it's bound to the event loop.
+        if self._flush_event is not None:
+            self._flush_event.set()
+
+    @property
+    def _buffers_are_full(self) -> bool:
+        # Items in the spool only become readable once they have been written to disk,
+        # which is reported as a backlog instead.
+        return len(self._spans) + len(self._evaluations) >= self._batch_size.value
+
+    async def _wait_for_flush(self) -> Optional[FlushReason]:
+        """
+        Waits until the buffers fill up to the batch size, or until the oldest item in them
+        has waited for `max_latency`, whichever comes first. A backlog in the spool is flushed
+        right away. Returns None if nothing is buffered after the idle interval.
+        """
+        assert isinstance(self._flush_event, asyncio.Event)
+        deadline = perf_counter() + self._sleep
+        while True:
+            self._flush_event.clear()
+            if self._buffers_are_full:
+                return "size"
+            if self._spool is not None and self._spool.has_unread:
+                return "backlog"
+            if self._first_buffered_at is not None:
+                deadline = min(deadline, self._first_buffered_at + self._max_latency)
+            if (timeout := deadline - perf_counter()) <= 0:
+                return None if self._first_buffered_at is None else "latency"
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _flush_spool(self, spool: SpanSpool) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await loop.run_in_executor(None, spool.flush)
+            except Exception:
+                if self._enable_prometheus:
+                    from phoenix.server.prometheus import BULK_LOADER_EXCEPTIONS
+
+                    BULK_LOADER_EXCEPTIONS.inc()
+                logger.exception("Failed to write spool")
+            await asyncio.sleep(self._sleep)
+
+    async def _read_spool(
+        self,
+        spool: SpanSpool,
+    ) -> Optional[tuple[list[tuple[Span, str]], list[pb.Evaluation], SpoolPosition]]:
+        if spool.empty:
+            return None
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, spool.read, self._max_spooled_items_per_read
+            )
+        except Exception:
+            if self._enable_prometheus:
+                from phoenix.server.prometheus import BULK_LOADER_EXCEPTIONS
+
+                BULK_LOADER_EXCEPTIONS.inc()
+            logger.exception(
+                f"Failed to read spool. Will retry in {self._retry_delay_sec} seconds."
+            )
+            # The spool still has unread items, so the next flush would be right away.
+            await asyncio.sleep(self._retry_delay_sec)
+            return None
 
     async def _process_events(self, events: Iterable[Optional[DataManipulationEvent]]) -> None: ...
 
@@ -127,15 +311,21 @@ class BulkInserter:
             or not self._operations.empty()
             or self._spans
             or self._evaluations
+            or (self._spool is not None and not self._spool.empty)
         ):
-            if (
-                self._queue_inserters.empty
-                and self._operations.empty()
-                and not self._spans
-                and not self._evaluations
-            ):
-                await asyncio.sleep(self._sleep)
+            if self._enable_prometheus:
+                from phoenix.server.prometheus import BULK_LOADER_QUEUE_SIZE
+
+                BULK_LOADER_QUEUE_SIZE.labels(type="spans").set(len(self._spans))
+                BULK_LOADER_QUEUE_SIZE.labels(type="evaluations").set(len(self._evaluations))
+            reason = await self._wait_for_flush()
+            if reason is None and self._queue_inserters.empty and self._operations.empty():
                 continue
+            if reason is not None and self._enable_prometheus:
+                from phoenix.server.prometheus import BULK_LOADER_BATCH_SIZE, BULK_LOADER_FLUSHES
+
+                BULK_LOADER_FLUSHES.labels(reason=reason).inc()
+                BULK_LOADER_BATCH_SIZE.set(self._batch_size.value)
             ops_remaining = self._max_ops_per_transaction
             async with self._db() as session:
                 while ops_remaining and not self._operations.empty():
@@ -155,62 +345,140 @@ class BulkInserter:
             # it references doesn't exist. Grabbing the eval buffer later may
             # include an eval whose span is in the queue but missed being
             # included in the span buffer that was grabbed previously.
+            self._first_buffered_at = None
             if self._spans:
                 spans_buffer = self._spans
                 self._spans = []
             if self._evaluations:
                 evaluations_buffer = self._evaluations
                 self._evaluations = []
+            spool_position = None
+            if self._spool is not None and (spooled := await self._read_spool(self._spool)):
+                spooled_spans, spooled_evaluations, spool_position = spooled
+                spans_buffer = [*(spans_buffer or ()), *spooled_spans]
+                evaluations_buffer = [*(evaluations_buffer or ()), *spooled_evaluations]
             # Spans should be inserted before the evaluations, since an evaluation
             # insertion will fail if the span it references doesn't exist.
+            committed = True
             if spans_buffer:
-                await self._insert_spans(spans_buffer)
+                committed &= await self._insert_spans(spans_buffer)
                 spans_buffer = None
             if evaluations_buffer:
-                await self._insert_evaluations(evaluations_buffer)
+                committed &= await self._insert_evaluations(evaluations_buffer)
                 evaluations_buffer = None
+            if self._spool is not None and spool_position is not None:
+                # What was read from the spool is only discarded once all of it has been
+                # committed. Otherwise, it's read again, which is harmless because span and
+                # evaluation insertions are idempotent.
+                if committed:
+                    self._spool.commit(spool_position)
+                else:
+                    logger.warning(
+                        "Failed to insert spooled spans or evaluations. "
+                        f"Will retry in {self._retry_delay_sec} seconds."
+                    )
+                    await asyncio.sleep(self._retry_delay_sec)
             async for event in self._queue_inserters.insert():
                 self._event_queue.put(event)
-            await asyncio.sleep(self._sleep)
 
-    async def _insert_spans(self, spans: list[tuple[Span, str]]) -> None:
-        project_ids = set()
-        for i in range(0, len(spans), self._max_ops_per_transaction):
+    async def _insert_spans(self, spans: list[tuple[Span, str]]) -> bool:
+        """
+        Returns whether all the transactions were committed. Spans that fail to insert
+        individually, e.g. because they are invalid, don't count as failures.
+        """
+        # Spans are partitioned by trace so that each trace, along with the cumulative
+        # counts of its spans, is only ever written by one worker at a time.
+        partitions: list[list[tuple[Span, str]]] = [[] for _ in range(self._num_workers)]
+        for item in spans:
+            partitions[hash(item[0].context.trace_id) % self._num_workers].append(item)
+        results = await asyncio.gather(
+            *(
+                self._insert_span_partition(worker, partition)
+                for worker, partition in enumerate(partitions)
+                if partition
+            )
+        )
+        insertions = tuple(chain.from_iterable(insertions for insertions, _ in results))
+        project_ids = {insertion.project_rowid for insertion in insertions}
+        self._event_queue.put(SpanInsertEvent(tuple(project_ids), insertions))
+        return all(committed for _, committed in results)
+
+    async def _insert_span_partition(
+        self,
+        worker: int,
+        spans: list[tuple[Span, str]],
+    ) -> tuple[list[SpanInsertionEvent], bool]:
+        insertions: list[SpanInsertionEvent] = []
+        committed = True
+        while spans:
+            batch, spans = spans[: self._batch_size.value], spans[self._batch_size.value :]
             try:
                 start = perf_counter()
                 async with self._db() as session:
-                    for span, project_name in islice(spans, i, i + self._max_ops_per_transaction):
-                        if self._enable_prometheus:
-                            from phoenix.server.prometheus import BULK_LOADER_SPAN_INSERTIONS
+                    if self._enable_prometheus:
+                        from phoenix.server.prometheus import BULK_LOADER_SPAN_INSERTIONS
 
-                            BULK_LOADER_SPAN_INSERTIONS.inc()
-                        result: Optional[SpanInsertionEvent] = None
-                        try:
-                            async with session.begin_nested():
-                                result = await insert_span(session, span, project_name)
-                        except Exception:
-                            if self._enable_prometheus:
-                                from phoenix.server.prometheus import BULK_LOADER_EXCEPTIONS
+                        BULK_LOADER_SPAN_INSERTIONS.inc(len(batch))
+                    try:
+                        async with session.begin_nested():
+                            results = await insert_spans(session, *batch, cache=self._row_id_cache)
+                    except Exception:
+                        self._row_id_cache.clear()
+                        if self._enable_prometheus:
+                            from phoenix.server.prometheus import BULK_LOADER_EXCEPTIONS
 
-                                BULK_LOADER_EXCEPTIONS.inc()
-                            logger.exception(
-                                f"Failed to insert span with span_id={span.context.span_id}"
-                            )
-                        if result is not None:
-                            project_ids.add(result.project_rowid)
+                            BULK_LOADER_EXCEPTIONS.inc()
+                        logger.exception(
+                            "Failed to bulk insert spans. "
+                            f"Will try to insert ({len(batch)} spans) individually instead."
+                        )
+                        results = await self._insert_spans_individually(session, batch)
+                    insertions.extend(results)
+                elapsed = perf_counter() - start
+                self._batch_size.observe(len(batch), elapsed)
                 if self._enable_prometheus:
-                    from phoenix.server.prometheus import BULK_LOADER_INSERTION_TIME
+                    from phoenix.server.prometheus import (
+                        BULK_LOADER_INSERTION_TIME,
+                        BULK_LOADER_WORKER_INSERTION_TIME,
+                    )
 
-                    BULK_LOADER_INSERTION_TIME.observe(perf_counter() - start)
+                    BULK_LOADER_INSERTION_TIME.observe(elapsed)
+                    BULK_LOADER_WORKER_INSERTION_TIME.labels(worker=worker).observe(elapsed)
             except Exception:
+                self._row_id_cache.clear()
                 if self._enable_prometheus:
                     from phoenix.server.prometheus import BULK_LOADER_EXCEPTIONS
 
                     BULK_LOADER_EXCEPTIONS.inc()
                 logger.exception("Failed to insert spans")
-        self._event_queue.put(SpanInsertEvent(tuple(project_ids)))
+                committed = False
+        return insertions, committed
 
-    async def _insert_evaluations(self, evaluations: list[pb.Evaluation]) -> None:
+    async def _insert_spans_individually(
+        self,
+        session: AsyncSession,
+        spans: Iterable[tuple[Span, str]],
+    ) -> list[SpanInsertionEvent]:
+        results: list[SpanInsertionEvent] = []
+        for span, project_name in spans:
+            try:
+                async with session.begin_nested():
+                    if (result := await insert_span(session, span, project_name)) is not None:
+                        results.append(result)
+            except Exception:
+                if self._enable_prometheus:
+                    from phoenix.server.prometheus import BULK_LOADER_EXCEPTIONS
+
+                    BULK_LOADER_EXCEPTIONS.inc()
+                logger.exception(f"Failed to insert span with span_id={span.context.span_id}")
+        return results
+
+    async def _insert_evaluations(self, evaluations: list[pb.Evaluation]) -> bool:
+        """
+        Returns whether all the transactions were committed. Evaluations that fail to
+        insert individually, e.g. because their spans don't exist, don't count as failures.
+        """
+        committed = True
         for i in range(0, len(evaluations), self._max_ops_per_transaction):
             try:
                 start = perf_counter()
@@ -239,6 +507,8 @@ class BulkInserter:
 
                     BULK_LOADER_EXCEPTIONS.inc()
                 logger.exception("Failed to insert evaluations")
+                committed = False
+        return committed
 
 
 class _QueueInserters:
@@ -292,3 +562,41 @@ class _QueueInserters:
     @_enqueue.register(Insertables.DocumentAnnotation)
     async def _(self, item: Precursors.DocumentAnnotation) -> None:
         await self._document_annotations.enqueue(item)
+
+
+class _AdaptiveBatchSize:
+    """
+    Tunes the number of spans inserted per transaction so that transactions take about
+    `target_sec`, based on the throughput observed for recent transactions. Larger batches
+    amortize the per-transaction overhead, but hold locks longer and delay the visibility of
+    the spans in them.
+    """
+
+    def __init__(
+        self,
+        initial_size: int,
+        *,
+        min_size: int,
+        max_size: int,
+        target_sec: float,
+        smoothing: float = 0.5,
+    ) -> None:
+        self._min_size = min_size
+        self._max_size = max_size
+        self._target_sec = target_sec
+        self._smoothing = smoothing
+        self._size = float(min(max(initial_size, min_size), max_size))
+
+    @property
+    def value(self) -> int:
+        return int(self._size)
+
+    def observe(self, size: int, seconds: float) -> None:
+        if size <= 0 or seconds <= 0:
+            return
+        ideal = size / seconds * self._target_sec
+        if size < self.value and ideal > self._size:
+            # a partial batch says little about how large a full batch could be
+            return
+        size_ = self._smoothing * self._size + (1 - self._smoothing) * ideal
+        self._size = min(max(size_, self._min_size), self._max_size)
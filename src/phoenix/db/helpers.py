@@ -1,13 +1,24 @@
 from collections.abc import Callable, Hashable, Iterable
 from enum import Enum
-from typing import Any, Optional, TypeVar
+from typing import Any, Optional, TypeVar, Union
 
 from openinference.semconv.trace import (
     OpenInferenceSpanKindValues,
     RerankerAttributes,
     SpanAttributes,
 )
-from sqlalchemy import Integer, Select, SQLColumnExpression, case, distinct, func, select
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    Select,
+    SQLColumnExpression,
+    and_,
+    case,
+    distinct,
+    func,
+    or_,
+    select,
+)
 from typing_extensions import assert_never
 
 from phoenix.db import models
@@ -83,6 +94,27 @@ def get_project_names_for_experiments(*experiment_ids: int) -> Select[tuple[Opti
     )
 
 
+def dataset_example_revision_is_current(
+    dataset_version_id: Union[int, SQLColumnExpression[int], None] = None,
+) -> ColumnElement[bool]:
+    """
+    Filters dataset example revisions to the one current for each example as of the given
+    dataset version, or as of the latest version if none is given. Deletions are included.
+    Since the versions of all datasets share one sequence of IDs, this must be combined with
+    a filter on the dataset or on the examples.
+    """
+    revision = models.DatasetExampleRevision
+    if dataset_version_id is None:
+        return revision.superseded_by_dataset_version_id.is_(None)
+    return and_(
+        revision.dataset_version_id <= dataset_version_id,
+        or_(
+            revision.superseded_by_dataset_version_id.is_(None),
+            revision.superseded_by_dataset_version_id > dataset_version_id,
+        ),
+    )
+
+
 _AnyT = TypeVar("_AnyT")
 _KeyT = TypeVar("_KeyT", bound=Hashable)
 
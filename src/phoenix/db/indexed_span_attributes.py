@@ -0,0 +1,156 @@
+"""
+The registry of indexed span attributes, i.e. attributes that filters often compare, e.g.
+`metadata["tenant"] == "x"`, and that are therefore indexed, so that such comparisons don't
+need to extract the attribute from the JSON of every span in the time range. On SQLite, an
+indexed attribute is a virtual generated column of the spans table with an index, and on
+PostgreSQL, it's an expression index of the spans table, which is built concurrently so
+that spans can still be inserted in the meantime.
+
+The registry is persisted in the `indexed_span_attributes` table, and cached in memory for
+the filters (see `get_indexed_span_attributes`). The cache is loaded when the server starts
+and refreshed by the server that adds or removes an attribute. Other servers sharing the
+same PostgreSQL database keep using their cache until they restart, which is harmless,
+because the filters on PostgreSQL use the same expression with or without the index.
+"""
+
+import json
+from collections.abc import Mapping, Sequence
+from hashlib import sha256
+from types import MappingProxyType
+
+from sqlalchemy import delete, insert, select
+from typing_extensions import TypeAlias
+
+from phoenix.db import models
+from phoenix.db.helpers import SupportedSQLDialect
+from phoenix.server.types import DbSessionFactory
+
+AttributePath: TypeAlias = tuple[str, ...]
+ColumnName: TypeAlias = str
+
+_indexed_span_attributes: Mapping[AttributePath, ColumnName] = MappingProxyType({})
+
+
+def get_indexed_span_attributes() -> Mapping[AttributePath, ColumnName]:
+    """
+    Returns the column names of the indexed span attributes keyed by their paths, as of the
+    last time the registry was loaded.
+    """
+    return _indexed_span_attributes
+
+
+def get_column_name(path: Sequence[str]) -> ColumnName:
+    """
+    Returns the name of the generated column (and of the index, prefixed by `ix_spans_`)
+    of an indexed attribute, which is derived from its path.
+    """
+    digest = sha256(json.dumps(list(path)).encode()).hexdigest()
+    return f"indexed_attribute_{digest[:16]}"
+
+
+def validate_path(path: Sequence[str]) -> AttributePath:
+    if not path:
+        raise ValueError("The path of an indexed attribute must not be empty")
+    for key in path:
+        if not isinstance(key, str) or not key:
+            raise ValueError("The keys of an indexed attribute must be non-empty strings")
+        if '"' in key:
+            raise ValueError(f"The keys of an indexed attribute must not contain '\"': {key}")
+    return tuple(path)
+
+
+async def load_indexed_span_attributes(db: DbSessionFactory) -> None:
+    """
+    Loads the registry from the database into the in-memory cache.
+    """
+    global _indexed_span_attributes
+    async with db() as session:
+        rows = await session.execute(
+            select(models.IndexedSpanAttribute.path, models.IndexedSpanAttribute.column_name)
+        )
+        _indexed_span_attributes = MappingProxyType(
+            {tuple(path): column_name for path, column_name in rows}
+        )
+
+
+async def add_indexed_span_attribute(db: DbSessionFactory, path: Sequence[str]) -> bool:
+    """
+    Indexes the span attribute at the path, unless it's already indexed. Returns whether it
+    was added.
+    """
+    path = validate_path(path)
+    column_name = get_column_name(path)
+    async with db() as session:
+        if await session.scalar(
+            select(models.IndexedSpanAttribute.id).filter_by(column_name=column_name)
+        ):
+            return False
+    # The index is created before the attribute is registered, so that filters are never
+    # rewritten onto a generated column that doesn't exist yet.
+    if db.dialect is SupportedSQLDialect.POSTGRESQL:
+        expression = models.get_indexed_attribute_expression(path, "postgresql")
+        try:
+            await _execute_ddl(
+                db,
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_spans_{column_name} "
+                f"ON spans ({expression})",
+            )
+        except BaseException:
+            # a failed concurrent build leaves an invalid index behind
+            await _execute_ddl(db, f"DROP INDEX CONCURRENTLY IF EXISTS ix_spans_{column_name}")
+            raise
+    else:
+        expression = models.get_indexed_attribute_expression(path, "sqlite")
+        await _execute_ddl(
+            db,
+            f"ALTER TABLE spans ADD COLUMN {column_name} "
+            f"GENERATED ALWAYS AS ({expression}) VIRTUAL",
+            f"CREATE INDEX ix_spans_{column_name} ON spans ({column_name})",
+        )
+    async with db() as session:
+        await session.execute(
+            insert(models.IndexedSpanAttribute).values(path=list(path), column_name=column_name)
+        )
+    await load_indexed_span_attributes(db)
+    return True
+
+
+async def remove_indexed_span_attribute(db: DbSessionFactory, path: Sequence[str]) -> bool:
+    """
+    Drops the index of the span attribute at the path, if it's indexed. Returns whether it
+    was removed.
+    """
+    column_name = get_column_name(path)
+    # The attribute is unregistered before the index is dropped, so that filters are never
+    # rewritten onto a generated column that doesn't exist anymore.
+    async with db() as session:
+        if not await session.scalar(
+            delete(models.IndexedSpanAttribute)
+            .filter_by(column_name=column_name)
+            .returning(models.IndexedSpanAttribute.id)
+        ):
+            return False
+    await load_indexed_span_attributes(db)
+    if db.dialect is SupportedSQLDialect.POSTGRESQL:
+        await _execute_ddl(db, f"DROP INDEX CONCURRENTLY IF EXISTS ix_spans_{column_name}")
+    else:
+        await _execute_ddl(
+            db,
+            f"DROP INDEX IF EXISTS ix_spans_{column_name}",
+            f"ALTER TABLE spans DROP COLUMN {column_name}",
+        )
+    return True
+
+
+async def _execute_ddl(db: DbSessionFactory, *statements: str) -> None:
+    # The statements are executed as is, because the paths in the expressions may contain
+    # e.g. colons, which SQLAlchemy would take for bind parameters in `text()`. On
+    # PostgreSQL, indexes are created and dropped concurrently, which can't be done in a
+    # transaction.
+    execution_options = (
+        {"isolation_level": "AUTOCOMMIT"} if db.dialect is SupportedSQLDialect.POSTGRESQL else {}
+    )
+    async with db() as session:
+        connection = await session.connection(execution_options=execution_options)
+        for statement in statements:
+            await connection.exec_driver_sql(statement)
@@ -0,0 +1,76 @@
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from cachetools import TTLCache
+from typing_extensions import TypeAlias
+
+from phoenix.datetime_utils import normalize_datetime
+
+_ProjectName: TypeAlias = str
+_ProjectRowId: TypeAlias = int
+_TraceId: TypeAlias = str
+_TraceRowId: TypeAlias = int
+
+
+class CachedTrace(NamedTuple):
+    rowid: _TraceRowId
+    project_rowid: _ProjectRowId
+    start_time: datetime
+    end_time: datetime
+
+    def covers(self, start_time: datetime, end_time: datetime) -> bool:
+        start, end = normalize_datetime(start_time), normalize_datetime(end_time)
+        if start is None or end is None:
+            return False
+        return self.start_time <= start and end <= self.end_time
+
+
+class RowIdCache:
+    """
+    Bounded cache of the row ids of recently ingested projects and traces, so that
+    span insertion doesn't need to look them up again for each batch. Entries can be
+    stale if the rows have been deleted in the meantime, in which case the insertion
+    fails on a foreign key constraint and the caller is expected to clear the cache.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_projects: int = 1000,
+        max_traces: int = 100_000,
+        ttl_seconds: float = 600,
+    ) -> None:
+        self._projects: TTLCache[_ProjectName, _ProjectRowId] = TTLCache(
+            maxsize=max_projects, ttl=ttl_seconds
+        )
+        self._traces: TTLCache[_TraceId, CachedTrace] = TTLCache(
+            maxsize=max_traces, ttl=ttl_seconds
+        )
+
+    def get_project_rowid(self, name: _ProjectName) -> Optional[_ProjectRowId]:
+        return self._projects.get(name)
+
+    def set_project_rowid(self, name: _ProjectName, rowid: _ProjectRowId) -> None:
+        self._projects[name] = rowid
+
+    def get_trace(self, trace_id: _TraceId) -> Optional[CachedTrace]:
+        return self._traces.get(trace_id)
+
+    def set_trace(self, trace_id: _TraceId, trace: CachedTrace) -> None:
+        self._traces[trace_id] = trace
+
+    def invalidate(self, *project_rowids: _ProjectRowId) -> None:
+        """
+        Discards the given projects along with all of their traces.
+        """
+        if not project_rowids:
+            return
+        ids = set(project_rowids)
+        for name in [k for k, v in self._projects.items() if v in ids]:
+            self._projects.pop(name, None)
+        for trace_id in [k for k, v in self._traces.items() if v.project_rowid in ids]:
+            self._traces.pop(trace_id, None)
+
+    def clear(self) -> None:
+        self._projects.clear()
+        self._traces.clear()
@@ -1,12 +1,13 @@
+import asyncio
 import logging
-from collections.abc import Awaitable, Iterable, Iterator, Mapping
+from collections.abc import Awaitable, Iterable, Iterator, Mapping, Sequence
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from itertools import chain
+from itertools import chain, islice
 from typing import Any, Optional, Union, cast
 
-from sqlalchemy import insert, select
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import TypeAlias
 
@@ -21,6 +22,8 @@ DatasetExampleId: TypeAlias = int
 DatasetExampleRevisionId: TypeAlias = int
 SpanRowId: TypeAlias = int
 
+_MAX_EXAMPLES_PER_INSERT = 1_000
+
 
 @dataclass(frozen=True)
 class ExampleContent:
@@ -95,6 +98,25 @@ async def insert_dataset_example(
     return cast(DatasetExampleId, id_)
 
 
+async def insert_dataset_examples(
+    session: AsyncSession,
+    dataset_id: DatasetId,
+    num_examples: int,
+    created_at: Optional[datetime] = None,
+) -> list[DatasetExampleId]:
+    """
+    Inserts `num_examples` examples with a multi-row insert, and returns their ids in
+    order.
+    """
+    ids = await session.scalars(
+        insert(models.DatasetExample).returning(
+            models.DatasetExample.id, sort_by_parameter_order=True
+        ),
+        [{"dataset_id": dataset_id, "created_at": created_at}] * num_examples,
+    )
+    return list(ids)
+
+
 class RevisionKind(Enum):
     CREATE = "CREATE"
     PATCH = "PATCH"
@@ -107,6 +129,28 @@ class RevisionKind(Enum):
         raise ValueError(f"Invalid revision kind: {v}")
 
 
+async def supersede_dataset_example_revisions(
+    session: AsyncSession,
+    dataset_version_id: DatasetVersionId,
+    dataset_example_ids: Iterable[DatasetExampleId],
+) -> None:
+    """
+    Marks the current revisions of the examples as superseded by the given version. This
+    must be done whenever an existing example is given a new revision, so that each
+    example has exactly one current revision as of any version.
+    """
+    revision = models.DatasetExampleRevision
+    ids = iter(dataset_example_ids)
+    while chunk := list(islice(ids, _MAX_EXAMPLES_PER_INSERT)):
+        await session.execute(
+            update(revision)
+            .where(revision.dataset_example_id.in_(chunk))
+            .where(revision.dataset_version_id < dataset_version_id)
+            .where(revision.superseded_by_dataset_version_id.is_(None))
+            .values(superseded_by_dataset_version_id=dataset_version_id)
+        )
+
+
 async def insert_dataset_example_revision(
     session: AsyncSession,
     dataset_version_id: DatasetVersionId,
@@ -117,6 +161,10 @@ async def insert_dataset_example_revision(
     revision_kind: RevisionKind = RevisionKind.CREATE,
     created_at: Optional[datetime] = None,
 ) -> DatasetExampleRevisionId:
+    if revision_kind is not RevisionKind.CREATE:
+        await supersede_dataset_example_revisions(
+            session, dataset_version_id, (dataset_example_id,)
+        )
     id_ = await session.scalar(
         insert(models.DatasetExampleRevision)
         .values(
@@ -133,6 +181,40 @@ async def insert_dataset_example_revision(
     return cast(DatasetExampleRevisionId, id_)
 
 
+async def insert_dataset_example_revisions(
+    session: AsyncSession,
+    dataset_version_id: DatasetVersionId,
+    dataset_example_ids: Sequence[DatasetExampleId],
+    examples: Sequence[ExampleContent],
+    revision_kind: RevisionKind = RevisionKind.CREATE,
+    created_at: Optional[datetime] = None,
+) -> list[DatasetExampleRevisionId]:
+    """
+    Inserts a revision for each example with a multi-row insert, and returns their ids in
+    order.
+    """
+    if revision_kind is not RevisionKind.CREATE:
+        await supersede_dataset_example_revisions(session, dataset_version_id, dataset_example_ids)
+    ids = await session.scalars(
+        insert(models.DatasetExampleRevision).returning(
+            models.DatasetExampleRevision.id, sort_by_parameter_order=True
+        ),
+        [
+            {
+                "dataset_version_id": dataset_version_id,
+                "dataset_example_id": dataset_example_id,
+                "input": example.input,
+                "output": example.output,
+                "metadata_": example.metadata,
+                "revision_kind": revision_kind.value,
+                "created_at": created_at,
+            }
+            for dataset_example_id, example in zip(dataset_example_ids, examples)
+        ],
+    )
+    return list(ids)
+
+
 class DatasetAction(Enum):
     CREATE = "create"
     APPEND = "append"
@@ -179,35 +261,44 @@ async def add_dataset_examples(
     except Exception:
         logger.exception(f"Failed to insert dataset version for {dataset_id=}")
         raise
-    for example in (await examples) if isinstance(examples, Awaitable) else examples:
+    examples = (await examples) if isinstance(examples, Awaitable) else examples
+    # The examples may be parsed lazily from an uploaded file, so they are pulled in a
+    # worker thread to keep the decompression and parsing off the event loop.
+    chunks = _chunks(examples, _MAX_EXAMPLES_PER_INSERT)
+    loop = asyncio.get_running_loop()
+    while chunk := await loop.run_in_executor(None, next, chunks, None):
         try:
-            dataset_example_id = await insert_dataset_example(
+            dataset_example_ids = await insert_dataset_examples(
                 session=session,
                 dataset_id=dataset_id,
+                num_examples=len(chunk),
                 created_at=created_at,
             )
         except Exception:
-            logger.exception(f"Failed to insert dataset example for {dataset_id=}")
+            logger.exception(f"Failed to insert dataset examples for {dataset_id=}")
             raise
         try:
-            await insert_dataset_example_revision(
+            await insert_dataset_example_revisions(
                 session=session,
                 dataset_version_id=dataset_version_id,
-                dataset_example_id=dataset_example_id,
-                input=example.input,
-                output=example.output,
-                metadata=example.metadata,
+                dataset_example_ids=dataset_example_ids,
+                examples=chunk,
                 created_at=created_at,
             )
         except Exception:
             logger.exception(
-                f"Failed to insert dataset example revision for {dataset_version_id=}, "
-                f"{dataset_example_id=}"
+                f"Failed to insert dataset example revisions for {dataset_version_id=}"
             )
             raise
     return DatasetExampleAdditionEvent(dataset_id=dataset_id)
 
 
+def _chunks(examples: Iterable[ExampleContent], size: int) -> Iterator[list[ExampleContent]]:
+    iterator = iter(examples)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
 @dataclass(frozen=True)
 class DatasetKeys:
     input: frozenset[str]
@@ -1,7 +1,10 @@
-from typing import NamedTuple, Optional
+from collections.abc import AsyncIterator, Iterable, Sequence
+from itertools import islice
+from typing import Any, NamedTuple, Optional, Union
 
-from sqlalchemy import select
+from sqlalchemy import Row, Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 from typing_extensions import assert_never
 
 from phoenix.db import models
@@ -29,6 +32,18 @@ class TraceEvaluationInsertionEvent(EvaluationInsertionEvent): ...
 class DocumentEvaluationInsertionEvent(EvaluationInsertionEvent): ...
 
 
+class BulkEvaluationInsertionResult(NamedTuple):
+    annotation_rowids: tuple[int, ...]
+    """The row ids of the inserted or updated annotations."""
+    missing: tuple[int, ...]
+    """The positions of the evaluations whose spans or traces were not found."""
+
+
+# Keeps the number of bind parameters per statement well below the limits of
+# both SQLite and asyncpg, since each annotation row binds several values.
+_MAX_ROWS_PER_STATEMENT = 1000
+
+
 async def insert_evaluation(
     session: AsyncSession,
     evaluation: pb.Evaluation,
@@ -189,3 +204,191 @@ async def _insert_document_evaluation(
         )
     )
     return DocumentEvaluationInsertionEvent(project_rowid, evaluation_name)
+
+
+async def insert_span_evaluations(
+    session: AsyncSession,
+    evaluation_name: str,
+    span_ids: Sequence[str],
+    scores: Sequence[Optional[float]],
+    labels: Sequence[Optional[str]],
+    explanations: Sequence[Optional[str]],
+) -> BulkEvaluationInsertionResult:
+    """
+    Upserts the evaluations of a batch of spans, given column by column. Span ids are
+    resolved to row ids with one query per chunk, and the annotations are written with
+    multi-row upserts.
+    """
+    span_rowids = {
+        span_id: span_rowid
+        async for span_id, span_rowid in _select_in(
+            session,
+            select(models.Span.span_id, models.Span.id),
+            models.Span.span_id,
+            span_ids,
+        )
+    }
+    records: list[dict[str, Any]] = []
+    missing: list[int] = []
+    for i, span_id in enumerate(span_ids):
+        if (span_rowid := span_rowids.get(span_id)) is None:
+            missing.append(i)
+            continue
+        records.append(
+            _annotation_record(
+                evaluation_name,
+                scores[i],
+                labels[i],
+                explanations[i],
+                span_rowid=span_rowid,
+            )
+        )
+    annotation_rowids = await _upsert(
+        session, records, models.SpanAnnotation, ("name", "span_rowid")
+    )
+    return BulkEvaluationInsertionResult(annotation_rowids, tuple(missing))
+
+
+async def insert_trace_evaluations(
+    session: AsyncSession,
+    evaluation_name: str,
+    trace_ids: Sequence[str],
+    scores: Sequence[Optional[float]],
+    labels: Sequence[Optional[str]],
+    explanations: Sequence[Optional[str]],
+) -> BulkEvaluationInsertionResult:
+    """
+    Upserts the evaluations of a batch of traces, given column by column.
+    """
+    trace_rowids = {
+        trace_id: trace_rowid
+        async for trace_id, trace_rowid in _select_in(
+            session,
+            select(models.Trace.trace_id, models.Trace.id),
+            models.Trace.trace_id,
+            trace_ids,
+        )
+    }
+    records: list[dict[str, Any]] = []
+    missing: list[int] = []
+    for i, trace_id in enumerate(trace_ids):
+        if (trace_rowid := trace_rowids.get(trace_id)) is None:
+            missing.append(i)
+            continue
+        records.append(
+            _annotation_record(
+                evaluation_name,
+                scores[i],
+                labels[i],
+                explanations[i],
+                trace_rowid=trace_rowid,
+            )
+        )
+    annotation_rowids = await _upsert(
+        session, records, models.TraceAnnotation, ("name", "trace_rowid")
+    )
+    return BulkEvaluationInsertionResult(annotation_rowids, tuple(missing))
+
+
+async def insert_document_evaluations(
+    session: AsyncSession,
+    evaluation_name: str,
+    span_ids: Sequence[str],
+    document_positions: Sequence[int],
+    scores: Sequence[Optional[float]],
+    labels: Sequence[Optional[str]],
+    explanations: Sequence[Optional[str]],
+) -> BulkEvaluationInsertionResult:
+    """
+    Upserts the evaluations of a batch of retrieved documents, given column by column.
+    Evaluations of document positions that don't exist on their spans are discarded.
+    """
+    dialect = SupportedSQLDialect(session.bind.dialect.name)
+    spans = {
+        span_id: (span_rowid, num_docs)
+        async for span_id, span_rowid, num_docs in _select_in(
+            session,
+            select(models.Span.span_id, models.Span.id, num_docs_col(dialect)),
+            models.Span.span_id,
+            span_ids,
+        )
+    }
+    records: list[dict[str, Any]] = []
+    missing: list[int] = []
+    for i, span_id in enumerate(span_ids):
+        if (span := spans.get(span_id)) is None:
+            missing.append(i)
+            continue
+        span_rowid, num_docs = span
+        if not 0 <= (document_position := document_positions[i]) < (num_docs or 0):
+            continue
+        records.append(
+            _annotation_record(
+                evaluation_name,
+                scores[i],
+                labels[i],
+                explanations[i],
+                span_rowid=span_rowid,
+                document_position=document_position,
+            )
+        )
+    annotation_rowids = await _upsert(
+        session,
+        records,
+        models.DocumentAnnotation,
+        ("name", "span_rowid", "document_position"),
+    )
+    return BulkEvaluationInsertionResult(annotation_rowids, tuple(missing))
+
+
+def _annotation_record(
+    evaluation_name: str,
+    score: Optional[float],
+    label: Optional[str],
+    explanation: Optional[str],
+    **subject: int,
+) -> dict[str, Any]:
+    return dict(
+        **subject,
+        name=evaluation_name,
+        label=label,
+        score=None if score is None or score != score else score,  # NaN is missing
+        explanation=explanation,
+        metadata_={},  # `metadata_` must match ORM
+        annotator_kind="LLM",
+    )
+
+
+async def _select_in(
+    session: AsyncSession,
+    stmt: Select[Any],
+    column: InstrumentedAttribute[str],
+    keys: Iterable[str],
+) -> AsyncIterator[Row[Any]]:
+    unique_keys = iter(set(keys))
+    while chunk := list(islice(unique_keys, _MAX_ROWS_PER_STATEMENT)):
+        async for row in await session.stream(stmt.where(column.in_(chunk))):
+            yield row
+
+
+async def _upsert(
+    session: AsyncSession,
+    records: Sequence[dict[str, Any]],
+    table: Union[
+        type[models.SpanAnnotation],
+        type[models.TraceAnnotation],
+        type[models.DocumentAnnotation],
+    ],
+    unique_by: Sequence[str],
+) -> tuple[int, ...]:
+    dialect = SupportedSQLDialect(session.bind.dialect.name)
+    annotation_rowids: list[int] = []
+    for i in range(0, len(records), _MAX_ROWS_PER_STATEMENT):
+        stmt = insert_on_conflict(
+            *islice(records, i, i + _MAX_ROWS_PER_STATEMENT),
+            dialect=dialect,
+            table=table,
+            unique_by=unique_by,
+        ).returning(table.id)
+        annotation_rowids.extend(await session.scalars(stmt))
+    return tuple(annotation_rowids)
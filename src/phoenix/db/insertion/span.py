@@ -1,25 +1,57 @@
+from collections import defaultdict
+from collections.abc import Iterable, Mapping, Sequence
 from dataclasses import asdict
-from typing import NamedTuple, Optional, cast
+from datetime import datetime
+from itertools import islice
+from typing import Any, NamedTuple, Optional, cast
 
 from openinference.semconv.trace import SpanAttributes
-from sqlalchemy import func, insert, select, update
+from sqlalchemy import bindparam, case, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as insert_postgresql
+from sqlalchemy.dialects.sqlite import insert as insert_sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing_extensions import TypeAlias, assert_never
 
 from phoenix.db import models
-from phoenix.db.helpers import SupportedSQLDialect
+from phoenix.db.helpers import SupportedSQLDialect, dedup
+from phoenix.db.insertion.cache import CachedTrace, RowIdCache
 from phoenix.db.insertion.helpers import OnConflict, insert_on_conflict
 from phoenix.trace.attributes import get_attribute_value
 from phoenix.trace.schemas import Span, SpanStatusCode
 
 
+class InsertedSpan(NamedTuple):
+    start_time: datetime
+    llm_token_count_prompt: Optional[int] = None
+    llm_token_count_completion: Optional[int] = None
+
+
 class SpanInsertionEvent(NamedTuple):
+    """
+    The spans inserted into a project, along with the time bounds of the traces that were
+    created or widened by them, so that cached aggregates can be updated incrementally.
+    """
+
     project_rowid: int
+    spans: tuple[InsertedSpan, ...] = ()
+    trace_bounds: tuple[tuple[datetime, datetime], ...] = ()
 
 
 class ClearProjectSpansEvent(NamedTuple):
     project_rowid: int
 
 
+_SpanId: TypeAlias = str
+_TraceId: TypeAlias = str
+_ProjectName: TypeAlias = str
+_ProjectRowId: TypeAlias = int
+_TraceRowId: TypeAlias = int
+
+# Keeps the number of bind parameters per statement well below the limits of
+# both SQLite and asyncpg, since each span row binds more than a dozen values.
+_MAX_SPANS_PER_STATEMENT = 500
+
+
 async def insert_span(
     session: AsyncSession,
     span: Span,
@@ -39,9 +71,11 @@ async def insert_span(
         select(models.Trace).where(models.Trace.trace_id == span.context.trace_id)
     ):
         trace_rowid = trace.id
+        trace_bounds: tuple[tuple[datetime, datetime], ...] = ()
         if span.start_time < trace.start_time or trace.end_time < span.end_time:
             trace_start_time = min(trace.start_time, span.start_time)
             trace_end_time = max(trace.end_time, span.end_time)
+            trace_bounds = ((trace_start_time, trace_end_time),)
             await session.execute(
                 update(models.Trace)
                 .where(models.Trace.id == trace_rowid)
@@ -64,20 +98,8 @@ async def insert_span(
                 .returning(models.Trace.id)
             ),
         )
-    cumulative_error_count = int(span.status_code is SpanStatusCode.ERROR)
-    cumulative_llm_token_count_prompt = cast(
-        int, get_attribute_value(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_PROMPT) or 0
-    )
-    cumulative_llm_token_count_completion = cast(
-        int, get_attribute_value(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_COMPLETION) or 0
-    )
-    llm_token_count_prompt = cast(
-        Optional[int], get_attribute_value(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_PROMPT)
-    )
-    llm_token_count_completion = cast(
-        Optional[int],
-        get_attribute_value(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_COMPLETION),
-    )
+        trace_bounds = ((span.start_time, span.end_time),)
+    cumulative_counts = _own_counts(span)
     if accumulation := (
         await session.execute(
             select(
@@ -87,29 +109,10 @@ async def insert_span(
             ).where(models.Span.parent_id == span.context.span_id)
         )
     ).first():
-        cumulative_error_count += cast(int, accumulation[0] or 0)
-        cumulative_llm_token_count_prompt += cast(int, accumulation[1] or 0)
-        cumulative_llm_token_count_completion += cast(int, accumulation[2] or 0)
+        cumulative_counts = _add(cumulative_counts, _Counts(*(int(v or 0) for v in accumulation)))
     span_rowid = await session.scalar(
         insert_on_conflict(
-            dict(
-                span_id=span.context.span_id,
-                trace_rowid=trace_rowid,
-                parent_id=span.parent_id,
-                span_kind=span.span_kind.value,
-                name=span.name,
-                start_time=span.start_time,
-                end_time=span.end_time,
-                attributes=span.attributes,
-                events=[asdict(event) for event in span.events],
-                status_code=span.status_code.value,
-                status_message=span.status_message,
-                cumulative_error_count=cumulative_error_count,
-                cumulative_llm_token_count_prompt=cumulative_llm_token_count_prompt,
-                cumulative_llm_token_count_completion=cumulative_llm_token_count_completion,
-                llm_token_count_prompt=llm_token_count_prompt,
-                llm_token_count_completion=llm_token_count_completion,
-            ),
+            _span_record(span, trace_rowid, cumulative_counts),
             dialect=dialect,
             table=models.Span,
             unique_by=("span_id",),
@@ -122,9 +125,432 @@ async def insert_span(
     # the parent usually arrives after the child. But in the event that a
     # child arrives after its parent, we need to make sure that all the
     # ancestors' cumulative values are updated.
+    if span.parent_id is not None:
+        await _propagate_to_ancestors(session, span.parent_id, cumulative_counts)
+    return SpanInsertionEvent(project_rowid, (_inserted_span(span),), trace_bounds)
+
+
+async def insert_spans(
+    session: AsyncSession,
+    *spans: tuple[Span, str],
+    cache: Optional[RowIdCache] = None,
+) -> list[SpanInsertionEvent]:
+    """
+    Set-based insertion of a batch of spans. Projects and traces are resolved with
+    one multi-row statement each, and spans are inserted with multi-row `INSERT ...
+    ON CONFLICT DO NOTHING` statements. Cumulative counts are accumulated in memory
+    for spans whose descendants are in the same batch or already in the database.
+
+    If a cache is given, projects and traces found in it are not looked up again,
+    and a cached trace is only updated when the batch widens its time bounds. The
+    cache is populated before the transaction is committed, so the caller should
+    clear it if the transaction fails.
+    """
+    dialect = SupportedSQLDialect(session.bind.dialect.name)
+    spans = tuple(dedup(spans, lambda s: s[0].context.span_id))
+    if not spans:
+        return []
+    existing_span_ids = set(
+        await session.scalars(
+            select(models.Span.span_id).where(
+                models.Span.span_id.in_([span.context.span_id for span, _ in spans])
+            )
+        )
+    )
+    if existing_span_ids:
+        spans = tuple(s for s in spans if s[0].context.span_id not in existing_span_ids)
+        if not spans:
+            return []
+    project_rowids = await _get_or_create_projects(
+        session, dialect, {project_name for _, project_name in spans}, cache
+    )
+    trace_rowids, upserted_traces = await _upsert_traces(
+        session, dialect, spans, project_rowids, cache
+    )
+    cumulative_counts = await _accumulate(session, (span for span, _ in spans))
+    project_rowid_by_span_id: dict[_SpanId, _ProjectRowId] = {}
+    records = []
+    for span, project_name in spans:
+        span_id = span.context.span_id
+        project_rowid_by_span_id[span_id] = project_rowids[project_name]
+        records.append(
+            _span_record(
+                span,
+                trace_rowids[span.context.trace_id],
+                cumulative_counts[span_id],
+            )
+        )
+    inserted_span_ids: set[_SpanId] = set()
+    for i in range(0, len(records), _MAX_SPANS_PER_STATEMENT):
+        stmt = insert_on_conflict(
+            *islice(records, i, i + _MAX_SPANS_PER_STATEMENT),
+            dialect=dialect,
+            table=models.Span,
+            unique_by=("span_id",),
+            on_conflict=OnConflict.DO_NOTHING,
+        ).returning(models.Span.span_id)
+        inserted_span_ids.update(await session.scalars(stmt))
+    # Propagate cumulative values to ancestors that were already in the database.
+    # Descendants within the batch have been accounted for above, so only the spans
+    # whose parents are outside of the batch need to be propagated.
+    deltas: dict[_SpanId, _Counts] = {}
+    for span, _ in spans:
+        if (
+            (span_id := span.context.span_id) not in inserted_span_ids
+            or span.parent_id is None
+            or span.parent_id in cumulative_counts
+        ):
+            continue
+        deltas[span.parent_id] = _add(
+            deltas.get(span.parent_id, _Counts()), cumulative_counts[span_id]
+        )
+    await _propagate_to_existing_ancestors(session, deltas)
+    inserted_spans: defaultdict[_ProjectRowId, list[InsertedSpan]] = defaultdict(list)
+    for span, _ in spans:
+        if (span_id := span.context.span_id) in inserted_span_ids:
+            inserted_spans[project_rowid_by_span_id[span_id]].append(_inserted_span(span))
+    trace_bounds: defaultdict[_ProjectRowId, list[tuple[datetime, datetime]]] = defaultdict(list)
+    for trace in upserted_traces:
+        trace_bounds[trace.project_rowid].append((trace.start_time, trace.end_time))
+    return [
+        SpanInsertionEvent(project_rowid, tuple(spans_), tuple(trace_bounds[project_rowid]))
+        for project_rowid, spans_ in inserted_spans.items()
+    ]
+
+
+class _Counts(NamedTuple):
+    error_count: int = 0
+    llm_token_count_prompt: int = 0
+    llm_token_count_completion: int = 0
+
+
+def _add(*counts: _Counts) -> _Counts:
+    return _Counts(*map(sum, zip(*counts)))
+
+
+def _own_counts(span: Span) -> _Counts:
+    return _Counts(
+        error_count=int(span.status_code is SpanStatusCode.ERROR),
+        llm_token_count_prompt=cast(
+            int, get_attribute_value(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_PROMPT) or 0
+        ),
+        llm_token_count_completion=cast(
+            int,
+            get_attribute_value(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_COMPLETION) or 0,
+        ),
+    )
+
+
+def _inserted_span(span: Span) -> InsertedSpan:
+    return InsertedSpan(
+        start_time=span.start_time,
+        llm_token_count_prompt=cast(
+            Optional[int],
+            get_attribute_value(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_PROMPT),
+        ),
+        llm_token_count_completion=cast(
+            Optional[int],
+            get_attribute_value(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_COMPLETION),
+        ),
+    )
+
+
+def _span_record(
+    span: Span,
+    trace_rowid: _TraceRowId,
+    cumulative_counts: _Counts,
+) -> dict[str, Any]:
+    return dict(
+        span_id=span.context.span_id,
+        trace_rowid=trace_rowid,
+        parent_id=span.parent_id,
+        span_kind=span.span_kind.value,
+        name=span.name,
+        start_time=span.start_time,
+        end_time=span.end_time,
+        attributes=span.attributes,
+        events=[asdict(event) for event in span.events],
+        status_code=span.status_code.value,
+        status_message=span.status_message,
+        cumulative_error_count=cumulative_counts.error_count,
+        cumulative_llm_token_count_prompt=cumulative_counts.llm_token_count_prompt,
+        cumulative_llm_token_count_completion=cumulative_counts.llm_token_count_completion,
+        llm_token_count_prompt=cast(
+            Optional[int],
+            get_attribute_value(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_PROMPT),
+        ),
+        llm_token_count_completion=cast(
+            Optional[int],
+            get_attribute_value(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_COMPLETION),
+        ),
+        **get_materialized_attributes(span.attributes),
+    )
+
+
+def get_materialized_attributes(attributes: Mapping[str, Any]) -> dict[str, Optional[str]]:
+    """
+    Returns the values of the span columns that are materialized from its attributes,
+    i.e. the previews and mime types of its input and output, and its LLM model name.
+    """
+    input_value = get_attribute_value(attributes, SpanAttributes.INPUT_VALUE)
+    output_value = get_attribute_value(attributes, SpanAttributes.OUTPUT_VALUE)
+    return dict(
+        input_preview=_preview(input_value),
+        input_mime_type=_str(get_attribute_value(attributes, SpanAttributes.INPUT_MIME_TYPE)),
+        output_preview=_preview(output_value),
+        output_mime_type=_str(get_attribute_value(attributes, SpanAttributes.OUTPUT_MIME_TYPE)),
+        llm_model_name=_str(get_attribute_value(attributes, SpanAttributes.LLM_MODEL_NAME)),
+    )
+
+
+def _preview(value: Any) -> Optional[str]:
+    return value[: models.MAX_PREVIEW_LENGTH] if isinstance(value, str) else None
+
+
+def _str(value: Any) -> Optional[str]:
+    return value if isinstance(value, str) else None
+
+
+async def _get_or_create_projects(
+    session: AsyncSession,
+    dialect: SupportedSQLDialect,
+    project_names: set[_ProjectName],
+    cache: Optional[RowIdCache] = None,
+) -> dict[_ProjectName, _ProjectRowId]:
+    project_rowids: dict[_ProjectName, _ProjectRowId] = {}
+    if cache is not None:
+        for name in project_names:
+            if (rowid := cache.get_project_rowid(name)) is not None:
+                project_rowids[name] = rowid
+    if missing := project_names.difference(project_rowids):
+        stmt = select(models.Project.name, models.Project.id).where(
+            models.Project.name.in_(missing)
+        )
+        project_rowids.update({name: id_ for name, id_ in await session.execute(stmt)})
+    if missing := project_names.difference(project_rowids):
+        # Another transaction may be creating the same projects concurrently, in which
+        # case the conflicting rows are not returned and have to be selected afterwards.
+        returning = insert_on_conflict(
+            *(dict(name=name) for name in missing),
+            dialect=dialect,
+            table=models.Project,
+            unique_by=("name",),
+            on_conflict=OnConflict.DO_NOTHING,
+        ).returning(models.Project.name, models.Project.id)
+        project_rowids.update({name: id_ for name, id_ in await session.execute(returning)})
+    if missing := project_names.difference(project_rowids):
+        stmt = select(models.Project.name, models.Project.id).where(
+            models.Project.name.in_(missing)
+        )
+        project_rowids.update({name: id_ for name, id_ in await session.execute(stmt)})
+    if cache is not None:
+        for name, rowid in project_rowids.items():
+            cache.set_project_rowid(name, rowid)
+    return project_rowids
+
+
+async def _upsert_traces(
+    session: AsyncSession,
+    dialect: SupportedSQLDialect,
+    spans: Iterable[tuple[Span, str]],
+    project_rowids: Mapping[_ProjectName, _ProjectRowId],
+    cache: Optional[RowIdCache] = None,
+) -> tuple[dict[_TraceId, _TraceRowId], list[CachedTrace]]:
+    """
+    Returns the row ids of the traces of the spans, along with the traces that were
+    created or whose time bounds may have been widened.
+    """
+    records: dict[_TraceId, dict[str, Any]] = {}
+    for span, project_name in spans:
+        if (record := records.get(trace_id := span.context.trace_id)) is None:
+            records[trace_id] = dict(
+                project_rowid=project_rowids[project_name],
+                trace_id=trace_id,
+                start_time=span.start_time,
+                end_time=span.end_time,
+            )
+        else:
+            record["start_time"] = min(cast(datetime, record["start_time"]), span.start_time)
+            record["end_time"] = max(cast(datetime, record["end_time"]), span.end_time)
+    trace_rowids: dict[_TraceId, _TraceRowId] = {}
+    if cache is not None:
+        # Traces whose cached bounds already cover the batch need no update.
+        for trace_id, record in list(records.items()):
+            if (cached := cache.get_trace(trace_id)) is not None and cached.covers(
+                record["start_time"], record["end_time"]
+            ):
+                trace_rowids[trace_id] = cached.rowid
+                del records[trace_id]
+    if not records:
+        return trace_rowids, []
+    if dialect is SupportedSQLDialect.POSTGRESQL:
+        excluded = insert_postgresql(models.Trace).excluded
+    elif dialect is SupportedSQLDialect.SQLITE:
+        excluded = insert_sqlite(models.Trace).excluded
+    else:
+        assert_never(dialect)
+    # Existing traces keep their project and only have their time bounds widened.
+    stmt = insert_on_conflict(
+        *records.values(),
+        dialect=dialect,
+        table=models.Trace,
+        unique_by=("trace_id",),
+        set_=dict(
+            start_time=case(
+                (excluded.start_time < models.Trace.start_time, excluded.start_time),
+                else_=models.Trace.start_time,
+            ),
+            end_time=case(
+                (excluded.end_time > models.Trace.end_time, excluded.end_time),
+                else_=models.Trace.end_time,
+            ),
+        ),
+    ).returning(
+        models.Trace.trace_id,
+        models.Trace.id,
+        models.Trace.project_rowid,
+        models.Trace.start_time,
+        models.Trace.end_time,
+    )
+    upserted: list[CachedTrace] = []
+    for trace_id, id_, project_rowid, start_time, end_time in await session.execute(stmt):
+        trace_rowids[trace_id] = id_
+        upserted.append(trace := CachedTrace(id_, project_rowid, start_time, end_time))
+        if cache is not None:
+            cache.set_trace(trace_id, trace)
+    return trace_rowids, upserted
+
+
+async def _accumulate(
+    session: AsyncSession,
+    spans: Iterable[Span],
+) -> dict[_SpanId, _Counts]:
+    """
+    Computes the cumulative counts of each span from its own counts, the counts of its
+    children already in the database, and the counts of its descendants in the batch.
+    """
+    own_counts: dict[_SpanId, _Counts] = {}
+    children: defaultdict[_SpanId, list[_SpanId]] = defaultdict(list)
+    for span in spans:
+        own_counts[span_id := span.context.span_id] = _own_counts(span)
+        if span.parent_id is not None:
+            children[span.parent_id].append(span_id)
+    stmt = (
+        select(
+            models.Span.parent_id,
+            func.sum(models.Span.cumulative_error_count),
+            func.sum(models.Span.cumulative_llm_token_count_prompt),
+            func.sum(models.Span.cumulative_llm_token_count_completion),
+        )
+        .where(models.Span.parent_id.in_(list(own_counts)))
+        .group_by(models.Span.parent_id)
+    )
+    for parent_id, *accumulation in await session.execute(stmt):
+        own_counts[parent_id] = _add(
+            own_counts[parent_id], _Counts(*(int(v or 0) for v in accumulation))
+        )
+    cumulative_counts: dict[_SpanId, _Counts] = {}
+    for span_id in _post_order(own_counts, children):
+        cumulative_counts[span_id] = _add(
+            own_counts[span_id],
+            *(cumulative_counts.get(child_id, _Counts()) for child_id in children.get(span_id, ())),
+        )
+    return cumulative_counts
+
+
+def _post_order(
+    span_ids: Iterable[_SpanId],
+    children: Mapping[_SpanId, Sequence[_SpanId]],
+) -> Iterable[_SpanId]:
+    """
+    Yields each span after all of its descendants, iteratively so that deep traces
+    don't run into the recursion limit.
+    """
+    visited: set[_SpanId] = set()
+    for root in span_ids:
+        if root in visited:
+            continue
+        visited.add(root)
+        stack = [(root, iter(children.get(root, ())))]
+        while stack:
+            span_id, it = stack[-1]
+            if (child_id := next(it, None)) is None:
+                stack.pop()
+                yield span_id
+            elif child_id not in visited:
+                visited.add(child_id)
+                stack.append((child_id, iter(children.get(child_id, ()))))
+
+
+async def _propagate_to_existing_ancestors(
+    session: AsyncSession,
+    deltas: Mapping[_SpanId, _Counts],
+) -> None:
+    """
+    Adds the counts to each of the given spans and all of their ancestors, using one
+    query to find the ancestors and one set-based update. This is usually a no-op,
+    since parents usually arrive after their children.
+    """
+    if not deltas:
+        return
+    ancestors = (
+        select(
+            models.Span.span_id.label("descendant_span_id"),
+            models.Span.id,
+            models.Span.parent_id,
+        )
+        .where(models.Span.span_id.in_(list(deltas)))
+        .cte(recursive=True)
+    )
+    child = ancestors.alias()
+    ancestors = ancestors.union_all(
+        select(child.c.descendant_span_id, models.Span.id, models.Span.parent_id).join(
+            child, models.Span.span_id == child.c.parent_id
+        )
+    )
+    totals: defaultdict[int, list[_Counts]] = defaultdict(list)
+    for descendant_span_id, id_ in await session.execute(
+        select(ancestors.c.descendant_span_id, ancestors.c.id)
+    ):
+        totals[id_].append(deltas[descendant_span_id])
+    if not totals:
+        return
+    stmt = (
+        update(models.Span)
+        .where(models.Span.id == bindparam("id_"))
+        .values(
+            cumulative_error_count=models.Span.cumulative_error_count + bindparam("error_count_"),
+            cumulative_llm_token_count_prompt=models.Span.cumulative_llm_token_count_prompt
+            + bindparam("llm_token_count_prompt_"),
+            cumulative_llm_token_count_completion=models.Span.cumulative_llm_token_count_completion
+            + bindparam("llm_token_count_completion_"),
+        )
+    )
+    # Executed on the connection as a plain executemany, since the ORM would treat a
+    # list of parameters as a bulk update by primary key.
+    connection = await session.connection()
+    await connection.execute(
+        stmt,
+        [
+            dict(
+                id_=id_,
+                error_count_=total.error_count,
+                llm_token_count_prompt_=total.llm_token_count_prompt,
+                llm_token_count_completion_=total.llm_token_count_completion,
+            )
+            for id_, total in ((id_, _add(*counts)) for id_, counts in totals.items())
+        ],
+    )
+
+
+async def _propagate_to_ancestors(
+    session: AsyncSession,
+    parent_id: _SpanId,
+    counts: _Counts,
+) -> None:
     ancestors = (
         select(models.Span.id, models.Span.parent_id)
-        .where(models.Span.span_id == span.parent_id)
+        .where(models.Span.span_id == parent_id)
         .cte(recursive=True)
     )
     child = ancestors.alias()
@@ -137,11 +563,10 @@ async def insert_span(
         update(models.Span)
         .where(models.Span.id.in_(select(ancestors.c.id)))
         .values(
-            cumulative_error_count=models.Span.cumulative_error_count + cumulative_error_count,
+            cumulative_error_count=models.Span.cumulative_error_count + counts.error_count,
             cumulative_llm_token_count_prompt=models.Span.cumulative_llm_token_count_prompt
-            + cumulative_llm_token_count_prompt,
+            + counts.llm_token_count_prompt,
             cumulative_llm_token_count_completion=models.Span.cumulative_llm_token_count_completion
-            + cumulative_llm_token_count_completion,
+            + counts.llm_token_count_completion,
         )
     )
-    return SpanInsertionEvent(project_rowid)
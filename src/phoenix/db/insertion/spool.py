@@ -0,0 +1,244 @@
+"""
+An append-only, on-disk spool for spans and evaluations waiting to be inserted into the
+database, so that they survive restarts and ingestion bursts don't have to fit in memory.
+
+The spool is a directory of segment files named by sequence number. Each segment is a
+series of records, each of which is a header with the kind and the length of its payload,
+followed by the payload. Spans are stored as OTLP protobuf messages prefixed with the name
+of their project, and evaluations as their protobuf messages. Records are appended to the
+active segment, which is sealed once it is large enough or when the reader has caught up
+with everything else. Sealed segments are memory-mapped for reading, and deleted once the
+reader commits past them. Segments left over from a previous process are replayed on
+startup. Records read but not yet committed before a crash are replayed too, which is
+harmless because span and evaluation insertions are idempotent.
+"""
+
+import logging
+import mmap
+import struct
+from pathlib import Path
+from threading import Lock
+from typing import BinaryIO, NamedTuple, Optional
+
+import opentelemetry.proto.trace.v1.trace_pb2 as otlp
+
+import phoenix.trace.v1 as pb
+from phoenix.trace.otel import decode_otlp_span, encode_span_to_otlp
+from phoenix.trace.schemas import Span
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct(">BI")  # kind and length of payload
+_NAME_LENGTH = struct.Struct(">H")
+_SPAN = 1
+_EVALUATION = 2
+_SUFFIX = ".spool"
+_DEFAULT_MAX_SEGMENT_BYTES = 64 * 1024 * 1024
+
+
+class SpoolPosition(NamedTuple):
+    segment: int
+    offset: int
+
+
+class SpanSpool:
+    """
+    Spans and evaluations are buffered in memory by `put_span` and `put_evaluation`, and
+    written to disk by `flush`. `read` returns them in the order they were written, with
+    the spans of each flush preceding its evaluations, and `commit` discards what has been
+    read. `flush` and `read` do blocking IO and are meant to be run in worker threads, but
+    only one thread should be flushing, and only one thread should be reading, at a time.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        max_segment_bytes: int = _DEFAULT_MAX_SEGMENT_BYTES,
+    ) -> None:
+        self._directory = directory
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_segment_bytes = max_segment_bytes
+        self._lock = Lock()
+        self._pending_spans: list[tuple[Span, str]] = []
+        self._pending_evaluations: list[pb.Evaluation] = []
+        self._sealed: dict[int, int] = {}  # segment number -> size in bytes
+        for path in sorted(directory.glob(f"*{_SUFFIX}"), key=lambda p: int(p.stem)):
+            self._sealed[int(path.stem)] = path.stat().st_size
+        self._active_segment = max(self._sealed, default=-1) + 1
+        self._active: Optional[BinaryIO] = None
+        self._active_size = 0
+        self._cursor = SpoolPosition(min(self._sealed, default=self._active_segment), 0)
+
+    @property
+    def num_pending(self) -> int:
+        """
+        The number of items not yet flushed to disk.
+        """
+        return len(self._pending_spans) + len(self._pending_evaluations)
+
+    @property
+    def empty(self) -> bool:
+        with self._lock:
+            return not (self.num_pending or self._active_size or self._has_unread_sealed())
+
+    @property
+    def has_unread(self) -> bool:
+        """
+        Whether anything written to disk has yet to be read.
+        """
+        with self._lock:
+            return bool(self._active_size or self._has_unread_sealed())
+
+    def put_span(self, span: Span, project_name: str) -> None:
+        with self._lock:
+            self._pending_spans.append((span, project_name))
+
+    def put_evaluation(self, evaluation: pb.Evaluation) -> None:
+        with self._lock:
+            self._pending_evaluations.append(evaluation)
+
+    def flush(self) -> None:
+        with self._lock:
+            spans, self._pending_spans = self._pending_spans, []
+            evaluations, self._pending_evaluations = self._pending_evaluations, []
+        if not spans and not evaluations:
+            return
+        records: list[bytes] = []
+        for span, project_name in spans:
+            try:
+                name = project_name.encode()
+                payload = _NAME_LENGTH.pack(len(name)) + name
+                payload += encode_span_to_otlp(span).SerializeToString()
+            except Exception:
+                logger.exception(f"Failed to spool span with span_id={span.context.span_id}")
+                continue
+            records.append(_HEADER.pack(_SPAN, len(payload)) + payload)
+        for evaluation in evaluations:
+            payload = evaluation.SerializeToString()
+            records.append(_HEADER.pack(_EVALUATION, len(payload)) + payload)
+        data = b"".join(records)
+        with self._lock:
+            if self._active is None:
+                self._active = open(self._path(self._active_segment), "ab")
+            self._active.write(data)
+            self._active.flush()
+            self._active_size += len(data)
+            if self._active_size >= self._max_segment_bytes:
+                self._seal()
+
+    def read(
+        self,
+        max_items: int,
+    ) -> tuple[list[tuple[Span, str]], list[pb.Evaluation], SpoolPosition]:
+        """
+        Returns up to `max_items` spans and evaluations following the last commit, along
+        with the position to commit once they have been inserted.
+        """
+        with self._lock:
+            if self._active_size and not self._has_unread_sealed():
+                self._seal()
+            segments = [(n, size) for n, size in self._sealed.items() if n >= self._cursor.segment]
+            position = self._cursor
+        spans: list[tuple[Span, str]] = []
+        evaluations: list[pb.Evaluation] = []
+        for segment, size in segments:
+            if len(spans) + len(evaluations) >= max_items:
+                break
+            offset = position.offset if segment == position.segment else 0
+            if offset < size:
+                try:
+                    offset = self._read_segment(
+                        segment,
+                        size,
+                        offset,
+                        max_items - len(spans) - len(evaluations),
+                        spans,
+                        evaluations,
+                    )
+                except FileNotFoundError:
+                    logger.warning(f"Spool segment {self._path(segment)} is missing")
+                    offset = size
+            position = SpoolPosition(segment, offset)
+        return spans, evaluations, position
+
+    def commit(self, position: SpoolPosition) -> None:
+        """
+        Discards everything before `position`, deleting the segments that have been read
+        to the end.
+        """
+        with self._lock:
+            for segment, size in list(self._sealed.items()):
+                if segment < position.segment or (
+                    segment == position.segment and position.offset >= size
+                ):
+                    del self._sealed[segment]
+                    self._path(segment).unlink(missing_ok=True)
+            self._cursor = position
+
+    def close(self) -> None:
+        with self._lock:
+            if self._active is not None:
+                self._active.close()
+                self._active = None
+
+    def _path(self, segment: int) -> Path:
+        return self._directory / f"{segment:020d}{_SUFFIX}"
+
+    def _has_unread_sealed(self) -> bool:
+        cursor = self._cursor
+        return any(
+            segment > cursor.segment or (segment == cursor.segment and cursor.offset < size)
+            for segment, size in self._sealed.items()
+        )
+
+    def _seal(self) -> None:
+        if self._active is not None:
+            self._active.close()
+            self._active = None
+        self._sealed[self._active_segment] = self._active_size
+        self._active_segment += 1
+        self._active_size = 0
+
+    def _read_segment(
+        self,
+        segment: int,
+        size: int,
+        offset: int,
+        max_items: int,
+        spans: list[tuple[Span, str]],
+        evaluations: list[pb.Evaluation],
+    ) -> int:
+        """
+        Decodes up to `max_items` records starting at `offset`, and returns the offset
+        following the last one decoded. A truncated record at the end of the segment,
+        e.g. from a crash in the middle of a write, is skipped.
+        """
+        num_items = 0
+        with (
+            open(self._path(segment), "rb") as f,
+            mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as m,
+        ):
+            while num_items < max_items and offset + _HEADER.size <= size:
+                kind, length = _HEADER.unpack_from(m, offset)
+                start, end = offset + _HEADER.size, offset + _HEADER.size + length
+                if end > size:
+                    logger.warning(f"Skipping truncated record at the end of {f.name}")
+                    return size
+                offset = end
+                num_items += 1
+                try:
+                    if kind == _SPAN:
+                        (name_length,) = _NAME_LENGTH.unpack_from(m, start)
+                        start += _NAME_LENGTH.size
+                        project_name = m[start : start + name_length].decode()
+                        otlp_span = otlp.Span.FromString(m[start + name_length : end])
+                        spans.append((decode_otlp_span(otlp_span), project_name))
+                    elif kind == _EVALUATION:
+                        evaluations.append(pb.Evaluation.FromString(m[start:end]))
+                    else:
+                        logger.warning(f"Skipping record of unknown kind {kind} in {f.name}")
+                except Exception:
+                    logger.exception(f"Failed to decode record in {f.name}")
+        # fewer items than requested means the rest of the segment is unreadable, if any
+        return offset if num_items >= max_items else size
@@ -0,0 +1,109 @@
+"""materialized span attributes
+
+Revision ID: 319c49069d9d
+Revises: 4ded9e43755f
+Create Date: 2024-09-09 14:27:05.318846
+
+"""
+
+import logging
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+logger = logging.getLogger(__name__)
+
+# revision identifiers, used by Alembic.
+revision: str = "319c49069d9d"
+down_revision: Union[str, None] = "4ded9e43755f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MAX_PREVIEW_LENGTH = 1000
+
+# column -> (attribute key, whether the column is a preview)
+COLUMNS = {
+    "input_preview": ("input.value", True),
+    "input_mime_type": ("input.mime_type", False),
+    "output_preview": ("output.value", True),
+    "output_mime_type": ("output.mime_type", False),
+    "llm_model_name": ("llm.model_name", False),
+}
+PREVIEW_COLUMNS = [column for column, (_, is_preview) in COLUMNS.items() if is_preview]
+
+
+def _sqlite_value(key: str, is_preview: bool) -> str:
+    path = f"'$.{key}'"
+    value = f"json_extract(attributes, {path})"
+    if is_preview:
+        value = f"substr({value}, 1, {MAX_PREVIEW_LENGTH})"
+    return f"CASE WHEN json_type(attributes, {path}) = 'text' THEN {value} END"
+
+
+def _postgresql_value(key: str, is_preview: bool) -> str:
+    path = "'{" + key.replace(".", ",") + "}'"
+    value = f"attributes #>> {path}"
+    if is_preview:
+        value = f"left({value}, {MAX_PREVIEW_LENGTH})"
+    return f"CASE WHEN jsonb_typeof(attributes #> {path}) = 'string' THEN {value} END"
+
+
+def _create_trigram_indexes() -> None:
+    """
+    Creates the indexes for substring searches of the previews, which need the pg_trgm
+    extension. They are skipped if the extension can't be created, e.g. for lack of
+    privileges, in which case the searches still work but can't use the indexes.
+    """
+    connection = op.get_bind()
+    try:
+        with connection.begin_nested():
+            connection.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except sa.exc.DBAPIError:
+        logger.warning("Failed to create the pg_trgm extension, skipping trigram indexes")
+        return
+    for column in PREVIEW_COLUMNS:
+        op.create_index(
+            f"ix_spans_{column}_trgm",
+            "spans",
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def upgrade() -> None:
+    for column in COLUMNS:
+        op.add_column("spans", sa.Column(column, sa.String, nullable=True))
+    if (dialect := op.get_bind().dialect.name) == "postgresql":
+        value = _postgresql_value
+    elif dialect == "sqlite":
+        value = _sqlite_value
+    else:
+        raise ValueError(f"Unsupported dialect: {dialect}")
+    assignments = ", ".join(
+        f"{column} = {value(key, is_preview)}" for column, (key, is_preview) in COLUMNS.items()
+    )
+    op.execute(f"UPDATE spans SET {assignments}")
+    op.create_index("ix_spans_llm_model_name", "spans", ["llm_model_name"])
+    if dialect == "postgresql":
+        for column in PREVIEW_COLUMNS:
+            # for the spans whose values must be searched because their previews are
+            # truncated
+            op.create_index(
+                f"ix_spans_truncated_{column}",
+                "spans",
+                ["id"],
+                postgresql_where=sa.text(f"char_length({column}) >= {MAX_PREVIEW_LENGTH}"),
+            )
+        _create_trigram_indexes()
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        for column in PREVIEW_COLUMNS:
+            op.execute(f"DROP INDEX IF EXISTS ix_spans_truncated_{column}")
+            op.execute(f"DROP INDEX IF EXISTS ix_spans_{column}_trgm")
+    op.drop_index("ix_spans_llm_model_name", "spans")
+    for column in reversed(COLUMNS):
+        op.drop_column("spans", column)
@@ -0,0 +1,59 @@
+"""dataset example revision ranges
+
+Revision ID: 4ded9e43755f
+Revises: cd164e83824f
+Create Date: 2024-09-02 10:12:41.527704
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4ded9e43755f"
+down_revision: Union[str, None] = "cd164e83824f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+dataset_example_revisions = sa.table(
+    "dataset_example_revisions",
+    sa.column("dataset_example_id", sa.Integer),
+    sa.column("dataset_version_id", sa.Integer),
+    sa.column("superseded_by_dataset_version_id", sa.Integer),
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "dataset_example_revisions",
+        sa.Column("superseded_by_dataset_version_id", sa.Integer, nullable=True),
+    )
+    later_revisions = dataset_example_revisions.alias("later_revisions")
+    op.execute(
+        sa.update(dataset_example_revisions).values(
+            superseded_by_dataset_version_id=sa.select(
+                sa.func.min(later_revisions.c.dataset_version_id)
+            )
+            .where(
+                later_revisions.c.dataset_example_id
+                == dataset_example_revisions.c.dataset_example_id
+            )
+            .where(
+                later_revisions.c.dataset_version_id
+                > dataset_example_revisions.c.dataset_version_id
+            )
+            .scalar_subquery()
+        )
+    )
+    op.create_index(
+        "ix_dataset_example_revisions_superseded",
+        "dataset_example_revisions",
+        ["dataset_example_id", "superseded_by_dataset_version_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_dataset_example_revisions_superseded", "dataset_example_revisions")
+    op.drop_column("dataset_example_revisions", "superseded_by_dataset_version_id")
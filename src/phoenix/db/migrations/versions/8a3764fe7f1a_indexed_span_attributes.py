@@ -0,0 +1,72 @@
+"""indexed span attributes
+
+Revision ID: 8a3764fe7f1a
+Revises: 319c49069d9d
+Create Date: 2024-09-12 16:41:52.730614
+
+"""
+
+from typing import Any, Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import JSON
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.compiler import compiles
+
+
+class JSONB(JSON):
+    # See https://docs.sqlalchemy.org/en/20/core/custom_types.html
+    __visit_name__ = "JSONB"
+
+
+@compiles(JSONB, "sqlite")
+def _(*args: Any, **kwargs: Any) -> str:
+    # See https://docs.sqlalchemy.org/en/20/core/custom_types.html
+    return "JSONB"
+
+
+JSON_ = (
+    JSON()
+    .with_variant(
+        postgresql.JSONB(),  # type: ignore
+        "postgresql",
+    )
+    .with_variant(
+        JSONB(),
+        "sqlite",
+    )
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "8a3764fe7f1a"
+down_revision: Union[str, None] = "319c49069d9d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "indexed_span_attributes",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("path", JSON_, nullable=False),
+        sa.Column("column_name", sa.String, nullable=False, unique=True),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+
+
+def downgrade() -> None:
+    # the indexes, and on SQLite the generated columns, of the attributes indexed since
+    # the upgrade
+    connection = op.get_bind()
+    column_names = connection.scalars(sa.text("SELECT column_name FROM indexed_span_attributes"))
+    for column_name in column_names.all():
+        op.execute(f"DROP INDEX IF EXISTS ix_spans_{column_name}")
+        if connection.dialect.name == "sqlite":
+            op.execute(f"ALTER TABLE spans DROP COLUMN {column_name}")
+    op.drop_table("indexed_span_attributes")
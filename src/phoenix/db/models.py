@@ -1,3 +1,5 @@
+import re
+from collections.abc import Sequence
 from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Optional, TypedDict
@@ -6,6 +8,7 @@ from sqlalchemy import (
     JSON,
     NUMERIC,
     TIMESTAMP,
+    Boolean,
     CheckConstraint,
     ColumnElement,
     Dialect,
@@ -16,10 +19,15 @@ from sqlalchemy import (
     String,
     TypeDecorator,
     UniqueConstraint,
+    and_,
     case,
+    column,
     func,
     insert,
+    literal,
+    literal_column,
     not_,
+    or_,
     select,
     text,
 )
@@ -199,6 +207,9 @@ class Trace(Base):
     )
 
 
+MAX_PREVIEW_LENGTH = 1000
+
+
 class Span(Base):
     __tablename__ = "spans"
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -226,6 +237,15 @@ class Span(Base):
     llm_token_count_prompt: Mapped[Optional[int]]
     llm_token_count_completion: Mapped[Optional[int]]
 
+    # Materialized from the attributes at ingestion, so that the spans table and filters
+    # don't need to extract them from the JSON. The previews are the first
+    # MAX_PREVIEW_LENGTH characters of the input and output values, if they are strings.
+    input_preview: Mapped[Optional[str]]
+    input_mime_type: Mapped[Optional[str]]
+    output_preview: Mapped[Optional[str]]
+    output_mime_type: Mapped[Optional[str]]
+    llm_model_name: Mapped[Optional[str]] = mapped_column(index=True)
+
     @hybrid_property
     def latency_ms(self) -> float:
         # See https://docs.sqlalchemy.org/en/20/orm/extensions/hybrid.html
@@ -261,6 +281,19 @@ class Span(Base):
             "ix_cumulative_llm_token_count_total",
             text("(cumulative_llm_token_count_prompt + cumulative_llm_token_count_completion)"),
         ),
+        # The trigram indexes of the previews for substring searches, i.e. LIKE '%...%'
+        # (see TextPreviewContains), are only created by the migration, because they need
+        # the pg_trgm extension, which may not be available.
+        *(
+            # for the spans whose values must be searched because their previews are
+            # truncated
+            Index(
+                f"ix_spans_truncated_{column}",
+                "id",
+                postgresql_where=text(f"char_length({column}) >= {MAX_PREVIEW_LENGTH}"),
+            ).ddl_if(dialect="postgresql")
+            for column in ("input_preview", "output_preview")
+        ),
     )
 
 
@@ -329,6 +362,126 @@ def _(element: Any, compiler: Any, **kw: Any) -> Any:
     return compiler.process(func.text_contains(string, substring) > 0, **kw)
 
 
+class TextPreviewContains(expression.FunctionElement[bool]):
+    """
+    Whether a string value contains a substring, given a preview of the value, i.e. its
+    first `MAX_PREVIEW_LENGTH` characters, so that the value itself is only searched when
+    its preview is truncated. On PostgreSQL, the preview is matched with LIKE, which can use
+    the trigram index of the preview column.
+    """
+
+    # See https://docs.sqlalchemy.org/en/20/core/compiler.html
+    inherit_cache = True
+    type = Boolean()
+    name = "text_preview_contains"
+
+    def __init__(self, preview: Any, value: Any, substring: str) -> None:
+        escaped = re.sub(r"([\\%_])", r"\\\1", substring)
+        super().__init__(preview, value, literal(substring), literal(f"%{escaped}%"))
+
+
+@compiles(TextPreviewContains)
+def _(element: Any, compiler: Any, **kw: Any) -> Any:
+    # See https://docs.sqlalchemy.org/en/20/core/compiler.html
+    preview, value, substring, _ = list(element.clauses)
+    return compiler.process(
+        or_(
+            TextContains(preview, substring),
+            and_(
+                func.length(preview) >= literal_column(str(MAX_PREVIEW_LENGTH)),
+                TextContains(value, substring),
+            ),
+        ).self_group(),
+        **kw,
+    )
+
+
+@compiles(TextPreviewContains, "postgresql")
+def _(element: Any, compiler: Any, **kw: Any) -> Any:
+    # See https://docs.sqlalchemy.org/en/20/core/compiler.html
+    preview, value, substring, pattern = list(element.clauses)
+    return compiler.process(
+        or_(
+            preview.like(pattern, escape="\\"),
+            and_(
+                # the same expression as the predicate of the partial index of the spans
+                # with truncated previews
+                func.char_length(preview) >= literal_column(str(MAX_PREVIEW_LENGTH)),
+                TextContains(value, substring),
+            ),
+        ).self_group(),
+        **kw,
+    )
+
+
+def _postgresql_text_array(path: Sequence[str]) -> str:
+    keys = ", ".join("'" + key.replace("'", "''") + "'" for key in path)
+    return f"ARRAY[{keys}]"
+
+
+def get_indexed_attribute_expression(path: Sequence[str], dialect: str) -> str:
+    """
+    Returns the SQL expression for the value of a span attribute that is indexed (see
+    `IndexedSpanAttribute`), i.e. the expression of its virtual generated column on SQLite
+    and of its expression index on PostgreSQL.
+    """
+    if dialect == "postgresql":
+        return f"(attributes #>> {_postgresql_text_array(path)})"
+    json_path = "$" + "".join(f'."{key}"' for key in path)
+    return "json_extract(attributes, '" + json_path.replace("'", "''") + "')"
+
+
+class IndexedAttributeValue(expression.FunctionElement[str]):
+    """
+    The value of a span attribute that is indexed (see `IndexedSpanAttribute`). On SQLite,
+    it's read from the generated column. On PostgreSQL, it's extracted with the expression
+    of the index, with the path inline, because the planner only matches an expression index
+    to the very same expression, which one with a bound parameter is not.
+    """
+
+    # See https://docs.sqlalchemy.org/en/20/core/compiler.html
+    inherit_cache = True
+    type = String()
+    name = "indexed_attribute_value"
+
+    def __init__(self, column_name: str, path: Sequence[str]) -> None:
+        super().__init__(
+            column(column_name, String(), _selectable=Span.__table__),
+            Span.attributes.op("#>>", return_type=String())(
+                literal_column(_postgresql_text_array(path))
+            ).self_group(),
+        )
+
+
+@compiles(IndexedAttributeValue)
+def _(element: Any, compiler: Any, **kw: Any) -> Any:
+    # See https://docs.sqlalchemy.org/en/20/core/compiler.html
+    generated_column, _ = list(element.clauses)
+    return compiler.process(generated_column, **kw)
+
+
+@compiles(IndexedAttributeValue, "postgresql")
+def _(element: Any, compiler: Any, **kw: Any) -> Any:
+    # See https://docs.sqlalchemy.org/en/20/core/compiler.html
+    _, value = list(element.clauses)
+    return compiler.process(value, **kw)
+
+
+class IndexedSpanAttribute(Base):
+    """
+    A span attribute that filters often compare, e.g. `metadata["tenant"]`, and that is
+    therefore indexed, by a virtual generated column with an index on SQLite and by an
+    expression index on PostgreSQL, both named after `column_name`. The path is the list of
+    keys of the attribute, e.g. `["metadata", "tenant"]`.
+    """
+
+    __tablename__ = "indexed_span_attributes"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    path: Mapped[list[str]] = mapped_column(JsonList)
+    column_name: Mapped[str] = mapped_column(unique=True)
+    created_at: Mapped[datetime] = mapped_column(UtcTimeStamp, server_default=func.now())
+
+
 async def init_models(engine: AsyncEngine) -> None:
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -525,6 +678,10 @@ class DatasetExampleRevision(Base):
         ForeignKey("dataset_versions.id", ondelete="CASCADE"),
         index=True,
     )
+    # The version of the next revision of the same example, if any. A revision is current
+    # from its own version up to, but not including, the one that supersedes it. Versions
+    # are only ever deleted along with their dataset, so this isn't a foreign key.
+    superseded_by_dataset_version_id: Mapped[Optional[int]]
     input: Mapped[dict[str, Any]]
     output: Mapped[dict[str, Any]]
     metadata_: Mapped[dict[str, Any]] = mapped_column("metadata")
@@ -540,6 +697,12 @@ class DatasetExampleRevision(Base):
             "dataset_example_id",
             "dataset_version_id",
         ),
+        # for the revisions current as of a version (see dataset_example_revision_is_current)
+        Index(
+            "ix_dataset_example_revisions_superseded",
+            "dataset_example_id",
+            "superseded_by_dataset_version_id",
+        ),
     )
 
 
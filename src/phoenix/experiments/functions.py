@@ -4,13 +4,15 @@ import inspect
 import json
 import traceback
 from binascii import hexlify
-from collections.abc import Awaitable, Mapping, Sequence
+from collections.abc import Awaitable, Callable, Hashable, Mapping, Sequence
 from contextlib import ExitStack
 from copy import deepcopy
 from dataclasses import replace
 from datetime import datetime, timezone
 from itertools import product
-from typing import Any, Literal, Optional, Union, cast
+from threading import Lock
+from time import monotonic
+from typing import Any, Literal, Optional, TypeVar, Union, cast
 from urllib.parse import urljoin
 
 import httpx
@@ -26,11 +28,11 @@ from opentelemetry.context import Context
 from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import Span
-from opentelemetry.sdk.trace.export import SimpleSpanProcessor
-from opentelemetry.trace import Status, StatusCode, Tracer
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter
+from opentelemetry.trace import Status, StatusCode
 from typing_extensions import TypeAlias
 
-from phoenix.config import get_base_url
+from phoenix.config import get_base_url, get_env_collector_endpoint
 from phoenix.evals.executors import get_executor_on_sync_context
 from phoenix.evals.models.rate_limiters import RateLimiter
 from phoenix.evals.utils import get_tqdm_progress_bar_formatter
@@ -39,7 +41,7 @@ from phoenix.experiments.evaluators.base import (
     Evaluator,
     ExperimentEvaluator,
 )
-from phoenix.experiments.tracing import capture_spans
+from phoenix.experiments.tracing import InProcessSpanExporter, capture_spans
 from phoenix.experiments.types import (
     DRY_RUN,
     Dataset,
@@ -95,6 +97,7 @@ def run_experiment(
     dry_run: Union[bool, int] = False,
     print_summary: bool = True,
     concurrency: int = 3,
+    experiment_id: Optional[str] = None,
 ) -> RanExperiment:
     """
     Runs an experiment using a given set of dataset of examples.
@@ -148,6 +151,12 @@ def run_experiment(
         concurrency (int): Specifies the concurrency for task execution. In order to enable
             concurrent task execution, the task callable must be a coroutine function.
             Defaults to 3.
+        experiment_id (Optional[str]): The ID of an existing experiment on the same dataset
+            version to resume, e.g. one that was interrupted, instead of creating a new one.
+            The task is only run on the examples and repetitions that don't have runs yet, and
+            the evaluators only evaluate runs that don't have evaluations of the same name yet.
+            The name, description, and metadata of the experiment are left as they are.
+            Defaults to None.
 
     Returns:
         RanExperiment: The results of the experiment and evaluation. Additional evaluations can be
@@ -172,7 +181,28 @@ def run_experiment(
         "metadata": experiment_metadata,
         "repetitions": repetitions,
     }
-    if not dry_run:
+    completed_runs: dict[Hashable, ExperimentRun] = {}
+    if experiment_id is not None:
+        if dry_run:
+            raise ValueError("An existing experiment can't be resumed in dry-run mode")
+        experiment_response = sync_client.get(f"/v1/experiments/{experiment_id}")
+        experiment_response.raise_for_status()
+        experiment = Experiment.from_dict(experiment_response.json()["data"])
+        if (experiment.dataset_id, experiment.dataset_version_id) != (
+            dataset.id,
+            dataset.version_id,
+        ):
+            raise ValueError(
+                f"Experiment {experiment_id} was run on a different dataset or version: "
+                f"{experiment.dataset_id=}, {experiment.dataset_version_id=}"
+            )
+        repetitions = experiment.repetitions
+        runs_response = sync_client.get(f"/v1/experiments/{experiment.id}/runs")
+        runs_response.raise_for_status()
+        completed_runs = {
+            _run_key(run): run for run in map(ExperimentRun.from_dict, runs_response.json()["data"])
+        }
+    elif not dry_run:
         experiment_response = sync_client.post(
             f"/v1/datasets/{dataset.id}/experiments",
             json=payload,
@@ -196,7 +226,8 @@ def run_experiment(
             project_name="",
         )
 
-    tracer, resource = _get_tracer(experiment.project_name)
+    tracer_provider, resource = _get_tracer_provider(experiment.project_name)
+    tracer = tracer_provider.get_tracer(__name__)
     root_span_name = f"Task: {get_func_name(task)}"
     root_span_kind = CHAIN
 
@@ -282,9 +313,7 @@ def run_experiment(
             trace_id=_str_trace_id(span.get_span_context().trace_id),  # type: ignore[no-untyped-call]
         )
         if not dry_run:
-            resp = sync_client.post(f"/v1/experiments/{experiment.id}/runs", json=jsonify(exp_run))
-            resp.raise_for_status()
-            exp_run = replace(exp_run, id=resp.json()["data"]["id"])
+            run_submitter.submit(_run_key(exp_run), jsonify(exp_run))
         return exp_run
 
     async def async_run_experiment(test_case: TestCase) -> ExperimentRun:
@@ -343,21 +372,11 @@ def run_experiment(
             trace_id=_str_trace_id(span.get_span_context().trace_id),  # type: ignore[no-untyped-call]
         )
         if not dry_run:
-            # Below is a workaround to avoid timeout errors sometimes
-            # encountered when the task is a synchronous function that
-            # blocks for too long.
-            resp = await asyncio.get_running_loop().run_in_executor(
-                None,
-                functools.partial(
-                    sync_client.post,
-                    url=f"/v1/experiments/{experiment.id}/runs",
-                    json=jsonify(exp_run),
-                ),
-            )
-            resp.raise_for_status()
-            exp_run = replace(exp_run, id=resp.json()["data"]["id"])
+            await run_submitter.asubmit(_run_key(exp_run), jsonify(exp_run))
         return exp_run
 
+    run_submitter = _BufferedSubmitter(sync_client, f"/v1/experiments/{experiment.id}/runs/bulk")
+
     _errors: tuple[type[BaseException], ...]
     if not isinstance(rate_limit_errors, Sequence):
         _errors = (rate_limit_errors,) if rate_limit_errors is not None else ()
@@ -385,9 +404,18 @@ def run_experiment(
     test_cases = [
         TestCase(example=deepcopy(ex), repetition_number=rep)
         for ex, rep in product(dataset.examples.values(), range(1, repetitions + 1))
+        if (ex.id, rep) not in completed_runs
     ]
+    if completed_runs:
+        print(f"⏭️ Resuming the experiment with {len(test_cases)} test cases left to run.")
     task_runs, _execution_details = executor.run(test_cases)
+    # flushes the spans waiting to be exported
+    tracer_provider.shutdown()
+    if not dry_run:
+        run_submitter.flush()
+        task_runs = _with_submitted_ids(task_runs, run_submitter, _run_key)
     print("✅ Task runs completed.")
+    task_runs = [*completed_runs.values(), *task_runs]
     params = ExperimentParameters(n_examples=len(dataset.examples), n_repetitions=repetitions)
     task_summary = TaskSummary.from_task_runs(params, task_runs)
     ran_experiment: RanExperiment = object.__new__(RanExperiment)
@@ -406,6 +434,7 @@ def run_experiment(
             print_summary=print_summary,
             rate_limit_errors=rate_limit_errors,
             concurrency=concurrency,
+            resume=experiment_id is not None,
         )
     if print_summary:
         print(ran_experiment)
@@ -420,7 +449,13 @@ def evaluate_experiment(
     print_summary: bool = True,
     rate_limit_errors: Optional[RateLimitErrors] = None,
     concurrency: int = 3,
+    resume: bool = False,
 ) -> RanExperiment:
+    """
+    Evaluates the runs of an experiment. If `resume` is True, runs that already have an
+    evaluation with the name of an evaluator aren't evaluated again by that evaluator, and
+    their existing evaluations are included in the results instead.
+    """
     if not dry_run and _is_dry_run(experiment):
         dry_run = True
     evaluators_by_name = _evaluators_by_name(evaluators)
@@ -478,12 +513,26 @@ def evaluate_experiment(
         example = examples.get(exp_run.dataset_example_id)
         if example:
             example_run_pairs.append((deepcopy(example), exp_run))
+    completed_eval_runs: dict[Hashable, ExperimentEvaluationRun] = {}
+    if resume and not dry_run:
+        evaluations_response = sync_client.get(f"/v1/experiments/{ran_experiment.id}/evaluations")
+        evaluations_response.raise_for_status()
+        completed_eval_runs = {
+            _eval_key(eval_run): eval_run
+            for eval_run in map(
+                ExperimentEvaluationRun.from_dict, evaluations_response.json()["data"]
+            )
+            if eval_run.name in evaluators_by_name
+            and eval_run.experiment_run_id in ran_experiment.runs
+        }
     evaluation_input = [
         (example, run, evaluator)
         for (example, run), evaluator in product(example_run_pairs, evaluators_by_name.values())
+        if (run.id, evaluator.name) not in completed_eval_runs
     ]
 
-    tracer, resource = _get_tracer(None if dry_run else "evaluators")
+    tracer_provider, resource = _get_tracer_provider(None if dry_run else "evaluators")
+    tracer = tracer_provider.get_tracer(__name__)
     root_span_kind = EVALUATOR
 
     def sync_evaluate_run(
@@ -533,9 +582,7 @@ def evaluate_experiment(
             trace_id=_str_trace_id(span.get_span_context().trace_id),  # type: ignore[no-untyped-call]
         )
         if not dry_run:
-            resp = sync_client.post("/v1/experiment_evaluations", json=jsonify(eval_run))
-            resp.raise_for_status()
-            eval_run = replace(eval_run, id=resp.json()["data"]["id"])
+            eval_submitter.submit(_eval_key(eval_run), jsonify(eval_run))
         return eval_run
 
     async def async_evaluate_run(
@@ -585,21 +632,11 @@ def evaluate_experiment(
             trace_id=_str_trace_id(span.get_span_context().trace_id),  # type: ignore[no-untyped-call]
         )
         if not dry_run:
-            # Below is a workaround to avoid timeout errors sometimes
-            # encountered when the evaluator is a synchronous function
-            # that blocks for too long.
-            resp = await asyncio.get_running_loop().run_in_executor(
-                None,
-                functools.partial(
-                    sync_client.post,
-                    url="/v1/experiment_evaluations",
-                    json=jsonify(eval_run),
-                ),
-            )
-            resp.raise_for_status()
-            eval_run = replace(eval_run, id=resp.json()["data"]["id"])
+            await eval_submitter.asubmit(_eval_key(eval_run), jsonify(eval_run))
         return eval_run
 
+    eval_submitter = _BufferedSubmitter(sync_client, "/v1/experiment_evaluations/bulk")
+
     _errors: tuple[type[BaseException], ...]
     if not isinstance(rate_limit_errors, Sequence):
         _errors = (rate_limit_errors,) if rate_limit_errors is not None else ()
@@ -624,6 +661,12 @@ def evaluate_experiment(
         concurrency=concurrency,
     )
     eval_runs, _execution_details = executor.run(evaluation_input)
+    # flushes the spans waiting to be exported
+    tracer_provider.shutdown()
+    if not dry_run:
+        eval_submitter.flush()
+        eval_runs = _with_submitted_ids(eval_runs, eval_submitter, _eval_key)
+    eval_runs = [*completed_eval_runs.values(), *eval_runs]
     eval_summary = EvaluationSummary.from_eval_runs(
         EvaluationParameters(
             eval_names=frozenset(evaluators_by_name),
@@ -667,16 +710,36 @@ def _evaluators_by_name(obj: Optional[Evaluators]) -> Mapping[EvaluatorName, Eva
     return evaluators_by_name
 
 
-def _get_tracer(project_name: Optional[str] = None) -> tuple[Tracer, Resource]:
+def _get_tracer_provider(
+    project_name: Optional[str] = None,
+) -> tuple[trace_sdk.TracerProvider, Resource]:
+    """
+    Returns a tracer provider whose spans are exported in batches by a background thread,
+    so that tasks and evaluators don't wait for the export of their spans. Spans are
+    dropped if they can't be exported as fast as they are created and the queue of spans
+    waiting to be exported fills up. The provider must be shut down to flush the queue.
+    """
     resource = Resource({ResourceAttributes.PROJECT_NAME: project_name} if project_name else {})
     tracer_provider = trace_sdk.TracerProvider(resource=resource)
     span_processor = (
-        SimpleSpanProcessor(OTLPSpanExporter(urljoin(f"{get_base_url()}", "v1/traces")))
+        BatchSpanProcessor(_get_span_exporter(), max_queue_size=_MAX_SPAN_QUEUE_SIZE)
         if project_name
         else _NoOpProcessor()
     )
     tracer_provider.add_span_processor(span_processor)
-    return tracer_provider.get_tracer(__name__), resource
+    return tracer_provider, resource
+
+
+def _get_span_exporter() -> SpanExporter:
+    exporter = OTLPSpanExporter(urljoin(f"{get_base_url()}", "v1/traces"))
+    if get_env_collector_endpoint():
+        return exporter
+    from phoenix.session.session import ThreadSession, active_session
+
+    if isinstance(session := active_session(), ThreadSession):
+        # the app is running in this process, so the export over the network is skipped
+        return InProcessSpanExporter(session.queue_spans, fallback=exporter)
+    return exporter
 
 
 def _str_trace_id(id_: int) -> str:
@@ -756,6 +819,106 @@ def _print_experiment_error(
     print("\033[91m" + formatted_exception + "\033[0m")  # prints in red
 
 
+_MAX_SPAN_QUEUE_SIZE = 10_000
+_MAX_SUBMISSION_BATCH_SIZE = 100
+_MAX_SUBMISSION_LATENCY_SEC = 1.0
+
+
+class _BufferedSubmitter:
+    """
+    Posts the results of an experiment to a bulk endpoint in batches, rather than one request
+    per result. Results are buffered until there are `max_batch_size` of them or the oldest
+    has waited `max_latency` seconds when the next one is submitted, and the rest are posted
+    by a final call to `flush`. Batches are posted one at a time in the order they were
+    filled, and the endpoint returns the ID of each result in the order they were posted, so
+    `ids` maps the key of every submitted result to its ID. The results of a batch that fails
+    to post have no ID.
+    """
+
+    def __init__(
+        self,
+        client: httpx.Client,
+        url: str,
+        *,
+        max_batch_size: int = _MAX_SUBMISSION_BATCH_SIZE,
+        max_latency: float = _MAX_SUBMISSION_LATENCY_SEC,
+    ) -> None:
+        self._client = client
+        self._url = url
+        self._max_batch_size = max_batch_size
+        self._max_latency = max_latency
+        self._buffer: list[tuple[Hashable, Any]] = []
+        self._buffered_at = 0.0
+        self._buffer_lock = Lock()
+        self._post_lock = Lock()
+        self.ids: dict[Hashable, str] = {}
+
+    def submit(self, key: Hashable, result: Any) -> None:
+        if self._append(key, result):
+            self.flush()
+
+    async def asubmit(self, key: Hashable, result: Any) -> None:
+        if self._append(key, result):
+            # The batch is posted from a worker thread to avoid timeout
+            # errors sometimes encountered when a synchronous task or
+            # evaluator blocks the event loop for too long.
+            await asyncio.get_running_loop().run_in_executor(None, self.flush)
+
+    def flush(self) -> None:
+        with self._post_lock:
+            with self._buffer_lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return
+            try:
+                resp = self._client.post(self._url, json={"data": [result for _, result in batch]})
+                resp.raise_for_status()
+                ids = [data["id"] for data in resp.json()["data"]]
+            except Exception as exc:
+                print(f"\033[91mFailed to submit {len(batch)} results: {exc!r}\033[0m")
+                return
+            self.ids.update((key, id_) for (key, _), id_ in zip(batch, ids))
+
+    def _append(self, key: Hashable, result: Any) -> bool:
+        """
+        Buffers a result and returns whether the buffer is due to be flushed.
+        """
+        with self._buffer_lock:
+            if not self._buffer:
+                self._buffered_at = monotonic()
+            self._buffer.append((key, result))
+            return (
+                len(self._buffer) >= self._max_batch_size
+                or monotonic() - self._buffered_at >= self._max_latency
+            )
+
+
+_SubmittedRun = TypeVar("_SubmittedRun", ExperimentRun, ExperimentEvaluationRun)
+
+
+def _with_submitted_ids(
+    runs: Sequence[Optional[_SubmittedRun]],
+    submitter: _BufferedSubmitter,
+    key: Callable[[_SubmittedRun], Hashable],
+) -> list[Optional[_SubmittedRun]]:
+    """
+    Assigns the IDs returned by the server to the runs, in place of their placeholder IDs.
+    Runs that failed to be submitted are dropped, the same as runs that failed to complete.
+    """
+    return [
+        replace(run, id=id_) if run is not None and (id_ := submitter.ids.get(key(run))) else None
+        for run in runs
+    ]
+
+
+def _run_key(run: ExperimentRun) -> Hashable:
+    return run.dataset_example_id, run.repetition_number
+
+
+def _eval_key(eval_run: ExperimentEvaluationRun) -> Hashable:
+    return eval_run.experiment_run_id, eval_run.name
+
+
 class _NoOpProcessor(trace_sdk.SpanProcessor):
     def force_flush(self, *_: Any) -> bool:
         return True
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Callable, Iterator
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from contextlib import contextmanager
 from contextvars import ContextVar
 from threading import Lock
@@ -8,9 +8,13 @@ from typing import Any, Optional
 
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
 from opentelemetry.trace import INVALID_TRACE_ID
 from wrapt import apply_patch, resolve_path, wrap_function_wrapper
 
+from phoenix.trace.otel import decode_otlp_export_request
+from phoenix.trace.schemas import Span
+
 
 class SpanModifier:
     """
@@ -84,3 +88,42 @@ def capture_spans(resource: Resource) -> Iterator[SpanModifier]:
         token = _ACTIVE_MODIFIER.set(modifier)
         yield modifier
         _ACTIVE_MODIFIER.reset(token)
+
+
+class InProcessSpanExporter(SpanExporter):
+    """
+    Exports spans by handing them straight to a Phoenix server running in the same process,
+    e.g. one started by `px.launch_app()`, rather than sending them over the network. Spans
+    are exported with the fallback exporter whenever the server isn't accepting them, or the
+    installed version of the OTLP exporter can't encode them.
+
+    Args:
+      queue_spans: Callable[[Iterable[tuple[Span, str]]], bool]: queues spans, along with
+        the names of their projects, for insertion by the server, and returns whether it
+        accepted them.
+      fallback: SpanExporter: the exporter used when the server doesn't accept spans.
+    """
+
+    def __init__(
+        self,
+        queue_spans: Callable[[Iterable[tuple[Span, str]]], bool],
+        fallback: SpanExporter,
+    ) -> None:
+        self._queue_spans = queue_spans
+        self._fallback = fallback
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        try:
+            from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+        except ImportError:
+            # versions of the OTLP exporter before 1.18 don't have the encoder
+            return self._fallback.export(spans)
+        if self._queue_spans(decode_otlp_export_request(encode_spans(spans))):
+            return SpanExportResult.SUCCESS
+        return self._fallback.export(spans)
+
+    def shutdown(self) -> None:
+        self._fallback.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._fallback.force_flush(timeout_millis)
@@ -34,6 +34,7 @@ from phoenix.server.api.dataloaders import (
     SpanAnnotationsDataLoader,
     SpanDatasetExamplesDataLoader,
     SpanDescendantsDataLoader,
+    SpanFieldsDataLoader,
     SpanProjectsDataLoader,
     TokenCountDataLoader,
     TraceRowIdsDataLoader,
@@ -46,6 +47,7 @@ from phoenix.server.types import (
     CanGetLastUpdatedAt,
     CanPutItem,
     DbSessionFactory,
+    ProjectUpdates,
     TokenStore,
     UserId,
 )
@@ -71,6 +73,7 @@ class DataLoaders:
     span_annotations: SpanAnnotationsDataLoader
     span_dataset_examples: SpanDatasetExamplesDataLoader
     span_descendants: SpanDescendantsDataLoader
+    span_fields: SpanFieldsDataLoader
     span_projects: SpanProjectsDataLoader
     token_counts: TokenCountDataLoader
     trace_row_ids: TraceRowIdsDataLoader
@@ -98,6 +101,7 @@ class Context(BaseContext):
     auth_enabled: bool = False
     secret: Optional[str] = None
     token_store: Optional[TokenStore] = None
+    project_updates: Optional[ProjectUpdates] = None
 
     def get_secret(self) -> str:
         """A type-safe way to get the application secret. Throws an error if the secret is not set.
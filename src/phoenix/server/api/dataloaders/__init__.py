@@ -22,6 +22,7 @@ from .record_counts import RecordCountCache, RecordCountDataLoader
 from .span_annotations import SpanAnnotationsDataLoader
 from .span_dataset_examples import SpanDatasetExamplesDataLoader
 from .span_descendants import SpanDescendantsDataLoader
+from .span_fields import SpanFieldsDataLoader
 from .span_projects import SpanProjectsDataLoader
 from .token_counts import TokenCountCache, TokenCountDataLoader
 from .trace_row_ids import TraceRowIdsDataLoader
@@ -47,6 +48,7 @@ __all__ = [
     "RecordCountDataLoader",
     "SpanDatasetExamplesDataLoader",
     "SpanDescendantsDataLoader",
+    "SpanFieldsDataLoader",
     "SpanProjectsDataLoader",
     "TokenCountDataLoader",
     "TraceRowIdsDataLoader",
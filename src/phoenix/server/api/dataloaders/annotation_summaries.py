@@ -14,7 +14,7 @@ from phoenix.server.api.dataloaders.cache import TwoTierCache
 from phoenix.server.api.input_types.TimeRange import TimeRange
 from phoenix.server.api.types.AnnotationSummary import AnnotationSummary
 from phoenix.server.types import DbSessionFactory
-from phoenix.trace.dsl import SpanFilter
+from phoenix.trace.dsl.filter import get_span_filter
 
 Kind: TypeAlias = Literal["span", "trace"]
 ProjectRowId: TypeAlias = int
@@ -110,7 +110,7 @@ def _get_stmt(
         time_column = models.Span.start_time
         stmt = stmt.join(models.Span).join_from(models.Span, models.Trace)
         if filter_condition:
-            sf = SpanFilter(filter_condition)
+            sf = get_span_filter(filter_condition)
             stmt = sf(stmt)
     elif kind == "trace":
         mta = models.TraceAnnotation
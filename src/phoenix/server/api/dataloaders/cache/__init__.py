@@ -1,3 +1,9 @@
+from phoenix.server.api.dataloaders.cache.time_interval import TimeInterval, contains, overlaps
 from phoenix.server.api.dataloaders.cache.two_tier_cache import TwoTierCache
 
-__all__ = ("TwoTierCache",)
+__all__ = (
+    "TimeInterval",
+    "TwoTierCache",
+    "contains",
+    "overlaps",
+)
@@ -0,0 +1,34 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from typing_extensions import TypeAlias
+
+from phoenix.datetime_utils import normalize_datetime
+
+TimeInterval: TypeAlias = tuple[Optional[datetime], Optional[datetime]]
+
+
+def contains(interval: TimeInterval, t: datetime) -> bool:
+    """
+    Whether the right-exclusive interval contains `t`. A missing endpoint is unbounded.
+    """
+    start, end = interval
+    t = _utc(t)
+    return (start is None or _utc(start) <= t) and (end is None or t < _utc(end))
+
+
+def overlaps(interval: TimeInterval, start_time: datetime, end_time: datetime) -> bool:
+    """
+    Whether the right-exclusive interval overlaps the closed interval from `start_time`
+    to `end_time`. A missing endpoint is unbounded.
+    """
+    start, end = interval
+    return (start is None or _utc(start) <= _utc(end_time)) and (
+        end is None or _utc(start_time) < _utc(end)
+    )
+
+
+def _utc(dt: datetime) -> datetime:
+    normalized = normalize_datetime(dt, timezone.utc)
+    assert normalized is not None
+    return normalized
@@ -45,6 +45,37 @@ class TwoTierCache(
         if sub_cache := self._cache.get(section):
             sub_cache.clear()
 
+    def sub_keys(self, section: _Section) -> list[_SubKey]:
+        if not (sub_cache := self._cache.get(section)):
+            return []
+        return list(sub_cache.keys())
+
+    def invalidate_sub_key(self, section: _Section, sub_key: _SubKey) -> None:
+        if (sub_cache := self._cache.get(section)) is not None:
+            sub_cache.pop(sub_key, None)
+
+    def update_sub_key(
+        self,
+        section: _Section,
+        sub_key: _SubKey,
+        fn: Callable[[_Result], _Result],
+    ) -> None:
+        """
+        Replaces a cached result with the result of applying `fn` to it. Results that are
+        still being loaded, or that have failed, are invalidated instead, because it's not
+        known whether they already reflect the update.
+        """
+        if (sub_cache := self._cache.get(section)) is None:
+            return
+        if (future := sub_cache.get(sub_key)) is None:
+            return
+        if not future.done() or future.cancelled() or future.exception() is not None:
+            del sub_cache[sub_key]
+            return
+        updated: "Future[_Result]" = future.get_loop().create_future()
+        updated.set_result(fn(future.result()))
+        sub_cache[sub_key] = updated
+
     def get(self, key: _Key) -> Optional["Future[_Result]"]:
         section, sub_key = self._cache_key(key)
         if not (sub_cache := self._cache.get(section)):
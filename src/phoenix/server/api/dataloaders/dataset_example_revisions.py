@@ -1,11 +1,11 @@
 from typing import Optional, Union
 
-from sqlalchemy import and_, case, func, null, or_, select
-from sqlalchemy.sql.expression import literal
+from sqlalchemy import and_, false, null, or_, select
 from strawberry.dataloader import DataLoader
 from typing_extensions import TypeAlias
 
 from phoenix.db import models
+from phoenix.db.helpers import dataset_example_revision_is_current
 from phoenix.server.api.exceptions import NotFound
 from phoenix.server.api.types.DatasetExampleRevision import DatasetExampleRevision
 from phoenix.server.types import DbSessionFactory
@@ -43,19 +43,18 @@ class DatasetExampleRevisionsDataLoader(DataLoader[Key, Result]):
                 )
                 .select_from(models.DatasetExample)
                 .join(
+                    # an inner join, so that keys with versions that don't exist are not found
                     models.DatasetVersion,
-                    onclause=literal(True),  # cross join
-                )
-                .where(
-                    or_(
+                    onclause=or_(
+                        false(),  # in case all the keys are versionless
                         *(
                             and_(
                                 models.DatasetExample.id == example_id,
                                 models.DatasetVersion.id == version_id,
                             )
                             for example_id, version_id in example_and_version_ids
-                        )
-                    )
+                        ),
+                    ),
                 )
             )
             .union(
@@ -65,67 +64,34 @@ class DatasetExampleRevisionsDataLoader(DataLoader[Key, Result]):
             )
             .subquery()
         )
-        revision_ids = (
+        query = (
             select(
                 resolved_example_and_version_ids.c.example_id,
                 resolved_example_and_version_ids.c.version_id,
-                func.max(models.DatasetExampleRevision.id).label("revision_id"),
+                models.DatasetExampleRevision,
             )
             .select_from(resolved_example_and_version_ids)
             .join(
                 models.DatasetExampleRevision,
-                onclause=resolved_example_and_version_ids.c.example_id
-                == models.DatasetExampleRevision.dataset_example_id,
-            )
-            .where(
-                or_(
-                    resolved_example_and_version_ids.c.version_id.is_(None),
-                    models.DatasetExampleRevision.dataset_version_id
-                    <= resolved_example_and_version_ids.c.version_id,
-                )
-            )
-            .group_by(
-                resolved_example_and_version_ids.c.example_id,
-                resolved_example_and_version_ids.c.version_id,
-            )
-        ).subquery()
-        query = (
-            select(
-                revision_ids.c.example_id,
-                revision_ids.c.version_id,
-                case(
-                    (
-                        or_(
-                            revision_ids.c.version_id.is_(None),
-                            models.DatasetVersion.id.is_not(None),
+                onclause=and_(
+                    resolved_example_and_version_ids.c.example_id
+                    == models.DatasetExampleRevision.dataset_example_id,
+                    or_(
+                        and_(
+                            resolved_example_and_version_ids.c.version_id.is_(None),
+                            dataset_example_revision_is_current(),
+                        ),
+                        dataset_example_revision_is_current(
+                            resolved_example_and_version_ids.c.version_id
                         ),
-                        True,
                     ),
-                    else_=False,
-                ).label("is_valid_version"),  # check that non-null versions exist
-                models.DatasetExampleRevision,
-            )
-            .select_from(revision_ids)
-            .join(
-                models.DatasetExampleRevision,
-                onclause=revision_ids.c.revision_id == models.DatasetExampleRevision.id,
-            )
-            .join(
-                models.DatasetVersion,
-                onclause=revision_ids.c.version_id == models.DatasetVersion.id,
-                isouter=True,  # keep rows where the version id is null
+                ),
             )
             .where(models.DatasetExampleRevision.revision_kind != "DELETE")
         )
         async with self._db() as session:
             results = {
                 (example_id, version_id): DatasetExampleRevision.from_orm_revision(revision)
-                async for (
-                    example_id,
-                    version_id,
-                    is_valid_version,
-                    revision,
-                ) in await session.stream(query)
-                if is_valid_version
+                async for example_id, version_id, revision in await session.stream(query)
             }
         return [results.get(key, NotFound("Could not find revision.")) for key in keys]
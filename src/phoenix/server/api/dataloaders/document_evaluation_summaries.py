@@ -16,7 +16,7 @@ from phoenix.server.api.dataloaders.cache import TwoTierCache
 from phoenix.server.api.input_types.TimeRange import TimeRange
 from phoenix.server.api.types.DocumentEvaluationSummary import DocumentEvaluationSummary
 from phoenix.server.types import DbSessionFactory
-from phoenix.trace.dsl import SpanFilter
+from phoenix.trace.dsl.filter import get_span_filter
 
 ProjectRowId: TypeAlias = int
 TimeInterval: TypeAlias = tuple[Optional[datetime], Optional[datetime]]
@@ -139,6 +139,6 @@ def _get_stmt(
     if end_time:
         stmt = stmt.where(models.Span.start_time < end_time)
     if filter_condition:
-        span_filter = SpanFilter(condition=filter_condition)
+        span_filter = get_span_filter(filter_condition)
         stmt = span_filter(stmt)
     return stmt
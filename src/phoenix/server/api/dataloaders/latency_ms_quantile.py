@@ -1,5 +1,5 @@
 from collections import defaultdict
-from collections.abc import AsyncIterator, Mapping
+from collections.abc import AsyncIterator, Mapping, Sequence
 from datetime import datetime
 from typing import Any, Literal, Optional, cast
 
@@ -23,10 +23,11 @@ from typing_extensions import TypeAlias, assert_never
 
 from phoenix.db import models
 from phoenix.db.helpers import SupportedSQLDialect
-from phoenix.server.api.dataloaders.cache import TwoTierCache
+from phoenix.db.insertion.span import InsertedSpan
+from phoenix.server.api.dataloaders.cache import TwoTierCache, contains, overlaps
 from phoenix.server.api.input_types.TimeRange import TimeRange
 from phoenix.server.types import DbSessionFactory
-from phoenix.trace.dsl import SpanFilter
+from phoenix.trace.dsl.filter import get_span_filter
 
 Kind: TypeAlias = Literal["span", "trace"]
 ProjectRowId: TypeAlias = int
@@ -74,6 +75,27 @@ class LatencyMsQuantileCache(
         (kind, interval, filter_condition), (project_rowid, probability) = _cache_key_fn(key)
         return project_rowid, (interval, filter_condition, kind, probability)
 
+    def on_spans_inserted(
+        self,
+        project_rowid: ProjectRowId,
+        spans: Sequence[InsertedSpan],
+        trace_bounds: Sequence[tuple[datetime, datetime]],
+    ) -> None:
+        """
+        Quantiles are invalidated if their time intervals may include the inserted spans,
+        or the traces whose start times may have changed.
+        """
+        for sub_key in self.sub_keys(project_rowid):
+            interval, _, kind, _ = sub_key
+            if kind == "span":
+                affected = any(contains(interval, span.start_time) for span in spans)
+            elif kind == "trace":
+                affected = any(overlaps(interval, *bounds) for bounds in trace_bounds)
+            else:
+                assert_never(kind)
+            if affected:
+                self.invalidate_sub_key(project_rowid, sub_key)
+
 
 class LatencyMsQuantileDataLoader(DataLoader[Key, Result]):
     def __init__(
@@ -123,7 +145,7 @@ async def _get_results(
         time_column = models.Span.start_time
         stmt = stmt.join(models.Span)
         if filter_condition:
-            sf = SpanFilter(filter_condition)
+            sf = get_span_filter(filter_condition)
             stmt = sf(stmt)
     else:
         assert_never(kind)
@@ -1,4 +1,5 @@
 from collections import defaultdict
+from collections.abc import Sequence
 from datetime import datetime
 from typing import Literal, Optional
 
@@ -38,6 +39,26 @@ class MinStartOrMaxEndTimeCache(
     def _cache_key(self, key: Key) -> tuple[_Section, _SubKey]:
         return key
 
+    def on_spans_inserted(
+        self,
+        project_rowid: ProjectRowId,
+        trace_bounds: Sequence[tuple[datetime, datetime]],
+    ) -> None:
+        """
+        Widens the cached time bounds of the project to include the bounds of the traces
+        that were created or widened.
+        """
+        if not trace_bounds:
+            return
+        min_start = min(start for start, _ in trace_bounds)
+        max_end = max(end for _, end in trace_bounds)
+        self.update_sub_key(
+            project_rowid, "start", lambda t: min_start if t is None else min(t, min_start)
+        )
+        self.update_sub_key(
+            project_rowid, "end", lambda t: max_end if t is None else max(t, max_end)
+        )
+
 
 class MinStartOrMaxEndTimeDataLoader(DataLoader[Key, Result]):
     def __init__(
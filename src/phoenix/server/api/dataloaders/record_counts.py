@@ -1,4 +1,5 @@
 from collections import defaultdict
+from collections.abc import Sequence
 from datetime import datetime
 from typing import Any, Literal, Optional
 
@@ -8,10 +9,11 @@ from strawberry.dataloader import AbstractCache, DataLoader
 from typing_extensions import TypeAlias, assert_never
 
 from phoenix.db import models
-from phoenix.server.api.dataloaders.cache import TwoTierCache
+from phoenix.db.insertion.span import InsertedSpan
+from phoenix.server.api.dataloaders.cache import TwoTierCache, contains, overlaps
 from phoenix.server.api.input_types.TimeRange import TimeRange
 from phoenix.server.types import DbSessionFactory
-from phoenix.trace.dsl import SpanFilter
+from phoenix.trace.dsl.filter import get_span_filter
 
 Kind: TypeAlias = Literal["span", "trace"]
 ProjectRowId: TypeAlias = int
@@ -56,6 +58,29 @@ class RecordCountCache(
         (kind, interval, filter_condition), project_rowid = _cache_key_fn(key)
         return project_rowid, (interval, filter_condition, kind)
 
+    def on_spans_inserted(
+        self,
+        project_rowid: ProjectRowId,
+        spans: Sequence[InsertedSpan],
+        trace_bounds: Sequence[tuple[datetime, datetime]],
+    ) -> None:
+        """
+        Counts are invalidated if their time intervals may include the inserted spans, or
+        the traces whose start times may have changed. They can't be incremented in place,
+        because a count loaded after the spans were committed, but before this is called,
+        already includes them.
+        """
+        for sub_key in self.sub_keys(project_rowid):
+            interval, _, kind = sub_key
+            if kind == "span":
+                if any(contains(interval, span.start_time) for span in spans):
+                    self.invalidate_sub_key(project_rowid, sub_key)
+            elif kind == "trace":
+                if any(overlaps(interval, *bounds) for bounds in trace_bounds):
+                    self.invalidate_sub_key(project_rowid, sub_key)
+            else:
+                assert_never(kind)
+
 
 class RecordCountDataLoader(DataLoader[Key, Result]):
     def __init__(
@@ -100,7 +125,7 @@ def _get_stmt(
         time_column = models.Span.start_time
         stmt = stmt.join(models.Span)
         if filter_condition:
-            sf = SpanFilter(filter_condition)
+            sf = get_span_filter(filter_condition)
             stmt = sf(stmt)
     elif kind == "trace":
         time_column = models.Trace.start_time
@@ -0,0 +1,62 @@
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Union
+
+from openinference.semconv.trace import SpanAttributes
+from sqlalchemy import SQLColumnExpression, select
+from strawberry.dataloader import DataLoader
+from typing_extensions import TypeAlias
+
+from phoenix.db import models
+from phoenix.server.types import DbSessionFactory
+
+
+def _attribute(key: str) -> SQLColumnExpression[Any]:
+    return models.Span.attributes[key.split(".")]
+
+
+# The JSON-heavy fields of spans, which are left out when spans are listed, and loaded
+# only for the fields queried. Attributes are extracted by the database where possible,
+# so e.g. the metadata of a span can be shown without loading all its attributes.
+SPAN_FIELDS: Mapping[str, SQLColumnExpression[Any]] = MappingProxyType(
+    {
+        "attributes": models.Span.attributes,
+        "events": models.Span.events,
+        **{
+            key: _attribute(key)
+            for key in (
+                SpanAttributes.INPUT_VALUE,
+                SpanAttributes.METADATA,
+                SpanAttributes.OUTPUT_VALUE,
+                SpanAttributes.RETRIEVAL_DOCUMENTS,
+            )
+        },
+    }
+)
+
+SpanRowId: TypeAlias = int
+FieldName: TypeAlias = str
+Key: TypeAlias = tuple[SpanRowId, FieldName]
+Result: TypeAlias = Any
+
+
+class SpanFieldsDataLoader(DataLoader[Key, Result]):
+    def __init__(self, db: DbSessionFactory) -> None:
+        super().__init__(load_fn=self._load_fn)
+        self._db = db
+
+    async def _load_fn(self, keys: list[Key]) -> list[Union[Result, ValueError]]:
+        span_rowids = list({span_rowid for span_rowid, _ in keys})
+        names = list({name for _, name in keys})
+        stmt = select(models.Span.id, *(SPAN_FIELDS[name] for name in names)).where(
+            models.Span.id.in_(span_rowids)
+        )
+        async with self._db() as session:
+            fields = {
+                span_rowid: dict(zip(names, values))
+                async for span_rowid, *values in await session.stream(stmt)
+            }
+        return [
+            fields[span_rowid][name] if span_rowid in fields else ValueError("Invalid span ID")
+            for span_rowid, name in keys
+        ]
@@ -1,4 +1,5 @@
 from collections import defaultdict
+from collections.abc import Sequence
 from datetime import datetime
 from typing import Any, Literal, Optional
 
@@ -6,13 +7,14 @@ from cachetools import LFUCache, TTLCache
 from sqlalchemy import Select, func, select
 from sqlalchemy.sql.functions import coalesce
 from strawberry.dataloader import AbstractCache, DataLoader
-from typing_extensions import TypeAlias
+from typing_extensions import TypeAlias, assert_never
 
 from phoenix.db import models
-from phoenix.server.api.dataloaders.cache import TwoTierCache
+from phoenix.db.insertion.span import InsertedSpan
+from phoenix.server.api.dataloaders.cache import TwoTierCache, contains
 from phoenix.server.api.input_types.TimeRange import TimeRange
 from phoenix.server.types import DbSessionFactory
-from phoenix.trace.dsl import SpanFilter
+from phoenix.trace.dsl.filter import get_span_filter
 
 Kind: TypeAlias = Literal["prompt", "completion", "total"]
 ProjectRowId: TypeAlias = int
@@ -57,6 +59,37 @@ class TokenCountCache(
         (interval, filter_condition), (project_rowid, kind) = _cache_key_fn(key)
         return project_rowid, (interval, filter_condition, kind)
 
+    def on_spans_inserted(
+        self,
+        project_rowid: ProjectRowId,
+        spans: Sequence[InsertedSpan],
+    ) -> None:
+        """
+        Filtered token counts are invalidated if their time intervals include any of the
+        inserted spans, and unfiltered ones if those spans have token counts of their kind.
+        They can't be incremented in place, because a count loaded after the spans were
+        committed, but before this is called, already includes them.
+        """
+        for sub_key in self.sub_keys(project_rowid):
+            interval, filter_condition, kind = sub_key
+            if not (covered := [span for span in spans if contains(interval, span.start_time)]):
+                continue
+            if filter_condition:
+                self.invalidate_sub_key(project_rowid, sub_key)
+                continue
+            has_prompt = any(s.llm_token_count_prompt is not None for s in covered)
+            has_completion = any(s.llm_token_count_completion is not None for s in covered)
+            if kind == "prompt":
+                changed = has_prompt
+            elif kind == "completion":
+                changed = has_completion
+            elif kind == "total":
+                changed = has_prompt or has_completion
+            else:
+                assert_never(kind)
+            if changed:
+                self.invalidate_sub_key(project_rowid, sub_key)
+
 
 class TokenCountDataLoader(DataLoader[Key, Result]):
     def __init__(
@@ -118,7 +151,7 @@ def _get_stmt(
     if end_time:
         stmt = stmt.where(models.Span.start_time < end_time)
     if filter_condition:
-        sf = SpanFilter(filter_condition)
+        sf = get_span_filter(filter_condition)
         stmt = sf(stmt)
     stmt = stmt.where(pid.in_([rowid for rowid, _ in params]))
     return stmt
@@ -32,6 +32,7 @@ from typing_extensions import Self, TypeAlias, assert_never
 
 from phoenix.datetime_utils import local_now, normalize_datetime
 from phoenix.db import models
+from phoenix.db.insertion.span import get_materialized_attributes
 from phoenix.server.api.input_types.ChatCompletionInput import ChatCompletionInput
 from phoenix.server.api.types.ChatCompletionMessageRole import ChatCompletionMessageRole
 from phoenix.server.api.types.ChatCompletionSubscriptionPayload import (
@@ -147,6 +148,7 @@ class streaming_llm_span:
                 start_time=self._start_time,
                 end_time=end_time,
             )
+            attributes = unflatten(self._attributes.items())
             span = models.Span(
                 trace_rowid=trace.id,
                 span_id=span_id,
@@ -155,7 +157,7 @@ class streaming_llm_span:
                 span_kind=LLM,
                 start_time=self._start_time,
                 end_time=end_time,
-                attributes=unflatten(self._attributes.items()),
+                attributes=attributes,
                 events=[_serialize_event(event) for event in self._events],
                 status_code=status_code.name,
                 status_message=status_message,
@@ -164,6 +166,7 @@ class streaming_llm_span:
                 cumulative_llm_token_count_completion=completion_tokens,
                 llm_token_count_prompt=prompt_tokens,
                 llm_token_count_completion=completion_tokens,
+                **get_materialized_attributes(attributes),
                 trace=trace,
             )
             session.add(trace)
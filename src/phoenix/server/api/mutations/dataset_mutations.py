@@ -6,12 +6,17 @@ import strawberry
 from openinference.semconv.trace import (
     SpanAttributes,
 )
-from sqlalchemy import and_, delete, distinct, func, insert, select, update
+from sqlalchemy import and_, delete, distinct, insert, select, update
 from strawberry import UNSET
 from strawberry.types import Info
 
 from phoenix.db import models
-from phoenix.db.helpers import get_eval_trace_ids_for_datasets, get_project_names_for_datasets
+from phoenix.db.helpers import (
+    dataset_example_revision_is_current,
+    get_eval_trace_ids_for_datasets,
+    get_project_names_for_datasets,
+)
+from phoenix.db.insertion.dataset import supersede_dataset_example_revisions
 from phoenix.server.api.auth import IsNotReadOnly
 from phoenix.server.api.context import Context
 from phoenix.server.api.exceptions import BadRequest, NotFound
@@ -425,18 +430,13 @@ class DatasetMutationMixin:
                 raise BadRequest("Examples must come from the same dataset.")
             dataset = datasets[0]
 
-            revision_ids = (
-                select(func.max(models.DatasetExampleRevision.id))
-                .where(models.DatasetExampleRevision.dataset_example_id.in_(example_ids))
-                .group_by(models.DatasetExampleRevision.dataset_example_id)
-                .scalar_subquery()
-            )
             revisions = (
                 await session.scalars(
                     select(models.DatasetExampleRevision)
                     .where(
                         and_(
-                            models.DatasetExampleRevision.id.in_(revision_ids),
+                            models.DatasetExampleRevision.dataset_example_id.in_(example_ids),
+                            dataset_example_revision_is_current(),
                             models.DatasetExampleRevision.revision_kind != "DELETE",
                         )
                     )
@@ -459,6 +459,7 @@ class DatasetMutationMixin:
             )
             assert version_id is not None
 
+            await supersede_dataset_example_revisions(session, version_id, example_ids)
             await session.execute(
                 insert(models.DatasetExampleRevision),
                 [
@@ -538,6 +539,10 @@ class DatasetMutationMixin:
                     "Provided examples contain already deleted examples. Delete aborted."
                 )
 
+            assert dataset_version_rowid is not None
+            await supersede_dataset_example_revisions(
+                session, dataset_version_rowid, example_db_ids
+            )
             DatasetExampleRevision = models.DatasetExampleRevision
             await session.execute(
                 insert(DatasetExampleRevision),
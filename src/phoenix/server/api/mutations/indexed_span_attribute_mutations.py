@@ -0,0 +1,74 @@
+import strawberry
+from sqlalchemy import select
+from strawberry.types import Info
+
+from phoenix.db import models
+from phoenix.db.indexed_span_attributes import (
+    add_indexed_span_attribute,
+    get_column_name,
+    remove_indexed_span_attribute,
+)
+from phoenix.server.api.auth import IsAdmin, IsNotReadOnly
+from phoenix.server.api.context import Context
+from phoenix.server.api.exceptions import BadRequest, NotFound
+from phoenix.server.api.queries import Query
+from phoenix.server.api.types.IndexedSpanAttribute import (
+    IndexedSpanAttribute,
+    to_gql_indexed_span_attribute,
+)
+from phoenix.trace.dsl.filter import get_attribute_path
+
+
+@strawberry.input
+class IndexedSpanAttributeInput:
+    key: str = strawberry.field(
+        description="The attribute as written in filter conditions, "
+        'e.g. `metadata["tenant"]` or `llm.model_name`'
+    )
+
+
+@strawberry.type
+class AddIndexedSpanAttributeMutationPayload:
+    indexed_span_attribute: IndexedSpanAttribute
+    query: Query
+
+
+@strawberry.type
+class IndexedSpanAttributeMutationMixin:
+    @strawberry.mutation(permission_classes=[IsNotReadOnly, IsAdmin])  # type: ignore
+    async def add_indexed_span_attribute(
+        self, info: Info[Context, None], input: IndexedSpanAttributeInput
+    ) -> AddIndexedSpanAttributeMutationPayload:
+        """
+        Indexes a span attribute, so that filter conditions comparing it can use the index.
+        The index is built online, which can take a while for many spans.
+        """
+        path = _get_attribute_path(input.key)
+        try:
+            await add_indexed_span_attribute(info.context.db, path)
+        except ValueError as error:
+            raise BadRequest(str(error))
+        async with info.context.db() as session:
+            indexed_span_attribute = await session.scalar(
+                select(models.IndexedSpanAttribute).filter_by(column_name=get_column_name(path))
+            )
+        assert indexed_span_attribute is not None
+        return AddIndexedSpanAttributeMutationPayload(
+            indexed_span_attribute=to_gql_indexed_span_attribute(indexed_span_attribute),
+            query=Query(),
+        )
+
+    @strawberry.mutation(permission_classes=[IsNotReadOnly, IsAdmin])  # type: ignore
+    async def remove_indexed_span_attribute(
+        self, info: Info[Context, None], input: IndexedSpanAttributeInput
+    ) -> Query:
+        if not await remove_indexed_span_attribute(info.context.db, _get_attribute_path(input.key)):
+            raise NotFound(f"Span attribute is not indexed: {input.key}")
+        return Query()
+
+
+def _get_attribute_path(key: str) -> tuple[str, ...]:
+    try:
+        return get_attribute_path(key)
+    except (SyntaxError, ValueError) as error:
+        raise BadRequest(str(error))
@@ -14,6 +14,7 @@ from strawberry.types import Info
 from typing_extensions import Annotated, TypeAlias
 
 from phoenix.db import enums, models
+from phoenix.db.helpers import dataset_example_revision_is_current
 from phoenix.db.models import (
     DatasetExample as OrmExample,
 )
@@ -68,6 +69,10 @@ from phoenix.server.api.types.GenerativeProvider import (
     GenerativeProvider,
     GenerativeProviderKey,
 )
+from phoenix.server.api.types.IndexedSpanAttribute import (
+    IndexedSpanAttribute,
+    to_gql_indexed_span_attribute,
+)
 from phoenix.server.api.types.InferencesRole import AncillaryInferencesRole, InferencesRole
 from phoenix.server.api.types.Model import Model
 from phoenix.server.api.types.node import from_global_id, from_global_id_with_expected_type
@@ -218,6 +223,18 @@ class Query:
             for api_key in api_keys
         ]
 
+    @strawberry.field(permission_classes=[IsAdmin])  # type: ignore
+    async def indexed_span_attributes(
+        self, info: Info[Context, None]
+    ) -> list[IndexedSpanAttribute]:
+        stmt = select(models.IndexedSpanAttribute).order_by(models.IndexedSpanAttribute.id)
+        async with info.context.db() as session:
+            indexed_span_attributes = await session.scalars(stmt)
+        return [
+            to_gql_indexed_span_attribute(indexed_span_attribute)
+            for indexed_span_attribute in indexed_span_attributes
+        ]
+
     @strawberry.field
     async def projects(
         self,
@@ -330,25 +347,14 @@ class Query:
             if num_resolved_experiment_ids != len(experiment_ids_):
                 raise ValueError("Unable to resolve one or more experiment IDs.")
 
-            revision_ids = (
-                select(func.max(OrmRevision.id))
-                .join(OrmExample, OrmExample.id == OrmRevision.dataset_example_id)
-                .where(
-                    and_(
-                        OrmRevision.dataset_version_id <= version_id,
-                        OrmExample.dataset_id == dataset_id,
-                    )
-                )
-                .group_by(OrmRevision.dataset_example_id)
-                .scalar_subquery()
-            )
             examples = (
                 await session.scalars(
                     select(OrmExample)
                     .join(OrmRevision, OrmExample.id == OrmRevision.dataset_example_id)
                     .where(
                         and_(
-                            OrmRevision.id.in_(revision_ids),
+                            OrmExample.dataset_id == dataset_id,
+                            dataset_example_revision_is_current(version_id),
                             OrmRevision.revision_kind != "DELETE",
                         )
                     )
@@ -473,11 +479,6 @@ class Query:
             return to_gql_dataset(dataset)
         elif type_name == DatasetExample.__name__:
             example_id = node_id
-            latest_revision_id = (
-                select(func.max(models.DatasetExampleRevision.id))
-                .where(models.DatasetExampleRevision.dataset_example_id == example_id)
-                .scalar_subquery()
-            )
             async with info.context.db() as session:
                 example = await session.scalar(
                     select(models.DatasetExample)
@@ -489,7 +490,7 @@ class Query:
                     .where(
                         and_(
                             models.DatasetExample.id == example_id,
-                            models.DatasetExampleRevision.id == latest_revision_id,
+                            dataset_example_revision_is_current(),
                             models.DatasetExampleRevision.revision_kind != "DELETE",
                         )
                     )
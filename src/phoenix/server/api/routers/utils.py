@@ -1,9 +1,14 @@
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import Future
 from datetime import datetime
-from typing import Optional, cast
+from typing import Any, Optional, Union, cast
 
 import pandas as pd
 import pyarrow as pa
 
+from phoenix.utilities.byte_chunks import ByteChunksReader
+
 
 def table_to_bytes(table: pa.Table) -> bytes:
     sink = pa.BufferOutputStream()
@@ -19,3 +24,105 @@ def from_iso_format(value: Optional[str]) -> Optional[datetime]:
 def df_to_bytes(df: pd.DataFrame) -> bytes:
     pa_table = pa.Table.from_pandas(df)
     return table_to_bytes(pa_table)
+
+
+class AsyncRecordBatchReader:
+    """
+    Decodes an Arrow IPC stream from an asynchronous byte stream, e.g. the body of a
+    request, without buffering all of it. The decoding happens in a worker thread, which
+    pulls bytes from the stream as needed and stays at most `max_in_flight` record batches
+    ahead of the consumer, so memory use is bounded by the size of the batches rather than
+    the size of the stream.
+
+    Usage:
+
+        async with AsyncRecordBatchReader(request.stream(), max_in_flight=4) as reader:
+            schema = reader.schema
+            async for batch in reader:
+                ...
+
+    Entering the context raises `pyarrow.ArrowInvalid` if the stream doesn't start with
+    a valid schema, and iterating raises it if a record batch is invalid.
+    """
+
+    def __init__(self, stream: AsyncIterator[bytes], *, max_in_flight: int) -> None:
+        self._stream = stream
+        self._queue: asyncio.Queue[Union[pa.Schema, pa.RecordBatch, BaseException, None]] = (
+            asyncio.Queue(maxsize=max(1, max_in_flight))
+        )
+        self._closed = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker: Optional[asyncio.Future[None]] = None
+        self._schema: Optional[pa.Schema] = None
+
+    @property
+    def schema(self) -> pa.Schema:
+        assert self._schema is not None
+        return self._schema
+
+    async def __aenter__(self) -> "AsyncRecordBatchReader":
+        self._loop = asyncio.get_running_loop()
+        self._worker = self._loop.run_in_executor(None, self._read)
+        item = await self._queue.get()
+        if isinstance(item, BaseException):
+            await self.__aexit__()
+            raise item
+        if not isinstance(item, pa.Schema):
+            await self.__aexit__()
+            raise pa.ArrowInvalid("Stream has no schema")
+        self._schema = item
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        self._closed = True
+        if self._worker is None:
+            return
+        # Unblocks the worker if it's waiting for room in the queue.
+        while not self._worker.done():
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            await asyncio.wait({self._worker}, timeout=0.01)
+
+    async def __aiter__(self) -> AsyncIterator[pa.RecordBatch]:
+        while (item := await self._queue.get()) is not None:
+            if isinstance(item, BaseException):
+                raise item
+            assert isinstance(item, pa.RecordBatch)
+            yield item
+
+    def _read(self) -> None:
+        try:
+            with pa.ipc.open_stream(ByteChunksReader(self._chunks())) as reader:
+                self._put(reader.schema)
+                for batch in reader:
+                    if self._closed:
+                        return
+                    self._put(batch)
+        except BaseException as e:
+            self._put(e)
+        else:
+            self._put(None)
+
+    def _put(self, item: Union[pa.Schema, pa.RecordBatch, BaseException, None]) -> None:
+        if not self._closed:
+            self._run(self._queue.put(item)).result()
+
+    def _run(self, coro: Any) -> "Future[Any]":
+        assert self._loop is not None
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def _chunks(self) -> Iterator[bytes]:
+        """
+        Blocks the worker thread on each chunk of the stream.
+        """
+        while chunk := self._run(self._next_chunk()).result():
+            yield chunk
+
+    async def _next_chunk(self) -> bytes:
+        while True:
+            try:
+                chunk = await self._stream.__anext__()
+            except StopAsyncIteration:
+                return b""
+            if chunk:
+                return chunk
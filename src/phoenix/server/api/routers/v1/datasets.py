@@ -6,17 +6,16 @@ import logging
 import zlib
 from asyncio import QueueFull
 from collections import Counter
-from collections.abc import Awaitable, Callable, Coroutine, Iterator, Mapping, Sequence
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator, Mapping, Sequence
 from datetime import datetime
 from enum import Enum
 from functools import partial
-from typing import Any, Optional, Union, cast
+from typing import Any, BinaryIO, NamedTuple, Optional, cast
 
-import pandas as pd
 import pyarrow as pa
 from fastapi import APIRouter, BackgroundTasks, HTTPException, Path, Query
 from fastapi.responses import PlainTextResponse, StreamingResponse
-from sqlalchemy import and_, delete, func, select
+from sqlalchemy import Select, and_, delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.concurrency import run_in_threadpool
 from starlette.datastructures import FormData, UploadFile
@@ -34,7 +33,11 @@ from strawberry.relay import GlobalID
 from typing_extensions import TypeAlias, assert_never
 
 from phoenix.db import models
-from phoenix.db.helpers import get_eval_trace_ids_for_datasets, get_project_names_for_datasets
+from phoenix.db.helpers import (
+    dataset_example_revision_is_current,
+    get_eval_trace_ids_for_datasets,
+    get_project_names_for_datasets,
+)
 from phoenix.db.insertion.dataset import (
     DatasetAction,
     DatasetExampleAdditionEvent,
@@ -47,6 +50,7 @@ from phoenix.server.api.types.DatasetVersion import DatasetVersion as DatasetVer
 from phoenix.server.api.types.node import from_global_id_with_expected_type
 from phoenix.server.api.utils import delete_projects, delete_traces
 from phoenix.server.dml_event import DatasetInsertEvent
+from phoenix.server.types import DbSessionFactory
 
 from .pydantic_compat import V1RoutesBaseModel
 from .utils import (
@@ -58,8 +62,12 @@ from .utils import (
 
 logger = logging.getLogger(__name__)
 
+_MAX_ROWS_PER_RECORD_BATCH_SLICE = 1_000
+_MAX_EXAMPLES_PER_PARTITION = 1_000
+
 DATASET_NODE_NAME = DatasetNodeType.__name__
 DATASET_VERSION_NODE_NAME = DatasetVersionNodeType.__name__
+DATASET_EXAMPLE_NODE_NAME = DatasetExampleNodeType.__name__
 
 
 router = APIRouter(tags=["datasets"])
@@ -391,7 +399,8 @@ async def upload_dataset(
     ),
 ) -> Optional[UploadDatasetResponseBody]:
     request_content_type = request.headers["content-type"]
-    examples: Union[Examples, Awaitable[Examples]]
+    examples: Examples
+    form: Optional[FormData] = None
     if request_content_type.startswith("application/json"):
         try:
             examples, action, name, description = await run_in_threadpool(
@@ -410,22 +419,19 @@ async def upload_dataset(
                         status_code=HTTP_409_CONFLICT,
                     )
     elif request_content_type.startswith("multipart/form-data"):
-        async with request.form() as form:
-            try:
-                (
-                    action,
-                    name,
-                    description,
-                    input_keys,
-                    output_keys,
-                    metadata_keys,
-                    file,
-                ) = await _parse_form_data(form)
-            except ValueError as e:
-                raise HTTPException(
-                    detail=str(e),
-                    status_code=HTTP_422_UNPROCESSABLE_ENTITY,
-                )
+        # The form stays open until the examples are inserted, because they are parsed
+        # lazily from the uploaded file, which the form parser has spooled to disk.
+        form = await request.form()
+        try:
+            (
+                action,
+                name,
+                description,
+                input_keys,
+                output_keys,
+                metadata_keys,
+                file,
+            ) = await _parse_form_data(form)
             if action is DatasetAction.CREATE:
                 async with request.app.state.db() as session:
                     if await _check_table_exists(session, name):
@@ -433,23 +439,25 @@ async def upload_dataset(
                             detail=f"Dataset with the same name already exists: {name=}",
                             status_code=HTTP_409_CONFLICT,
                         )
-            content = await file.read()
-        try:
             file_content_type = FileContentType(file.content_type)
             if file_content_type is FileContentType.CSV:
                 encoding = FileContentEncoding(file.headers.get("content-encoding"))
                 examples = await _process_csv(
-                    content, encoding, input_keys, output_keys, metadata_keys
+                    file.file, encoding, input_keys, output_keys, metadata_keys
                 )
             elif file_content_type is FileContentType.PYARROW:
-                examples = await _process_pyarrow(content, input_keys, output_keys, metadata_keys)
+                examples = await _process_pyarrow(file.file, input_keys, output_keys, metadata_keys)
             else:
                 assert_never(file_content_type)
         except ValueError as e:
+            await form.close()
             raise HTTPException(
                 detail=str(e),
                 status_code=HTTP_422_UNPROCESSABLE_ENTITY,
             )
+        except BaseException:
+            await form.close()
+            raise
     else:
         raise HTTPException(
             detail="Invalid request Content-Type",
@@ -458,16 +466,20 @@ async def upload_dataset(
     operation = cast(
         Callable[[AsyncSession], Awaitable[DatasetExampleAdditionEvent]],
         partial(
-            add_dataset_examples,
+            _add_dataset_examples,
             examples=examples,
             action=action,
             name=name,
             description=description,
+            form=form,
         ),
     )
     if sync:
-        async with request.app.state.db() as session:
-            dataset_id = (await operation(session)).dataset_id
+        try:
+            async with request.app.state.db() as session:
+                dataset_id = (await operation(session)).dataset_id
+        except _InvalidFileError as e:
+            raise HTTPException(detail=str(e), status_code=HTTP_422_UNPROCESSABLE_ENTITY)
         request.state.event_queue.put(DatasetInsertEvent((dataset_id,)))
         return UploadDatasetResponseBody(
             data=UploadDatasetData(dataset_id=str(GlobalID(Dataset.__name__, str(dataset_id))))
@@ -475,8 +487,8 @@ async def upload_dataset(
     try:
         request.state.enqueue_operation(operation)
     except QueueFull:
-        if isinstance(examples, Coroutine):
-            examples.close()
+        if form is not None:
+            await form.close()
         raise HTTPException(detail="Too many requests.", status_code=HTTP_429_TOO_MANY_REQUESTS)
     return None
 
@@ -515,6 +527,27 @@ DatasetId: TypeAlias = int
 Examples: TypeAlias = Iterator[ExampleContent]
 
 
+async def _add_dataset_examples(
+    session: AsyncSession,
+    examples: Examples,
+    action: DatasetAction,
+    name: str,
+    description: Optional[str],
+    form: Optional[FormData],
+) -> Optional[DatasetExampleAdditionEvent]:
+    try:
+        return await add_dataset_examples(
+            session=session,
+            examples=examples,
+            action=action,
+            name=name,
+            description=description,
+        )
+    finally:
+        if form is not None:
+            await form.close()
+
+
 def _process_json(
     data: Mapping[str, Any],
 ) -> tuple[Examples, DatasetAction, Name, Description]:
@@ -546,27 +579,39 @@ def _process_json(
 
 
 async def _process_csv(
-    content: bytes,
+    file: BinaryIO,
     content_encoding: FileContentEncoding,
     input_keys: InputKeys,
     output_keys: OutputKeys,
     metadata_keys: MetadataKeys,
 ) -> Examples:
+    """
+    Parses the rows lazily, decompressing the file incrementally, so that the file is never
+    held in memory as a whole.
+    """
+    stream: BinaryIO
     if content_encoding is FileContentEncoding.GZIP:
-        content = await run_in_threadpool(gzip.decompress, content)
+        stream = cast(BinaryIO, gzip.GzipFile(fileobj=file, mode="rb"))
     elif content_encoding is FileContentEncoding.DEFLATE:
-        content = await run_in_threadpool(zlib.decompress, content)
-    elif content_encoding is not FileContentEncoding.NONE:
+        stream = cast(BinaryIO, io.BufferedReader(_InflatingReader(file)))
+    elif content_encoding is FileContentEncoding.NONE:
+        stream = file
+    else:
         assert_never(content_encoding)
-    reader = await run_in_threadpool(lambda c: csv.DictReader(io.StringIO(c.decode())), content)
-    if reader.fieldnames is None:
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    reader = csv.DictReader(text)
+    try:
+        fieldnames = await run_in_threadpool(lambda: reader.fieldnames)
+    except (OSError, EOFError, UnicodeDecodeError, zlib.error) as e:
+        raise ValueError("File is not valid CSV") from e
+    if fieldnames is None:
         raise ValueError("Missing CSV column header")
-    (header, freq), *_ = Counter(reader.fieldnames).most_common(1)
+    (header, freq), *_ = Counter(fieldnames).most_common(1)
     if freq > 1:
         raise ValueError(f"Duplicated column header in CSV file: {header}")
-    column_headers = frozenset(reader.fieldnames)
+    column_headers = frozenset(fieldnames)
     _check_keys_exist(column_headers, input_keys, output_keys, metadata_keys)
-    return (
+    examples = (
         ExampleContent(
             input={k: row.get(k) for k in input_keys},
             output={k: row.get(k) for k in output_keys},
@@ -574,30 +619,80 @@ async def _process_csv(
         )
         for row in iter(reader)
     )
+    return _check_decoding(examples, "File is not valid CSV")
 
 
 async def _process_pyarrow(
-    content: bytes,
+    file: BinaryIO,
     input_keys: InputKeys,
     output_keys: OutputKeys,
     metadata_keys: MetadataKeys,
-) -> Awaitable[Examples]:
+) -> Examples:
+    """
+    Parses the rows lazily, one record batch at a time, and converts at most
+    `_MAX_ROWS_PER_RECORD_BATCH_SLICE` rows to pandas at a time.
+    """
     try:
-        reader = pa.ipc.open_stream(content)
+        reader = await run_in_threadpool(pa.ipc.open_stream, file)
     except pa.ArrowInvalid as e:
         raise ValueError("File is not valid pyarrow") from e
     column_headers = frozenset(reader.schema.names)
     _check_keys_exist(column_headers, input_keys, output_keys, metadata_keys)
 
     def get_examples() -> Iterator[ExampleContent]:
-        for row in reader.read_pandas().to_dict(orient="records"):
-            yield ExampleContent(
-                input={k: row.get(k) for k in input_keys},
-                output={k: row.get(k) for k in output_keys},
-                metadata={k: row.get(k) for k in metadata_keys},
-            )
+        for batch in reader:
+            for offset in range(0, batch.num_rows, _MAX_ROWS_PER_RECORD_BATCH_SLICE):
+                df = batch.slice(offset, _MAX_ROWS_PER_RECORD_BATCH_SLICE).to_pandas()
+                for row in df.to_dict(orient="records"):
+                    yield ExampleContent(
+                        input={k: row.get(k) for k in input_keys},
+                        output={k: row.get(k) for k in output_keys},
+                        metadata={k: row.get(k) for k in metadata_keys},
+                    )
+
+    return _check_decoding(get_examples(), "File is not valid pyarrow")
+
+
+class _InvalidFileError(ValueError):
+    """
+    An uploaded file turned out to be invalid after its header, i.e. while its rows were
+    being inserted.
+    """
+
+
+def _check_decoding(examples: Examples, message: str) -> Examples:
+    """
+    Raises `_InvalidFileError` for the errors of decoding the rest of the file.
+    """
+    try:
+        yield from examples
+    except (OSError, EOFError, UnicodeDecodeError, zlib.error, csv.Error, pa.ArrowInvalid) as e:
+        raise _InvalidFileError(message) from e
+
+
+class _InflatingReader(io.RawIOBase):
+    """
+    A file-like view of the decompressed content of a deflate-compressed file.
+    """
+
+    def __init__(self, file: BinaryIO) -> None:
+        self._file = file
+        self._decompressor = zlib.decompressobj()
+        self._buffer = b""
 
-    return run_in_threadpool(get_examples)
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        while not self._buffer and not self._decompressor.eof:
+            if not (data := self._file.read(io.DEFAULT_BUFFER_SIZE)):
+                self._buffer = self._decompressor.flush()
+                break
+            self._buffer = self._decompressor.decompress(data)
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
 
 
 async def _check_table_exists(session: AsyncSession, name: str) -> bool:
@@ -671,14 +766,14 @@ class ListDatasetExamplesData(V1RoutesBaseModel):
 
 
 class ListDatasetExamplesResponseBody(ResponseBody[ListDatasetExamplesData]):
-    pass
+    next_cursor: Optional[str] = None
 
 
 @router.get(
     "/datasets/{id}/examples",
     operation_id="getDatasetExamples",
     summary="Get examples from a dataset",
-    responses=add_errors_to_responses([HTTP_404_NOT_FOUND]),
+    responses=add_errors_to_responses([HTTP_404_NOT_FOUND, HTTP_422_UNPROCESSABLE_ENTITY]),
 )
 async def get_dataset_examples(
     request: Request,
@@ -689,6 +784,17 @@ async def get_dataset_examples(
             "The ID of the dataset version " "(if omitted, returns data from the latest version)"
         ),
     ),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Cursor for pagination",
+    ),
+    limit: Optional[int] = Query(
+        default=None,
+        description=(
+            "The max number of examples to return at a time " "(if omitted, returns all examples)"
+        ),
+        gt=0,
+    ),
 ) -> ListDatasetExamplesResponseBody:
     dataset_gid = GlobalID.from_id(id)
     version_gid = GlobalID.from_id(version_id) if version_id else None
@@ -703,6 +809,18 @@ async def get_dataset_examples(
             detail=f"ID {version_gid} refers to a {version_type}", status_code=HTTP_404_NOT_FOUND
         )
 
+    start = 0
+    if cursor:
+        try:
+            start = from_global_id_with_expected_type(
+                GlobalID.from_id(cursor), DATASET_EXAMPLE_NODE_NAME
+            )
+        except ValueError:
+            raise HTTPException(
+                detail=f"Invalid cursor format: {cursor}",
+                status_code=HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+
     async with request.app.state.db() as session:
         if (
             resolved_dataset_id := await session.scalar(
@@ -714,12 +832,6 @@ async def get_dataset_examples(
                 status_code=HTTP_404_NOT_FOUND,
             )
 
-        # Subquery to find the maximum created_at for each dataset_example_id
-        # timestamp tiebreaks are resolved by the largest id
-        partial_subquery = select(
-            func.max(models.DatasetExampleRevision.id).label("max_id"),
-        ).group_by(models.DatasetExampleRevision.dataset_example_id)
-
         if version_gid:
             if (
                 resolved_version_id := await session.scalar(
@@ -735,10 +847,6 @@ async def get_dataset_examples(
                     detail=f"No dataset version with id {version_id} can be found.",
                     status_code=HTTP_404_NOT_FOUND,
                 )
-            # if a version_id is provided, filter the subquery to only include revisions from that
-            partial_subquery = partial_subquery.filter(
-                models.DatasetExampleRevision.dataset_version_id <= resolved_version_id
-            )
         else:
             if (
                 resolved_version_id := await session.scalar(
@@ -752,38 +860,30 @@ async def get_dataset_examples(
                     status_code=HTTP_404_NOT_FOUND,
                 )
 
-        subquery = partial_subquery.subquery()
-        # Query for the most recent example revisions that are not deleted
-        query = (
-            select(models.DatasetExample, models.DatasetExampleRevision)
-            .join(
-                models.DatasetExampleRevision,
-                models.DatasetExample.id == models.DatasetExampleRevision.dataset_example_id,
-            )
-            .join(
-                subquery,
-                (subquery.c.max_id == models.DatasetExampleRevision.id),
-            )
-            .filter(models.DatasetExample.dataset_id == resolved_dataset_id)
-            .filter(models.DatasetExampleRevision.revision_kind != "DELETE")
-            .order_by(models.DatasetExample.id.asc())
-        )
+        query = _select_latest_revisions(resolved_dataset_id, resolved_version_id, start)
+        if limit is not None:
+            query = query.limit(limit + 1)
         examples = [
             DatasetExample(
-                id=str(GlobalID("DatasetExample", str(example.id))),
-                input=revision.input,
-                output=revision.output,
-                metadata=revision.metadata_,
-                updated_at=revision.created_at,
+                id=str(GlobalID(DATASET_EXAMPLE_NODE_NAME, str(example.id))),
+                input=example.input,
+                output=example.output,
+                metadata=example.metadata,
+                updated_at=example.updated_at,
             )
-            async for example, revision in await session.stream(query)
+            async for example in _stream_revisions(session, query)
         ]
+
+    next_cursor = None
+    if limit is not None and len(examples) == limit + 1:
+        next_cursor = examples.pop().id
     return ListDatasetExamplesResponseBody(
         data=ListDatasetExamplesData(
             dataset_id=str(GlobalID("Dataset", str(resolved_dataset_id))),
             version_id=str(GlobalID("DatasetVersion", str(resolved_version_id))),
             examples=examples,
-        )
+        ),
+        next_cursor=next_cursor,
     )
 
 
@@ -800,7 +900,6 @@ async def get_dataset_examples(
 )
 async def get_dataset_csv(
     request: Request,
-    response: Response,
     id: str = Path(description="The ID of the dataset"),
     version_id: Optional[str] = Query(
         default=None,
@@ -811,14 +910,13 @@ async def get_dataset_csv(
 ) -> Response:
     try:
         async with request.app.state.db() as session:
-            dataset_name, examples = await _get_db_examples(
+            dataset_name, dataset_id, dataset_version_id = await _get_db_dataset_version(
                 session=session, id=id, version_id=version_id
             )
     except ValueError as e:
         raise HTTPException(detail=str(e), status_code=HTTP_422_UNPROCESSABLE_ENTITY)
-    content = await run_in_threadpool(_get_content_csv, examples)
-    return Response(
-        content=content,
+    return StreamingResponse(
+        content=_stream_csv(request.app.state.db, dataset_id, dataset_version_id),
         headers={
             "content-disposition": f'attachment; filename="{dataset_name}.csv"',
             "content-type": "text/csv",
@@ -826,6 +924,52 @@ async def get_dataset_csv(
     )
 
 
+@router.get(
+    "/datasets/{id}/arrow",
+    operation_id="getDatasetArrow",
+    summary="Download dataset examples as an Arrow IPC stream",
+    description=(
+        "The examples are streamed as record batches with the columns `id`, `input`, "
+        "`output`, `metadata` and `updated_at`, where `input`, `output` and `metadata` "
+        "are JSON strings."
+    ),
+    response_class=StreamingResponse,
+    status_code=HTTP_200_OK,
+    responses={
+        **add_errors_to_responses([HTTP_422_UNPROCESSABLE_ENTITY]),
+        HTTP_200_OK: {
+            "content": {
+                "application/x-pandas-arrow": {
+                    "schema": {"type": "string", "format": "binary"},
+                }
+            }
+        },
+    },
+)
+async def get_dataset_arrow(
+    request: Request,
+    id: str = Path(description="The ID of the dataset"),
+    version_id: Optional[str] = Query(
+        default=None,
+        description=(
+            "The ID of the dataset version " "(if omitted, returns data from the latest version)"
+        ),
+    ),
+) -> Response:
+    try:
+        async with request.app.state.db() as session:
+            dataset_name, dataset_id, dataset_version_id = await _get_db_dataset_version(
+                session=session, id=id, version_id=version_id
+            )
+    except ValueError as e:
+        raise HTTPException(detail=str(e), status_code=HTTP_422_UNPROCESSABLE_ENTITY)
+    return StreamingResponse(
+        content=_stream_arrow(request.app.state.db, dataset_id, dataset_version_id),
+        media_type="application/x-pandas-arrow",
+        headers={"content-disposition": f'attachment; filename="{dataset_name}.arrow"'},
+    )
+
+
 @router.get(
     "/datasets/{id}/jsonl/openai_ft",
     operation_id="getDatasetJSONLOpenAIFineTuning",
@@ -842,7 +986,6 @@ async def get_dataset_csv(
 )
 async def get_dataset_jsonl_openai_ft(
     request: Request,
-    response: Response,
     id: str = Path(description="The ID of the dataset"),
     version_id: Optional[str] = Query(
         default=None,
@@ -850,17 +993,21 @@ async def get_dataset_jsonl_openai_ft(
             "The ID of the dataset version " "(if omitted, returns data from the latest version)"
         ),
     ),
-) -> bytes:
+) -> Response:
     try:
         async with request.app.state.db() as session:
-            dataset_name, examples = await _get_db_examples(
+            dataset_name, dataset_id, dataset_version_id = await _get_db_dataset_version(
                 session=session, id=id, version_id=version_id
             )
     except ValueError as e:
         raise HTTPException(detail=str(e), status_code=HTTP_422_UNPROCESSABLE_ENTITY)
-    content = await run_in_threadpool(_get_content_jsonl_openai_ft, examples)
-    response.headers["content-disposition"] = f'attachment; filename="{dataset_name}.jsonl"'
-    return content
+    return StreamingResponse(
+        content=_stream_jsonl(
+            request.app.state.db, dataset_id, dataset_version_id, _to_openai_ft_record
+        ),
+        media_type="text/plain",
+        headers={"content-disposition": f'attachment; filename="{dataset_name}.jsonl"'},
+    )
 
 
 @router.get(
@@ -879,7 +1026,6 @@ async def get_dataset_jsonl_openai_ft(
 )
 async def get_dataset_jsonl_openai_evals(
     request: Request,
-    response: Response,
     id: str = Path(description="The ID of the dataset"),
     version_id: Optional[str] = Query(
         default=None,
@@ -887,130 +1033,252 @@ async def get_dataset_jsonl_openai_evals(
             "The ID of the dataset version " "(if omitted, returns data from the latest version)"
         ),
     ),
-) -> bytes:
+) -> Response:
     try:
         async with request.app.state.db() as session:
-            dataset_name, examples = await _get_db_examples(
+            dataset_name, dataset_id, dataset_version_id = await _get_db_dataset_version(
                 session=session, id=id, version_id=version_id
             )
     except ValueError as e:
         raise HTTPException(detail=str(e), status_code=HTTP_422_UNPROCESSABLE_ENTITY)
-    content = await run_in_threadpool(_get_content_jsonl_openai_evals, examples)
-    response.headers["content-disposition"] = f'attachment; filename="{dataset_name}.jsonl"'
-    return content
-
-
-def _get_content_csv(examples: list[models.DatasetExampleRevision]) -> bytes:
-    records = [
-        {
-            "example_id": GlobalID(
-                type_name=DatasetExampleNodeType.__name__,
-                node_id=str(ex.dataset_example_id),
-            ),
-            **{f"input_{k}": v for k, v in ex.input.items()},
-            **{f"output_{k}": v for k, v in ex.output.items()},
-            **{f"metadata_{k}": v for k, v in ex.metadata_.items()},
-        }
-        for ex in examples
-    ]
-    return str(pd.DataFrame.from_records(records).to_csv(index=False)).encode()
+    return StreamingResponse(
+        content=_stream_jsonl(
+            request.app.state.db, dataset_id, dataset_version_id, _to_openai_evals_record
+        ),
+        media_type="text/plain",
+        headers={"content-disposition": f'attachment; filename="{dataset_name}.jsonl"'},
+    )
 
 
-def _get_content_jsonl_openai_ft(examples: list[models.DatasetExampleRevision]) -> bytes:
-    records = io.BytesIO()
-    for ex in examples:
-        records.write(
-            (
-                json.dumps(
-                    {
-                        "messages": (
-                            ims if isinstance(ims := ex.input.get("messages"), list) else []
-                        )
-                        + (oms if isinstance(oms := ex.output.get("messages"), list) else [])
-                    },
-                    ensure_ascii=False,
-                )
-                + "\n"
-            ).encode()
-        )
-    records.seek(0)
-    return records.read()
+class _ExampleRevision(NamedTuple):
+    id: int
+    input: dict[str, Any]
+    output: dict[str, Any]
+    metadata: dict[str, Any]
+    updated_at: datetime
 
 
-def _get_content_jsonl_openai_evals(examples: list[models.DatasetExampleRevision]) -> bytes:
-    records = io.BytesIO()
-    for ex in examples:
-        records.write(
-            (
-                json.dumps(
-                    {
-                        "messages": ims
-                        if isinstance(ims := ex.input.get("messages"), list)
-                        else [],
-                        "ideal": (
-                            ideal if isinstance(ideal := last_message.get("content"), str) else ""
-                        )
-                        if isinstance(oms := ex.output.get("messages"), list)
-                        and oms
-                        and hasattr(last_message := oms[-1], "get")
-                        else "",
-                    },
-                    ensure_ascii=False,
-                )
-                + "\n"
-            ).encode()
+def _select_latest_revisions(
+    dataset_id: int,
+    dataset_version_id: int,
+    start: int = 0,
+) -> Select[tuple[int, dict[str, Any], dict[str, Any], dict[str, Any], datetime]]:
+    """
+    Selects the current revision as of the given version of each example with an ID of at
+    least `start`, except the deleted ones, in the order of the example IDs.
+    """
+    revision = models.DatasetExampleRevision
+    return (
+        select(
+            revision.dataset_example_id,
+            revision.input,
+            revision.output,
+            revision.metadata_,
+            revision.created_at,
         )
-    records.seek(0)
-    return records.read()
+        .join(models.DatasetExample)
+        .where(models.DatasetExample.dataset_id == dataset_id)
+        .where(revision.dataset_example_id >= start)
+        .where(dataset_example_revision_is_current(dataset_version_id))
+        .where(revision.revision_kind != "DELETE")
+        .order_by(revision.dataset_example_id)
+    )
+
+
+async def _stream_revisions(
+    session: AsyncSession,
+    stmt: Select[tuple[int, dict[str, Any], dict[str, Any], dict[str, Any], datetime]],
+) -> AsyncIterator[_ExampleRevision]:
+    async for row in await session.stream(stmt):
+        yield _ExampleRevision(*row)
+
+
+async def _read_revisions(
+    db: DbSessionFactory,
+    dataset_id: int,
+    dataset_version_id: Optional[int],
+) -> AsyncIterator[list[_ExampleRevision]]:
+    """
+    Reads the latest revisions of the examples in partitions by keyset pagination, so that
+    memory use is bounded by the size of a partition. Each partition is read in its own
+    short transaction, so that a slow client doesn't hold on to a database connection (or
+    the SQLite lock) for the duration of a download.
+    """
+    if dataset_version_id is None:
+        return
+    start = 0
+    while True:
+        stmt = _select_latest_revisions(dataset_id, dataset_version_id, start)
+        async with db() as session:
+            rows = (await session.execute(stmt.limit(_MAX_EXAMPLES_PER_PARTITION))).all()
+        if rows:
+            yield [_ExampleRevision(*row) for row in rows]
+        if len(rows) < _MAX_EXAMPLES_PER_PARTITION:
+            break
+        start = rows[-1][0] + 1
+
+
+async def _stream_csv(
+    db: DbSessionFactory,
+    dataset_id: int,
+    dataset_version_id: Optional[int],
+) -> AsyncIterator[bytes]:
+    """
+    Writes the CSV rows partition by partition. The columns, i.e. the keys of all examples
+    in the order they first appear, must be known before the first row is written, so the
+    revisions are read twice: once for the columns, and again for the rows.
+    """
+    columns: dict[str, None] = {}
+    async for revisions in _read_revisions(db, dataset_id, dataset_version_id):
+        for revision in revisions:
+            columns.update(dict.fromkeys(_to_csv_record(revision)))
+    if not columns:
+        # what pandas writes for a frame without columns
+        yield b"\n"
+        return
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(columns), lineterminator="\n")
+    writer.writeheader()
+    async for revisions in _read_revisions(db, dataset_id, dataset_version_id):
+        writer.writerows(map(_to_csv_record, revisions))
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def _stream_arrow(
+    db: DbSessionFactory,
+    dataset_id: int,
+    dataset_version_id: Optional[int],
+) -> AsyncIterator[bytes]:
+    sink = _OutputBuffer()
+    with pa.ipc.new_stream(sink, _EXAMPLES_ARROW_SCHEMA) as writer:
+        yield sink.take()
+        async for revisions in _read_revisions(db, dataset_id, dataset_version_id):
+            writer.write_batch(_to_record_batch(revisions))
+            yield sink.take()
+    yield sink.take()
+
+
+async def _stream_jsonl(
+    db: DbSessionFactory,
+    dataset_id: int,
+    dataset_version_id: Optional[int],
+    to_record: Callable[[_ExampleRevision], dict[str, Any]],
+) -> AsyncIterator[bytes]:
+    async for revisions in _read_revisions(db, dataset_id, dataset_version_id):
+        yield "".join(
+            json.dumps(to_record(revision), ensure_ascii=False) + "\n" for revision in revisions
+        ).encode()
+
+
+def _to_csv_record(revision: _ExampleRevision) -> dict[str, Any]:
+    return {
+        "example_id": GlobalID(DATASET_EXAMPLE_NODE_NAME, str(revision.id)),
+        **{f"input_{k}": v for k, v in revision.input.items()},
+        **{f"output_{k}": v for k, v in revision.output.items()},
+        **{f"metadata_{k}": v for k, v in revision.metadata.items()},
+    }
+
+
+_EXAMPLES_ARROW_SCHEMA = pa.schema(
+    [
+        pa.field("id", pa.string()),
+        pa.field("input", pa.string()),
+        pa.field("output", pa.string()),
+        pa.field("metadata", pa.string()),
+        pa.field("updated_at", pa.timestamp("us", tz="UTC")),
+    ]
+)
+
+
+def _to_record_batch(revisions: Sequence[_ExampleRevision]) -> pa.RecordBatch:
+    return pa.record_batch(
+        [
+            [str(GlobalID(DATASET_EXAMPLE_NODE_NAME, str(r.id))) for r in revisions],
+            [json.dumps(r.input, ensure_ascii=False) for r in revisions],
+            [json.dumps(r.output, ensure_ascii=False) for r in revisions],
+            [json.dumps(r.metadata, ensure_ascii=False) for r in revisions],
+            [r.updated_at for r in revisions],
+        ],
+        schema=_EXAMPLES_ARROW_SCHEMA,
+    )
 
 
-async def _get_db_examples(
-    *, session: Any, id: str, version_id: Optional[str]
-) -> tuple[str, list[models.DatasetExampleRevision]]:
+class _OutputBuffer(io.RawIOBase):
+    """
+    A write-only stream whose contents can be taken out as they are written, so that an
+    Arrow IPC stream can be sent one record batch at a time. Its position keeps counting
+    past what has been taken out, since Arrow aligns its messages by it.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b: Any) -> int:
+        chunk = bytes(b)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def take(self) -> bytes:
+        content = b"".join(self._chunks)
+        self._chunks.clear()
+        return content
+
+
+def _to_openai_ft_record(revision: _ExampleRevision) -> dict[str, Any]:
+    return {
+        "messages": (ims if isinstance(ims := revision.input.get("messages"), list) else [])
+        + (oms if isinstance(oms := revision.output.get("messages"), list) else [])
+    }
+
+
+def _to_openai_evals_record(revision: _ExampleRevision) -> dict[str, Any]:
+    return {
+        "messages": ims if isinstance(ims := revision.input.get("messages"), list) else [],
+        "ideal": (ideal if isinstance(ideal := last_message.get("content"), str) else "")
+        if isinstance(oms := revision.output.get("messages"), list)
+        and oms
+        and hasattr(last_message := oms[-1], "get")
+        else "",
+    }
+
+
+async def _get_db_dataset_version(
+    *, session: AsyncSession, id: str, version_id: Optional[str]
+) -> tuple[str, int, Optional[int]]:
+    """
+    Returns the name and the row ID of the dataset, and the row ID of the version to read
+    its examples at, i.e. the given version or else the latest one. The version is None if
+    the dataset has no such version, in which case there are no examples to read.
+    """
     dataset_id = from_global_id_with_expected_type(GlobalID.from_id(id), DATASET_NODE_NAME)
     dataset_version_id: Optional[int] = None
     if version_id:
         dataset_version_id = from_global_id_with_expected_type(
             GlobalID.from_id(version_id), DATASET_VERSION_NODE_NAME
         )
-    latest_version = (
-        select(
-            models.DatasetExampleRevision.dataset_example_id,
-            func.max(models.DatasetExampleRevision.dataset_version_id).label("dataset_version_id"),
-        )
-        .group_by(models.DatasetExampleRevision.dataset_example_id)
-        .join(models.DatasetExample)
-        .where(models.DatasetExample.dataset_id == dataset_id)
-    )
-    if dataset_version_id is not None:
-        max_dataset_version_id = (
-            select(models.DatasetVersion.id)
-            .where(models.DatasetVersion.id == dataset_version_id)
-            .where(models.DatasetVersion.dataset_id == dataset_id)
-        ).scalar_subquery()
-        latest_version = latest_version.where(
-            models.DatasetExampleRevision.dataset_version_id <= max_dataset_version_id
-        )
-    subq = latest_version.subquery("latest_version")
-    stmt = (
-        select(models.DatasetExampleRevision)
-        .join(
-            subq,
-            onclause=and_(
-                models.DatasetExampleRevision.dataset_example_id == subq.c.dataset_example_id,
-                models.DatasetExampleRevision.dataset_version_id == subq.c.dataset_version_id,
-            ),
-        )
-        .where(models.DatasetExampleRevision.revision_kind != "DELETE")
-        .order_by(models.DatasetExampleRevision.dataset_example_id)
-    )
     dataset_name: Optional[str] = await session.scalar(
         select(models.Dataset.name).where(models.Dataset.id == dataset_id)
     )
     if not dataset_name:
         raise ValueError("Dataset does not exist.")
-    examples = [r async for r in await session.stream_scalars(stmt)]
-    return dataset_name, examples
+    stmt = select(func.max(models.DatasetVersion.id)).where(
+        models.DatasetVersion.dataset_id == dataset_id
+    )
+    if dataset_version_id is not None:
+        stmt = stmt.where(models.DatasetVersion.id == dataset_version_id)
+    return dataset_name, dataset_id, await session.scalar(stmt)
 
 
 def _is_all_dict(seq: Sequence[Any]) -> bool:
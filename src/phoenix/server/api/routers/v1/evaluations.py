@@ -1,16 +1,15 @@
 import gzip
-from collections.abc import Callable
-from itertools import chain
-from typing import Any, Iterator, Optional, Union, cast
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from datetime import datetime, timezone
+from typing import Any, NamedTuple, Optional, Union, cast
 
 import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
 from fastapi import APIRouter, Header, HTTPException, Query
 from google.protobuf.message import DecodeError
-from pandas import DataFrame
-from sqlalchemy import select
-from sqlalchemy.engine import Connectable
-from starlette.background import BackgroundTask
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.datastructures import State
 from starlette.requests import Request
 from starlette.responses import Response, StreamingResponse
@@ -19,26 +18,42 @@ from starlette.status import (
     HTTP_404_NOT_FOUND,
     HTTP_415_UNSUPPORTED_MEDIA_TYPE,
     HTTP_422_UNPROCESSABLE_ENTITY,
+    HTTP_503_SERVICE_UNAVAILABLE,
 )
-from typing_extensions import TypeAlias
+from strawberry.relay import GlobalID
 
 import phoenix.trace.v1 as pb
-from phoenix.config import DEFAULT_PROJECT_NAME
+from phoenix.config import DEFAULT_PROJECT_NAME, get_env_max_in_flight_evaluation_batches
+from phoenix.datetime_utils import normalize_datetime
 from phoenix.db import models
+from phoenix.db.insertion.evaluation import (
+    insert_document_evaluations,
+    insert_span_evaluations,
+    insert_trace_evaluations,
+)
 from phoenix.db.insertion.types import Precursors
 from phoenix.exceptions import PhoenixEvaluationNameIsMissing
-from phoenix.server.api.routers.utils import table_to_bytes
+from phoenix.server.api.routers.utils import AsyncRecordBatchReader, table_to_bytes
+from phoenix.server.dml_event import (
+    DmlEvent,
+    DocumentAnnotationDmlEvent,
+    SpanAnnotationDmlEvent,
+    TraceAnnotationDmlEvent,
+)
 from phoenix.server.types import DbSessionFactory
 from phoenix.trace.span_evaluations import (
     DocumentEvaluations,
     Evaluations,
     SpanEvaluations,
     TraceEvaluations,
+    _parse_schema_metadata,
 )
 
 from .utils import add_errors_to_responses
 
-EvaluationName: TypeAlias = str
+_MAX_EVALUATIONS_PER_TRANSACTION = 10_000
+_MAX_EVALUATIONS_PER_PARTITION = 10_000
+_NEXT_CURSOR_HEADER = "x-next-cursor"
 
 router = APIRouter(tags=["traces"], include_in_schema=False)
 
@@ -58,6 +73,10 @@ router = APIRouter(tags=["traces"], include_in_schema=False)
                 ),
             },
             HTTP_422_UNPROCESSABLE_ENTITY,
+            {
+                "status_code": HTTP_503_SERVICE_UNAVAILABLE,
+                "description": "Server is at capacity and cannot process more requests",
+            },
         ]
     ),
     openapi_extra={
@@ -75,6 +94,12 @@ async def post_evaluations(
     content_type: Optional[str] = Header(default=None),
     content_encoding: Optional[str] = Header(default=None),
 ) -> Response:
+    if request.state.span_queue_is_full():
+        raise HTTPException(
+            detail="Server is at capacity and cannot process more requests",
+            status_code=HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": "1"},
+        )
     if content_type == "application/x-pandas-arrow":
         return await _process_pyarrow(request)
     if content_type != "application/x-protobuf":
@@ -108,7 +133,7 @@ async def post_evaluations(
     "/evaluations",
     operation_id="getEvaluations",
     summary="Get span, trace, or document evaluations from a project",
-    responses=add_errors_to_responses([HTTP_404_NOT_FOUND]),
+    responses=add_errors_to_responses([HTTP_404_NOT_FOUND, HTTP_422_UNPROCESSABLE_ENTITY]),
 )
 async def get_evaluations(
     request: Request,
@@ -119,6 +144,19 @@ async def get_evaluations(
             f"evaluations will be drawn from the `{DEFAULT_PROJECT_NAME}` project)"
         ),
     ),
+    updated_after: Optional[datetime] = Query(
+        default=None,
+        description="Only return evaluations created or updated after this time",
+    ),
+    cursor: Optional[str] = Query(
+        default=None,
+        description=f"Cursor for pagination, from the `{_NEXT_CURSOR_HEADER}` response header",
+    ),
+    limit: Optional[int] = Query(
+        default=None,
+        description="The max number of evaluations to return at a time (all if omitted)",
+        gt=0,
+    ),
 ) -> Response:
     project_name = (
         project_name
@@ -126,131 +164,192 @@ async def get_evaluations(
         or request.headers.get("project-name")  # read from headers for backwards compatibility
         or DEFAULT_PROJECT_NAME
     )
-
+    if updated_after is not None:
+        updated_after = normalize_datetime(updated_after, timezone.utc)
+    start = (0, 0)
+    if cursor:
+        try:
+            start = _parse_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                detail=f"Invalid cursor format: {cursor}",
+                status_code=HTTP_422_UNPROCESSABLE_ENTITY,
+            )
     db: DbSessionFactory = request.app.state.db
     async with db() as session:
-        connection = await session.connection()
-        trace_evals_dataframe = await connection.run_sync(
-            _read_sql_trace_evaluations_into_dataframe,
-            project_name,
-        )
-        span_evals_dataframe = await connection.run_sync(
-            _read_sql_span_evaluations_into_dataframe,
-            project_name,
-        )
-        document_evals_dataframe = await connection.run_sync(
-            _read_sql_document_evaluations_into_dataframe,
-            project_name,
-        )
-    if (
-        trace_evals_dataframe.empty
-        and span_evals_dataframe.empty
-        and document_evals_dataframe.empty
-    ):
+        ranges, next_cursor = await _paginate(session, project_name, updated_after, start, limit)
+    if not ranges:
         return Response(status_code=HTTP_404_NOT_FOUND)
-
-    evals = chain(
-        map(
-            lambda args: TraceEvaluations(*args),
-            _groupby_eval_name(trace_evals_dataframe),
-        ),
-        map(
-            lambda args: SpanEvaluations(*args),
-            _groupby_eval_name(span_evals_dataframe),
-        ),
-        map(
-            lambda args: DocumentEvaluations(*args),
-            _groupby_eval_name(document_evals_dataframe),
-        ),
-    )
-    bytestream = map(lambda evals: table_to_bytes(evals.to_pyarrow_table()), evals)
     return StreamingResponse(
-        content=bytestream,
+        content=_stream_evaluations(db, project_name, updated_after, ranges),
         media_type="application/x-pandas-arrow",
+        headers={_NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None,
     )
 
 
 async def _process_pyarrow(request: Request) -> Response:
-    body = await request.body()
+    """
+    Reads the Arrow IPC stream in the request body incrementally, and inserts each record
+    batch as it arrives, so the whole body is never held in memory. Each batch is validated
+    before it is inserted, but the batches inserted before an invalid one are kept, i.e. an
+    invalid upload can be partially committed.
+    """
+    db: DbSessionFactory = request.app.state.db
     try:
-        reader = pa.ipc.open_stream(body)
+        async with AsyncRecordBatchReader(
+            request.stream(),
+            max_in_flight=get_env_max_in_flight_evaluation_batches(),
+        ) as reader:
+            try:
+                _, eval_name, evaluations_cls = _parse_schema_metadata(reader.schema)
+            except Exception as e:
+                raise _invalid_evaluations(e)
+            events: list[DmlEvent] = []
+            try:
+                async for batch in reader:
+                    if not batch.num_rows:
+                        continue
+                    try:
+                        _validate_batch(batch, eval_name, evaluations_cls)
+                    except Exception as e:
+                        raise _invalid_evaluations(e)
+                    events.extend(
+                        await _add_evaluations(request.state, db, batch, eval_name, evaluations_cls)
+                    )
+            finally:
+                # Events are put only after all insertions, rather than after each batch,
+                # to spare the event handlers from running in the middle of the upload.
+                for event in events:
+                    request.state.event_queue.put(event)
     except pa.ArrowInvalid:
         raise HTTPException(
             detail="Request body is not valid pyarrow",
             status_code=HTTP_422_UNPROCESSABLE_ENTITY,
         )
-    try:
-        evaluations = Evaluations.from_pyarrow_reader(reader)
-    except Exception as e:
-        if isinstance(e, PhoenixEvaluationNameIsMissing):
-            raise HTTPException(
-                detail="Evaluation name must not be blank/empty",
-                status_code=HTTP_422_UNPROCESSABLE_ENTITY,
-            )
-        raise HTTPException(
-            detail="Invalid data in request body",
+    return Response()
+
+
+def _validate_batch(
+    batch: pa.RecordBatch,
+    eval_name: str,
+    evaluations_cls: type[Evaluations],
+) -> None:
+    """
+    Validates the index and result columns of a record batch without converting all of its
+    rows to pandas. The dtype of a converted column depends only on its Arrow type and on
+    whether it has nulls, so the first row, together with the first null row of each column
+    with nulls, converts to the same dtypes as the whole batch. The index columns, which
+    identify the annotations, must not have nulls.
+    """
+    rows = {0}
+    for column in batch.columns:
+        if column.null_count:
+            rows.add(pc.index(column.is_null(), True).as_py())
+    dataframe = pa.Table.from_batches([batch.take(sorted(rows))]).to_pandas()
+    evaluations_cls(eval_name=eval_name, dataframe=dataframe)
+    for aliases in evaluations_cls.index_names:
+        name = next(name for name in aliases if name in batch.schema.names)
+        if batch.column(name).null_count:
+            raise ValueError(f"The index column {name!r} must not have nulls")
+
+
+def _invalid_evaluations(e: Exception) -> HTTPException:
+    if isinstance(e, PhoenixEvaluationNameIsMissing):
+        return HTTPException(
+            detail="Evaluation name must not be blank/empty",
             status_code=HTTP_422_UNPROCESSABLE_ENTITY,
         )
-    return Response(background=BackgroundTask(_add_evaluations, request.state, evaluations))
-
-
-async def _add_evaluations(state: State, evaluations: Evaluations) -> None:
-    dataframe = evaluations.dataframe
-    eval_name = evaluations.eval_name
-    names = dataframe.index.names
-    if (
-        len(names) == 2
-        and "document_position" in names
-        and ("context.span_id" in names or "span_id" in names)
-    ):
-        cls = _document_annotation_factory(
-            names.index("span_id") if "span_id" in names else names.index("context.span_id"),
-            names.index("document_position"),
-        )
-        for index, row in dataframe.iterrows():
-            score, label, explanation = _get_annotation_result(row)
-            document_annotation = cls(cast(Union[tuple[str, int], tuple[int, str]], index))(
-                name=eval_name,
-                annotator_kind="LLM",
-                score=score,
-                label=label,
-                explanation=explanation,
-                metadata_={},
-            )
-            await state.enqueue(document_annotation)
-    elif len(names) == 1 and names[0] in ("context.span_id", "span_id"):
-        for index, row in dataframe.iterrows():
-            score, label, explanation = _get_annotation_result(row)
-            span_annotation = _span_annotation_factory(cast(str, index))(
-                name=eval_name,
-                annotator_kind="LLM",
-                score=score,
-                label=label,
-                explanation=explanation,
-                metadata_={},
-            )
-            await state.enqueue(span_annotation)
-    elif len(names) == 1 and names[0] in ("context.trace_id", "trace_id"):
-        for index, row in dataframe.iterrows():
-            score, label, explanation = _get_annotation_result(row)
-            trace_annotation = _trace_annotation_factory(cast(str, index))(
-                name=eval_name,
-                annotator_kind="LLM",
-                score=score,
-                label=label,
-                explanation=explanation,
-                metadata_={},
-            )
-            await state.enqueue(trace_annotation)
+    return HTTPException(
+        detail="Invalid data in request body",
+        status_code=HTTP_422_UNPROCESSABLE_ENTITY,
+    )
 
 
-def _get_annotation_result(
-    row: "pd.Series[Any]",
-) -> tuple[Optional[float], Optional[str], Optional[str]]:
-    return (
-        cast(Optional[float], row.get("score")),
-        cast(Optional[str], row.get("label")),
-        cast(Optional[str], row.get("explanation")),
+async def _add_evaluations(
+    state: State,
+    db: DbSessionFactory,
+    batch: pa.RecordBatch,
+    eval_name: str,
+    evaluations_cls: type[Evaluations],
+) -> list[DmlEvent]:
+    """
+    Upserts a record batch of evaluations, reading it column by column, and returns the
+    events for the annotations upserted. Evaluations whose spans or traces have yet to
+    arrive are enqueued for the bulk inserter, which retries them for a while.
+    """
+    events: list[DmlEvent] = []
+    subject_ids, *other_index_columns = [
+        next(name for name in aliases if name in batch.schema.names)
+        for aliases in evaluations_cls.index_names
+    ]
+    for offset in range(0, batch.num_rows, _MAX_EVALUATIONS_PER_TRANSACTION):
+        chunk = batch.slice(offset, _MAX_EVALUATIONS_PER_TRANSACTION)
+        ids = cast(list[str], chunk.column(subject_ids).to_pylist())
+        scores, labels, explanations = (
+            cast(list[Any], chunk.column(name).to_pylist())
+            if name in chunk.schema.names
+            else [None] * chunk.num_rows
+            for name in ("score", "label", "explanation")
+        )
+        event: DmlEvent
+        precursors: list[Any] = []
+        async with db() as session:
+            if evaluations_cls is DocumentEvaluations:
+                positions = cast(list[int], chunk.column(other_index_columns[0]).to_pylist())
+                result = await insert_document_evaluations(
+                    session, eval_name, ids, positions, scores, labels, explanations
+                )
+                event = DocumentAnnotationDmlEvent(result.annotation_rowids)
+                factory = _document_annotation_factory(0, 1)
+                for i in result.missing:
+                    precursors.append(
+                        factory((ids[i], positions[i]))(
+                            **_annotation_kwargs(eval_name, scores[i], labels[i], explanations[i])
+                        )
+                    )
+            elif evaluations_cls is SpanEvaluations:
+                result = await insert_span_evaluations(
+                    session, eval_name, ids, scores, labels, explanations
+                )
+                event = SpanAnnotationDmlEvent(result.annotation_rowids)
+                for i in result.missing:
+                    precursors.append(
+                        _span_annotation_factory(ids[i])(
+                            **_annotation_kwargs(eval_name, scores[i], labels[i], explanations[i])
+                        )
+                    )
+            elif evaluations_cls is TraceEvaluations:
+                result = await insert_trace_evaluations(
+                    session, eval_name, ids, scores, labels, explanations
+                )
+                event = TraceAnnotationDmlEvent(result.annotation_rowids)
+                for i in result.missing:
+                    precursors.append(
+                        _trace_annotation_factory(ids[i])(
+                            **_annotation_kwargs(eval_name, scores[i], labels[i], explanations[i])
+                        )
+                    )
+            else:
+                return events
+        events.append(event)
+        if precursors:
+            await state.enqueue(*precursors)
+    return events
+
+
+def _annotation_kwargs(
+    eval_name: str,
+    score: Optional[float],
+    label: Optional[str],
+    explanation: Optional[str],
+) -> dict[str, Any]:
+    return dict(
+        name=eval_name,
+        annotator_kind="LLM",
+        score=score,
+        label=label,
+        explanation=explanation,
+        metadata_={},
     )
 
 
@@ -285,78 +384,164 @@ def _trace_annotation_factory(trace_id: str) -> Callable[..., Precursors.TraceAn
     )
 
 
-def _read_sql_trace_evaluations_into_dataframe(
-    connectable: Connectable,
-    project_name: str,
-) -> DataFrame:
-    """
-    Reads a project's trace evaluations into a pandas dataframe.
+class _EvaluationKind(NamedTuple):
+    cursor_type: str
+    table: Union[
+        type[models.TraceAnnotation],
+        type[models.SpanAnnotation],
+        type[models.DocumentAnnotation],
+    ]
+    evaluations_cls: type[Evaluations]
+    index_columns: tuple[Any, ...]
 
-    Inputs a synchronous connectable to pandas.read_sql since it does not
-    support async connectables. For more information, see:
 
-    https://stackoverflow.com/questions/70848256/how-can-i-use-pandas-read-sql-on-an-async-connection
-    """
-    return pd.read_sql(
-        select(models.TraceAnnotation, models.Trace.trace_id)
-        .join_from(models.TraceAnnotation, models.Trace)
-        .join_from(models.Trace, models.Project)
-        .where(models.Project.name == project_name)
-        .where(models.TraceAnnotation.annotator_kind == "LLM"),
-        connectable,
-        index_col="trace_id",
-    )
+_EVALUATION_KINDS = (
+    _EvaluationKind(
+        "TraceAnnotation",
+        models.TraceAnnotation,
+        TraceEvaluations,
+        (models.Trace.trace_id,),
+    ),
+    _EvaluationKind(
+        "SpanAnnotation",
+        models.SpanAnnotation,
+        SpanEvaluations,
+        (models.Span.span_id,),
+    ),
+    _EvaluationKind(
+        "DocumentAnnotation",
+        models.DocumentAnnotation,
+        DocumentEvaluations,
+        (models.Span.span_id, models.DocumentAnnotation.document_position),
+    ),
+)
 
 
-def _read_sql_span_evaluations_into_dataframe(
-    connectable: Connectable,
-    project_name: str,
-) -> DataFrame:
-    """
-    Reads a project's span evaluations into a pandas dataframe.
+class _IdRange(NamedTuple):
+    kind: _EvaluationKind
+    start: int
+    end: Optional[int]  # exclusive
 
-    Inputs a synchronous connectable to pandas.read_sql since it does not
-    support async connectables. For more information, see:
 
-    https://stackoverflow.com/questions/70848256/how-can-i-use-pandas-read-sql-on-an-async-connection
-    """
-    return pd.read_sql_query(
-        select(models.SpanAnnotation, models.Span.span_id)
-        .join_from(models.SpanAnnotation, models.Span)
-        .join_from(models.Span, models.Trace)
-        .join_from(models.Trace, models.Project)
-        .where(models.Project.name == project_name)
-        .where(models.SpanAnnotation.annotator_kind == "LLM"),
-        connectable,
-        index_col="span_id",
-    )
+def _cursor(kind_index: int, id_: int) -> str:
+    return str(GlobalID(_EVALUATION_KINDS[kind_index].cursor_type, str(id_)))
 
 
-def _read_sql_document_evaluations_into_dataframe(
-    connectable: Connectable,
-    project_name: str,
-) -> DataFrame:
+def _parse_cursor(cursor: str) -> tuple[int, int]:
     """
-    Reads a project's document evaluations into a pandas dataframe.
+    Returns the index of the kind of evaluation and the id where the page starts.
+    """
+    global_id = GlobalID.from_id(cursor)
+    for i, kind in enumerate(_EVALUATION_KINDS):
+        if kind.cursor_type == global_id.type_name:
+            return i, int(global_id.node_id)
+    raise ValueError(f"Unknown cursor type: {global_id.type_name}")
 
-    Inputs a synchronous connectable to pandas.read_sql since it does not
-    support async connectables. For more information, see:
 
-    https://stackoverflow.com/questions/70848256/how-can-i-use-pandas-read-sql-on-an-async-connection
-    """
-    return pd.read_sql(
-        select(models.DocumentAnnotation, models.Span.span_id)
-        .join_from(models.DocumentAnnotation, models.Span)
-        .join_from(models.Span, models.Trace)
-        .join_from(models.Trace, models.Project)
+def _select_evaluations(
+    kind: _EvaluationKind,
+    project_name: str,
+    updated_after: Optional[datetime],
+    *columns: Any,
+) -> Select[Any]:
+    table = kind.table
+    stmt = select(*columns)
+    if table is models.TraceAnnotation:
+        stmt = stmt.join_from(table, models.Trace)
+    else:
+        stmt = stmt.join_from(table, models.Span).join_from(models.Span, models.Trace)
+    stmt = (
+        stmt.join_from(models.Trace, models.Project)
         .where(models.Project.name == project_name)
-        .where(models.DocumentAnnotation.annotator_kind == "LLM"),
-        connectable,
-    ).set_index(["span_id", "document_position"])
+        .where(table.annotator_kind == "LLM")
+    )
+    if updated_after is not None:
+        stmt = stmt.where(table.updated_at > updated_after)
+    return stmt
 
 
-def _groupby_eval_name(
-    evals_dataframe: DataFrame,
-) -> Iterator[tuple[EvaluationName, DataFrame]]:
-    for eval_name, evals_dataframe_for_name in evals_dataframe.groupby("name", as_index=False):
-        yield str(eval_name), evals_dataframe_for_name
+async def _paginate(
+    session: AsyncSession,
+    project_name: str,
+    updated_after: Optional[datetime],
+    start: tuple[int, int],
+    limit: Optional[int],
+) -> tuple[list[_IdRange], Optional[str]]:
+    """
+    Finds the ranges of ids, one per kind of evaluation, that make up the page starting at
+    `start`, along with the cursor for the next page, if any. Only ids are read here, so
+    that the evaluations themselves can be streamed afterwards.
+    """
+    ranges: list[_IdRange] = []
+    start_kind, start_id = start
+    for i, kind in enumerate(_EVALUATION_KINDS[start_kind:], start_kind):
+        stmt = _select_evaluations(kind, project_name, updated_after, kind.table.id)
+        stmt = stmt.order_by(kind.table.id)
+        if i == start_kind:
+            stmt = stmt.where(kind.table.id >= start_id)
+        if limit is None:
+            if (first_id := await session.scalar(stmt.limit(1))) is not None:
+                ranges.append(_IdRange(kind, first_id, None))
+            continue
+        ids = (await session.scalars(stmt.limit(limit + 1))).all()
+        if len(ids) > limit:
+            if limit:
+                ranges.append(_IdRange(kind, ids[0], ids[limit]))
+            return ranges, _cursor(i, ids[limit])
+        if ids:
+            ranges.append(_IdRange(kind, ids[0], ids[-1] + 1))
+            limit -= len(ids)
+    return ranges, None
+
+
+async def _stream_evaluations(
+    db: DbSessionFactory,
+    project_name: str,
+    updated_after: Optional[datetime],
+    ranges: list[_IdRange],
+) -> AsyncIterator[bytes]:
+    """
+    Streams the evaluations in partitions read by keyset pagination, as one Arrow IPC
+    stream for each evaluation name in each partition, so that memory use is bounded by
+    the size of a partition. Each partition is read in its own short transaction, so that
+    a slow client doesn't hold on to a database connection (or the SQLite lock).
+    """
+    for kind, start, end in ranges:
+        table = kind.table
+        stmt = _select_evaluations(
+            kind,
+            project_name,
+            updated_after,
+            table.id,
+            table.name,
+            *kind.index_columns,
+            table.score,
+            table.label,
+            table.explanation,
+        )
+        if end is not None:
+            stmt = stmt.where(table.id < end)
+        stmt = stmt.order_by(table.id).limit(_MAX_EVALUATIONS_PER_PARTITION)
+        while True:
+            async with db() as session:
+                rows = (await session.execute(stmt.where(table.id >= start))).all()
+            if not rows:
+                break
+            for evaluations in _to_evaluations(kind, [row[1:] for row in rows]):
+                yield table_to_bytes(evaluations.to_pyarrow_table())
+            if len(rows) < _MAX_EVALUATIONS_PER_PARTITION:
+                break
+            start = rows[-1][0] + 1
+
+
+def _to_evaluations(kind: _EvaluationKind, rows: Sequence[Any]) -> Iterator[Evaluations]:
+    index_names = [column.key for column in kind.index_columns]
+    df = pd.DataFrame.from_records(
+        rows, columns=["name", *index_names, "score", "label", "explanation"]
+    )
+    df["score"] = df["score"].astype(float)
+    for eval_name, df_for_name in df.groupby("name"):
+        yield kind.evaluations_cls(
+            eval_name=str(eval_name),
+            dataframe=df_for_name.drop(columns="name").set_index(index_names),
+        )
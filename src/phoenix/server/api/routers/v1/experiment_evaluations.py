@@ -3,6 +3,7 @@ from typing import Any, Literal, Optional
 
 from fastapi import APIRouter, HTTPException
 from pydantic import Field
+from sqlalchemy import select, tuple_
 from starlette.requests import Request
 from starlette.status import HTTP_404_NOT_FOUND
 from strawberry.relay import GlobalID
@@ -14,7 +15,7 @@ from phoenix.server.api.types.node import from_global_id_with_expected_type
 from phoenix.server.dml_event import ExperimentRunAnnotationInsertEvent
 
 from .pydantic_compat import V1RoutesBaseModel
-from .utils import ResponseBody, add_errors_to_responses
+from .utils import RequestBody, ResponseBody, add_errors_to_responses
 
 router = APIRouter(tags=["experiments"], include_in_schema=False)
 
@@ -113,3 +114,174 @@ async def upsert_experiment_evaluation(
     return UpsertExperimentEvaluationResponseBody(
         data=UpsertExperimentEvaluationResponseBodyData(id=str(evaluation_gid))
     )
+
+
+class UpsertExperimentEvaluationsRequestBody(
+    RequestBody[list[UpsertExperimentEvaluationRequestBody]]
+):
+    data: list[UpsertExperimentEvaluationRequestBody]
+
+
+class UpsertExperimentEvaluationsResponseBody(
+    ResponseBody[list[UpsertExperimentEvaluationResponseBodyData]]
+):
+    pass
+
+
+@router.post(
+    "/experiment_evaluations/bulk",
+    operation_id="upsertExperimentEvaluations",
+    summary="Create or update evaluations for experiment runs",
+    response_description="Experiment evaluations upserted successfully, in the order given",
+    responses=add_errors_to_responses(
+        [{"status_code": HTTP_404_NOT_FOUND, "description": "Experiment run not found"}]
+    ),
+)
+async def upsert_experiment_evaluations(
+    request: Request, request_body: UpsertExperimentEvaluationsRequestBody
+) -> UpsertExperimentEvaluationsResponseBody:
+    if not request_body.data:
+        return UpsertExperimentEvaluationsResponseBody(data=[])
+    records = []
+    for evaluation in request_body.data:
+        experiment_run_gid = GlobalID.from_id(evaluation.experiment_run_id)
+        try:
+            experiment_run_id = from_global_id_with_expected_type(
+                experiment_run_gid, "ExperimentRun"
+            )
+        except ValueError:
+            raise HTTPException(
+                detail=f"ExperimentRun with ID {experiment_run_gid} does not exist",
+                status_code=HTTP_404_NOT_FOUND,
+            )
+        result = evaluation.result
+        records.append(
+            dict(
+                experiment_run_id=experiment_run_id,
+                name=evaluation.name,
+                annotator_kind=evaluation.annotator_kind,
+                label=result.label if result else None,
+                score=result.score if result else None,
+                explanation=result.explanation if result else None,
+                error=evaluation.error,
+                metadata_=evaluation.metadata or {},  # `metadata_` must match database
+                start_time=evaluation.start_time,
+                end_time=evaluation.end_time,
+                trace_id=evaluation.trace_id,
+            )
+        )
+    keys = [(record["experiment_run_id"], record["name"]) for record in records]
+    async with request.app.state.db() as session:
+        dialect = SupportedSQLDialect(session.bind.dialect.name)
+        await session.execute(
+            insert_on_conflict(
+                *records,
+                dialect=dialect,
+                table=models.ExperimentRunAnnotation,
+                unique_by=("experiment_run_id", "name"),
+            )
+        )
+        # the rows affected by an upsert aren't returned in any particular order, so the
+        # ids are looked up by the unique key of each evaluation
+        ids = {
+            (experiment_run_id, name): id_
+            for id_, experiment_run_id, name in await session.execute(
+                select(
+                    models.ExperimentRunAnnotation.id,
+                    models.ExperimentRunAnnotation.experiment_run_id,
+                    models.ExperimentRunAnnotation.name,
+                ).where(
+                    tuple_(
+                        models.ExperimentRunAnnotation.experiment_run_id,
+                        models.ExperimentRunAnnotation.name,
+                    ).in_(set(keys))
+                )
+            )
+        }
+    request.state.event_queue.put(ExperimentRunAnnotationInsertEvent(tuple(ids.values())))
+    return UpsertExperimentEvaluationsResponseBody(
+        data=[
+            UpsertExperimentEvaluationResponseBodyData(
+                id=str(GlobalID("ExperimentEvaluation", str(ids[key])))
+            )
+            for key in keys
+        ]
+    )
+
+
+class ExperimentEvaluation(V1RoutesBaseModel):
+    id: str = Field(description="The ID of the experiment evaluation")
+    experiment_run_id: str = Field(description="The ID of the experiment run evaluated")
+    name: str = Field(description="The name of the evaluation")
+    annotator_kind: Literal["LLM", "CODE", "HUMAN"] = Field(
+        description="The kind of annotator used for the evaluation"
+    )
+    start_time: datetime = Field(description="The start time of the evaluation")
+    end_time: datetime = Field(description="The end time of the evaluation")
+    result: Optional[ExperimentEvaluationResult] = Field(
+        default=None,
+        description="The result of the evaluation, unless the evaluation encountered an error",
+    )
+    error: Optional[str] = Field(
+        default=None, description="Error message if the evaluation encountered an error"
+    )
+    metadata: dict[str, Any] = Field(description="Metadata for the evaluation")
+    trace_id: Optional[str] = Field(default=None, description="The ID of the trace, if any")
+
+
+class ListExperimentEvaluationsResponseBody(ResponseBody[list[ExperimentEvaluation]]):
+    pass
+
+
+@router.get(
+    "/experiments/{experiment_id}/evaluations",
+    operation_id="listExperimentEvaluations",
+    summary="List evaluations of the runs of an experiment",
+    response_description="Experiment evaluations retrieved successfully",
+    responses=add_errors_to_responses(
+        [{"status_code": HTTP_404_NOT_FOUND, "description": "Experiment not found"}]
+    ),
+)
+async def list_experiment_evaluations(
+    request: Request, experiment_id: str
+) -> ListExperimentEvaluationsResponseBody:
+    experiment_gid = GlobalID.from_id(experiment_id)
+    try:
+        experiment_rowid = from_global_id_with_expected_type(experiment_gid, "Experiment")
+    except ValueError:
+        raise HTTPException(
+            detail=f"Experiment with ID {experiment_gid} does not exist",
+            status_code=HTTP_404_NOT_FOUND,
+        )
+    evaluations = []
+    async with request.app.state.db() as session:
+        async for evaluation in await session.stream_scalars(
+            select(models.ExperimentRunAnnotation)
+            .join(models.ExperimentRun)
+            .where(models.ExperimentRun.experiment_id == experiment_rowid)
+            .order_by(models.ExperimentRunAnnotation.id)
+        ):
+            has_result = evaluation.score is not None or evaluation.label is not None
+            evaluations.append(
+                ExperimentEvaluation(
+                    id=str(GlobalID("ExperimentEvaluation", str(evaluation.id))),
+                    experiment_run_id=str(
+                        GlobalID("ExperimentRun", str(evaluation.experiment_run_id))
+                    ),
+                    name=evaluation.name,
+                    annotator_kind=evaluation.annotator_kind,
+                    start_time=evaluation.start_time,
+                    end_time=evaluation.end_time,
+                    result=ExperimentEvaluationResult(
+                        label=evaluation.label,
+                        score=evaluation.score,
+                        explanation=evaluation.explanation,
+                    )
+                    if has_result
+                    else None,
+                    error=evaluation.error,
+                    metadata=evaluation.metadata_,
+                    trace_id=evaluation.trace_id,
+                )
+            )
+    return ListExperimentEvaluationsResponseBody(data=evaluations)
@@ -3,7 +3,7 @@ from typing import Any, Optional
 
 from fastapi import APIRouter, HTTPException
 from pydantic import Field
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from starlette.requests import Request
 from starlette.status import HTTP_404_NOT_FOUND
 from strawberry.relay import GlobalID
@@ -14,7 +14,7 @@ from phoenix.server.api.types.node import from_global_id_with_expected_type
 from phoenix.server.dml_event import ExperimentRunInsertEvent
 
 from .pydantic_compat import V1RoutesBaseModel
-from .utils import ResponseBody, add_errors_to_responses
+from .utils import RequestBody, ResponseBody, add_errors_to_responses
 
 router = APIRouter(tags=["experiments"], include_in_schema=False)
 
@@ -108,6 +108,83 @@ async def create_experiment_run(
     return CreateExperimentResponseBody(data=CreateExperimentRunResponseBodyData(id=str(run_gid)))
 
 
+class CreateExperimentRunsRequestBody(RequestBody[list[CreateExperimentRunRequestBody]]):
+    data: list[CreateExperimentRunRequestBody]
+
+
+class CreateExperimentRunsResponseBody(ResponseBody[list[CreateExperimentRunResponseBodyData]]):
+    pass
+
+
+@router.post(
+    "/experiments/{experiment_id}/runs/bulk",
+    operation_id="createExperimentRuns",
+    summary="Create runs for an experiment",
+    response_description="Experiment runs created successfully, in the order given",
+    responses=add_errors_to_responses(
+        [
+            {
+                "status_code": HTTP_404_NOT_FOUND,
+                "description": "Experiment or dataset example not found",
+            }
+        ]
+    ),
+)
+async def create_experiment_runs(
+    request: Request, experiment_id: str, request_body: CreateExperimentRunsRequestBody
+) -> CreateExperimentRunsResponseBody:
+    experiment_gid = GlobalID.from_id(experiment_id)
+    try:
+        experiment_rowid = from_global_id_with_expected_type(experiment_gid, "Experiment")
+    except ValueError:
+        raise HTTPException(
+            detail=f"Experiment with ID {experiment_gid} does not exist",
+            status_code=HTTP_404_NOT_FOUND,
+        )
+    if not request_body.data:
+        return CreateExperimentRunsResponseBody(data=[])
+
+    values = []
+    for run in request_body.data:
+        example_gid = GlobalID.from_id(run.dataset_example_id)
+        try:
+            dataset_example_id = from_global_id_with_expected_type(example_gid, "DatasetExample")
+        except ValueError:
+            raise HTTPException(
+                detail=f"DatasetExample with ID {example_gid} does not exist",
+                status_code=HTTP_404_NOT_FOUND,
+            )
+        values.append(
+            {
+                "experiment_id": experiment_rowid,
+                "dataset_example_id": dataset_example_id,
+                "trace_id": run.trace_id,
+                "output": ExperimentRunOutput(task_output=run.output),
+                "repetition_number": run.repetition_number,
+                "start_time": run.start_time,
+                "end_time": run.end_time,
+                "error": run.error,
+            }
+        )
+
+    async with request.app.state.db() as session:
+        run_ids = list(
+            await session.scalars(
+                insert(models.ExperimentRun).returning(
+                    models.ExperimentRun.id, sort_by_parameter_order=True
+                ),
+                values,
+            )
+        )
+    request.state.event_queue.put(ExperimentRunInsertEvent(tuple(run_ids)))
+    return CreateExperimentRunsResponseBody(
+        data=[
+            CreateExperimentRunResponseBodyData(id=str(GlobalID("ExperimentRun", str(run_id))))
+            for run_id in run_ids
+        ]
+    )
+
+
 class ExperimentRunResponse(ExperimentRun):
     id: str = Field(description="The ID of the experiment run")
     experiment_id: str = Field(description="The ID of the experiment")
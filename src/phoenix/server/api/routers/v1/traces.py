@@ -17,6 +17,7 @@ from starlette.status import (
     HTTP_404_NOT_FOUND,
     HTTP_415_UNSUPPORTED_MEDIA_TYPE,
     HTTP_422_UNPROCESSABLE_ENTITY,
+    HTTP_503_SERVICE_UNAVAILABLE,
 )
 from strawberry.relay import GlobalID
 
@@ -25,8 +26,7 @@ from phoenix.db.helpers import SupportedSQLDialect
 from phoenix.db.insertion.helpers import as_kv, insert_on_conflict
 from phoenix.db.insertion.types import Precursors
 from phoenix.server.dml_event import TraceAnnotationInsertEvent
-from phoenix.trace.otel import decode_otlp_span
-from phoenix.utilities.project import get_project_name
+from phoenix.trace.otel import decode_otlp_export_request
 
 from .pydantic_compat import V1RoutesBaseModel
 from .utils import RequestBody, ResponseBody, add_errors_to_responses
@@ -48,6 +48,10 @@ router = APIRouter(tags=["traces"])
                 ),
             },
             {"status_code": HTTP_422_UNPROCESSABLE_ENTITY, "description": "Invalid request body"},
+            {
+                "status_code": HTTP_503_SERVICE_UNAVAILABLE,
+                "description": "Server is at capacity and cannot process more requests",
+            },
         ]
     ),
     openapi_extra={
@@ -66,6 +70,12 @@ async def post_traces(
     content_type: Optional[str] = Header(default=None),
     content_encoding: Optional[str] = Header(default=None),
 ) -> None:
+    if request.state.span_queue_is_full():
+        raise HTTPException(
+            detail="Server is at capacity and cannot process more requests",
+            status_code=HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": "1"},
+        )
     if content_type != "application/x-protobuf":
         raise HTTPException(
             detail=f"Unsupported content type: {content_type}",
@@ -199,9 +209,5 @@ async def annotate_traces(
 
 
 async def _add_spans(req: ExportTraceServiceRequest, state: State) -> None:
-    for resource_spans in req.resource_spans:
-        project_name = get_project_name(resource_spans.resource.attributes)
-        for scope_span in resource_spans.scope_spans:
-            for otlp_span in scope_span.spans:
-                span = await run_in_threadpool(decode_otlp_span, otlp_span)
-                await state.queue_span_for_bulk_insert(span, project_name)
+    for span, project_name in await run_in_threadpool(decode_otlp_export_request, req):
+        await state.queue_span_for_bulk_insert(span, project_name)
@@ -5,9 +5,11 @@ from typing import (
 )
 
 import strawberry
+from strawberry.relay import GlobalID
 from strawberry.types import Info
 from typing_extensions import TypeAlias, assert_never
 
+from phoenix.db import models
 from phoenix.server.api.context import Context
 from phoenix.server.api.exceptions import BadRequest
 from phoenix.server.api.helpers.playground_clients import initialize_playground_clients
@@ -21,6 +23,9 @@ from phoenix.server.api.types.ChatCompletionMessageRole import ChatCompletionMes
 from phoenix.server.api.types.ChatCompletionSubscriptionPayload import (
     ChatCompletionSubscriptionPayload,
 )
+from phoenix.server.api.types.node import from_global_id_with_expected_type
+from phoenix.server.api.types.Project import Project
+from phoenix.server.api.types.ProjectUpdate import ProjectUpdate, to_gql_project_update
 from phoenix.server.api.types.TemplateLanguage import TemplateLanguage
 from phoenix.server.dml_event import SpanInsertEvent
 from phoenix.utilities.template_formatters import (
@@ -82,6 +87,31 @@ class Subscription:
         yield span.finished_chat_completion
         info.context.event_queue.put(SpanInsertEvent(ids=(span.project_id,)))
 
+    @strawberry.subscription
+    async def project_updates(
+        self, info: Info[Context, None], project_ids: Optional[list[GlobalID]] = None
+    ) -> AsyncIterator[ProjectUpdate]:
+        """
+        Pushes the updates of the projects, or of all projects if none are given, so that
+        clients don't need to poll `Project.streamingLastUpdatedAt`. The updates of each
+        project are coalesced, and pushed at most once a second.
+        """
+        assert (project_updates := info.context.project_updates) is not None
+        project_rowids: Optional[list[int]] = None
+        if project_ids is not None:
+            try:
+                project_rowids = [
+                    from_global_id_with_expected_type(project_id, Project.__name__)
+                    for project_id in project_ids
+                ]
+            except ValueError as error:
+                raise BadRequest(str(error))
+        async for update in project_updates.subscribe(project_rowids):
+            yield to_gql_project_update(
+                update,
+                info.context.last_updated_at.get(models.Project, update.project_rowid),
+            )
+
 
 def _formatted_messages(
     messages: Iterable[ChatCompletionMessage],
@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import ClassVar, Optional, cast
 
 import strawberry
-from sqlalchemy import and_, func, select
+from sqlalchemy import ColumnElement, and_, func, select
 from sqlalchemy.sql.functions import count
 from strawberry import UNSET
 from strawberry.relay import Connection, GlobalID, Node, NodeID
@@ -11,6 +11,7 @@ from strawberry.scalars import JSON
 from strawberry.types import Info
 
 from phoenix.db import models
+from phoenix.db.helpers import dataset_example_revision_is_current
 from phoenix.server.api.context import Context
 from phoenix.server.api.input_types.DatasetVersionSort import DatasetVersionSort
 from phoenix.server.api.types.DatasetExample import DatasetExample
@@ -93,25 +94,11 @@ class Dataset(Node):
             if dataset_version_id
             else None
         )
-        revision_ids = (
-            select(func.max(models.DatasetExampleRevision.id))
-            .join(models.DatasetExample)
-            .where(models.DatasetExample.dataset_id == dataset_id)
-            .group_by(models.DatasetExampleRevision.dataset_example_id)
-        )
-        if version_id:
-            version_id_subquery = (
-                select(models.DatasetVersion.id)
-                .where(models.DatasetVersion.dataset_id == dataset_id)
-                .where(models.DatasetVersion.id == version_id)
-                .scalar_subquery()
-            )
-            revision_ids = revision_ids.where(
-                models.DatasetExampleRevision.dataset_version_id <= version_id_subquery
-            )
         stmt = (
             select(count(models.DatasetExampleRevision.id))
-            .where(models.DatasetExampleRevision.id.in_(revision_ids))
+            .join(models.DatasetExample)
+            .where(models.DatasetExample.dataset_id == dataset_id)
+            .where(_revision_is_current(dataset_id, version_id))
             .where(models.DatasetExampleRevision.revision_kind != "DELETE")
         )
         async with info.context.db() as session:
@@ -141,22 +128,6 @@ class Dataset(Node):
             if dataset_version_id
             else None
         )
-        revision_ids = (
-            select(func.max(models.DatasetExampleRevision.id))
-            .join(models.DatasetExample)
-            .where(models.DatasetExample.dataset_id == dataset_id)
-            .group_by(models.DatasetExampleRevision.dataset_example_id)
-        )
-        if version_id:
-            version_id_subquery = (
-                select(models.DatasetVersion.id)
-                .where(models.DatasetVersion.dataset_id == dataset_id)
-                .where(models.DatasetVersion.id == version_id)
-                .scalar_subquery()
-            )
-            revision_ids = revision_ids.where(
-                models.DatasetExampleRevision.dataset_version_id <= version_id_subquery
-            )
         query = (
             select(models.DatasetExample)
             .join(
@@ -164,9 +135,10 @@ class Dataset(Node):
                 onclause=models.DatasetExample.id
                 == models.DatasetExampleRevision.dataset_example_id,
             )
+            .where(models.DatasetExample.dataset_id == dataset_id)
             .where(
                 and_(
-                    models.DatasetExampleRevision.id.in_(revision_ids),
+                    _revision_is_current(dataset_id, version_id),
                     models.DatasetExampleRevision.revision_kind != "DELETE",
                 )
             )
@@ -303,3 +275,18 @@ def to_gql_dataset(dataset: models.Dataset) -> Dataset:
         created_at=dataset.created_at,
         updated_at=dataset.updated_at,
     )
+
+
+def _revision_is_current(dataset_id: int, version_id: Optional[int]) -> ColumnElement[bool]:
+    """
+    Filters the example revisions to those current as of the given version of the dataset,
+    or as of its latest version if none is given. A version of another dataset matches none.
+    """
+    if not version_id:
+        return dataset_example_revision_is_current()
+    return dataset_example_revision_is_current(
+        select(models.DatasetVersion.id)
+        .where(models.DatasetVersion.dataset_id == dataset_id)
+        .where(models.DatasetVersion.id == version_id)
+        .scalar_subquery()
+    )
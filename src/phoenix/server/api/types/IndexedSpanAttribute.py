@@ -0,0 +1,24 @@
+from datetime import datetime
+
+import strawberry
+from strawberry.relay import Node, NodeID
+
+from phoenix.db import models
+
+
+@strawberry.type
+class IndexedSpanAttribute(Node):
+    id_attr: NodeID[int]
+    path: list[str]
+    created_at: datetime
+
+
+def to_gql_indexed_span_attribute(
+    indexed_span_attribute: models.IndexedSpanAttribute,
+) -> IndexedSpanAttribute:
+    """Convert an ORM indexed span attribute to a GraphQL indexed span attribute."""
+    return IndexedSpanAttribute(
+        id_attr=indexed_span_attribute.id,
+        path=indexed_span_attribute.path,
+        created_at=indexed_span_attribute.created_at,
+    )
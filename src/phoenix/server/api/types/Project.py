@@ -29,10 +29,10 @@ from phoenix.server.api.types.pagination import (
     connection_from_cursors_and_nodes,
 )
 from phoenix.server.api.types.SortDir import SortDir
-from phoenix.server.api.types.Span import Span, to_gql_span
+from phoenix.server.api.types.Span import DEFERRED_SPAN_COLUMNS, Span, to_gql_span
 from phoenix.server.api.types.Trace import Trace
 from phoenix.server.api.types.ValidationResult import ValidationResult
-from phoenix.trace.dsl import SpanFilter
+from phoenix.trace.dsl.filter import get_span_filter
 
 
 @strawberry.type
@@ -172,6 +172,7 @@ class Project(Node):
             .join(models.Trace)
             .where(models.Trace.project_rowid == self.id_attr)
             .options(contains_eager(models.Span.trace).load_only(models.Trace.trace_id))
+            .options(*DEFERRED_SPAN_COLUMNS)
         )
         if time_range:
             stmt = stmt.where(
@@ -189,7 +190,7 @@ class Project(Node):
                 models.Span.parent_id == parent.c.span_id,
             ).where(parent.c.span_id.is_(None))
         if filter_condition:
-            span_filter = SpanFilter(condition=filter_condition)
+            span_filter = get_span_filter(filter_condition)
             stmt = span_filter(stmt)
         sort_config: Optional[SpanSortConfig] = None
         cursor_rowid_column: Any = models.Span.id
@@ -341,8 +342,8 @@ class Project(Node):
         # This query is too expensive to run on every validation
         # valid_eval_names = await self.span_annotation_names()
         try:
-            SpanFilter(
-                condition=condition,
+            get_span_filter(
+                condition,
                 # valid_eval_names=valid_eval_names,
             )
             return ValidationResult(is_valid=True, error_message=None)
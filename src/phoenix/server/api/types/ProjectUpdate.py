@@ -0,0 +1,43 @@
+from datetime import datetime
+from typing import Optional
+
+import strawberry
+from strawberry.relay import GlobalID
+
+from phoenix.server.api.types.Project import Project
+from phoenix.server.types import ProjectUpdate as ProjectUpdateEvent
+
+
+@strawberry.type
+class ProjectUpdate:
+    project_id: GlobalID
+    streaming_last_updated_at: Optional[datetime] = strawberry.field(
+        description="The same as `Project.streamingLastUpdatedAt` at the time of the update",
+    )
+    span_count: int = strawberry.field(
+        description="The number of spans inserted since the previous update",
+    )
+    earliest_start_time: Optional[datetime] = strawberry.field(
+        description="The earliest start time of the spans inserted since the previous update",
+    )
+    latest_start_time: Optional[datetime] = strawberry.field(
+        description="The latest start time of the spans inserted since the previous update",
+    )
+    refetch: bool = strawberry.field(
+        description="Whether the project changed otherwise too since the previous update, "
+        "e.g. spans were deleted or annotated, so that it needs to be refetched",
+    )
+
+
+def to_gql_project_update(
+    update: ProjectUpdateEvent,
+    streaming_last_updated_at: Optional[datetime],
+) -> ProjectUpdate:
+    return ProjectUpdate(
+        project_id=GlobalID(type_name=Project.__name__, node_id=str(update.project_rowid)),
+        streaming_last_updated_at=streaming_last_updated_at,
+        span_count=update.span_count,
+        earliest_start_time=update.earliest_start_time,
+        latest_start_time=update.latest_start_time,
+        refetch=update.refetch,
+    )
@@ -1,14 +1,17 @@
 import json
-from collections.abc import Mapping, Sized
+from collections.abc import Awaitable, Callable, Mapping, Sized
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+from functools import partial
 from typing import TYPE_CHECKING, Any, Optional, cast
 
 import numpy as np
+import sqlalchemy
 import strawberry
 from openinference.semconv.trace import EmbeddingAttributes, SpanAttributes
-from strawberry import ID, UNSET
+from sqlalchemy.orm import defer
+from strawberry import ID, UNSET, Private
 from strawberry.relay import Node, NodeID
 from strawberry.types import Info
 from typing_extensions import Annotated
@@ -49,6 +52,14 @@ OUTPUT_MIME_TYPE = SpanAttributes.OUTPUT_MIME_TYPE
 OUTPUT_VALUE = SpanAttributes.OUTPUT_VALUE
 RETRIEVAL_DOCUMENTS = SpanAttributes.RETRIEVAL_DOCUMENTS
 
+# Spans listed in tables, e.g. the spans of a project or a trace, are loaded without their
+# JSON columns, which are loaded by the `span_fields` dataloader only for the spans whose
+# attributes or events are queried.
+DEFERRED_SPAN_COLUMNS = (
+    defer(models.Span.attributes, raiseload=True),
+    defer(models.Span.events, raiseload=True),
+)
+
 
 @strawberry.enum
 class SpanKind(Enum):
@@ -85,13 +96,24 @@ class SpanContext:
 @strawberry.type
 class SpanIOValue:
     mime_type: MimeType
-    value: str
+    preview: Private[str]
+    get_value: Private[Callable[[Info[Context, None]], Awaitable[Any]]]
+
+    @strawberry.field
+    async def value(self, info: Info[Context, None]) -> str:
+        return await self._get_value(info)
 
     @strawberry.field(
         description="Truncate value up to `chars` characters, appending '...' if truncated.",
     )  # type: ignore
-    def truncated_value(self, chars: int = 100) -> str:
-        return f"{self.value[: max(0, chars - 3)]}..." if len(self.value) > chars else self.value
+    async def truncated_value(self, info: Info[Context, None], chars: int = 100) -> str:
+        value = self.preview if len(self.preview) > chars else await self._get_value(info)
+        return f"{value[: max(0, chars - 3)]}..." if len(value) > chars else value
+
+    async def _get_value(self, info: Info[Context, None]) -> str:
+        if len(self.preview) < models.MAX_PREVIEW_LENGTH:
+            return self.preview
+        return cast(str, await self.get_value(info))
 
 
 @strawberry.enum
@@ -141,19 +163,42 @@ class Span(Node):
     )
     span_kind: SpanKind
     context: SpanContext
-    attributes: str = strawberry.field(
+
+    @strawberry.field(
         description="Span attributes as a JSON string",
-    )
-    metadata: Optional[str] = strawberry.field(
+    )  # type: ignore
+    async def attributes(self, info: Info[Context, None]) -> str:
+        attributes = await self._get_field(info, "attributes")
+        return json.dumps(_hide_embedding_vectors(attributes), cls=_JSONEncoder)
+
+    @strawberry.field(
         description="Metadata as a JSON string",
-    )
-    num_documents: Optional[int]
+    )  # type: ignore
+    async def metadata(self, info: Info[Context, None]) -> Optional[str]:
+        return _convert_metadata_to_string(await self._get_field(info, METADATA))
+
+    @strawberry.field
+    async def num_documents(self, info: Info[Context, None]) -> Optional[int]:
+        return await self._get_num_documents(info)
+
     token_count_total: Optional[int]
     token_count_prompt: Optional[int]
     token_count_completion: Optional[int]
-    input: Optional[SpanIOValue]
-    output: Optional[SpanIOValue]
-    events: list[SpanEvent]
+
+    @strawberry.field
+    def input(self) -> Optional[SpanIOValue]:
+        db_span = self.db_span
+        return self._get_io_value(db_span.input_preview, db_span.input_mime_type, INPUT_VALUE)
+
+    @strawberry.field
+    def output(self) -> Optional[SpanIOValue]:
+        db_span = self.db_span
+        return self._get_io_value(db_span.output_preview, db_span.output_mime_type, OUTPUT_VALUE)
+
+    @strawberry.field
+    async def events(self, info: Info[Context, None]) -> list[SpanEvent]:
+        return list(map(SpanEvent.from_dict, await self._get_field(info, "events")))
+
     cumulative_token_count_total: Optional[int] = strawberry.field(
         description="Cumulative (prompt plus completion) token count from "
         "self and all descendant spans (children, grandchildren, etc.)",
@@ -213,10 +258,10 @@ class Span(Node):
         info: Info[Context, None],
         evaluation_name: Optional[str] = UNSET,
     ) -> list[DocumentRetrievalMetrics]:
-        if not self.num_documents:
+        if not (num_documents := await self._get_num_documents(info)):
             return []
         return await info.context.data_loaders.document_retrieval_metrics.load(
-            (self.id_attr, evaluation_name or None, self.num_documents),
+            (self.id_attr, evaluation_name or None, num_documents),
         )
 
     @strawberry.field(
@@ -234,10 +279,9 @@ class Span(Node):
         description="The span's attributes translated into an example revision for a dataset",
     )  # type: ignore
     async def as_example_revision(self, info: Info[Context, None]) -> SpanAsExampleRevision:
-        db_span = self.db_span
-        attributes = db_span.attributes
+        attributes = await self._get_field(info, "attributes")
         span_io = _SpanIO(
-            span_kind=db_span.span_kind,
+            span_kind=self.db_span.span_kind,
             input_value=get_attribute_value(attributes, INPUT_VALUE),
             input_mime_type=get_attribute_value(attributes, INPUT_MIME_TYPE),
             output_value=get_attribute_value(attributes, OUTPUT_VALUE),
@@ -291,13 +335,43 @@ class Span(Node):
         examples = await info.context.data_loaders.span_dataset_examples.load(self.id_attr)
         return bool(examples)
 
+    async def _get_field(self, info: Info[Context, None], name: str) -> Any:
+        """
+        Returns the value of one of the `SPAN_FIELDS`, i.e. the attributes or events
+        of the span, or an attribute. The span's own columns are used if they are
+        loaded, otherwise the value is loaded with those of the other spans queried.
+        """
+        column = "events" if name == "events" else "attributes"
+        if column not in sqlalchemy.inspect(self.db_span).unloaded:
+            value = getattr(self.db_span, column)
+            return value if name == column else get_attribute_value(value, name)
+        return await info.context.data_loaders.span_fields.load((self.id_attr, name))
+
+    async def _get_num_documents(self, info: Info[Context, None]) -> Optional[int]:
+        retrieval_documents = await self._get_field(info, RETRIEVAL_DOCUMENTS)
+        return len(retrieval_documents) if isinstance(retrieval_documents, Sized) else None
+
+    def _get_io_value(
+        self,
+        preview: Optional[str],
+        mime_type: Optional[str],
+        value_key: str,
+    ) -> Optional[SpanIOValue]:
+        if preview is None:
+            return None
+        return SpanIOValue(
+            mime_type=MimeType(mime_type),
+            preview=preview,
+            get_value=partial(self._get_field, name=value_key),
+        )
+
 
 def to_gql_span(span: models.Span) -> Span:
-    events: list[SpanEvent] = list(map(SpanEvent.from_dict, span.events))
-    input_value = cast(Optional[str], get_attribute_value(span.attributes, INPUT_VALUE))
-    output_value = cast(Optional[str], get_attribute_value(span.attributes, OUTPUT_VALUE))
-    retrieval_documents = get_attribute_value(span.attributes, RETRIEVAL_DOCUMENTS)
-    num_documents = len(retrieval_documents) if isinstance(retrieval_documents, Sized) else None
+    """
+    Converts a span to its GraphQL type. The attributes and events of the span may be
+    deferred (see `DEFERRED_SPAN_COLUMNS`), in which case they are loaded only if
+    queried.
+    """
     return Span(
         id_attr=span.id,
         db_span=span,
@@ -313,9 +387,6 @@ def to_gql_span(span: models.Span) -> Span:
             trace_id=cast(ID, span.trace.trace_id),
             span_id=cast(ID, span.span_id),
         ),
-        attributes=json.dumps(_hide_embedding_vectors(span.attributes), cls=_JSONEncoder),
-        metadata=_convert_metadata_to_string(get_attribute_value(span.attributes, METADATA)),
-        num_documents=num_documents,
         token_count_total=span.llm_token_count_total,
         token_count_prompt=span.llm_token_count_prompt,
         token_count_completion=span.llm_token_count_completion,
@@ -328,23 +399,6 @@ def to_gql_span(span: models.Span) -> Span:
             if span.cumulative_error_count
             else SpanStatusCode(span.status_code)
         ),
-        events=events,
-        input=(
-            SpanIOValue(
-                mime_type=MimeType(get_attribute_value(span.attributes, INPUT_MIME_TYPE)),
-                value=input_value,
-            )
-            if input_value is not None
-            else None
-        ),
-        output=(
-            SpanIOValue(
-                mime_type=MimeType(get_attribute_value(span.attributes, OUTPUT_MIME_TYPE)),
-                value=output_value,
-            )
-            if output_value is not None
-            else None
-        ),
     )
 
 
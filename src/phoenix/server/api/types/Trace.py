@@ -18,7 +18,7 @@ from phoenix.server.api.types.pagination import (
     connection_from_list,
 )
 from phoenix.server.api.types.SortDir import SortDir
-from phoenix.server.api.types.Span import Span, to_gql_span
+from phoenix.server.api.types.Span import DEFERRED_SPAN_COLUMNS, Span, to_gql_span
 from phoenix.server.api.types.TraceAnnotation import TraceAnnotation, to_gql_trace_annotation
 
 
@@ -54,6 +54,7 @@ class Trace(Node):
             .join(models.Trace)
             .where(models.Trace.id == self.id_attr)
             .options(contains_eager(models.Span.trace).load_only(models.Trace.trace_id))
+            .options(*DEFERRED_SPAN_COLUMNS)
             # Sort descending because the root span tends to show up later
             # in the ingestion process.
             .order_by(desc(models.Span.id))
@@ -6,7 +6,7 @@ from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Sequen
 from contextlib import AbstractAsyncContextManager, AsyncExitStack
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from functools import cached_property
+from functools import cached_property, partial
 from pathlib import Path
 from types import MethodType
 from typing import (
@@ -52,7 +52,10 @@ from phoenix.config import (
     OAuth2ClientConfig,
     get_env_csrf_trusted_origins,
     get_env_host,
+    get_env_max_spans_queue_size,
+    get_env_num_span_insertion_workers,
     get_env_port,
+    get_env_span_spool_dir,
     server_instrumentation_is_enabled,
 )
 from phoenix.core.model_schema import Model
@@ -61,6 +64,8 @@ from phoenix.db.bulk_inserter import BulkInserter
 from phoenix.db.engines import create_engine
 from phoenix.db.facilitator import Facilitator
 from phoenix.db.helpers import SupportedSQLDialect
+from phoenix.db.indexed_span_attributes import load_indexed_span_attributes
+from phoenix.db.insertion.cache import RowIdCache
 from phoenix.exceptions import PhoenixMigrationError
 from phoenix.pointcloud.umap_parameters import UMAPParameters
 from phoenix.server.api.context import Context, DataLoaders
@@ -85,6 +90,7 @@ from phoenix.server.api.dataloaders import (
     SpanAnnotationsDataLoader,
     SpanDatasetExamplesDataLoader,
     SpanDescendantsDataLoader,
+    SpanFieldsDataLoader,
     SpanProjectsDataLoader,
     TokenCountDataLoader,
     TraceRowIdsDataLoader,
@@ -113,6 +119,7 @@ from phoenix.server.types import (
     DaemonTask,
     DbSessionFactory,
     LastUpdatedAt,
+    ProjectUpdates,
     TokenStore,
 )
 from phoenix.trace.fixtures import (
@@ -428,6 +435,7 @@ def _lifespan(
             ) = await stack.enter_async_context(bulk_inserter)
             grpc_server = GrpcServer(
                 queue_span,
+                span_queue_is_full=bulk_inserter.span_queue_is_full,
                 disabled=read_only,
                 tracer_provider=tracer_provider,
                 enable_prometheus=enable_prometheus,
@@ -450,6 +458,7 @@ def _lifespan(
                 "queue_span_for_bulk_insert": queue_span,
                 "queue_evaluation_for_bulk_insert": queue_evaluation,
                 "enqueue_operation": enqueue_operation,
+                "span_queue_is_full": bulk_inserter.span_queue_is_full,
             }
         for callback in shutdown_callbacks:
             if isinstance((res := callback()), Awaitable):
@@ -477,6 +486,7 @@ def create_graphql_router(
     read_only: bool = False,
     secret: Optional[str] = None,
     token_store: Optional[TokenStore] = None,
+    project_updates: Optional[ProjectUpdates] = None,
 ) -> GraphQLRouter:  # type: ignore[type-arg]
     """Creates the GraphQL router.
 
@@ -492,6 +502,8 @@ def create_graphql_router(
         cache_for_dataloaders (Optional[CacheForDataLoaders], optional): GraphQL data loaders.
         read_only (bool, optional): Marks the app as read-only. Defaults to False.
         secret (Optional[str], optional): The application secret for auth. Defaults to None.
+        project_updates (Optional[ProjectUpdates], optional): The updates pushed to clients
+            subscribed to projects. Defaults to None.
 
     Returns:
         GraphQLRouter: The router mounted at /graphql
@@ -551,6 +563,7 @@ def create_graphql_router(
                 span_annotations=SpanAnnotationsDataLoader(db),
                 span_dataset_examples=SpanDatasetExamplesDataLoader(db),
                 span_descendants=SpanDescendantsDataLoader(db),
+                span_fields=SpanFieldsDataLoader(db),
                 span_projects=SpanProjectsDataLoader(db),
                 token_counts=TokenCountDataLoader(
                     db,
@@ -566,6 +579,7 @@ def create_graphql_router(
             auth_enabled=authentication_enabled,
             secret=secret,
             token_store=token_store,
+            project_updates=project_updates,
         )
 
     return GraphQLRouter(
@@ -689,6 +703,7 @@ def create_app(
     startup_callbacks_list: list[_Callback] = list(startup_callbacks)
     shutdown_callbacks_list: list[_Callback] = list(shutdown_callbacks)
     startup_callbacks_list.append(Facilitator(db=db))
+    startup_callbacks_list.append(partial(load_indexed_span_attributes, db))
     initial_batch_of_spans: Iterable[tuple[Span, str]] = (
         ()
         if initial_spans is None
@@ -702,6 +717,8 @@ def create_app(
         CacheForDataLoaders() if db.dialect is SupportedSQLDialect.SQLITE else None
     )
     last_updated_at = LastUpdatedAt()
+    project_updates = ProjectUpdates()
+    row_id_cache = RowIdCache()
     middlewares: list[Middleware] = [Middleware(HeadersMiddleware)]
     if origins := get_env_csrf_trusted_origins():
         trusted_hostnames = [h for o in origins if o and (h := urlparse(o).hostname)]
@@ -727,6 +744,8 @@ def create_app(
         db=db,
         cache_for_dataloaders=cache_for_dataloaders,
         last_updated_at=last_updated_at,
+        row_id_cache=row_id_cache,
+        project_updates=project_updates,
     )
     bulk_inserter = bulk_inserter_factory(
         db,
@@ -734,6 +753,10 @@ def create_app(
         event_queue=dml_event_handler,
         initial_batch_of_spans=initial_batch_of_spans,
         initial_batch_of_evaluations=initial_batch_of_evaluations,
+        max_spans_queue_size=get_env_max_spans_queue_size(),
+        row_id_cache=row_id_cache,
+        spool_dir=get_env_span_spool_dir(),
+        num_workers=get_env_num_span_insertion_workers(),
     )
     tracer_provider = None
     strawberry_extensions: list[Union[type[SchemaExtension], SchemaExtension]] = []
@@ -775,6 +798,7 @@ def create_app(
         read_only=read_only,
         secret=secret,
         token_store=token_store,
+        project_updates=project_updates,
     )
     if enable_prometheus:
         from phoenix.server.prometheus import PrometheusMiddleware
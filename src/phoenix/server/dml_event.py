@@ -5,6 +5,7 @@ from dataclasses import dataclass, field
 from typing import ClassVar
 
 from phoenix.db import models
+from phoenix.db.insertion.span import SpanInsertionEvent
 
 
 @dataclass(frozen=True)
@@ -38,7 +39,13 @@ class SpanDmlEvent(ProjectDmlEvent): ...
 
 
 @dataclass(frozen=True)
-class SpanInsertEvent(SpanDmlEvent): ...
+class SpanInsertEvent(SpanDmlEvent):
+    """
+    If `insertions` are given, they describe all the spans inserted into the projects,
+    so that cached aggregates can be updated incrementally rather than cleared.
+    """
+
+    insertions: tuple[SpanInsertionEvent, ...] = ()
 
 
 @dataclass(frozen=True)
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from asyncio import gather
+from collections import defaultdict
 from collections.abc import Callable, Iterable, Iterator, Mapping
+from datetime import datetime
 from inspect import getmro
 from itertools import chain
 from typing import Any, Generic, Optional, TypedDict, TypeVar, Union, cast
@@ -10,6 +12,8 @@ from typing import Any, Generic, Optional, TypedDict, TypeVar, Union, cast
 from sqlalchemy import Select, select
 from typing_extensions import TypeAlias, Unpack
 
+from phoenix.db.insertion.cache import RowIdCache
+from phoenix.db.insertion.span import InsertedSpan, SpanInsertionEvent
 from phoenix.db.models import (
     Base,
     DocumentAnnotation,
@@ -23,15 +27,20 @@ from phoenix.server.api.dataloaders import CacheForDataLoaders
 from phoenix.server.dml_event import (
     DmlEvent,
     DocumentAnnotationDmlEvent,
+    ProjectDeleteEvent,
+    ProjectDmlEvent,
     SpanAnnotationDmlEvent,
     SpanDeleteEvent,
     SpanDmlEvent,
+    SpanInsertEvent,
     TraceAnnotationDmlEvent,
 )
 from phoenix.server.types import (
     BatchedCaller,
+    CanPutItem,
     CanSetLastUpdatedAt,
     DbSessionFactory,
+    ProjectUpdate,
 )
 
 _DmlEventT = TypeVar("_DmlEventT", bound=DmlEvent)
@@ -60,6 +69,8 @@ class _HandlerParams(TypedDict):
     db: DbSessionFactory
     last_updated_at: CanSetLastUpdatedAt
     cache_for_dataloaders: Optional[CacheForDataLoaders]
+    row_id_cache: Optional[RowIdCache]
+    project_updates: Optional[CanPutItem[ProjectUpdate]]
     sleep_seconds: float
 
 
@@ -83,9 +94,31 @@ class _HasCacheForDataLoaders(ABC):
         self._cache_for_dataloaders = cache_for_dataloaders
 
 
+class _HasRowIdCache(ABC):
+    def __init__(
+        self,
+        row_id_cache: Optional[RowIdCache] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self._row_id_cache = row_id_cache
+
+
+class _HasProjectUpdates(ABC):
+    def __init__(
+        self,
+        project_updates: Optional[CanPutItem[ProjectUpdate]] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self._project_updates = project_updates
+
+
 class _DmlEventHandler(
     _HasLastUpdatedAt,
     _HasCacheForDataLoaders,
+    _HasRowIdCache,
+    _HasProjectUpdates,
     BatchedCaller[_DmlEventT],
     Generic[_DmlEventT],
     ABC,
@@ -112,9 +145,41 @@ class _GenericDmlEventHandler(_DmlEventHandler[DmlEvent]):
 
 class _SpanDmlEventHandler(_DmlEventHandler[SpanDmlEvent]):
     async def __call__(self) -> None:
-        if cache := self._cache_for_dataloaders:
-            for id_ in set(chain.from_iterable(e.ids for e in self._batch)):
-                self._clear(cache, id_)
+        if not (cache := self._cache_for_dataloaders):
+            return
+        cleared: set[int] = set()
+        insertions: defaultdict[int, list[SpanInsertionEvent]] = defaultdict(list)
+        for e in self._batch:
+            if isinstance(e, SpanInsertEvent) and e.insertions:
+                for insertion in e.insertions:
+                    insertions[insertion.project_rowid].append(insertion)
+            else:
+                cleared.update(e.ids)
+        for id_ in cleared:
+            self._clear(cache, id_)
+        for id_, events in insertions.items():
+            if id_ not in cleared:
+                self._update(cache, id_, events)
+
+    @staticmethod
+    def _update(
+        cache: CacheForDataLoaders,
+        project_id: int,
+        insertions: Iterable[SpanInsertionEvent],
+    ) -> None:
+        """
+        Updates the cached aggregates of a project incrementally, so that only the entries
+        whose time intervals are affected by the inserted spans are recomputed.
+        """
+        spans: list[InsertedSpan] = []
+        trace_bounds: list[tuple[datetime, datetime]] = []
+        for insertion in insertions:
+            spans.extend(insertion.spans)
+            trace_bounds.extend(insertion.trace_bounds)
+        cache.latency_ms_quantile.on_spans_inserted(project_id, spans, trace_bounds)
+        cache.token_count.on_spans_inserted(project_id, spans)
+        cache.record_count.on_spans_inserted(project_id, spans, trace_bounds)
+        cache.min_start_or_max_end_time.on_spans_inserted(project_id, trace_bounds)
 
     @staticmethod
     def _clear(cache: CacheForDataLoaders, project_id: int) -> None:
@@ -125,12 +190,52 @@ class _SpanDmlEventHandler(_DmlEventHandler[SpanDmlEvent]):
 
 
 class _SpanDeleteEventHandler(_SpanDmlEventHandler):
+    async def __call__(self) -> None:
+        await super().__call__()
+        if row_id_cache := self._row_id_cache:
+            row_id_cache.invalidate(*chain.from_iterable(e.ids for e in self._batch))
+
     @staticmethod
     def _clear(cache: CacheForDataLoaders, project_id: int) -> None:
         cache.annotation_summary.invalidate_project(project_id)
         cache.document_evaluation_summary.invalidate_project(project_id)
 
 
+class _ProjectUpdateHandler(_DmlEventHandler[ProjectDmlEvent]):
+    async def __call__(self) -> None:
+        if not (project_updates := self._project_updates):
+            return
+        updates: dict[int, ProjectUpdate] = {}
+        for e in self._batch:
+            new_updates: Iterable[ProjectUpdate]
+            if isinstance(e, SpanInsertEvent) and e.insertions:
+                new_updates = map(self._summarize, e.insertions)
+            else:
+                new_updates = (ProjectUpdate(id_, refetch=True) for id_ in e.ids)
+            for update in new_updates:
+                if pending := updates.get(update.project_rowid):
+                    update = pending + update
+                updates[update.project_rowid] = update
+        for update in updates.values():
+            project_updates.put(update)
+
+    @staticmethod
+    def _summarize(insertion: SpanInsertionEvent) -> ProjectUpdate:
+        start_times = [span.start_time for span in insertion.spans]
+        return ProjectUpdate(
+            project_rowid=insertion.project_rowid,
+            span_count=len(start_times),
+            earliest_start_time=min(start_times, default=None),
+            latest_start_time=max(start_times, default=None),
+        )
+
+
+class _ProjectDeleteEventHandler(_DmlEventHandler[ProjectDeleteEvent]):
+    async def __call__(self) -> None:
+        if row_id_cache := self._row_id_cache:
+            row_id_cache.invalidate(*chain.from_iterable(e.ids for e in self._batch))
+
+
 _AnnotationTable: TypeAlias = Union[
     type[SpanAnnotation],
     type[TraceAnnotation],
@@ -173,6 +278,8 @@ class _AnnotationDmlEventHandler(
         async with self._db() as session:
             async for row in await session.stream(self._get_stmt()):
                 self._last_updated_at.set(Project, row.id)
+                if project_updates := self._project_updates:
+                    project_updates.put(ProjectUpdate(row.id, refetch=True))
                 if cache := self._cache_for_dataloaders:
                     self._clear(cache, row.id, row.name)
 
@@ -220,16 +327,22 @@ class DmlEventHandler:
         db: DbSessionFactory,
         last_updated_at: CanSetLastUpdatedAt,
         cache_for_dataloaders: Optional[CacheForDataLoaders] = None,
+        row_id_cache: Optional[RowIdCache] = None,
+        project_updates: Optional[CanPutItem[ProjectUpdate]] = None,
         sleep_seconds: float = 0.1,
     ) -> None:
         kwargs = _HandlerParams(
             db=db,
             last_updated_at=last_updated_at,
             cache_for_dataloaders=cache_for_dataloaders,
+            row_id_cache=row_id_cache,
+            project_updates=project_updates,
             sleep_seconds=sleep_seconds,
         )
         self._handlers: Mapping[type[DmlEvent], Iterable[_DmlEventHandler[Any]]] = {
             DmlEvent: [_GenericDmlEventHandler(**kwargs)],
+            ProjectDmlEvent: [_ProjectUpdateHandler(**kwargs)],
+            ProjectDeleteEvent: [_ProjectDeleteEventHandler(**kwargs)],
             SpanDmlEvent: [_SpanDmlEventHandler(**kwargs)],
             SpanDeleteEvent: [_SpanDeleteEventHandler(**kwargs)],
             SpanAnnotationDmlEvent: [_SpanAnnotationDmlEventHandler(**kwargs)],
@@ -2,7 +2,7 @@ from collections.abc import Awaitable, Callable
 from typing import TYPE_CHECKING, Any, Optional
 
 import grpc
-from grpc.aio import RpcContext, Server, ServerInterceptor
+from grpc.aio import Server, ServerInterceptor, ServicerContext
 from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
     ExportTraceServiceRequest,
     ExportTraceServiceResponse,
@@ -11,14 +11,14 @@ from opentelemetry.proto.collector.trace.v1.trace_service_pb2_grpc import (
     TraceServiceServicer,
     add_TraceServiceServicer_to_server,
 )
+from starlette.concurrency import run_in_threadpool
 from typing_extensions import TypeAlias
 
 from phoenix.auth import CanReadToken
 from phoenix.config import get_env_grpc_port
 from phoenix.server.bearer_auth import ApiKeyInterceptor
-from phoenix.trace.otel import decode_otlp_span
+from phoenix.trace.otel import decode_otlp_export_request
 from phoenix.trace.schemas import Span
-from phoenix.utilities.project import get_project_name
 
 if TYPE_CHECKING:
     from opentelemetry.trace import TracerProvider
@@ -30,21 +30,24 @@ class Servicer(TraceServiceServicer):  # type: ignore[misc,unused-ignore]
     def __init__(
         self,
         callback: Callable[[Span, ProjectName], Awaitable[None]],
+        span_queue_is_full: Callable[[], bool] = lambda: False,
     ) -> None:
         super().__init__()
         self._callback = callback
+        self._span_queue_is_full = span_queue_is_full
 
     async def Export(
         self,
         request: ExportTraceServiceRequest,
-        context: RpcContext,
+        context: ServicerContext,
     ) -> ExportTraceServiceResponse:
-        for resource_spans in request.resource_spans:
-            project_name = get_project_name(resource_spans.resource.attributes)
-            for scope_span in resource_spans.scope_spans:
-                for otlp_span in scope_span.spans:
-                    span = decode_otlp_span(otlp_span)
-                    await self._callback(span, project_name)
+        if self._span_queue_is_full():
+            await context.abort(
+                grpc.StatusCode.RESOURCE_EXHAUSTED,
+                "Server is at capacity and cannot process more requests",
+            )
+        for span, project_name in await run_in_threadpool(decode_otlp_export_request, request):
+            await self._callback(span, project_name)
         return ExportTraceServiceResponse()
 
 
@@ -52,12 +55,14 @@ class GrpcServer:
     def __init__(
         self,
         callback: Callable[[Span, ProjectName], Awaitable[None]],
+        span_queue_is_full: Callable[[], bool] = lambda: False,
         tracer_provider: Optional["TracerProvider"] = None,
         enable_prometheus: bool = False,
         disabled: bool = False,
         token_store: Optional[CanReadToken] = None,
     ) -> None:
         self._callback = callback
+        self._span_queue_is_full = span_queue_is_full
         self._server: Optional[Server] = None
         self._tracer_provider = tracer_provider
         self._enable_prometheus = enable_prometheus
@@ -85,7 +90,9 @@ class GrpcServer:
             interceptors=interceptors,
         )
         server.add_insecure_port(f"[::]:{get_env_grpc_port()}")
-        add_TraceServiceServicer_to_server(Servicer(self._callback), server)  # type: ignore[no-untyped-call,unused-ignore]
+        add_TraceServiceServicer_to_server(
+            Servicer(self._callback, self._span_queue_is_full), server
+        )  # type: ignore[no-untyped-call,unused-ignore]
         await server.start()
         self._server = server
 
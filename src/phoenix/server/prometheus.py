@@ -1,18 +1,25 @@
 import time
+from collections.abc import Iterator
 from threading import Thread
 
 import psutil
 from prometheus_client import (
     Counter,
     Gauge,
+    Histogram,
     Summary,
     start_http_server,
 )
+from prometheus_client.core import REGISTRY, CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.metrics_core import Metric
+from prometheus_client.registry import Collector
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.requests import Request
 from starlette.responses import Response
 from starlette.routing import Match
 
+from phoenix.trace.dsl.filter import get_cache_info
+
 REQUESTS_PROCESSING_TIME = Summary(
     name="starlette_requests_processing_time_seconds_summary",
     documentation="Summary of requests processing time by method and path (in seconds)",
@@ -37,6 +44,11 @@ BULK_LOADER_INSERTION_TIME = Summary(
     name="bulk_loader_insertion_time_seconds_summary",
     documentation="Summary of database insertion time (seconds)",
 )
+BULK_LOADER_WORKER_INSERTION_TIME = Histogram(
+    name="bulk_loader_worker_insertion_time_seconds",
+    documentation="Histogram of database insertion time by bulk loader worker (seconds)",
+    labelnames=["worker"],
+)
 BULK_LOADER_SPAN_INSERTIONS = Counter(
     name="bulk_loader_span_insertions_total",
     documentation="Total count of bulk loader span insertions",
@@ -49,6 +61,24 @@ BULK_LOADER_EXCEPTIONS = Counter(
     name="bulk_loader_exceptions_total",
     documentation="Total count of bulk loader exceptions",
 )
+BULK_LOADER_QUEUE_SIZE = Gauge(
+    name="bulk_loader_queue_size",
+    documentation="Current number of items buffered for insertion by the bulk loader",
+    labelnames=["type"],
+)
+BULK_LOADER_REJECTIONS = Counter(
+    name="bulk_loader_rejections_total",
+    documentation="Total count of requests rejected because the bulk loader queue is full",
+)
+BULK_LOADER_BATCH_SIZE = Gauge(
+    name="bulk_loader_batch_size",
+    documentation="Current number of spans the bulk loader inserts per transaction",
+)
+BULK_LOADER_FLUSHES = Counter(
+    name="bulk_loader_flushes_total",
+    documentation="Total count of bulk loader flushes by reason",
+    labelnames=["reason"],
+)
 
 RATE_LIMITER_CACHE_SIZE = Gauge(
     name="rate_limiter_cache_size",
@@ -71,6 +101,37 @@ JWT_STORE_API_KEYS_ACTIVE = Gauge(
 )
 
 
+class SpanFilterCacheCollector(Collector):
+    """
+    Exports the statistics of the process-wide caches of compiled span filters and
+    projectors, which are read at scrape time.
+    """
+
+    def collect(self) -> Iterator[Metric]:
+        hits = CounterMetricFamily(
+            "span_filter_cache_hits",
+            "Total count of compiled span filter cache hits by type",
+            labels=["type"],
+        )
+        misses = CounterMetricFamily(
+            "span_filter_cache_misses",
+            "Total count of compiled span filter cache misses by type",
+            labels=["type"],
+        )
+        size = GaugeMetricFamily(
+            "span_filter_cache_size",
+            "Current number of compiled span filters in the cache by type",
+            labels=["type"],
+        )
+        for type_, info in get_cache_info().items():
+            hits.add_metric([type_], info.hits)
+            misses.add_metric([type_], info.misses)
+            size.add_metric([type_], info.currsize)
+        yield hits
+        yield misses
+        yield size
+
+
 class PrometheusMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
         for route in request.app.routes:
@@ -93,6 +154,7 @@ class PrometheusMiddleware(BaseHTTPMiddleware):
 
 
 def start_prometheus() -> None:
+    REGISTRY.register(SpanFilterCacheCollector())
     Thread(target=gather_system_data, daemon=True).start()
     start_http_server(9090, addr="::")
 
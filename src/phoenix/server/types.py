@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from asyncio import Task, create_task, sleep
+from asyncio import Event, Task, create_task, sleep
 from collections import defaultdict
-from collections.abc import Callable, Iterator
+from collections.abc import AsyncGenerator, Callable, Collection, Iterator
 from contextlib import AbstractAsyncContextManager
 from dataclasses import dataclass
 from datetime import datetime, timezone
@@ -131,6 +131,91 @@ class LastUpdatedAt:
         self._cache[table][id_] = datetime.now(timezone.utc)
 
 
+@dataclass(frozen=True)
+class ProjectUpdate:
+    """
+    A change notification for a project. `span_count` spans were inserted, whose start
+    times are between `earliest_start_time` and `latest_start_time`, so that clients can
+    fetch only those.
+    `refetch` is set if the project changed otherwise too, e.g. spans were deleted or
+    annotated, which clients can only see by refetching.
+    """
+
+    project_rowid: int
+    span_count: int = 0
+    earliest_start_time: Optional[datetime] = None
+    latest_start_time: Optional[datetime] = None
+    refetch: bool = False
+
+    def __add__(self, other: ProjectUpdate) -> ProjectUpdate:
+        assert self.project_rowid == other.project_rowid
+        earliest = [t for t in (self.earliest_start_time, other.earliest_start_time) if t]
+        latest = [t for t in (self.latest_start_time, other.latest_start_time) if t]
+        return ProjectUpdate(
+            project_rowid=self.project_rowid,
+            span_count=self.span_count + other.span_count,
+            earliest_start_time=min(earliest, default=None),
+            latest_start_time=max(latest, default=None),
+            refetch=self.refetch or other.refetch,
+        )
+
+
+class _ProjectUpdateSubscriber:
+    def __init__(self, project_rowids: Optional[Collection[int]] = None) -> None:
+        self._project_rowids = None if project_rowids is None else frozenset(project_rowids)
+        self._pending: dict[int, ProjectUpdate] = {}
+        self._ready = Event()
+
+    def put(self, update: ProjectUpdate) -> None:
+        if self._project_rowids is not None and update.project_rowid not in self._project_rowids:
+            return
+        if pending := self._pending.get(update.project_rowid):
+            update = pending + update
+        self._pending[update.project_rowid] = update
+        self._ready.set()
+
+    async def get(self) -> list[ProjectUpdate]:
+        await self._ready.wait()
+        self._ready.clear()
+        updates = list(self._pending.values())
+        self._pending.clear()
+        return updates
+
+
+class ProjectUpdates:
+    """
+    Pushes project updates to subscribers, e.g. clients of GraphQL subscriptions, so that
+    they don't need to poll for changes. The updates of a project that arrive while a
+    subscriber is busy or throttled are coalesced into one.
+    """
+
+    def __init__(self, min_interval_seconds: float = 1.0) -> None:
+        self._min_interval_seconds = min_interval_seconds
+        self._subscribers: set[_ProjectUpdateSubscriber] = set()
+
+    def put(self, update: ProjectUpdate) -> None:
+        for subscriber in self._subscribers:
+            subscriber.put(update)
+
+    async def subscribe(
+        self,
+        project_rowids: Optional[Collection[int]] = None,
+    ) -> AsyncGenerator[ProjectUpdate, None]:
+        """
+        Yields the updates of the projects, or of all projects if none are given, at most
+        once per `min_interval_seconds` for each project.
+        """
+        subscriber = _ProjectUpdateSubscriber(project_rowids)
+        self._subscribers.add(subscriber)
+        try:
+            while True:
+                for update in await subscriber.get():
+                    yield update
+                await sleep(self._min_interval_seconds)
+        finally:
+            self._subscribers.discard(subscriber)
+
+
 class PasswordResetToken(Token): ...
 
 
@@ -4,7 +4,7 @@ import logging
 import re
 import weakref
 from collections import Counter
-from collections.abc import Iterable, Mapping, Sequence
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 from datetime import datetime
 from io import BytesIO
 from pathlib import Path
@@ -35,11 +35,16 @@ from phoenix.session.data_extractor import DEFAULT_SPAN_LIMIT, TraceDataExtracto
 from phoenix.trace import Evaluations, TraceDataset
 from phoenix.trace.dsl import SpanQuery
 from phoenix.trace.otel import encode_span_to_otlp
+from phoenix.utilities.byte_chunks import ByteChunksReader
 from phoenix.utilities.client import VersionedClient
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT_IN_SECONDS = 5
+_MAX_EVALUATIONS_PER_RECORD_BATCH = 10_000
+_MAX_EXAMPLES_PER_RECORD_BATCH = 10_000
+_EVALUATIONS_PAGE_SIZE = 100_000
+_DATASET_EXAMPLES_PAGE_SIZE = 1_000
 
 DatasetAction: TypeAlias = Literal["create", "append"]
 
@@ -196,6 +201,8 @@ class Client(TraceDataExtractor):
     def get_evaluations(
         self,
         project_name: Optional[str] = None,
+        *,
+        updated_after: Optional[datetime] = None,
     ) -> list[Evaluations]:
         """
         Retrieves evaluations for a given project from the Phoenix server or active session.
@@ -204,36 +211,82 @@ class Client(TraceDataExtractor):
             project_name (str, optional): The name of the project to retrieve evaluations for.
                 This can be set using environment variables. If not provided, falls back to the
                 default project.
+            updated_after (datetime, optional): If provided, only evaluations created or
+                updated after this time are retrieved, e.g. to sync what changed since the
+                last retrieval.
 
         Returns:
             list[Evaluations]:
                 A list of Evaluations objects containing evaluation data. Returns an
                 empty list if no evaluations are found.
         """
-        project_name = project_name or get_env_project_name()
-        response = self._client.get(
-            url=urljoin(self._base_url, "v1/evaluations"),
-            params={
-                "project_name": project_name,
-                "project-name": project_name,  # for backward-compatibility
-            },
-        )
-        if response.status_code == 404:
-            logger.info("No evaluations found.")
-            return []
-        elif response.status_code == 422:
-            raise ValueError(response.content.decode())
-        response.raise_for_status()
-        source = BytesIO(response.content)
+        parts: dict[tuple[type[Evaluations], str], list[Evaluations]] = {}
+        for evals in self.iter_evaluations(project_name, updated_after=updated_after):
+            parts.setdefault((type(evals), evals.eval_name), []).append(evals)
         results = []
-        while True:
-            try:
-                with pa.ipc.open_stream(source) as reader:
-                    results.append(Evaluations.from_pyarrow_reader(reader))
-            except ArrowInvalid:
-                break
+        for (evaluations_cls, eval_name), evals_list in parts.items():
+            if len(evals_list) == 1:
+                results.extend(evals_list)
+                continue
+            dataframe = pd.concat([evals.dataframe for evals in evals_list])
+            results.append(evaluations_cls(eval_name=eval_name, dataframe=dataframe))
         return results
 
+    def iter_evaluations(
+        self,
+        project_name: Optional[str] = None,
+        *,
+        updated_after: Optional[datetime] = None,
+        page_size: int = _EVALUATIONS_PAGE_SIZE,
+    ) -> Iterator[Evaluations]:
+        """
+        Lazily retrieves evaluations for a given project from the Phoenix server, one page
+        at a time. Evaluations with the same name may be split across several of the
+        Evaluations objects yielded.
+
+        Args:
+            project_name (str, optional): The name of the project to retrieve evaluations for.
+                This can be set using environment variables. If not provided, falls back to the
+                default project.
+            updated_after (datetime, optional): If provided, only evaluations created or
+                updated after this time are retrieved.
+            page_size (int): The maximum number of evaluations to request at a time.
+
+        Yields:
+            Evaluations: Evaluations objects as they are received.
+        """
+        project_name = project_name or get_env_project_name()
+        params: dict[str, Any] = {
+            "project_name": project_name,
+            "project-name": project_name,  # for backward-compatibility
+            "limit": page_size,
+        }
+        if updated_after is not None:
+            params["updated_after"] = _to_iso_format(normalize_datetime(updated_after))
+        while True:
+            with self._client.stream(
+                "GET",
+                url=urljoin(self._base_url, "v1/evaluations"),
+                params=params,
+            ) as response:
+                if response.status_code == 404:
+                    logger.info("No evaluations found.")
+                    return
+                elif response.status_code == 422:
+                    raise ValueError(response.read().decode())
+                response.raise_for_status()
+                source = ByteChunksReader(response.iter_bytes())
+                while True:
+                    try:
+                        with pa.ipc.open_stream(source) as reader:
+                            evaluations = Evaluations.from_pyarrow_reader(reader)
+                    except ArrowInvalid:
+                        break
+                    yield evaluations
+                if not (cursor := response.headers.get("x-next-cursor")):
+                    return
+            params["cursor"] = cursor
+
     def _warn_if_phoenix_is_not_running(self) -> None:
         try:
             self._client.get(urljoin(self._base_url, "arize_phoenix_version")).raise_for_status()
@@ -265,7 +318,8 @@ class Client(TraceDataExtractor):
             sink = pa.BufferOutputStream()
             headers = {"content-type": "application/x-pandas-arrow"}
             with pa.ipc.new_stream(sink, table.schema) as writer:
-                writer.write_table(table)
+                # Smaller record batches let the server insert them as they arrive.
+                writer.write_table(table, max_chunksize=_MAX_EVALUATIONS_PER_RECORD_BATCH)
             self._client.post(
                 url=urljoin(self._base_url, "v1/evaluations"),
                 content=cast(bytes, sink.getvalue().to_pybytes()),
@@ -372,27 +426,31 @@ class Client(TraceDataExtractor):
         if not id:
             raise ValueError("Dataset id or name must be provided.")
 
-        response = self._client.get(
-            urljoin(self._base_url, f"v1/datasets/{quote(id)}/examples"),
-            params={"version_id": version_id} if version_id else None,
-        )
-        response.raise_for_status()
-        data = response.json()["data"]
-        examples = {
-            example["id"]: Example(
-                id=example["id"],
-                input=example["input"],
-                output=example["output"],
-                metadata=example["metadata"],
-                updated_at=datetime.fromisoformat(example["updated_at"]),
-            )
-            for example in data["examples"]
-        }
-        resolved_dataset_id = data["dataset_id"]
-        resolved_version_id = data["version_id"]
+        url = urljoin(self._base_url, f"v1/datasets/{quote(id)}/examples")
+        params: dict[str, Any] = {"limit": _DATASET_EXAMPLES_PAGE_SIZE}
+        if version_id:
+            params["version_id"] = version_id
+        examples: dict[str, Example] = {}
+        while True:
+            response = self._client.get(url, params=params)
+            response.raise_for_status()
+            body = response.json()
+            data = body["data"]
+            for example in data["examples"]:
+                examples[example["id"]] = Example(
+                    id=example["id"],
+                    input=example["input"],
+                    output=example["output"],
+                    metadata=example["metadata"],
+                    updated_at=datetime.fromisoformat(example["updated_at"]),
+                )
+            if not (next_cursor := body.get("next_cursor")):
+                break
+            # the version is pinned so that the pages are consistent with one another
+            params.update(version_id=data["version_id"], cursor=next_cursor)
         return Dataset(
-            id=resolved_dataset_id,
-            version_id=resolved_version_id,
+            id=data["dataset_id"],
+            version_id=data["version_id"],
             examples=examples,
         )
 
@@ -802,7 +860,8 @@ def _prepare_pyarrow(
     sink = pa.BufferOutputStream()
     options = pa.ipc.IpcWriteOptions(compression="lz4")
     with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
-        writer.write_table(table)
+        # Writes bounded record batches, which the server reads one at a time.
+        writer.write_table(table, max_chunksize=_MAX_EXAMPLES_PER_RECORD_BATCH)
     file = BytesIO(sink.getvalue().to_pybytes())
     return "pandas", file, "application/x-pandas-pyarrow", {}
 
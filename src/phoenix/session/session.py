@@ -31,6 +31,7 @@ from phoenix.config import (
     get_working_dir,
 )
 from phoenix.core.model_schema_adapter import create_model_from_inferences
+from phoenix.db.bulk_inserter import BulkInserter
 from phoenix.inferences.inferences import EMPTY_INFERENCES, Inferences
 from phoenix.pointcloud.umap_parameters import get_umap_parameters
 from phoenix.server.app import (
@@ -47,6 +48,7 @@ from phoenix.session.data_extractor import DEFAULT_SPAN_LIMIT, TraceDataExtracto
 from phoenix.session.evaluation import encode_evaluations
 from phoenix.trace import Evaluations
 from phoenix.trace.dsl.query import SpanQuery
+from phoenix.trace.schemas import Span
 from phoenix.trace.trace_dataset import TraceDataset
 
 try:
@@ -374,6 +376,7 @@ class ThreadSession(Session):
         engine = create_engine_and_run_migrations(database_url)
         instrumentation_cleanups = instrument_engine_if_enabled(engine)
         factory = DbSessionFactory(db=_db(engine), dialect=engine.dialect.name)
+        self._bulk_inserter: Optional[BulkInserter] = None
         self.app = create_app(
             db=factory,
             export_path=self.export_path,
@@ -389,6 +392,7 @@ class ThreadSession(Session):
                 else None
             ),
             shutdown_callbacks=instrumentation_cleanups,
+            bulk_inserter_factory=self._create_bulk_inserter,
         )
         self.server = ThreadServer(
             app=self.app,
@@ -407,6 +411,21 @@ class ThreadSession(Session):
         self.server.close()
         self.temp_dir.cleanup()
 
+    def queue_spans(self, spans: Iterable[tuple[Span, str]]) -> bool:
+        """
+        Hands spans created in this process straight to the server for insertion, along
+        with the names of their projects, bypassing the export over the network. Returns
+        False if the server isn't accepting spans, in which case they should be exported
+        instead.
+        """
+        if self._bulk_inserter is None or not self.active:
+            return False
+        return self._bulk_inserter.queue_spans_threadsafe(spans)
+
+    def _create_bulk_inserter(self, *args: Any, **kwargs: Any) -> BulkInserter:
+        self._bulk_inserter = BulkInserter(*args, **kwargs)
+        return self._bulk_inserter
+
 
 def delete_all(prompt_before_delete: Optional[bool] = True) -> None:
     """
@@ -18,13 +18,14 @@ them into a nested list of dictionaries i.e.
 import inspect
 import json
 from collections import defaultdict
-from collections.abc import Iterable, Iterator, Mapping, Sequence
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from functools import lru_cache
 from typing import Any, Optional, Union, cast
 
 import numpy as np
 from openinference.semconv import trace
 from openinference.semconv.trace import DocumentAttributes, SpanAttributes
-from typing_extensions import assert_never
+from typing_extensions import TypeAlias, assert_never
 
 DOCUMENT_METADATA = DocumentAttributes.DOCUMENT_METADATA
 LLM_PROMPT_TEMPLATE_VARIABLES = SpanAttributes.LLM_PROMPT_TEMPLATE_VARIABLES
@@ -169,6 +170,53 @@ def _partition_with_prefix_exclusion(
     return key.partition(separator)
 
 
+_KeyPath: TypeAlias = tuple[Union[str, int], ...]
+
+# Distinct attribute keys are few, e.g. `llm.input_messages.0.message.content` recurs
+# for every LLM span, so their paths are worth memoizing, but the cache must be bounded
+# because keys containing indices are unbounded in principle.
+_MAX_CACHED_KEY_PATHS = 10_000
+
+
+def _compile_key_path(
+    key: str,
+    separator: str = ".",
+    prefix_exclusions: Sequence[str] = (),
+) -> _KeyPath:
+    """
+    Split `key` into the sequence of branches leading to its value in the Trie. Partitions
+    that are all digits, e.g. "0", "12", etc., are converted to integers, i.e. indices.
+    """
+    path: list[Union[str, int]] = []
+    while True:
+        prefix, _, suffix = _partition_with_prefix_exclusion(
+            key,
+            separator,
+            prefix_exclusions,
+        )
+        path.append(int(prefix) if prefix.isdigit() else prefix)
+        if not suffix:
+            break
+        key = suffix
+    return tuple(path)
+
+
+@lru_cache(maxsize=32)
+def _get_key_path_compiler(
+    separator: str,
+    prefix_exclusions: tuple[str, ...],
+) -> Callable[[str], _KeyPath]:
+    """
+    Returns a memoized `_compile_key_path` for the given separator and prefix exclusions.
+    """
+
+    @lru_cache(maxsize=_MAX_CACHED_KEY_PATHS)
+    def compile_key_path(key: str) -> _KeyPath:
+        return _compile_key_path(key, separator, prefix_exclusions)
+
+    return compile_key_path
+
+
 class _Trie(defaultdict[Union[str, int], "_Trie"]):
     """
     Prefix Tree with special handling for indices (i.e. all-digit keys). Indices
@@ -212,27 +260,18 @@ def _build_trie(
     Build a Trie (a.k.a. prefix tree) from `key_value_pairs`, by partitioning the keys by
     separator. Each partition is a branch in the Trie. Special handling is done for partitions
     that are all digits, e.g. "0", "12", etc., which are converted to integers and collected
-    as indices.
+    as indices. The partitions of each key are memoized across calls.
     """
+    compile_key_path = _get_key_path_compiler(separator, tuple(prefix_exclusions))
     trie = _Trie()
     for key, value in key_value_pairs:
         if value is None:
             continue
         t = trie
-        while True:
-            prefix, _, suffix = _partition_with_prefix_exclusion(
-                key,
-                separator,
-                prefix_exclusions,
-            )
-            if prefix.isdigit():
-                index = int(prefix)
-                t = t.add_index(index) if suffix else t.add_branch(index)
-            else:
-                t = t.add_branch(prefix)
-            if not suffix:
-                break
-            key = suffix
+        *path, last = compile_key_path(key)
+        for branch in path:
+            t = t.add_index(branch) if isinstance(branch, int) else t.add_branch(branch)
+        t = t.add_branch(last)
         t.set_value(value)
     return trie
 
@@ -4,6 +4,7 @@ import sys
 import typing
 from dataclasses import dataclass, field
 from difflib import SequenceMatcher
+from functools import lru_cache
 from itertools import chain
 from types import MappingProxyType
 from uuid import uuid4
@@ -16,6 +17,7 @@ from typing_extensions import TypeAlias, TypeGuard, assert_never
 
 import phoenix.trace.v1 as pb
 from phoenix.db import models
+from phoenix.db.indexed_span_attributes import get_indexed_span_attributes
 
 _VALID_EVAL_ATTRIBUTES: tuple[str, ...] = tuple(
     field.name for field in pb.Evaluation.Result.DESCRIPTOR.fields
@@ -99,6 +101,7 @@ _STRING_NAMES: typing.Mapping[str, sqlalchemy.SQLColumnExpression[typing.Any]] =
         "name": models.Span.name,
         "status_code": models.Span.status_code,
         "status_message": models.Span.status_message,
+        "llm_model_name": models.Span.llm_model_name,
     }
 )
 _FLOAT_NAMES: typing.Mapping[str, sqlalchemy.SQLColumnExpression[typing.Any]] = MappingProxyType(
@@ -135,15 +138,35 @@ _BACKWARD_COMPATIBILITY_REPLACEMENTS: typing.Mapping[str, str] = MappingProxyTyp
     }
 )
 
+# attributes materialized into columns of the spans table at ingestion
+_MATERIALIZED_ATTRIBUTES: typing.Mapping[tuple[str, ...], str] = MappingProxyType(
+    {
+        ("llm", "model_name"): "llm_model_name",
+    }
+)
+# previews of attributes materialized at ingestion, for substring searches
+_PREVIEWS: typing.Mapping[tuple[str, ...], str] = MappingProxyType(
+    {
+        ("input", "value"): "input_preview",
+        ("output", "value"): "output_preview",
+    }
+)
+
 
 @dataclass(frozen=True)
 class SpanFilter:
     condition: str = ""
     valid_eval_names: typing.Optional[typing.Sequence[str]] = None
+    # the column names of the indexed span attributes keyed by their paths, onto which
+    # comparisons are rewritten (see `phoenix.db.indexed_span_attributes`)
+    indexed_attributes: typing.Mapping[tuple[str, ...], str] = field(
+        default_factory=dict, repr=False
+    )
     translated: ast.Expression = field(init=False, repr=False)
     compiled: typing.Any = field(init=False, repr=False)
     _aliased_annotation_relations: tuple[AliasedAnnotationRelation] = field(init=False, repr=False)
     _aliased_annotation_attributes: dict[str, Mapped[typing.Any]] = field(init=False, repr=False)
+    _indexed_attribute_values: dict[str, typing.Any] = field(init=False, repr=False)
 
     def __bool__(self) -> bool:
         return bool(self.condition)
@@ -161,6 +184,7 @@ class SpanFilter:
                 for aliased_annotation in aliased_annotation_relations
                 for alias, _ in aliased_annotation.attributes
             ),
+            indexed_attributes=self.indexed_attributes,
         ).visit(root)
         ast.fix_missing_locations(translated)
         compiled = compile(translated, filename="", mode="eval")
@@ -173,6 +197,14 @@ class SpanFilter:
         object.__setattr__(self, "compiled", compiled)
         object.__setattr__(self, "_aliased_annotation_relations", aliased_annotation_relations)
         object.__setattr__(self, "_aliased_annotation_attributes", aliased_annotation_attributes)
+        object.__setattr__(
+            self,
+            "_indexed_attribute_values",
+            {
+                column_name: models.IndexedAttributeValue(column_name, path)
+                for path, column_name in self.indexed_attributes.items()
+            },
+        )
 
     def __call__(self, select: Select[typing.Any]) -> Select[typing.Any]:
         if not self.condition:
@@ -183,6 +215,7 @@ class SpanFilter:
                 {
                     **_NAMES,
                     **self._aliased_annotation_attributes,
+                    **self._indexed_attribute_values,
                     "not_": sqlalchemy.not_,
                     "and_": sqlalchemy.and_,
                     "or_": sqlalchemy.or_,
@@ -190,6 +223,9 @@ class SpanFilter:
                     "Float": sqlalchemy.Float,
                     "String": sqlalchemy.String,
                     "TextContains": models.TextContains,
+                    "TextPreviewContains": models.TextPreviewContains,
+                    "input_preview": models.Span.input_preview,
+                    "output_preview": models.Span.output_preview,
                 },
             )
         )
@@ -262,6 +298,89 @@ class Projector:
         )
 
 
+# The UI sends the same few conditions over and over, e.g. once per dataloader per page
+# load, so compiled filters and projectors are shared across requests.
+_MAX_CACHED_SPAN_FILTERS = 1024
+_MAX_CACHED_PROJECTORS = 1024
+
+
+def get_span_filter(
+    condition: str = "",
+    valid_eval_names: typing.Optional[typing.Sequence[str]] = None,
+) -> SpanFilter:
+    """
+    Returns a `SpanFilter` for the condition, reusing a previously compiled one for the
+    same condition and eval names if it is still in the cache. Invalid conditions are not
+    cached, and raise the same errors as the constructor. Comparisons of indexed span
+    attributes are rewritten onto their indexes, and filters compiled before an attribute
+    was added or removed are not reused.
+    """
+    return _get_span_filter(
+        condition,
+        None if valid_eval_names is None else tuple(valid_eval_names),
+        tuple(get_indexed_span_attributes().items()),
+    )
+
+
+@lru_cache(maxsize=_MAX_CACHED_SPAN_FILTERS)
+def _get_span_filter(
+    condition: str,
+    valid_eval_names: typing.Optional[tuple[str, ...]],
+    indexed_attributes: tuple[tuple[tuple[str, ...], str], ...],
+) -> SpanFilter:
+    return SpanFilter(
+        condition=condition,
+        valid_eval_names=valid_eval_names,
+        indexed_attributes=dict(indexed_attributes),
+    )
+
+
+@lru_cache(maxsize=_MAX_CACHED_PROJECTORS)
+def get_projector(expression: str) -> Projector:
+    """
+    Returns a `Projector` for the expression, reusing a previously compiled one if it is
+    still in the cache.
+    """
+    return Projector(expression)
+
+
+def get_attribute_path(key: str) -> tuple[str, ...]:
+    """
+    Returns the path of the span attribute that a key of filter conditions refers to, e.g.
+    `("metadata", "tenant")` for `metadata["tenant"]`, or `("llm", "model_name")` for
+    `llm.model_name`. Raises `SyntaxError` if the key is not an attribute, and `ValueError`
+    if the attribute is already a column of the spans table.
+    """
+    node = ast.parse(key, mode="eval").body
+    keys: typing.Optional[list[ast.Constant]]
+    if isinstance(node, ast.Name):
+        keys = [ast.Constant(value=node.id, kind=None)]
+    else:
+        keys = _get_attribute_keys_list(node)
+    if (
+        not keys
+        or key in _NAMES
+        or key in _BACKWARD_COMPATIBILITY_REPLACEMENTS
+        or not all(isinstance(constant.value, str) for constant in keys)
+    ):
+        raise SyntaxError(f"invalid attribute: {key}")
+    path = tuple(constant.value for constant in keys)
+    if path in _MATERIALIZED_ATTRIBUTES:
+        raise ValueError(f"the attribute is already a column: {_MATERIALIZED_ATTRIBUTES[path]}")
+    return path
+
+
+def get_cache_info() -> dict[str, typing.Any]:
+    """
+    Returns the `functools` cache statistics (hits, misses, size) of compiled span filters
+    and projectors.
+    """
+    return {
+        "span_filter": _get_span_filter.cache_info(),
+        "projector": get_projector.cache_info(),
+    }
+
+
 def _is_string_constant(node: typing.Any) -> TypeGuard[ast.Constant]:
     return isinstance(node, ast.Constant) and isinstance(node.value, str)
 
@@ -416,7 +535,7 @@ class _ProjectionTranslator(ast.NodeTransformer):
         if replacement := _BACKWARD_COMPATIBILITY_REPLACEMENTS.get(source_segment):
             return ast.Name(id=replacement, ctx=ast.Load())
         if (keys := _get_attribute_keys_list(node)) is not None:
-            return _as_attribute(keys)
+            return _as_attribute_or_column(keys)
         raise SyntaxError(f"invalid expression: {source_segment}")
 
     def visit_Name(self, node: ast.Name) -> typing.Any:
@@ -428,11 +547,19 @@ class _ProjectionTranslator(ast.NodeTransformer):
 
     def visit_Subscript(self, node: ast.Subscript) -> typing.Any:
         if (keys := _get_attribute_keys_list(node)) is not None:
-            return _as_attribute(keys)
+            return _as_attribute_or_column(keys)
         raise SyntaxError(f"invalid expression: {ast.unparse(node)}")
 
 
 class _FilterTranslator(_ProjectionTranslator):
+    def __init__(
+        self,
+        reserved_keywords: typing.Iterable[str] = (),
+        indexed_attributes: typing.Mapping[tuple[str, ...], str] = MappingProxyType({}),
+    ) -> None:
+        super().__init__(reserved_keywords)
+        self._indexed_attributes = indexed_attributes
+
     def visit_Compare(self, node: ast.Compare) -> typing.Any:
         if len(node.comparators) > 1:
             args: list[typing.Any] = []
@@ -450,18 +577,22 @@ class _FilterTranslator(_ProjectionTranslator):
             right = _cast_as("Float", right)
         elif not _is_float(left) and _is_float(right):
             left = _cast_as("Float", left)
+        if not isinstance(op, (ast.In, ast.NotIn)) or isinstance(right, (ast.List, ast.Tuple)):
+            # substring searches can't use the indexes
+            left, right = self._as_indexed_attribute(left), self._as_indexed_attribute(right)
         if isinstance(op, (ast.In, ast.NotIn)):
-            if _is_string_attribute(right) or ast.unparse(right) in _NAMES:
+            if _is_string_constant(left) and (preview := _get_preview_name(right)):
+                call = ast.Call(
+                    func=ast.Name(id="TextPreviewContains", ctx=ast.Load()),
+                    args=[ast.Name(id=preview, ctx=ast.Load()), right, left],
+                    keywords=[],
+                )
+            elif _is_string_attribute(right) or ast.unparse(right) in _NAMES:
                 call = ast.Call(
                     func=ast.Name(id="TextContains", ctx=ast.Load()),
                     args=[right, left],
                     keywords=[],
                 )
-                if isinstance(op, ast.NotIn):
-                    call = ast.Call(
-                        func=ast.Name(id="not_", ctx=ast.Load()), args=[call], keywords=[]
-                    )
-                return call
             elif isinstance(right, (ast.List, ast.Tuple)):
                 attr = "in_" if isinstance(op, ast.In) else "not_in"
                 return ast.Call(
@@ -471,12 +602,23 @@ class _FilterTranslator(_ProjectionTranslator):
                 )
             else:
                 raise SyntaxError(f"invalid expression: {ast.unparse(op)}")
+            if isinstance(op, ast.NotIn):
+                call = ast.Call(func=ast.Name(id="not_", ctx=ast.Load()), args=[call], keywords=[])
+            return call
         if isinstance(op, ast.Is):
             op = ast.Eq()
         elif isinstance(op, ast.IsNot):
             op = ast.NotEq()
         return ast.Compare(left=left, ops=[op], comparators=[right])
 
+    def _as_indexed_attribute(self, node: typing.Any) -> typing.Any:
+        # e.g. `attributes[["metadata", "tenant"]].as_string()` -> `indexed_attribute_...`
+        if (path := _get_string_attribute_path(node)) and (
+            column_name := self._indexed_attributes.get(path)
+        ):
+            return ast.Name(id=column_name, ctx=ast.Load())
+        return node
+
     def visit_BoolOp(self, node: ast.BoolOp) -> typing.Any:
         if isinstance(node.op, ast.And):
             func = ast.Name(id="and_", ctx=ast.Load())
@@ -646,6 +788,32 @@ def _as_attribute(
     )
 
 
+def _as_attribute_or_column(keys: list[ast.Constant]) -> typing.Union[ast.Subscript, ast.Name]:
+    # e.g. `["llm", "model_name"]` -> `llm_model_name`
+    if name := _MATERIALIZED_ATTRIBUTES.get(tuple(key.value for key in keys)):
+        return ast.Name(id=name, ctx=ast.Load())
+    return _as_attribute(keys)
+
+
+def _get_string_attribute_path(node: typing.Any) -> typing.Optional[tuple[str, ...]]:
+    # e.g. `attributes[["input", "value"]].as_string()` -> `("input", "value")`
+    if not (
+        _is_string_attribute(node)
+        and isinstance(subscript := typing.cast(ast.Attribute, node.func).value, ast.Subscript)
+        and isinstance(keys := subscript.slice, ast.List)
+        and all(isinstance(key, ast.Constant) for key in keys.elts)
+    ):
+        return None
+    return tuple(typing.cast(ast.Constant, key).value for key in keys.elts)
+
+
+def _get_preview_name(node: typing.Any) -> typing.Optional[str]:
+    # e.g. `attributes[["input", "value"]].as_string()` -> `input_preview`
+    if (path := _get_string_attribute_path(node)) is None:
+        return None
+    return _PREVIEWS.get(path)
+
+
 def _is_annotation(node: typing.Any) -> TypeGuard[ast.Subscript]:
     # e.g. `evals["name"]`
     return (
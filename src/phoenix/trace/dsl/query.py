@@ -28,7 +28,7 @@ from phoenix.trace.attributes import (
     unflatten,
 )
 from phoenix.trace.dsl import SpanFilter
-from phoenix.trace.dsl.filter import Projector
+from phoenix.trace.dsl.filter import Projector, get_projector, get_span_filter
 from phoenix.trace.schemas import ATTRIBUTE_PREFIX
 
 DEFAULT_SPAN_LIMIT = 1000
@@ -66,7 +66,7 @@ class Projection(_Base):
     def __post_init__(self) -> None:
         super().__post_init__()
         object.__setattr__(self, "key", _unalias(self.key))
-        object.__setattr__(self, "_projector", Projector(self.key))
+        object.__setattr__(self, "_projector", get_projector(self.key))
 
     def __bool__(self) -> bool:
         return bool(self.key)
@@ -452,7 +452,7 @@ class SpanQuery(_HasTmpSuffix):
         return replace(self, _select=MappingProxyType(_select))
 
     def where(self, condition: str) -> "SpanQuery":
-        _filter = SpanFilter(condition)
+        _filter = get_span_filter(condition)
         return replace(self, _filter=_filter)
 
     def explode(self, key: str, **kwargs: str) -> "SpanQuery":
@@ -12,6 +12,7 @@ from openinference.semconv.trace import (
     OpenInferenceMimeTypeValues,
     SpanAttributes,
 )
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
 from opentelemetry.proto.common.v1.common_pb2 import AnyValue, ArrayValue, KeyValue
 from opentelemetry.util.types import Attributes, AttributeValue
 from typing_extensions import TypeAlias, assert_never
@@ -39,6 +40,7 @@ from phoenix.trace.schemas import (
     TraceID,
 )
 from phoenix.utilities.json import jsonify
+from phoenix.utilities.project import get_project_name
 
 DOCUMENT_METADATA = DocumentAttributes.DOCUMENT_METADATA
 INPUT_MIME_TYPE = SpanAttributes.INPUT_MIME_TYPE
@@ -89,6 +91,27 @@ def decode_otlp_span(otlp_span: otlp.Span) -> Span:
     )
 
 
+ProjectName: TypeAlias = str
+
+
+def decode_otlp_export_request(
+    request: ExportTraceServiceRequest,
+) -> list[tuple[Span, ProjectName]]:
+    """
+    Decodes all the spans in an OTLP export request along with the names of their
+    projects. This is CPU-bound, so callers in the event loop should run it in a worker
+    thread, once per request rather than once per span.
+    """
+    spans: list[tuple[Span, ProjectName]] = []
+    for resource_spans in request.resource_spans:
+        project_name = get_project_name(resource_spans.resource.attributes)
+        for scope_span in resource_spans.scope_spans:
+            spans.extend(
+                (decode_otlp_span(otlp_span), project_name) for otlp_span in scope_span.spans
+            )
+    return spans
+
+
 def _decode_identifier(identifier: bytes) -> Optional[str]:
     if not identifier:
         return None
@@ -288,4 +311,5 @@ def _encode_value(value: AttributeValue) -> AnyValue:
 __all__ = [
     "encode_span_to_otlp",
     "decode_otlp_span",
+    "decode_otlp_export_request",
 ]
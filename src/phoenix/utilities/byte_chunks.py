@@ -0,0 +1,32 @@
+import io
+from collections.abc import Iterator
+from typing import Any
+
+
+class ByteChunksReader(io.RawIOBase):
+    """
+    A file-like view of an iterator of byte chunks, e.g. the body of a streamed request or
+    response, for reading Arrow IPC streams as they arrive.
+    """
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._chunk = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        # Arrow treats a short read as the end of the stream, so fill `b` unless at EOF.
+        size = 0
+        while size < len(b):
+            if not self._chunk:
+                if (chunk := next(self._chunks, None)) is None:
+                    break
+                self._chunk = memoryview(chunk)
+                continue
+            n = min(len(b) - size, len(self._chunk))
+            b[size : size + n] = self._chunk[:n]
+            self._chunk = self._chunk[n:]
+            size += n
+        return size
@@ -35,6 +35,11 @@ def test_up_and_down_migrations(
         _down(_engine, _alembic_config, "3be8647b87d8")
     _up(_engine, _alembic_config, "cd164e83824f")
 
+    for _ in range(2):
+        _up(_engine, _alembic_config, "4ded9e43755f")
+        _down(_engine, _alembic_config, "cd164e83824f")
+    _up(_engine, _alembic_config, "4ded9e43755f")
+
 
 def _up(_engine: Engine, _alembic_config: Config, revision: str) -> None:
     with _engine.connect() as conn:
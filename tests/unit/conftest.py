@@ -466,6 +466,8 @@ class GraphQLSubscription:
             if message_type == "complete":
                 break
             elif message_type == "next":
+                if (errors := message["payload"].get("errors")) is not None:
+                    raise RuntimeError(errors)
                 if (data := message["payload"]["data"]) is not None:
                     yield data
             elif message_type == "error":
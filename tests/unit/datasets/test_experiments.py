@@ -1,12 +1,19 @@
 import asyncio
 import json
 import platform
+import sys
+from collections.abc import Iterable
 from datetime import datetime, timezone
 from typing import Any
 from unittest.mock import patch
 
 import httpx
 import pytest
+from openinference.semconv.resource import ResourceAttributes
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
 from sqlalchemy import select
 from strawberry.relay import GlobalID
 
@@ -19,6 +26,8 @@ from phoenix.experiments.evaluators import (
     HelpfulnessEvaluator,
     create_evaluator,
 )
+from phoenix.experiments.functions import _BufferedSubmitter
+from phoenix.experiments.tracing import InProcessSpanExporter
 from phoenix.experiments.types import (
     AnnotatorKind,
     Dataset,
@@ -29,10 +38,11 @@ from phoenix.experiments.types import (
 )
 from phoenix.server.api.types.node import from_global_id_with_expected_type
 from phoenix.server.types import DbSessionFactory
+from phoenix.trace.schemas import Span
 
 
 @pytest.mark.skipif(platform.system() in ("Windows", "Darwin"), reason="Flaky on CI")
-@patch("opentelemetry.sdk.trace.export.SimpleSpanProcessor.on_end")
+@patch("opentelemetry.sdk.trace.export.BatchSpanProcessor.on_end")
 async def test_run_experiment(
     _: Any,
     db: DbSessionFactory,
@@ -108,7 +118,7 @@ async def test_run_experiment(
 
 
 @pytest.mark.skipif(platform.system() in ("Windows", "Darwin"), reason="Flaky on CI")
-@patch("opentelemetry.sdk.trace.export.SimpleSpanProcessor.on_end")
+@patch("opentelemetry.sdk.trace.export.BatchSpanProcessor.on_end")
 async def test_run_experiment_with_llm_eval(
     _: Any,
     db: DbSessionFactory,
@@ -188,7 +198,7 @@ async def test_run_experiment_with_llm_eval(
 
 
 @pytest.mark.skipif(platform.system() in ("Windows", "Darwin"), reason="Flaky on CI")
-@patch("opentelemetry.sdk.trace.export.SimpleSpanProcessor.on_end")
+@patch("opentelemetry.sdk.trace.export.BatchSpanProcessor.on_end")
 async def test_run_evaluation(
     _: Any,
     db: DbSessionFactory,
@@ -331,3 +341,157 @@ async def test_get_experiment_client_method(
     experiment = px_client.get_experiment(experiment_id=str(experiment_gid))
     assert experiment
     assert isinstance(experiment, Experiment)
+
+
+@pytest.mark.skipif(platform.system() in ("Windows", "Darwin"), reason="Flaky on CI")
+@patch("opentelemetry.sdk.trace.export.BatchSpanProcessor.on_end")
+async def test_resumed_experiment_skips_completed_runs_and_evaluations(
+    _: Any,
+    db: DbSessionFactory,
+    httpx_clients: httpx.AsyncClient,
+    simple_dataset_with_one_experiment_run: Any,
+    dialect: str,
+) -> None:
+    if dialect == "postgresql":
+        pytest.xfail("This test fails on PostgreSQL")
+    async with db() as session:
+        session.add(
+            models.ExperimentRunAnnotation(
+                experiment_run_id=0,
+                name="existing",
+                annotator_kind="CODE",
+                score=1,
+                metadata_={},
+                start_time=datetime.now(timezone.utc),
+                end_time=datetime.now(timezone.utc),
+            )
+        )
+    test_dataset = Dataset(
+        id=str(GlobalID("Dataset", "0")),
+        version_id=str(GlobalID("DatasetVersion", "0")),
+        examples={
+            (id_ := str(GlobalID("DatasetExample", "0"))): Example(
+                id=id_,
+                input={"in": "foo"},
+                output={"out": "bar"},
+                metadata={},
+                updated_at=datetime.now(timezone.utc),
+            )
+        },
+    )
+    called = []
+
+    def task(input: Any) -> Any:
+        called.append("task")
+
+    def existing(output: Any) -> float:
+        called.append("existing")
+        return 0
+
+    with patch("phoenix.experiments.functions._phoenix_clients", return_value=httpx_clients):
+        experiment = run_experiment(
+            dataset=test_dataset,
+            task=task,
+            evaluators={"existing": existing},
+            experiment_id=str(GlobalID("Experiment", "0")),
+            print_summary=False,
+        )
+        with pytest.raises(ValueError):
+            run_experiment(
+                dataset=test_dataset,
+                task=task,
+                experiment_id=str(GlobalID("Experiment", "0")),
+                dry_run=True,
+            )
+    assert not called
+    assert experiment.id == str(GlobalID("Experiment", "0"))
+    assert list(experiment.runs) == [str(GlobalID("ExperimentRun", "0"))]
+    ((eval_run),) = experiment.eval_runs
+    assert eval_run.name == "existing"
+    assert eval_run.result and eval_run.result.score == 1
+
+
+def test_buffered_submitter_posts_batches_in_order() -> None:
+    batches: list[list[int]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        batch = json.loads(request.content)["data"]
+        if -1 in batch:
+            return httpx.Response(500)
+        batches.append(batch)
+        return httpx.Response(200, json={"data": [{"id": f"id-{i}"} for i in batch]})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler), base_url="http://test")
+    submitter = _BufferedSubmitter(client, "/bulk", max_batch_size=2, max_latency=60)
+    for i in range(3):
+        submitter.submit(f"key-{i}", i)
+    assert batches == [[0, 1]]
+    submitter.submit("failed", -1)  # the batch fails to post
+    submitter.submit("key-4", 4)
+    submitter.flush()
+    assert batches == [[0, 1], [4]]
+    assert submitter.ids == {"key-0": "id-0", "key-1": "id-1", "key-4": "id-4"}
+
+
+async def test_buffered_submitter_flushes_after_max_latency() -> None:
+    batches: list[list[int]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        batches.append(batch := json.loads(request.content)["data"])
+        return httpx.Response(200, json={"data": [{"id": f"id-{i}"} for i in batch]})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler), base_url="http://test")
+    submitter = _BufferedSubmitter(client, "/bulk", max_batch_size=100, max_latency=0.1)
+    await submitter.asubmit(0, 0)
+    await asyncio.sleep(0.1)
+    await submitter.asubmit(1, 1)
+    await submitter.asubmit(2, 2)
+    assert batches == [[0, 1]]
+    submitter.flush()
+    assert batches == [[0, 1], [2]]
+    assert submitter.ids == {0: "id-0", 1: "id-1", 2: "id-2"}
+
+
+@pytest.mark.parametrize("accepted", [True, False])
+def test_in_process_span_exporter(accepted: bool) -> None:
+    queued: list[tuple[Span, str]] = []
+
+    def queue_spans(spans: Iterable[tuple[Span, str]]) -> bool:
+        if accepted:
+            queued.extend(spans)
+        return accepted
+
+    fallback = InMemorySpanExporter()
+    tracer_provider = TracerProvider(resource=Resource({ResourceAttributes.PROJECT_NAME: "abc"}))
+    tracer_provider.add_span_processor(
+        SimpleSpanProcessor(InProcessSpanExporter(queue_spans, fallback=fallback))
+    )
+    with tracer_provider.get_tracer(__name__).start_as_current_span("root"):
+        pass
+    if accepted:
+        ((span, project_name),) = queued
+        assert span.name == "root"
+        assert project_name == "abc"
+        assert not fallback.get_finished_spans()
+    else:
+        assert not queued
+        assert [span.name for span in fallback.get_finished_spans()] == ["root"]
+
+
+def test_in_process_span_exporter_without_otlp_encoder(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(sys.modules, "opentelemetry.exporter.otlp.proto.common.trace_encoder", None)
+    queued: list[tuple[Span, str]] = []
+
+    def queue_spans(spans: Iterable[tuple[Span, str]]) -> bool:
+        queued.extend(spans)
+        return True
+
+    fallback = InMemorySpanExporter()
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(
+        SimpleSpanProcessor(InProcessSpanExporter(queue_spans, fallback=fallback))
+    )
+    with tracer_provider.get_tracer(__name__).start_as_current_span("root"):
+        pass
+    assert not queued
+    assert [span.name for span in fallback.get_finished_spans()] == ["root"]
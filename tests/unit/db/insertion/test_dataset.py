@@ -1,7 +1,17 @@
+from datetime import datetime, timezone
+
+import pytest
 from sqlalchemy import select
 
 from phoenix.db import models
-from phoenix.db.insertion.dataset import ExampleContent, add_dataset_examples
+from phoenix.db.insertion.dataset import (
+    ExampleContent,
+    RevisionKind,
+    add_dataset_examples,
+    insert_dataset_example_revision,
+    insert_dataset_example_revisions,
+    insert_dataset_version,
+)
 from phoenix.server.types import DbSessionFactory
 
 
@@ -37,3 +47,91 @@ async def test_create_dataset(
     assert rev.input == {"x": 11, "y": 22}
     assert rev.output == {"z": 33}
     assert rev.metadata_ == {"zz": 44}
+
+
+async def test_examples_are_inserted_in_chunks_in_order(
+    db: DbSessionFactory,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr("phoenix.db.insertion.dataset._MAX_EXAMPLES_PER_INSERT", 3)
+    async with db() as session:
+        await add_dataset_examples(
+            session=session,
+            examples=(ExampleContent(input={"i": i}) for i in range(10)),
+            name="abc",
+        )
+    async with db() as session:
+        revisions = (
+            await session.execute(
+                select(models.DatasetExample.id, models.DatasetExampleRevision.input)
+                .join(models.DatasetExampleRevision)
+                .order_by(models.DatasetExample.id)
+            )
+        ).all()
+    assert [input["i"] for _, input in revisions] == list(range(10))
+    assert len({example_id for example_id, _ in revisions}) == 10
+
+
+async def test_new_revisions_supersede_current_revisions(
+    db: DbSessionFactory,
+) -> None:
+    now = datetime.now(timezone.utc)
+    async with db() as session:
+        event = await add_dataset_examples(
+            session=session,
+            examples=[ExampleContent(input={"i": i}) for i in range(3)],
+            name="abc",
+        )
+        assert event is not None
+        dataset_id = event.dataset_id
+        version_ids = list(
+            await session.scalars(
+                select(models.DatasetVersion.id).where(
+                    models.DatasetVersion.dataset_id == dataset_id
+                )
+            )
+        )
+        example_ids = list(
+            await session.scalars(
+                select(models.DatasetExample.id)
+                .where(models.DatasetExample.dataset_id == dataset_id)
+                .order_by(models.DatasetExample.id)
+            )
+        )
+        version_ids.append(await insert_dataset_version(session, dataset_id, created_at=now))
+        await insert_dataset_example_revisions(
+            session,
+            version_ids[1],
+            example_ids[:2],
+            [ExampleContent(input={"i": -i}) for i in range(2)],
+            revision_kind=RevisionKind.PATCH,
+            created_at=now,
+        )
+        version_ids.append(await insert_dataset_version(session, dataset_id, created_at=now))
+        await insert_dataset_example_revision(
+            session,
+            version_ids[2],
+            example_ids[0],
+            input={},
+            output={},
+            revision_kind=RevisionKind.DELETE,
+            created_at=now,
+        )
+    async with db() as session:
+        revisions = (
+            await session.execute(
+                select(
+                    models.DatasetExampleRevision.dataset_example_id,
+                    models.DatasetExampleRevision.dataset_version_id,
+                    models.DatasetExampleRevision.superseded_by_dataset_version_id,
+                ).order_by(models.DatasetExampleRevision.id)
+            )
+        ).all()
+    assert revisions == [
+        (example_ids[0], version_ids[0], version_ids[1]),
+        (example_ids[1], version_ids[0], version_ids[1]),
+        (example_ids[2], version_ids[0], None),
+        (example_ids[0], version_ids[1], version_ids[2]),
+        (example_ids[1], version_ids[1], None),
+        (example_ids[0], version_ids[2], None),
+    ]
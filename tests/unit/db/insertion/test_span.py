@@ -0,0 +1,223 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy import select, update
+
+from phoenix.db import models
+from phoenix.db.insertion.cache import RowIdCache
+from phoenix.db.insertion.span import InsertedSpan, insert_span, insert_spans
+from phoenix.db.models import MAX_PREVIEW_LENGTH
+from phoenix.server.types import DbSessionFactory
+from phoenix.trace.dsl.filter import SpanFilter
+from phoenix.trace.schemas import Span, SpanContext, SpanKind, SpanStatusCode
+
+_T0 = datetime(2021, 1, 1, tzinfo=timezone.utc)
+
+
+def _span(
+    span_id: str,
+    parent_id: Optional[str] = None,
+    *,
+    trace_id: str = "t1",
+    start: int = 0,
+    end: int = 1,
+    error: bool = False,
+    prompt_tokens: Optional[int] = None,
+) -> Span:
+    attributes: dict[str, Any] = {}
+    if prompt_tokens is not None:
+        attributes["llm"] = {"token_count": {"prompt": prompt_tokens}}
+    return Span(
+        name=span_id,
+        context=SpanContext(trace_id=trace_id, span_id=span_id),
+        span_kind=SpanKind.CHAIN,
+        parent_id=parent_id,
+        start_time=_T0 + timedelta(seconds=start),
+        end_time=_T0 + timedelta(seconds=end),
+        status_code=SpanStatusCode.ERROR if error else SpanStatusCode.OK,
+        status_message="",
+        attributes=attributes,
+        events=[],
+        conversation=None,
+    )
+
+
+async def _cumulative_counts(db: DbSessionFactory) -> dict[str, tuple[int, int]]:
+    async with db() as session:
+        rows = await session.execute(
+            select(
+                models.Span.span_id,
+                models.Span.cumulative_error_count,
+                models.Span.cumulative_llm_token_count_prompt,
+            )
+        )
+        return {span_id: (errors, prompt) for span_id, errors, prompt in rows}
+
+
+class TestInsertSpans:
+    async def test_accumulates_counts_within_batch_and_from_database(
+        self,
+        db: DbSessionFactory,
+    ) -> None:
+        async with db() as session:
+            # a grandchild that already exists in the database
+            await insert_span(session, _span("d", "c", error=True, prompt_tokens=1), "abc")
+            # an ancestor that already exists in the database
+            await insert_span(session, _span("a"), "abc")
+        async with db() as session:
+            events = await insert_spans(
+                session,
+                (_span("c", "b", prompt_tokens=10), "abc"),
+                (_span("b", "a", error=True), "abc"),
+                (_span("x", trace_id="t2"), "xyz"),
+                (_span("b", "a", error=True), "abc"),  # duplicate within batch
+                (_span("a"), "abc"),  # duplicate of existing span
+            )
+        assert len(events) == 2
+        assert await _cumulative_counts(db) == {
+            "a": (2, 11),
+            "b": (2, 11),
+            "c": (1, 11),
+            "d": (1, 1),
+            "x": (0, 0),
+        }
+        async with db() as session:
+            projects = {p.name for p in await session.scalars(select(models.Project))}
+        assert projects == {"abc", "xyz"}
+
+    async def test_propagates_counts_to_existing_ancestors(
+        self,
+        db: DbSessionFactory,
+    ) -> None:
+        async with db() as session:
+            await insert_spans(
+                session,
+                (_span("a"), "abc"),
+                (_span("b", "a"), "abc"),
+                (_span("c", "b", prompt_tokens=1), "abc"),
+            )
+        async with db() as session:
+            await insert_spans(
+                session,
+                (_span("d", "b", prompt_tokens=10), "abc"),
+                (_span("e", "d", error=True, prompt_tokens=100), "abc"),
+                (_span("f", "c", error=True), "abc"),
+                (_span("g", "z", prompt_tokens=1000), "abc"),  # parent not yet arrived
+            )
+        assert await _cumulative_counts(db) == {
+            "a": (2, 111),
+            "b": (2, 111),
+            "c": (1, 1),
+            "d": (1, 110),
+            "e": (1, 100),
+            "f": (1, 0),
+            "g": (0, 1000),
+        }
+
+    async def test_returns_inserted_spans_and_trace_bounds(
+        self,
+        db: DbSessionFactory,
+    ) -> None:
+        async with db() as session:
+            await insert_spans(session, (_span("a", start=5, end=6), "abc"))
+        async with db() as session:
+            (event,) = await insert_spans(
+                session,
+                (_span("a", start=5, end=6), "abc"),  # duplicate
+                (_span("b", "a", start=3, end=4, prompt_tokens=7), "abc"),
+                (_span("c", trace_id="t2", start=1, end=2), "abc"),
+            )
+        assert sorted(event.spans) == [
+            InsertedSpan(_T0 + timedelta(seconds=1)),
+            InsertedSpan(_T0 + timedelta(seconds=3), llm_token_count_prompt=7),
+        ]
+        assert sorted(event.trace_bounds) == [
+            (_T0 + timedelta(seconds=1), _T0 + timedelta(seconds=2)),
+            (_T0 + timedelta(seconds=3), _T0 + timedelta(seconds=6)),
+        ]
+
+    async def test_widens_existing_trace_bounds(
+        self,
+        db: DbSessionFactory,
+    ) -> None:
+        async with db() as session:
+            await insert_spans(session, (_span("a", start=5, end=6), "abc"))
+        async with db() as session:
+            await insert_spans(
+                session,
+                (_span("b", "a", start=3, end=4), "abc"),
+                (_span("c", "a", start=4, end=8), "abc"),
+            )
+        async with db() as session:
+            traces = (await session.scalars(select(models.Trace))).all()
+        assert len(traces) == 1
+        assert traces[0].start_time == _T0 + timedelta(seconds=3)
+        assert traces[0].end_time == _T0 + timedelta(seconds=8)
+
+    async def test_skips_lookups_and_updates_for_cached_rows(
+        self,
+        db: DbSessionFactory,
+    ) -> None:
+        cache = RowIdCache()
+        async with db() as session:
+            await insert_spans(session, (_span("a", start=2, end=6), "abc"), cache=cache)
+        assert (project_rowid := cache.get_project_rowid("abc")) is not None
+        assert (cached := cache.get_trace("t1")) is not None
+        assert cached.project_rowid == project_rowid
+        async with db() as session:
+            # the cached bounds are trusted, so the trace is not touched if they cover the span
+            await session.execute(
+                update(models.Trace).values(start_time=_T0 + timedelta(seconds=4))
+            )
+        async with db() as session:
+            await insert_spans(session, (_span("b", "a", start=3, end=5), "abc"), cache=cache)
+        async with db() as session:
+            trace = await session.scalar(select(models.Trace))
+        assert trace is not None
+        assert trace.start_time == _T0 + timedelta(seconds=4)
+        async with db() as session:
+            await insert_spans(session, (_span("c", "a", start=1, end=5), "abc"), cache=cache)
+        async with db() as session:
+            trace = await session.scalar(select(models.Trace))
+        assert trace is not None
+        assert trace.start_time == _T0 + timedelta(seconds=1)
+        assert trace.end_time == _T0 + timedelta(seconds=6)
+        assert cache.get_trace("t1") == (trace.id, project_rowid, trace.start_time, trace.end_time)
+        cache.invalidate(project_rowid)
+        assert cache.get_project_rowid("abc") is None
+        assert cache.get_trace("t1") is None
+
+    async def test_materializes_previews_and_hot_attributes(
+        self,
+        db: DbSessionFactory,
+    ) -> None:
+        long_span = _span("a")
+        long_span.attributes.update(
+            {
+                "input": {"value": "x" * MAX_PREVIEW_LENGTH + "needle", "mime_type": "text/plain"},
+                "output": {"value": {"not": "a string"}},
+                "llm": {"model_name": "gpt-4o"},
+            }
+        )
+        short_span = _span("b", "a")
+        short_span.attributes.update({"input": {"value": "short needle"}})
+        async with db() as session:
+            await insert_spans(session, (long_span, "abc"), (short_span, "abc"))
+        async with db() as session:
+            spans = {span.span_id: span for span in await session.scalars(select(models.Span))}
+        assert spans["a"].input_preview == "x" * MAX_PREVIEW_LENGTH
+        assert spans["a"].input_mime_type == "text/plain"
+        assert spans["a"].output_preview is None
+        assert spans["a"].llm_model_name == "gpt-4o"
+        assert spans["b"].input_preview == "short needle"
+        assert spans["b"].llm_model_name is None
+        # substrings past the end of truncated previews are still found
+        async with db() as session:
+            span_ids = await session.scalars(
+                SpanFilter("'needle' in input.value")(select(models.Span.span_id))
+            )
+            assert sorted(span_ids) == ["a", "b"]
+            span_ids = await session.scalars(
+                SpanFilter("'needle' not in input.value")(select(models.Span.span_id))
+            )
+            assert not span_ids.all()
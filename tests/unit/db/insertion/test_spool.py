@@ -0,0 +1,197 @@
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+from google.protobuf.wrappers_pb2 import DoubleValue
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import phoenix.trace.v1 as pb
+from phoenix.db import models
+from phoenix.db.bulk_inserter import BulkInserter
+from phoenix.db.insertion.spool import SpanSpool
+from phoenix.server.types import DbSessionFactory
+from phoenix.trace.schemas import Span, SpanContext, SpanKind, SpanStatusCode
+
+
+def _span(i: int) -> Span:
+    return Span(
+        name=f"span-{i}",
+        context=SpanContext(trace_id=f"{i + 1:032x}", span_id=f"{i + 1:016x}"),
+        span_kind=SpanKind.CHAIN,
+        parent_id=None,
+        start_time=datetime(2021, 1, 1, tzinfo=timezone.utc),
+        end_time=datetime(2021, 1, 1, 0, 1, tzinfo=timezone.utc),
+        status_code=SpanStatusCode.OK,
+        status_message="",
+        attributes={"input": {"value": str(i)}},
+        events=[],
+        conversation=None,
+    )
+
+
+def _evaluation(i: int) -> pb.Evaluation:
+    return pb.Evaluation(
+        name="eval",
+        subject_id=pb.Evaluation.SubjectId(span_id=f"{i + 1:016x}"),
+        result=pb.Evaluation.Result(score=DoubleValue(value=i)),
+    )
+
+
+class TestSpanSpool:
+    def test_reads_in_order_and_deletes_committed_segments(self, tmp_path: Path) -> None:
+        spool = SpanSpool(tmp_path, max_segment_bytes=1)
+        assert spool.empty
+        for i in range(3):
+            spool.put_span(_span(i), "abc")
+        spool.put_evaluation(_evaluation(0))
+        assert spool.num_pending == 4
+        spool.flush()
+        spool.put_span(_span(3), "xyz")
+        spool.flush()
+        assert spool.num_pending == 0
+        assert len(list(tmp_path.iterdir())) == 2
+        spans, evaluations, position = spool.read(2)
+        assert [(s.name, p) for s, p in spans] == [("span-0", "abc"), ("span-1", "abc")]
+        assert spans[0][0].attributes["input"] == {"value": "0"}
+        assert evaluations == []
+        spool.commit(position)
+        assert not spool.empty
+        spans, evaluations, position = spool.read(100)
+        assert [(s.name, p) for s, p in spans] == [("span-2", "abc"), ("span-3", "xyz")]
+        assert evaluations == [_evaluation(0)]
+        spool.commit(position)
+        assert spool.empty
+        assert list(tmp_path.iterdir()) == []
+
+    def test_replays_uncommitted_records_after_restart(self, tmp_path: Path) -> None:
+        spool = SpanSpool(tmp_path)
+        for i in range(3):
+            spool.put_span(_span(i), "abc")
+        spool.flush()
+        _, _, position = spool.read(1)
+        spool.commit(position)
+        spool.read(100)  # not committed
+        spool.put_span(_span(3), "abc")
+        spool.flush()
+        spool.close()
+        # simulate a crash in the middle of a write
+        (segment,) = sorted(tmp_path.iterdir())[-1:]
+        with open(segment, "ab") as f:
+            f.write(b"\x01\x00\x00\x10\x00partial")
+        spool = SpanSpool(tmp_path)
+        assert not spool.empty
+        spans, _, position = spool.read(100)
+        assert [s.name for s, _ in spans] == ["span-0", "span-1", "span-2", "span-3"]
+        spool.commit(position)
+        assert spool.empty
+        assert list(tmp_path.iterdir()) == []
+
+
+async def test_bulk_inserter_inserts_spooled_spans(
+    db: DbSessionFactory,
+    tmp_path: Path,
+) -> None:
+    spool = SpanSpool(tmp_path)
+    spool.put_span(_span(0), "abc")  # left over from a previous run
+    spool.flush()
+    spool.close()
+    bulk_inserter = BulkInserter(
+        db,
+        event_queue=_EventQueue(),
+        sleep=0.001,
+        spool_dir=tmp_path,
+    )
+    async with bulk_inserter as (_, queue_span, queue_evaluation, _):
+        await queue_span(_span(1), "abc")
+        await queue_evaluation(_evaluation(1))
+        for _ in range(1000):
+            await asyncio.sleep(0.01)
+            if bulk_inserter._spool is not None and bulk_inserter._spool.empty:
+                break
+    async with db() as session:
+        assert await session.scalar(select(func.count(models.Span.id))) == 2
+        assert await session.scalar(select(func.count(models.SpanAnnotation.id))) == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_bulk_inserter_keeps_spooled_spans_until_committed(
+    db: DbSessionFactory,
+    tmp_path: Path,
+) -> None:
+    outages = 2
+
+    @contextlib.asynccontextmanager
+    async def flaky_db() -> AsyncIterator[AsyncSession]:
+        nonlocal outages
+        async with db() as session:
+            used = False
+
+            def on_begin(*_: Any) -> None:
+                nonlocal used
+                used = True
+
+            event.listen(session.sync_session, "after_begin", on_begin)
+            yield session
+            if used and outages:
+                outages -= 1
+                raise RuntimeError("The database is unavailable")
+
+    spool = SpanSpool(tmp_path)
+    spool.put_span(_span(0), "abc")
+    spool.flush()
+    spool.close()
+    bulk_inserter = BulkInserter(
+        DbSessionFactory(db=flaky_db, dialect=db.dialect.value),
+        event_queue=_EventQueue(),
+        sleep=0.001,
+        retry_delay_sec=0.001,
+        spool_dir=tmp_path,
+    )
+    async with bulk_inserter:
+        for _ in range(1000):
+            await asyncio.sleep(0.01)
+            if bulk_inserter._spool is not None and bulk_inserter._spool.empty:
+                break
+    assert not outages
+    async with db() as session:
+        assert await session.scalar(select(func.count(models.Span.id))) == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_bulk_inserter_waits_to_retry_failed_spool_reads(
+    db: DbSessionFactory,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    spool = SpanSpool(tmp_path)
+    spool.put_span(_span(0), "abc")
+    spool.flush()
+    spool.close()
+    bulk_inserter = BulkInserter(
+        db,
+        event_queue=_EventQueue(),
+        sleep=0.001,
+        retry_delay_sec=60,
+        spool_dir=tmp_path,
+    )
+    reads = 0
+
+    def read(*_: Any) -> Any:
+        nonlocal reads
+        reads += 1
+        raise OSError("The spool is unreadable")
+
+    assert bulk_inserter._spool is not None
+    monkeypatch.setattr(bulk_inserter._spool, "read", read)
+    async with bulk_inserter:
+        await asyncio.sleep(0.1)
+    assert reads == 1
+
+
+class _EventQueue:
+    def put(self, item: object) -> None: ...
@@ -0,0 +1,148 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+from sqlalchemy import func, make_url, select
+
+from phoenix.db import models
+from phoenix.db.bulk_inserter import BulkInserter, _AdaptiveBatchSize
+from phoenix.db.engines import aio_sqlite_engine
+from phoenix.server.app import _db
+from phoenix.server.dml_event import SpanInsertEvent
+from phoenix.server.types import DbSessionFactory
+from phoenix.trace.schemas import Span, SpanContext, SpanKind, SpanStatusCode
+
+
+def _span(trace_id: str, span_id: str, parent_id: Optional[str] = None) -> Span:
+    start_time = datetime(2021, 1, 1, tzinfo=timezone.utc)
+    return Span(
+        name=span_id,
+        context=SpanContext(trace_id=trace_id, span_id=span_id),
+        span_kind=SpanKind.LLM,
+        parent_id=parent_id,
+        start_time=start_time,
+        end_time=start_time + timedelta(seconds=1),
+        status_code=SpanStatusCode.OK,
+        status_message="",
+        attributes={"llm": {"token_count": {"prompt": 1}}},
+        events=[],
+        conversation=None,
+    )
+
+
+class _EventQueue(list[Any]):
+    def put(self, item: Any) -> None:
+        self.append(item)
+
+
+async def test_insert_spans_with_multiple_workers(db: DbSessionFactory) -> None:
+    event_queue = _EventQueue()
+    bulk_inserter = BulkInserter(db, event_queue=event_queue, num_workers=4)
+    spans = [
+        (_span(f"t{i}", f"t{i}-s{j}", f"t{i}-s{j - 1}" if j else None), f"p{i % 3}")
+        for i in range(20)
+        for j in range(3)
+    ]
+    await bulk_inserter._insert_spans(spans)
+    async with db() as session:
+        projects = {
+            name: id_
+            for name, id_ in await session.execute(select(models.Project.name, models.Project.id))
+        }
+        cumulative_counts = {
+            span_id: count
+            for span_id, count in await session.execute(
+                select(models.Span.span_id, models.Span.cumulative_llm_token_count_prompt)
+            )
+        }
+    assert set(projects) == {"p0", "p1", "p2"}
+    assert len(cumulative_counts) == 60
+    assert all(cumulative_counts[f"t{i}-s0"] == 3 for i in range(20))
+    (event,) = event_queue
+    assert isinstance(event, SpanInsertEvent)
+    assert set(event.ids) == set(projects.values())
+
+
+class TestAdaptiveBatchSize:
+    def test_converges_toward_target_duration_within_bounds(self) -> None:
+        batch_size = _AdaptiveBatchSize(100, min_size=10, max_size=1000, target_sec=0.5)
+        for _ in range(20):
+            batch_size.observe(batch_size.value, batch_size.value / 400)  # 400 spans/sec
+        assert 190 <= batch_size.value <= 200
+        for _ in range(20):
+            batch_size.observe(batch_size.value, batch_size.value / 1_000_000)
+        assert batch_size.value == 1000
+        for _ in range(20):
+            batch_size.observe(batch_size.value, 10.0)
+        assert batch_size.value == 10
+
+    def test_ignores_partial_batches_when_growing(self) -> None:
+        batch_size = _AdaptiveBatchSize(100, min_size=10, max_size=1000, target_sec=0.5)
+        batch_size.observe(5, 0.001)
+        assert batch_size.value == 100
+        batch_size.observe(5, 1.0)
+        assert batch_size.value < 100
+
+
+async def test_flushes_when_buffer_reaches_batch_size(db: DbSessionFactory) -> None:
+    event_queue = _EventQueue()
+    bulk_inserter = BulkInserter(
+        db,
+        event_queue=event_queue,
+        sleep=60,
+        max_latency=60,
+        max_ops_per_transaction=10,
+    )
+    async with bulk_inserter as (_, queue_span, _, _):
+        for i in range(9):
+            await queue_span(_span("t", f"s{i}"), "abc")
+        await asyncio.sleep(0.1)
+        assert len(bulk_inserter._spans) == 9
+        await queue_span(_span("t", "s9"), "abc")
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if event_queue:
+                break
+        assert not bulk_inserter._spans
+        assert isinstance(event_queue[0], SpanInsertEvent)
+    async with db() as session:
+        assert await session.scalar(select(func.count(models.Span.id))) == 10
+
+
+async def test_queue_spans_threadsafe(db: DbSessionFactory) -> None:
+    event_queue = _EventQueue()
+    bulk_inserter = BulkInserter(db, event_queue=event_queue, sleep=0.01, max_latency=0.01)
+    spans = [(_span("t", f"s{i}"), "abc") for i in range(3)]
+    assert not bulk_inserter.queue_spans_threadsafe(spans)  # not running
+    async with bulk_inserter:
+        assert await asyncio.to_thread(bulk_inserter.queue_spans_threadsafe, spans)
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if event_queue:
+                break
+        assert isinstance(event_queue[0], SpanInsertEvent)
+    async with db() as session:
+        assert await session.scalar(select(func.count(models.Span.id))) == 3
+
+
+def test_bulk_inserter_created_outside_of_event_loop(tmp_path: Path) -> None:
+    # The server creates the inserter before the event loop it runs in is started.
+    engine = aio_sqlite_engine(make_url(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"))
+    db = DbSessionFactory(db=_db(engine, bypass_lock=True), dialect=engine.dialect.name)
+    event_queue = _EventQueue()
+    bulk_inserter = BulkInserter(db, event_queue=event_queue, sleep=0.01, max_latency=0.01)
+
+    async def insert_span() -> Optional[int]:
+        async with bulk_inserter as (_, queue_span, _, _):
+            await queue_span(_span("t", "s"), "abc")
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if event_queue:
+                    break
+        async with db() as session:
+            count = await session.scalar(select(func.count(models.Span.id)))
+        await engine.dispose()
+        return count
+
+    assert asyncio.run(insert_span()) == 1
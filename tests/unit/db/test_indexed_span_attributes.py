@@ -0,0 +1,99 @@
+from ast import unparse
+from datetime import datetime, timezone
+from types import MappingProxyType
+
+import pytest
+from sqlalchemy import insert, select, text
+from sqlalchemy.dialects import sqlite
+
+from phoenix.db import indexed_span_attributes, models
+from phoenix.db.helpers import SupportedSQLDialect
+from phoenix.db.indexed_span_attributes import (
+    add_indexed_span_attribute,
+    get_column_name,
+    get_indexed_span_attributes,
+    remove_indexed_span_attribute,
+)
+from phoenix.server.types import DbSessionFactory
+from phoenix.trace.dsl.filter import get_span_filter
+
+
+@pytest.fixture(autouse=True)
+def _reset_registry(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(indexed_span_attributes, "_indexed_span_attributes", MappingProxyType({}))
+
+
+async def _insert_spans(db: DbSessionFactory) -> None:
+    t = datetime(2021, 1, 1, tzinfo=timezone.utc)
+    async with db() as session:
+        project_rowid = await session.scalar(
+            insert(models.Project).values(name="abc").returning(models.Project.id)
+        )
+        trace_rowid = await session.scalar(
+            insert(models.Trace)
+            .values(trace_id="t", project_rowid=project_rowid, start_time=t, end_time=t)
+            .returning(models.Trace.id)
+        )
+        await session.execute(
+            insert(models.Span),
+            [
+                dict(
+                    trace_rowid=trace_rowid,
+                    span_id=span_id,
+                    name=span_id,
+                    span_kind="CHAIN",
+                    start_time=t,
+                    end_time=t,
+                    attributes=attributes,
+                    events=[],
+                    status_code="OK",
+                    status_message="",
+                    cumulative_error_count=0,
+                    cumulative_llm_token_count_prompt=0,
+                    cumulative_llm_token_count_completion=0,
+                )
+                for span_id, attributes in (
+                    ("a", {"metadata": {"tenant": "x", "it's": "y"}}),
+                    ("b", {"metadata": {"tenant": "y", "it's": "x"}}),
+                    ("c", {}),
+                )
+            ],
+        )
+
+
+async def _span_ids(db: DbSessionFactory, condition: str) -> list[str]:
+    stmt = get_span_filter(condition)(select(models.Span.span_id))
+    async with db() as session:
+        return sorted(await session.scalars(stmt))
+
+
+@pytest.mark.parametrize("path", [("metadata", "tenant"), ("metadata", "it's")])
+async def test_add_and_remove_indexed_span_attribute(
+    db: DbSessionFactory,
+    path: tuple[str, ...],
+) -> None:
+    await _insert_spans(db)
+    key = f'metadata["{path[-1]}"]'
+    expected = await _span_ids(db, f"{key} == 'x'")
+    assert len(expected) == 1
+    assert await add_indexed_span_attribute(db, path)
+    assert not await add_indexed_span_attribute(db, path)
+    column_name = get_column_name(path)
+    assert get_indexed_span_attributes() == {path: column_name}
+    f = get_span_filter(f"{key} == 'x' or {key} in ('z',)")
+    assert column_name in unparse(f.translated)
+    assert await _span_ids(db, f"{key} == 'x'") == expected
+    assert await _span_ids(db, f"{key} != 'x'") != expected
+    if db.dialect is SupportedSQLDialect.SQLITE:
+        stmt = get_span_filter(f"{key} == 'x'")(select(models.Span.id))
+        async with db() as session:
+            compiled = stmt.compile(
+                dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}
+            )
+            plan = await session.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))
+            assert f"ix_spans_{column_name}" in str(plan.all())
+    assert await remove_indexed_span_attribute(db, path)
+    assert not await remove_indexed_span_attribute(db, path)
+    assert get_indexed_span_attributes() == {}
+    assert column_name not in unparse(get_span_filter(f"{key} == 'x'").translated)
+    assert await _span_ids(db, f"{key} == 'x'") == expected
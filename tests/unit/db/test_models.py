@@ -1,6 +1,7 @@
 from typing import Any
 
 from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
 
 from phoenix.db import models
 from phoenix.server.types import DbSessionFactory
@@ -36,3 +37,15 @@ async def test_empty_projects(
     async with db() as session:
         result = (await session.execute(statement)).scalars().first()
     assert not result
+
+
+def test_text_preview_contains_uses_like_on_postgresql() -> None:
+    expression = models.TextPreviewContains(
+        models.Span.input_preview,
+        models.Span.attributes["input", "value"].as_string(),
+        "50%_off\\",
+    )
+    compiled = expression.compile(dialect=postgresql.dialect())  # type: ignore[no-untyped-call]
+    assert "spans.input_preview LIKE %(" in str(compiled)
+    assert "char_length(spans.input_preview) >=" in str(compiled)
+    assert "%50\\%\\_off\\\\%" in compiled.params.values()
@@ -142,6 +142,7 @@ async def empty_dataset(db: DbSessionFactory) -> None:
             id=1,
             dataset_example_id=1,
             dataset_version_id=1,
+            superseded_by_dataset_version_id=2,
             input={"in": "foo"},
             output={"out": "bar"},
             metadata_={"info": "first revision"},
@@ -154,6 +155,7 @@ async def empty_dataset(db: DbSessionFactory) -> None:
             id=2,
             dataset_example_id=2,
             dataset_version_id=1,
+            superseded_by_dataset_version_id=2,
             input={"in": "foofoo"},
             output={"out": "barbar"},
             metadata_={"info": "first revision"},
@@ -175,6 +177,7 @@ async def empty_dataset(db: DbSessionFactory) -> None:
             id=3,
             dataset_example_id=1,
             dataset_version_id=2,
+            superseded_by_dataset_version_id=3,
             input={"in": "FOO"},
             output={"out": "BAR"},
             metadata_={"info": "all caps revision"},
@@ -187,6 +190,7 @@ async def empty_dataset(db: DbSessionFactory) -> None:
             id=4,
             dataset_example_id=2,
             dataset_version_id=2,
+            superseded_by_dataset_version_id=3,
             input={"in": "FOOFOO"},
             output={"out": "BARBAR"},
             metadata_={"info": "all caps revision"},
@@ -287,6 +291,7 @@ async def dataset_with_revisions(db: DbSessionFactory) -> None:
             id=8,
             dataset_example_id=4,
             dataset_version_id=4,
+            superseded_by_dataset_version_id=5,
             input={"in": "foofoo"},
             output={"out": "barbar"},
             metadata_={"info": "first revision"},
@@ -394,6 +399,7 @@ async def dataset_with_revisions(db: DbSessionFactory) -> None:
             id=11,
             dataset_example_id=example_6.id,
             dataset_version_id=dataset_version_6.id,
+            superseded_by_dataset_version_id=dataset_version_7.id,
             input={"in": "look at us"},
             output={"out": "we have all the answers"},
             metadata_={"info": "a new example"},
@@ -418,6 +424,7 @@ async def dataset_with_revisions(db: DbSessionFactory) -> None:
             id=13,
             dataset_example_id=example_7.id,
             dataset_version_id=dataset_version_8.id,
+            superseded_by_dataset_version_id=dataset_version_9.id,
             input={"in": "look at me"},
             output={"out": "i have all the answers"},
             metadata_={"info": "a newer example"},
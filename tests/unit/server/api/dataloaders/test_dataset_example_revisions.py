@@ -0,0 +1,35 @@
+from typing import Optional
+
+from phoenix.server.api.dataloaders import DatasetExampleRevisionsDataLoader
+from phoenix.server.api.exceptions import NotFound
+from phoenix.server.api.types.DatasetExampleRevision import RevisionKind
+from phoenix.server.types import DbSessionFactory
+
+
+async def test_dataset_example_revisions(
+    db: DbSessionFactory,
+    dataset_with_revisions: None,
+) -> None:
+    keys: list[tuple[int, Optional[int]]] = [
+        (4, None),
+        (4, 4),
+        (4, 5),
+        (6, 6),
+        (6, 7),  # deleted
+        (6, 5),  # not created yet
+        (3, 999),  # no such version
+        (999, None),  # no such example
+    ]
+    results = await DatasetExampleRevisionsDataLoader(db)._load_fn(keys)
+    assert [
+        None if isinstance(result, NotFound) else result.revision_kind for result in results
+    ] == [
+        RevisionKind.PATCH,
+        RevisionKind.CREATE,
+        RevisionKind.PATCH,
+        RevisionKind.CREATE,
+        None,
+        None,
+        None,
+        None,
+    ]
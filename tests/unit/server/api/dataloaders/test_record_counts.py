@@ -1,12 +1,14 @@
-from datetime import datetime
+import asyncio
+from datetime import datetime, timedelta
 from typing import Literal
 
 import pandas as pd
 from sqlalchemy import func, select
 
 from phoenix.db import models
+from phoenix.db.insertion.span import InsertedSpan
 from phoenix.server.api.dataloaders import RecordCountDataLoader
-from phoenix.server.api.dataloaders.record_counts import Key
+from phoenix.server.api.dataloaders.record_counts import Key, RecordCountCache
 from phoenix.server.api.input_types.TimeRange import TimeRange
 from phoenix.server.types import DbSessionFactory
 
@@ -56,3 +58,29 @@ async def test_record_counts(
 
     actual = await RecordCountDataLoader(db)._load_fn(keys)
     assert actual == expected
+
+
+async def test_record_count_cache_is_invalidated_by_inserted_spans() -> None:
+    cache = RecordCountCache()
+    t0 = datetime.fromisoformat("2021-01-01T00:00:00.000+00:00")
+    hour = timedelta(hours=1)
+    earlier = TimeRange(start=t0 - hour, end=t0)
+    current = TimeRange(start=t0, end=t0 + hour)
+    keys: list[Key] = [
+        ("span", 1, earlier, None),
+        ("span", 1, current, None),
+        ("span", 1, None, None),
+        ("span", 1, current, "span_kind == 'LLM'"),
+        ("trace", 1, earlier, None),
+        ("trace", 1, current, None),
+        ("span", 2, current, None),
+    ]
+    loop = asyncio.get_running_loop()
+    for key in keys:
+        future: asyncio.Future[int] = loop.create_future()
+        future.set_result(10)
+        cache.set(key, future)
+    spans = [InsertedSpan(t0 + timedelta(minutes=i)) for i in range(3)]
+    cache.on_spans_inserted(1, spans, [(t0, t0 + timedelta(minutes=5))])
+    results = [f.result() if (f := cache.get(key)) else None for key in keys]
+    assert results == [10, None, None, None, 10, None, 10]
@@ -1,12 +1,14 @@
-from datetime import datetime
-from typing import Literal
+import asyncio
+from datetime import datetime, timedelta
+from typing import Literal, Optional
 
 import pandas as pd
 from sqlalchemy import func, select
 
 from phoenix.db import models
+from phoenix.db.insertion.span import InsertedSpan
 from phoenix.server.api.dataloaders import TokenCountDataLoader
-from phoenix.server.api.dataloaders.token_counts import Key
+from phoenix.server.api.dataloaders.token_counts import Key, TokenCountCache
 from phoenix.server.api.input_types.TimeRange import TimeRange
 from phoenix.server.types import DbSessionFactory
 
@@ -55,3 +57,32 @@ async def test_token_counts(
     ]
     actual = await TokenCountDataLoader(db)._load_fn(keys)
     assert actual == expected
+
+
+async def test_token_count_cache_is_invalidated_by_inserted_spans() -> None:
+    cache = TokenCountCache()
+    t0 = datetime.fromisoformat("2021-01-01T00:00:00.000+00:00")
+    time_range = TimeRange(start=t0, end=t0 + timedelta(hours=1))
+    loop = asyncio.get_running_loop()
+    keys: list[Key] = [
+        ("prompt", 1, time_range, None),
+        ("completion", 1, time_range, None),
+        ("total", 1, time_range, None),
+        ("total", 1, time_range, "span_kind == 'LLM'"),
+        ("completion", 1, TimeRange(start=t0 - timedelta(hours=1), end=t0), None),
+    ]
+    for key, result in zip(keys, [None, 5, 5, 5, 5]):
+        future: asyncio.Future[Optional[int]] = loop.create_future()
+        future.set_result(result)
+        cache.set(key, future)
+    pending_key: Key = ("prompt", 1, None, None)
+    cache.set(pending_key, loop.create_future())
+    spans = [
+        InsertedSpan(t0, llm_token_count_prompt=1, llm_token_count_completion=2),
+        InsertedSpan(t0, llm_token_count_prompt=10),
+        InsertedSpan(t0 - timedelta(seconds=1), llm_token_count_prompt=100),
+    ]
+    cache.on_spans_inserted(1, spans)
+    results = [f.result() if (f := cache.get(key)) else None for key in keys]
+    assert results == [None, None, None, None, 5]
+    assert cache.get(pending_key) is None
@@ -5,7 +5,7 @@ from typing import Any
 import httpx
 import pytest
 import pytz
-from sqlalchemy import insert, select
+from sqlalchemy import insert, select, update
 from strawberry.relay import GlobalID
 
 from phoenix.config import DEFAULT_PROJECT_NAME
@@ -880,6 +880,11 @@ async def dataset_with_revisions(db: DbSessionFactory) -> None:
         )
 
         # insert revisions for second version
+        await session.execute(
+            update(models.DatasetExampleRevision)
+            .where(models.DatasetExampleRevision.dataset_example_id == example_id_3)
+            .values(superseded_by_dataset_version_id=version_id_2)
+        )
         await session.execute(
             insert(models.DatasetExampleRevision).values(
                 dataset_example_id=example_id_3,
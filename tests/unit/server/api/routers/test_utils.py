@@ -0,0 +1,50 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+import pyarrow as pa
+import pytest
+
+from phoenix.server.api.routers.utils import AsyncRecordBatchReader, table_to_bytes
+
+
+class TestAsyncRecordBatchReader:
+    async def test_reads_batches_incrementally(self) -> None:
+        table = pa.table({"x": list(range(100))})
+        data = table_to_bytes(pa.Table.from_batches(table.to_batches(max_chunksize=10)))
+        num_chunks_read = 0
+
+        async def stream() -> AsyncIterator[bytes]:
+            nonlocal num_chunks_read
+            for i in range(0, len(data), 64):
+                num_chunks_read += 1
+                yield data[i : i + 64]
+
+        batches = []
+        async with AsyncRecordBatchReader(stream(), max_in_flight=1) as reader:
+            assert reader.schema == table.schema
+            async for batch in reader:
+                if not batches:
+                    await asyncio.sleep(0.1)
+                    # the reader stays at most one batch ahead of the consumer
+                    assert num_chunks_read < len(data) // 64
+                batches.append(batch)
+        assert pa.Table.from_batches(batches).equals(table)
+
+    async def test_raises_on_invalid_stream(self) -> None:
+        async def stream() -> AsyncIterator[bytes]:
+            yield b"not arrow"
+
+        with pytest.raises(pa.ArrowInvalid):
+            async with AsyncRecordBatchReader(stream(), max_in_flight=1):
+                pass
+
+    async def test_stops_reading_when_exited_early(self) -> None:
+        table = pa.table({"x": list(range(100))})
+        data = table_to_bytes(pa.Table.from_batches(table.to_batches(max_chunksize=1)))
+
+        async def stream() -> AsyncIterator[bytes]:
+            yield data
+
+        async with AsyncRecordBatchReader(stream(), max_in_flight=1) as reader:
+            async for _ in reader:
+                break
@@ -2,7 +2,9 @@ import gzip
 import inspect
 import io
 import json
+import zlib
 from io import BytesIO, StringIO
+from random import Random
 from typing import Any
 
 import httpx
@@ -429,6 +431,58 @@ async def test_get_dataset_jsonl_openai_evals(
     }
 
 
+async def test_get_dataset_downloads_are_streamed_partition_by_partition(
+    httpx_client: httpx.AsyncClient,
+    dataset_with_revisions: Any,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr("phoenix.server.api.routers.v1.datasets._MAX_EXAMPLES_PER_PARTITION", 2)
+    dataset_global_id = GlobalID("Dataset", str(2))
+    response = await httpx_client.get(f"/v1/datasets/{dataset_global_id}/csv")
+    assert response.status_code == 200
+    assert response.text == (
+        "example_id,input_in,output_out,metadata_info\n"
+        "RGF0YXNldEV4YW1wbGU6Mw==,foo,bar,first revision\n"
+        "RGF0YXNldEV4YW1wbGU6NA==,updated foofoo,updated barbar,updating revision\n"
+        "RGF0YXNldEV4YW1wbGU6NQ==,look at me,i have all the answers,a new example\n"
+    )
+    response = await httpx_client.get(f"/v1/datasets/{dataset_global_id}/arrow")
+    assert response.status_code == 200
+    assert response.headers.get("content-type") == "application/x-pandas-arrow"
+    assert (
+        response.headers.get("content-disposition")
+        == 'attachment; filename="revised dataset.arrow"'
+    )
+    with pa.ipc.open_stream(response.content) as reader:
+        batches = list(reader)
+    assert [batch.num_rows for batch in batches] == [2, 1]
+    table = pa.Table.from_batches(batches)
+    assert table.column("id").to_pylist() == [
+        str(GlobalID("DatasetExample", str(i))) for i in (3, 4, 5)
+    ]
+    assert [json.loads(value) for value in table.column("input").to_pylist()] == [
+        {"in": "foo"},
+        {"in": "updated foofoo"},
+        {"in": "look at me"},
+    ]
+    assert [json.loads(value) for value in table.column("metadata").to_pylist()] == [
+        {"info": "first revision"},
+        {"info": "updating revision"},
+        {"info": "a new example"},
+    ]
+
+
+async def test_get_dataset_arrow_of_empty_dataset(
+    httpx_client: httpx.AsyncClient,
+    empty_dataset: Any,
+) -> None:
+    dataset_global_id = GlobalID("Dataset", str(1))
+    response = await httpx_client.get(f"/v1/datasets/{dataset_global_id}/arrow")
+    assert response.status_code == 200
+    with pa.ipc.open_stream(response.content) as reader:
+        assert reader.read_all().num_rows == 0
+
+
 async def test_post_dataset_upload_json_create_then_append(
     httpx_client: httpx.AsyncClient,
     db: DbSessionFactory,
@@ -535,6 +589,43 @@ async def test_post_dataset_upload_csv_create_then_append(
     assert revisions[1].metadata_ == {"c": "33", "d": "44", "e": "55"}
 
 
+# long enough, even compressed, for the header to be read without reaching the end
+_ROWS = b"a,b\n" + b"".join(
+    b"%d,%s\n" % (i, Random(i).randbytes(100).hex().encode()) for i in range(1000)
+)
+
+
+@pytest.mark.parametrize(
+    "file,encoding",
+    [
+        pytest.param(_ROWS + b"\xff,1\n", "none", id="invalid-utf8"),
+        pytest.param(gzip.compress(_ROWS)[:-100], "gzip", id="truncated-gzip"),
+        pytest.param(
+            (compressed := zlib.compress(_ROWS))[: len(compressed) // 2]
+            + bytes(b ^ 0xFF for b in compressed[len(compressed) // 2 :]),
+            "deflate",
+            id="corrupted-deflate",
+        ),
+    ],
+)
+async def test_post_dataset_upload_csv_invalid_after_header(
+    httpx_client: httpx.AsyncClient,
+    db: DbSessionFactory,
+    file: bytes,
+    encoding: str,
+) -> None:
+    name = inspect.stack()[0][3]
+    response = await httpx_client.post(
+        url="v1/datasets/upload?sync=true",
+        files={"file": (" ", file, "text/csv", {"Content-Encoding": encoding})},
+        data={"action": "create", "name": name, "input_keys[]": ["a"]},
+    )
+    assert response.status_code == 422
+    assert response.text == "File is not valid CSV"
+    async with db() as session:
+        assert await session.scalar(select(models.Dataset.id)) is None
+
+
 async def test_post_dataset_upload_pyarrow_create_then_append(
     httpx_client: httpx.AsyncClient,
     db: DbSessionFactory,
@@ -600,6 +691,54 @@ async def test_post_dataset_upload_pyarrow_create_then_append(
     assert revisions[1].metadata_ == {"c": 33, "d": 44, "e": 55}
 
 
+async def test_post_dataset_upload_is_parsed_incrementally(
+    httpx_client: httpx.AsyncClient,
+    db: DbSessionFactory,
+) -> None:
+    rows = [f"{i},{i * 2}" for i in range(2500)]
+    compressor = zlib.compressobj()
+    csv_file = compressor.compress("\n".join(["a,b", *rows]).encode()) + compressor.flush()
+    table = pa.Table.from_pandas(pd.DataFrame({"a": range(2500), "b": range(0, 5000, 2)}))
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table, max_chunksize=1000)
+    files = {
+        "csv": (" ", csv_file, "text/csv", {"Content-Encoding": "deflate"}),
+        "pyarrow": (" ", sink.getvalue().to_pybytes(), "application/x-pandas-pyarrow", {}),
+    }
+    for name, file in files.items():
+        response = await httpx_client.post(
+            url="v1/datasets/upload?sync=true",
+            files={"file": file},
+            data={"name": name, "input_keys[]": ["a"], "output_keys[]": ["b"]},
+        )
+        assert response.status_code == 200
+        async with db() as session:
+            revisions = list(
+                await session.scalars(
+                    select(models.DatasetExampleRevision)
+                    .join(models.DatasetExample)
+                    .join_from(models.DatasetExample, models.Dataset)
+                    .where(models.Dataset.name == name)
+                    .order_by(models.DatasetExample.id)
+                )
+            )
+        assert [(int(r.input["a"]), int(r.output["b"])) for r in revisions] == [
+            (i, i * 2) for i in range(2500)
+        ]
+
+
+async def test_post_dataset_upload_rejects_invalid_gzip(
+    httpx_client: httpx.AsyncClient,
+) -> None:
+    response = await httpx_client.post(
+        url="v1/datasets/upload?sync=true",
+        files={"file": (" ", b"a,b\n1,2\n", "text/csv", {"Content-Encoding": "gzip"})},
+        data={"name": "abc", "input_keys[]": ["a"], "output_keys[]": ["b"]},
+    )
+    assert response.status_code == 422
+
+
 async def test_delete_dataset(
     httpx_client: httpx.AsyncClient,
     empty_dataset: Any,
@@ -854,3 +993,41 @@ async def test_list_dataset_with_revisions_examples_at_each_version(
     result = response.json()
     data = result["data"]
     assert len(data["examples"]) == 3
+
+
+async def test_get_dataset_examples_are_paginated(
+    httpx_client: httpx.AsyncClient,
+    dataset_with_revisions: Any,
+) -> None:
+    global_id = GlobalID("Dataset", str(2))
+    v8 = GlobalID("DatasetVersion", str(8))
+    params = {"version_id": str(v8), "limit": 3}
+    response = await httpx_client.get(f"/v1/datasets/{global_id}/examples", params=params)
+    assert response.status_code == 200
+    result = response.json()
+    assert [example["id"] for example in result["data"]["examples"]] == [
+        str(GlobalID("DatasetExample", str(i))) for i in (3, 4, 5)
+    ]
+    assert result["next_cursor"] == str(GlobalID("DatasetExample", str(7)))
+    params["cursor"] = result["next_cursor"]
+    response = await httpx_client.get(f"/v1/datasets/{global_id}/examples", params=params)
+    assert response.status_code == 200
+    result = response.json()
+    assert result["data"]["version_id"] == str(v8)
+    assert [example["id"] for example in result["data"]["examples"]] == [
+        str(GlobalID("DatasetExample", str(7)))
+    ]
+    assert result["next_cursor"] is None
+
+
+async def test_get_dataset_examples_422s_with_invalid_cursor(
+    httpx_client: httpx.AsyncClient,
+    dataset_with_revisions: Any,
+) -> None:
+    global_id = GlobalID("Dataset", str(2))
+    response = await httpx_client.get(
+        f"/v1/datasets/{global_id}/examples",
+        params={"cursor": str(GlobalID("Dataset", str(2))), "limit": 1},
+    )
+    assert response.status_code == 422
+    assert "Invalid cursor format" in response.text
@@ -0,0 +1,273 @@
+from collections.abc import AsyncIterator
+from datetime import datetime
+from io import BytesIO
+
+import httpx
+import pandas as pd
+import pyarrow as pa
+import pytest
+from sqlalchemy import insert, select, update
+
+from phoenix.db import models
+from phoenix.server.api.routers.utils import table_to_bytes
+from phoenix.server.types import DbSessionFactory
+from phoenix.trace import DocumentEvaluations, Evaluations, SpanEvaluations, TraceEvaluations
+
+
+@pytest.fixture
+async def project_with_a_retriever_span(db: DbSessionFactory) -> None:
+    async with db() as session:
+        project_rowid = await session.scalar(
+            insert(models.Project).values(name="project-name").returning(models.Project.id)
+        )
+        trace_rowid = await session.scalar(
+            insert(models.Trace)
+            .values(
+                trace_id="trace-0",
+                project_rowid=project_rowid,
+                start_time=datetime.fromisoformat("2021-01-01T00:00:00.000+00:00"),
+                end_time=datetime.fromisoformat("2021-01-01T00:01:00.000+00:00"),
+            )
+            .returning(models.Trace.id)
+        )
+        await session.execute(
+            insert(models.Span).values(
+                trace_rowid=trace_rowid,
+                span_id="span-0",
+                parent_id=None,
+                name="retriever span",
+                span_kind="RETRIEVER",
+                start_time=datetime.fromisoformat("2021-01-01T00:00:00.000+00:00"),
+                end_time=datetime.fromisoformat("2021-01-01T00:00:30.000+00:00"),
+                attributes={"retrieval": {"documents": [{}, {}]}},
+                events=[],
+                status_code="OK",
+                status_message="okay",
+                cumulative_error_count=0,
+                cumulative_llm_token_count_prompt=0,
+                cumulative_llm_token_count_completion=0,
+            )
+        )
+
+
+async def test_pyarrow_evaluations_are_upserted(
+    httpx_client: httpx.AsyncClient,
+    db: DbSessionFactory,
+    project_with_a_retriever_span: None,
+) -> None:
+    evaluations = [
+        SpanEvaluations(
+            eval_name="correctness",
+            dataframe=pd.DataFrame(
+                {"score": [1.0, float("nan"), 0.0], "label": ["good", "bad", "ugly"]},
+                index=pd.Index(["span-0", "span-0", "missing"], name="context.span_id"),
+            ),
+        ),
+        TraceEvaluations(
+            eval_name="correctness",
+            dataframe=pd.DataFrame(
+                {"explanation": ["fine"]},
+                index=pd.Index(["trace-0"], name="trace_id"),
+            ),
+        ),
+        DocumentEvaluations(
+            eval_name="relevance",
+            dataframe=pd.DataFrame(
+                {
+                    "span_id": ["span-0", "span-0", "span-0"],
+                    "position": [1, 0, 2],  # position 2 is out of bounds
+                    "score": [1, 0, 1],
+                }
+            ),
+        ),
+    ]
+    for evals in evaluations:
+        response = await httpx_client.post(
+            "v1/evaluations",
+            content=table_to_bytes(evals.to_pyarrow_table()),
+            headers={"content-type": "application/x-pandas-arrow"},
+        )
+        assert response.is_success
+    async with db() as session:
+        span_annotations = (await session.scalars(select(models.SpanAnnotation))).all()
+        trace_annotations = (await session.scalars(select(models.TraceAnnotation))).all()
+        document_annotations = (
+            await session.scalars(
+                select(models.DocumentAnnotation).order_by(
+                    models.DocumentAnnotation.document_position
+                )
+            )
+        ).all()
+    assert [(a.name, a.score, a.label) for a in span_annotations] == [("correctness", None, "bad")]
+    assert [(a.name, a.explanation) for a in trace_annotations] == [("correctness", "fine")]
+    assert [(a.document_position, a.score) for a in document_annotations] == [(0, 0), (1, 1)]
+    assert all(
+        a.annotator_kind == "LLM"
+        for a in (*span_annotations, *trace_annotations, *document_annotations)
+    )
+
+
+async def test_invalid_pyarrow_evaluations_are_rejected(
+    httpx_client: httpx.AsyncClient,
+) -> None:
+    evals = SpanEvaluations(
+        eval_name="correctness",
+        dataframe=pd.DataFrame({"score": [1.0]}, index=pd.Index(["span-0"], name="span_id")),
+    )
+    table = evals.to_pyarrow_table().rename_columns(["score", "not_a_span_id"])
+    response = await httpx_client.post(
+        "v1/evaluations",
+        content=table_to_bytes(table),
+        headers={"content-type": "application/x-pandas-arrow"},
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("as_index", [True, False])
+async def test_invalid_pyarrow_evaluation_batches_are_rejected_after_earlier_batches(
+    httpx_client: httpx.AsyncClient,
+    db: DbSessionFactory,
+    project_with_a_retriever_span: None,
+    as_index: bool,
+) -> None:
+    evals = DocumentEvaluations(
+        eval_name="relevance",
+        dataframe=pd.DataFrame(
+            {"span_id": ["span-0", "span-0"], "position": [0, 1], "score": [1.0, 0.0]}
+        ),
+    )
+    table = evals.to_pyarrow_table()
+    if not as_index:  # the index columns are then validated by their dtypes
+        table = table.replace_schema_metadata({b"arize": table.schema.metadata[b"arize"]})
+    first, second = table.to_batches(max_chunksize=1)
+    position = second.schema.get_field_index("document_position")
+    second = second.set_column(  # only the second batch has a null position
+        position, "document_position", pa.array([None], type=pa.int64())
+    )
+    response = await httpx_client.post(
+        "v1/evaluations",
+        content=table_to_bytes(pa.Table.from_batches([first, second])),
+        headers={"content-type": "application/x-pandas-arrow"},
+    )
+    assert response.status_code == 422
+    async with db() as session:
+        positions = (
+            await session.scalars(select(models.DocumentAnnotation.document_position))
+        ).all()
+    assert positions == [0]  # the batch before the invalid one is kept
+
+
+async def test_pyarrow_evaluations_are_streamed(
+    httpx_client: httpx.AsyncClient,
+    db: DbSessionFactory,
+    project_with_a_retriever_span: None,
+) -> None:
+    evals = SpanEvaluations(
+        eval_name="correctness",
+        dataframe=pd.DataFrame(
+            {"score": [float(i) for i in range(5)]},
+            index=pd.Index(["span-0"] * 5, name="span_id"),
+        ),
+    )
+    table = evals.to_pyarrow_table()
+    data = table_to_bytes(pa.Table.from_batches(table.to_batches(max_chunksize=1)))
+
+    async def content() -> AsyncIterator[bytes]:
+        for i in range(0, len(data), 100):
+            yield data[i : i + 100]
+
+    response = await httpx_client.post(
+        "v1/evaluations",
+        content=content(),
+        headers={"content-type": "application/x-pandas-arrow"},
+    )
+    assert response.is_success
+    async with db() as session:
+        scores = (await session.scalars(select(models.SpanAnnotation.score))).all()
+    assert scores == [4.0]
+
+
+async def test_evaluations_are_paginated_and_filtered_by_update_time(
+    httpx_client: httpx.AsyncClient,
+    db: DbSessionFactory,
+    project_with_a_retriever_span: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        "phoenix.server.api.routers.v1.evaluations._MAX_EVALUATIONS_PER_PARTITION", 2
+    )
+    evaluations = [
+        TraceEvaluations(
+            eval_name="a",
+            dataframe=pd.DataFrame({"score": [0.0]}, index=pd.Index(["trace-0"], name="trace_id")),
+        ),
+        *(
+            SpanEvaluations(
+                eval_name=name,
+                dataframe=pd.DataFrame(
+                    {"score": [1.0]}, index=pd.Index(["span-0"], name="span_id")
+                ),
+            )
+            for name in "abc"
+        ),
+        DocumentEvaluations(
+            eval_name="r",
+            dataframe=pd.DataFrame({"span_id": ["span-0", "span-0"], "position": [0, 1]}).assign(
+                label=["x", "y"]
+            ),
+        ),
+    ]
+    for evals in evaluations:
+        response = await httpx_client.post(
+            "v1/evaluations",
+            content=table_to_bytes(evals.to_pyarrow_table()),
+            headers={"content-type": "application/x-pandas-arrow"},
+        )
+        assert response.is_success
+    params = {"project_name": "project-name", "limit": 4}
+    response = await httpx_client.get("v1/evaluations", params=params)
+    assert response.status_code == 200
+    assert sorted((type(e).__name__, e.eval_name, len(e)) for e in _read(response)) == [
+        ("SpanEvaluations", "a", 1),
+        ("SpanEvaluations", "b", 1),
+        ("SpanEvaluations", "c", 1),
+        ("TraceEvaluations", "a", 1),
+    ]
+    assert (cursor := response.headers.get("x-next-cursor"))
+    response = await httpx_client.get("v1/evaluations", params={**params, "cursor": cursor})
+    assert response.status_code == 200
+    (document_evals,) = _read(response)
+    assert isinstance(document_evals, DocumentEvaluations)
+    assert document_evals.dataframe.label.to_list() == ["x", "y"]
+    assert "x-next-cursor" not in response.headers
+
+    async with db() as session:
+        await session.execute(
+            update(models.SpanAnnotation)
+            .where(models.SpanAnnotation.name != "b")
+            .values(updated_at=datetime.fromisoformat("2021-01-01T00:00:00+00:00"))
+        )
+    response = await httpx_client.get(
+        "v1/evaluations",
+        params={"project_name": "project-name", "updated_after": "2022-01-01T00:00:00+00:00"},
+    )
+    assert response.status_code == 200
+    assert sorted((type(e).__name__, e.eval_name) for e in _read(response)) == [
+        ("DocumentEvaluations", "r"),
+        ("SpanEvaluations", "b"),
+        ("TraceEvaluations", "a"),
+    ]
+    response = await httpx_client.get(
+        "v1/evaluations",
+        params={"project_name": "project-name", "cursor": "invalid"},
+    )
+    assert response.status_code == 422
+
+
+def _read(response: httpx.Response) -> list[Evaluations]:
+    source = BytesIO(response.content)
+    results = []
+    while source.tell() < len(response.content):
+        with pa.ipc.open_stream(source) as reader:
+            results.append(Evaluations.from_pyarrow_reader(reader))
+    return results
@@ -87,6 +87,113 @@ async def test_experiments_api(
     assert experiment_evaluation
 
 
+async def test_bulk_experiment_runs_and_evaluations(
+    httpx_client: httpx.AsyncClient,
+    simple_dataset: Any,
+) -> None:
+    dataset_gid = GlobalID("Dataset", "0")
+    experiment_gid = (
+        await httpx_client.post(
+            f"/v1/datasets/{dataset_gid}/experiments",
+            json={"version_id": None, "repetitions": 3},
+        )
+    ).json()["data"]["id"]
+    now = datetime.datetime.now().isoformat()
+    runs = [
+        {
+            "dataset_example_id": str(GlobalID("DatasetExample", "0")),
+            "output": f"output-{repetition_number}",
+            "repetition_number": repetition_number,
+            "start_time": now,
+            "end_time": now,
+        }
+        for repetition_number in (3, 1, 2)
+    ]
+    response = await httpx_client.post(
+        f"/v1/experiments/{experiment_gid}/runs/bulk", json={"data": runs}
+    )
+    assert response.status_code == 200
+    run_ids = [run["id"] for run in response.json()["data"]]
+    assert len(set(run_ids)) == 3
+    listed_runs = {
+        run["id"]: run
+        for run in (await httpx_client.get(f"/v1/experiments/{experiment_gid}/runs")).json()["data"]
+    }
+    assert [listed_runs[id_]["output"] for id_ in run_ids] == [run["output"] for run in runs]
+
+    def evaluation(run_id: str, name: str, score: float) -> dict[str, Any]:
+        return {
+            "experiment_run_id": run_id,
+            "name": name,
+            "annotator_kind": "CODE",
+            "result": {"score": score},
+            "start_time": now,
+            "end_time": now,
+        }
+
+    response = await httpx_client.post(
+        "/v1/experiment_evaluations/bulk",
+        json={
+            "data": [
+                evaluation(run_ids[0], "a", 0),
+                evaluation(run_ids[1], "a", 1),
+                evaluation(run_ids[0], "b", 2),
+                evaluation(run_ids[0], "a", 3),  # the last of duplicates wins
+            ]
+        },
+    )
+    assert response.status_code == 200
+    evaluation_ids = [evaluation["id"] for evaluation in response.json()["data"]]
+    assert len(set(evaluation_ids)) == 3
+    assert evaluation_ids[0] == evaluation_ids[3]
+    response = await httpx_client.post(
+        "/v1/experiment_evaluations/bulk",
+        json={"data": [evaluation(run_ids[1], "c", 4), evaluation(run_ids[1], "a", 5)]},
+    )
+    assert response.status_code == 200
+    assert response.json()["data"][1]["id"] == evaluation_ids[1]
+    response = await httpx_client.get(f"/v1/experiments/{experiment_gid}/evaluations")
+    assert response.status_code == 200
+    assert {
+        (evaluation["experiment_run_id"], evaluation["name"]): evaluation["result"]["score"]
+        for evaluation in response.json()["data"]
+    } == {
+        (run_ids[0], "a"): 3,
+        (run_ids[1], "a"): 5,
+        (run_ids[0], "b"): 2,
+        (run_ids[1], "c"): 4,
+    }
+
+
+async def test_bulk_experiment_runs_404s_with_invalid_dataset_example_id(
+    httpx_client: httpx.AsyncClient,
+    simple_dataset: Any,
+) -> None:
+    dataset_gid = GlobalID("Dataset", "0")
+    experiment_gid = (
+        await httpx_client.post(
+            f"/v1/datasets/{dataset_gid}/experiments",
+            json={"version_id": None, "repetitions": 1},
+        )
+    ).json()["data"]["id"]
+    now = datetime.datetime.now().isoformat()
+    response = await httpx_client.post(
+        f"/v1/experiments/{experiment_gid}/runs/bulk",
+        json={
+            "data": [
+                {
+                    "dataset_example_id": str(GlobalID("Dataset", "0")),
+                    "output": None,
+                    "repetition_number": 1,
+                    "start_time": now,
+                    "end_time": now,
+                }
+            ]
+        },
+    )
+    assert response.status_code == 404
+
+
 async def test_experiment_404s_with_missing_dataset(
     httpx_client: httpx.AsyncClient,
     simple_dataset: Any,
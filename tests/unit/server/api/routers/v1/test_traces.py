@@ -5,9 +5,11 @@ from typing import Any
 import httpx
 import pytest
 from faker import Faker
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
 from sqlalchemy import insert, select
 
 from phoenix.db import models
+from phoenix.db.bulk_inserter import BulkInserter
 from phoenix.server.types import DbSessionFactory
 
 
@@ -98,3 +100,24 @@ async def test_rest_trace_annotation(
     assert orm_annotation.score == 0.95
     assert orm_annotation.explanation == "This is a test annotation."
     assert orm_annotation.metadata_ == dict()
+
+
+async def test_traces_are_rejected_when_span_queue_is_full(
+    httpx_client: httpx.AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(BulkInserter, "is_full", property(lambda _: True))
+    response = await httpx_client.post(
+        "v1/traces",
+        content=ExportTraceServiceRequest().SerializeToString(),
+        headers={"content-type": "application/x-protobuf"},
+    )
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    monkeypatch.undo()
+    response = await httpx_client.post(
+        "v1/traces",
+        content=ExportTraceServiceRequest().SerializeToString(),
+        headers={"content-type": "application/x-protobuf"},
+    )
+    assert response.status_code == 204
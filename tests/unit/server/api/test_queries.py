@@ -303,36 +303,43 @@ async def comparison_experiments(db: DbSessionFactory) -> None:
                             {
                                 "dataset_example_id": example_ids[0],
                                 "dataset_version_id": version_ids[0],
+                                "superseded_by_dataset_version_id": version_ids[1],
                                 "revision_kind": "CREATE",
                             },
                             {
                                 "dataset_example_id": example_ids[0],
                                 "dataset_version_id": version_ids[1],
+                                "superseded_by_dataset_version_id": version_ids[2],
                                 "revision_kind": "PATCH",
                             },
                             {
                                 "dataset_example_id": example_ids[0],
                                 "dataset_version_id": version_ids[2],
+                                "superseded_by_dataset_version_id": None,
                                 "revision_kind": "PATCH",
                             },
                             {
                                 "dataset_example_id": example_ids[1],
                                 "dataset_version_id": version_ids[1],
+                                "superseded_by_dataset_version_id": None,
                                 "revision_kind": "CREATE",
                             },
                             {
                                 "dataset_example_id": example_ids[2],
                                 "dataset_version_id": version_ids[0],
+                                "superseded_by_dataset_version_id": version_ids[1],
                                 "revision_kind": "CREATE",
                             },
                             {
                                 "dataset_example_id": example_ids[2],
                                 "dataset_version_id": version_ids[1],
+                                "superseded_by_dataset_version_id": None,
                                 "revision_kind": "DELETE",
                             },
                             {
                                 "dataset_example_id": example_ids[3],
                                 "dataset_version_id": version_ids[2],
+                                "superseded_by_dataset_version_id": None,
                                 "revision_kind": "CREATE",
                             },
                         ]
@@ -1,20 +1,27 @@
+import asyncio
 import json
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+import pytest
 from openinference.semconv.trace import (
     OpenInferenceMimeTypeValues,
     OpenInferenceSpanKindValues,
     SpanAttributes,
 )
+from sqlalchemy import insert
+from strawberry.relay import GlobalID
 from vcr import use_cassette
 
+from phoenix.db import models
 from phoenix.server.api.types.ChatCompletionSubscriptionPayload import (
     FinishedChatCompletion,
     TextChunk,
     ToolCallChunk,
 )
+from phoenix.server.api.types.Project import Project
+from phoenix.server.types import DbSessionFactory
 from phoenix.trace.attributes import flatten
 
 
@@ -832,6 +839,72 @@ class TestChatCompletionSubscription:
         assert not attributes
 
 
+class TestProjectUpdatesSubscription:
+    QUERY = """
+      subscription ProjectUpdatesSubscription($projectIds: [GlobalID!]) {
+        projectUpdates(projectIds: $projectIds) {
+          projectId
+          spanCount
+          earliestStartTime
+          latestStartTime
+          refetch
+          streamingLastUpdatedAt
+        }
+      }
+    """
+
+    async def test_project_deletion_is_pushed(
+        self,
+        gql_client: Any,
+        db: DbSessionFactory,
+    ) -> None:
+        async with db() as session:
+            project_rowid = await session.scalar(
+                insert(models.Project).values(name="project").returning(models.Project.id)
+            )
+        project_id = str(GlobalID(Project.__name__, str(project_rowid)))
+        async with gql_client.subscription(
+            query=self.QUERY,
+            variables={"projectIds": [project_id]},
+            operation_name="ProjectUpdatesSubscription",
+        ) as subscription:
+
+            async def first_payload() -> dict[str, Any]:
+                async for payload in subscription.stream():
+                    return payload
+                assert False, "The subscription completed without any payload"
+
+            task = asyncio.create_task(first_payload())
+            await asyncio.sleep(0.1)  # for the subscription to start
+            await gql_client.execute(
+                query="mutation($id: GlobalID!) { deleteProject(id: $id) { __typename } }",
+                variables={"id": project_id},
+            )
+            payload = await asyncio.wait_for(task, timeout=5)
+        update = payload["projectUpdates"]
+        assert update.pop("streamingLastUpdatedAt")
+        assert update == {
+            "projectId": project_id,
+            "spanCount": 0,
+            "earliestStartTime": None,
+            "latestStartTime": None,
+            "refetch": True,
+        }
+
+    async def test_ids_of_other_node_types_are_rejected(
+        self,
+        gql_client: Any,
+    ) -> None:
+        async with gql_client.subscription(
+            query=self.QUERY,
+            variables={"projectIds": [str(GlobalID("Span", "1"))]},
+            operation_name="ProjectUpdatesSubscription",
+        ) as subscription:
+            with pytest.raises(RuntimeError, match="node of type Project"):
+                async for _ in subscription.stream():
+                    pass
+
+
 LLM = OpenInferenceSpanKindValues.LLM.value
 JSON = OpenInferenceMimeTypeValues.JSON.value
 
@@ -672,6 +672,7 @@ async def dataset_with_patch_revision(db: DbSessionFactory) -> None:
                 {
                     "dataset_example_id": dataset_examples[0].id,
                     "dataset_version_id": dataset_versions[0].id,
+                    "superseded_by_dataset_version_id": dataset_versions[1].id,
                     "input": {"input": "first-input"},
                     "output": {"output": "first-output"},
                     "metadata_": {},
@@ -680,6 +681,7 @@ async def dataset_with_patch_revision(db: DbSessionFactory) -> None:
                 {
                     "dataset_example_id": dataset_examples[1].id,
                     "dataset_version_id": dataset_versions[0].id,
+                    "superseded_by_dataset_version_id": dataset_versions[1].id,
                     "input": {"input": "first-input"},
                     "output": {"output": "first-output"},
                     "metadata_": {},
@@ -744,6 +746,7 @@ async def dataset_with_three_versions(db: DbSessionFactory) -> None:
             id=1,
             dataset_example_id=1,
             dataset_version_id=1,
+            superseded_by_dataset_version_id=3,
             input={"input": "first-input"},
             output={"output": "first-output"},
             metadata_={},
@@ -828,6 +831,7 @@ async def dataset_with_deletion(db: DbSessionFactory) -> None:
             id=1,
             dataset_example_id=1,
             dataset_version_id=1,
+            superseded_by_dataset_version_id=2,
             input={"input": "first-input"},
             output={"output": "first-output"},
             metadata_={},
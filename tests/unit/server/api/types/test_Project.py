@@ -5,11 +5,12 @@ from typing import Any
 
 import httpx
 import pytest
-from sqlalchemy import insert
+from sqlalchemy import insert, select
 from strawberry.relay import GlobalID
 
 from phoenix.config import DEFAULT_PROJECT_NAME
 from phoenix.db import models
+from phoenix.db.insertion.span import get_materialized_attributes
 from phoenix.server.api.types.pagination import Cursor, CursorSortColumn, CursorSortColumnDataType
 from phoenix.server.types import DbSessionFactory
 
@@ -532,6 +533,60 @@ async def test_project_spans(
     assert Cursor.from_string(edges[-1]["cursor"]) == end_cursor
 
 
+async def test_project_spans_resolve_deferred_fields(
+    httpx_client: httpx.AsyncClient,
+    llama_index_rag_spans: Any,
+) -> None:
+    fields = """
+      id
+      name
+      attributes
+      metadata
+      numDocuments
+      input { mimeType value }
+      output { mimeType value }
+      events { name message timestamp }
+    """
+    query = f"""
+      query ($projectId: GlobalID!) {{
+        node(id: $projectId) {{
+          ... on Project {{
+            spans(first: 50) {{
+              edges {{
+                node {{ {fields} }}
+              }}
+            }}
+          }}
+        }}
+      }}
+    """
+    response = await httpx_client.post(
+        "/graphql",
+        json={
+            "query": query,
+            "variables": {"projectId": str(GlobalID("Project", "1"))},
+        },
+    )
+    assert response.status_code == 200
+    response_json = response.json()
+    assert response_json.get("errors") is None
+    spans = [edge["node"] for edge in response_json["data"]["node"]["spans"]["edges"]]
+    assert spans
+    assert any(span["input"] for span in spans)
+    assert any(span["numDocuments"] for span in spans)
+    # the spans of the table are the same as those loaded individually with all columns
+    for span in spans:
+        response = await httpx_client.post(
+            "/graphql",
+            json={
+                "query": f"query ($id: GlobalID!) {{ node(id: $id) {{ ... on Span {{ {fields} }} }} }}",  # noqa: E501
+                "variables": {"id": span["id"]},
+            },
+        )
+        assert response.status_code == 200
+        assert response.json()["data"]["node"] == span
+
+
 @pytest.fixture
 async def llama_index_rag_spans(db: DbSessionFactory) -> None:
     # Inserts the first three traces from the llama-index-rag trace fixture
@@ -1068,6 +1123,10 @@ async def llama_index_rag_spans(db: DbSessionFactory) -> None:
                 ],
             )
         ).all()
+        # materialize the attributes the way span ingestion does
+        for span in await session.scalars(select(models.Span)):
+            for key, value in get_materialized_attributes(span.attributes).items():
+                setattr(span, key, value)
         await session.execute(
             insert(models.SpanAnnotation),
             [
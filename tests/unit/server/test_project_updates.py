@@ -0,0 +1,92 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from phoenix.db.insertion.span import InsertedSpan, SpanInsertionEvent
+from phoenix.server.dml_event import SpanDeleteEvent, SpanInsertEvent
+from phoenix.server.dml_event_handler import _ProjectUpdateHandler
+from phoenix.server.types import DbSessionFactory, LastUpdatedAt, ProjectUpdate, ProjectUpdates
+
+_T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class TestProjectUpdate:
+    def test_add(self) -> None:
+        a = ProjectUpdate(
+            1, span_count=2, earliest_start_time=_T0, latest_start_time=_T0 + timedelta(seconds=1)
+        )
+        b = ProjectUpdate(
+            1, span_count=3, earliest_start_time=_T0 - timedelta(seconds=1), latest_start_time=_T0
+        )
+        assert a + b == ProjectUpdate(
+            1,
+            span_count=5,
+            earliest_start_time=_T0 - timedelta(seconds=1),
+            latest_start_time=_T0 + timedelta(seconds=1),
+        )
+        assert a + ProjectUpdate(1, refetch=True) == ProjectUpdate(
+            1,
+            span_count=2,
+            earliest_start_time=_T0,
+            latest_start_time=_T0 + timedelta(seconds=1),
+            refetch=True,
+        )
+
+
+class TestProjectUpdates:
+    async def test_updates_are_filtered_and_coalesced(self) -> None:
+        project_updates = ProjectUpdates(min_interval_seconds=0.01)
+        all_updates = project_updates.subscribe()
+        some_updates = project_updates.subscribe([2])
+        # the subscribers are added when the iteration starts
+        first = asyncio.gather(all_updates.__anext__(), some_updates.__anext__())
+        await asyncio.sleep(0)
+        project_updates.put(
+            ProjectUpdate(1, span_count=1, earliest_start_time=_T0, latest_start_time=_T0)
+        )
+        project_updates.put(
+            ProjectUpdate(2, span_count=1, earliest_start_time=_T0, latest_start_time=_T0)
+        )
+        project_updates.put(ProjectUpdate(2, refetch=True))
+        assert await first == [
+            ProjectUpdate(1, span_count=1, earliest_start_time=_T0, latest_start_time=_T0),
+            ProjectUpdate(
+                2, span_count=1, earliest_start_time=_T0, latest_start_time=_T0, refetch=True
+            ),
+        ]
+        await all_updates.aclose()
+        await some_updates.aclose()
+        assert not project_updates._subscribers
+
+
+class TestProjectUpdateHandler:
+    async def test_span_events(self, db: DbSessionFactory) -> None:
+        updates: list[ProjectUpdate] = []
+
+        class _Updates:
+            def put(self, update: ProjectUpdate) -> None:
+                updates.append(update)
+
+        handler = _ProjectUpdateHandler(
+            db=db,
+            last_updated_at=LastUpdatedAt(),
+            project_updates=_Updates(),
+        )
+        t1 = _T0 + timedelta(seconds=1)
+        events: list[Any] = [
+            SpanInsertEvent(
+                ids=(1,),
+                insertions=(
+                    SpanInsertionEvent(1, (InsertedSpan(t1), InsertedSpan(_T0))),
+                    SpanInsertionEvent(1, (InsertedSpan(t1),)),
+                ),
+            ),
+            SpanDeleteEvent(ids=(2,)),
+        ]
+        for event in events:
+            handler.put(event)
+        await handler()
+        assert sorted(updates, key=lambda update: update.project_rowid) == [
+            ProjectUpdate(1, span_count=3, earliest_start_time=_T0, latest_start_time=t1),
+            ProjectUpdate(2, refetch=True),
+        ]
@@ -1,5 +1,6 @@
 import gzip
 from datetime import datetime
+from typing import Optional
 from unittest.mock import patch
 from urllib.parse import urljoin
 from uuid import uuid4
@@ -120,6 +121,29 @@ def test_get_evaluations(
     assert client.get_evaluations() == []
 
 
+def test_get_evaluations_follows_cursors_and_merges_pages(
+    client: Client,
+    endpoint: str,
+    evaluations: SpanEvaluations,
+    respx_mock: MockRouter,
+) -> None:
+    url = urljoin(endpoint, "v1/evaluations")
+    df0, df1 = evaluations.dataframe.iloc[:1], evaluations.dataframe.iloc[1:]
+    page0 = SpanEvaluations(eval_name="test", dataframe=df0).to_pyarrow_table()
+    page1 = SpanEvaluations(eval_name="test", dataframe=df1).to_pyarrow_table()
+    respx_mock.get(url, params={"cursor": "next"}).mock(
+        Response(200, content=_table_to_bytes(page1))
+    )
+    respx_mock.get(url).mock(
+        Response(200, content=_table_to_bytes(page0), headers={"x-next-cursor": "next"})
+    )
+    assert len(list(client.iter_evaluations(page_size=1))) == 2
+    (results,) = client.get_evaluations(updated_after=datetime(2024, 1, 1, tzinfo=UTC))
+    assert isinstance(results, SpanEvaluations)
+    assert_frame_equal(results.dataframe, evaluations.dataframe)
+    assert "updated_after" in respx_mock.calls.last.request.url.params
+
+
 def test_log_traces_sends_oltp_spans(
     client: Client,
     endpoint: str,
@@ -285,6 +309,47 @@ def test_get_dataset_returns_expected_dataset(
     assert example.updated_at == datetime.fromisoformat("2024-06-12T22:46:31+00:00")
 
 
+def test_get_dataset_follows_cursors_at_the_version_of_the_first_page(
+    client: Client,
+    endpoint: str,
+    respx_mock: MockRouter,
+) -> None:
+    dataset_id = str(GlobalID("Dataset", str(1)))
+    version_id = str(GlobalID("DatasetVersion", str(2)))
+    url = urljoin(endpoint, f"v1/datasets/{dataset_id}/examples")
+
+    def page(*example_ids: int, next_cursor: Optional[str] = None) -> Response:
+        examples = [
+            {
+                "id": str(GlobalID("DatasetExample", str(example_id))),
+                "input": {"input": example_id},
+                "output": {},
+                "metadata": {},
+                "updated_at": "2024-06-12T22:46:31+00:00",
+            }
+            for example_id in example_ids
+        ]
+        return Response(
+            200,
+            json={
+                "data": {"dataset_id": dataset_id, "version_id": version_id, "examples": examples},
+                "next_cursor": next_cursor,
+            },
+        )
+
+    next_cursor = str(GlobalID("DatasetExample", str(3)))
+    respx_mock.get(url, params={"cursor": next_cursor, "version_id": version_id}).mock(page(3))
+    respx_mock.get(url).mock(page(1, 2, next_cursor=next_cursor))
+    dataset = client.get_dataset(id=dataset_id)
+    assert dataset.version_id == version_id
+    assert [example.input for example in dataset.examples.values()] == [
+        {"input": 1},
+        {"input": 2},
+        {"input": 3},
+    ]
+    assert len(respx_mock.calls) == 2
+
+
 def test_client_headers(endpoint: str, respx_mock: MockRouter) -> None:
     client = Client(endpoint=endpoint, headers={"x-api-key": "my-api-key"})
     dataset_id = str(GlobalID("Dataset", str(1)))
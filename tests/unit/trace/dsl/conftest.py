@@ -1,10 +1,12 @@
 from datetime import datetime
 
 import pytest
-from sqlalchemy import insert
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from phoenix.config import DEFAULT_PROJECT_NAME
 from phoenix.db import models
+from phoenix.db.insertion.span import get_materialized_attributes
 from phoenix.server.types import DbSessionFactory
 
 
@@ -143,6 +145,7 @@ async def default_project(db: DbSessionFactory) -> None:
             )
             .returning(models.Span.id)
         )
+        await _materialize_attributes(session)
 
 
 @pytest.fixture
@@ -316,3 +319,11 @@ async def abc_project(db: DbSessionFactory) -> None:
                 metadata_={},
             )
         )
+        await _materialize_attributes(session)
+
+
+async def _materialize_attributes(session: AsyncSession) -> None:
+    # the way span ingestion does
+    for span in await session.scalars(select(models.Span)):
+        for key, value in get_materialized_attributes(span.attributes).items():
+            setattr(span, key, value)
@@ -11,7 +11,15 @@ from sqlalchemy import select
 import phoenix.trace.dsl.filter
 from phoenix.db import models
 from phoenix.server.types import DbSessionFactory
-from phoenix.trace.dsl.filter import SpanFilter, _apply_eval_aliasing, _get_attribute_keys_list
+from phoenix.trace.dsl.filter import (
+    SpanFilter,
+    _apply_eval_aliasing,
+    _get_attribute_keys_list,
+    get_attribute_path,
+    get_cache_info,
+    get_projector,
+    get_span_filter,
+)
 
 
 @pytest.mark.parametrize(
@@ -101,6 +109,16 @@ def test_get_attribute_keys_list(expression: str, expected: Optional[list[str]])
             "first.value in (1,) and second.value in ('2',) and '3' in third.value",
             "and_(attributes[['first', 'value']].as_float().in_((1,)), attributes[['second', 'value']].as_string().in_(('2',)), TextContains(attributes[['third', 'value']].as_string(), '3'))",  # noqa E501
         ),
+        (
+            "'abc' in input.value or 'xyz' not in output.value",
+            "or_(TextPreviewContains(input_preview, attributes[['input', 'value']].as_string(), 'abc'), not_(TextPreviewContains(output_preview, attributes[['output', 'value']].as_string(), 'xyz')))",  # noqa E501
+        ),
+        (
+            "llm.model_name == 'gpt-4o' and 'gpt' in attributes['llm']['model_name']",
+            "and_(llm_model_name == 'gpt-4o', TextContains(llm_model_name, 'gpt'))"
+            if sys.version_info >= (3, 9)
+            else "and_((llm_model_name == 'gpt-4o'), TextContains(llm_model_name, 'gpt'))",
+        ),
         (
             "'1.0' < my.value < 2.0",
             "and_('1.0' < attributes[['my', 'value']].as_string(), attributes[['my', 'value']].as_float() < 2.0)"  # noqa E501
@@ -242,3 +260,77 @@ def test_apply_eval_aliasing(filter_condition: str, expected: str) -> None:
     ):
         aliased, _ = _apply_eval_aliasing(filter_condition)
     assert aliased == expected
+
+
+async def test_get_span_filter_reuses_compiled_filters(
+    db: DbSessionFactory,
+    default_project: Any,
+    abc_project: Any,
+) -> None:
+    condition = "span_kind == 'LLM' and evals['Hallucination'].score < 0.5"
+    before = get_cache_info()["span_filter"]
+    f = get_span_filter(condition, ["Hallucination"])
+    assert (f.condition, f.valid_eval_names) == (condition, ("Hallucination",))
+    assert get_span_filter(condition, ("Hallucination",)) is f
+    assert get_span_filter(condition) is not f
+    after = get_cache_info()["span_filter"]
+    assert (after.hits - before.hits, after.misses - before.misses) == (1, 2)
+    # a shared filter can be applied to any number of statements
+    async with db() as session:
+        for _ in range(2):
+            await session.execute(f(select(models.Span.id)))
+    with pytest.raises(SyntaxError):
+        get_span_filter("evals['Hallucination'].score < 0.5", ["Q&A Correctness"])
+    with pytest.raises(SyntaxError):
+        get_span_filter("evals['Hallucination'].score < 0.5", ["Q&A Correctness"])
+
+
+def test_get_projector_reuses_compiled_projectors() -> None:
+    assert get_projector("llm.token_count.total") is get_projector("llm.token_count.total")
+    with pytest.raises(ValueError):
+        get_projector("")
+
+
+@pytest.mark.parametrize(
+    "condition,expected",
+    [
+        (
+            "metadata['tenant'] == 'abc' or attributes['tenant'] in ('x', 'y')",
+            "or_(tenant_column == 'abc', attributes[['tenant']].as_string().in_(('x', 'y')))",
+        ),
+        (
+            "'a' in metadata['tenant'] or float(metadata['tenant']) > 1",
+            "or_(TextContains(attributes[['metadata', 'tenant']].as_string(), 'a'), attributes[['metadata', 'tenant']].as_float() > 1)",  # noqa E501
+        ),
+    ],
+)
+def test_filter_rewrites_string_comparisons_onto_indexed_attributes(
+    condition: str,
+    expected: str,
+) -> None:
+    f = SpanFilter(condition, indexed_attributes={("metadata", "tenant"): "tenant_column"})
+    assert unparse(f.translated).strip() == expected
+
+
+@pytest.mark.parametrize(
+    "key,expected",
+    [
+        ("metadata['tenant']", ("metadata", "tenant")),
+        ("attributes['a.b']['c']", ("a.b", "c")),
+        ("session.id", ("session", "id")),
+        ("tenant", ("tenant",)),
+    ],
+)
+def test_get_attribute_path(key: str, expected: tuple[str, ...]) -> None:
+    assert get_attribute_path(key) == expected
+
+
+@pytest.mark.parametrize("key", ["span_kind", "attributes[0]", "'x'", "metadata['a'] == 1"])
+def test_get_attribute_path_rejects_non_attributes(key: str) -> None:
+    with pytest.raises(SyntaxError):
+        get_attribute_path(key)
+
+
+def test_get_attribute_path_rejects_materialized_attributes() -> None:
+    with pytest.raises(ValueError):
+        get_attribute_path("llm.model_name")
@@ -3,7 +3,12 @@ from typing import Any
 
 import pytest
 
-from phoenix.trace.attributes import get_attribute_value, unflatten
+from phoenix.trace.attributes import (
+    _compile_key_path,
+    _get_key_path_compiler,
+    get_attribute_value,
+    unflatten,
+)
 
 
 @pytest.mark.parametrize(
@@ -166,3 +171,33 @@ def test_unflatten_separator(
     assert actual == desired
     actual = dict(unflatten(reversed(key_value_pairs), separator=separator))
     assert actual == desired
+
+
+@pytest.mark.parametrize(
+    "key,separator,prefix_exclusions,desired",
+    [
+        ("a", ".", (), ("a",)),
+        ("a.0.b.12", ".", (), ("a", 0, "b", 12)),
+        ("a.b.0.c", ".", ("a.b",), ("a.b", 0, "c")),
+        ("a.bc.0", ".", ("a.b",), ("a", "bc", 0)),
+        ("1$$0$$2", "$$", (), (1, 0, 2)),
+    ],
+)
+def test_compile_key_path(
+    key: str,
+    separator: str,
+    prefix_exclusions: tuple[str, ...],
+    desired: tuple[Any, ...],
+) -> None:
+    assert _compile_key_path(key, separator, prefix_exclusions) == desired
+
+
+def test_unflatten_memoizes_key_paths() -> None:
+    key_value_pairs = (("x.y.0.z", 1), ("x.y.1.z", 2))
+    prefix_exclusions = ["x.y"]
+    desired = {"x.y": [{"z": 1}, {"z": 2}]}
+    assert unflatten(key_value_pairs, prefix_exclusions=prefix_exclusions) == desired
+    compile_key_path = _get_key_path_compiler(".", tuple(prefix_exclusions))
+    hits = compile_key_path.cache_info().hits  # type: ignore[attr-defined]
+    assert unflatten(key_value_pairs, prefix_exclusions=prefix_exclusions) == desired
+    assert compile_key_path.cache_info().hits == hits + 2  # type: ignore[attr-defined]
@@ -8,15 +8,24 @@ import numpy as np
 import opentelemetry.proto.trace.v1.trace_pb2 as otlp
 import pytest
 from google.protobuf.json_format import MessageToJson  # type: ignore[import-untyped]
+from openinference.semconv.resource import ResourceAttributes
 from openinference.semconv.trace import (
     SpanAttributes,
 )
-from opentelemetry.proto.common.v1.common_pb2 import AnyValue, ArrayValue, KeyValue
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+from opentelemetry.proto.common.v1.common_pb2 import (
+    AnyValue,
+    ArrayValue,
+    InstrumentationScope,
+    KeyValue,
+)
+from opentelemetry.proto.resource.v1.resource_pb2 import Resource
 from pytest import approx
 
 from phoenix.trace.otel import (
     _decode_identifier,
     _encode_identifier,
+    decode_otlp_export_request,
     decode_otlp_span,
     encode_span_to_otlp,
 )
@@ -463,6 +472,30 @@ def test_decode_encode_tool_parameters(span: Span) -> None:
     assert decoded_span.attributes["tool"]["parameters"] == span.attributes["tool"]["parameters"]
 
 
+def test_decode_otlp_export_request(span: Span) -> None:
+    otlp_span = encode_span_to_otlp(span)
+    project_name = KeyValue(
+        key=ResourceAttributes.PROJECT_NAME,
+        value=AnyValue(string_value="abc"),
+    )
+    request = ExportTraceServiceRequest(
+        resource_spans=[
+            otlp.ResourceSpans(
+                resource=Resource(attributes=[project_name]),
+                scope_spans=[
+                    otlp.ScopeSpans(scope=InstrumentationScope(name="x"), spans=[otlp_span]),
+                    otlp.ScopeSpans(scope=InstrumentationScope(name="y"), spans=[otlp_span]),
+                ],
+            ),
+            otlp.ResourceSpans(scope_spans=[otlp.ScopeSpans(spans=[otlp_span])]),
+        ]
+    )
+    decoded = decode_otlp_export_request(request)
+    assert [name for _, name in decoded] == ["abc", "abc", "default"]
+    assert all(s == decode_otlp_span(otlp_span) for s, _ in decoded)
+    assert decode_otlp_export_request(ExportTraceServiceRequest()) == []
+
+
 @pytest.fixture
 def span() -> Span:
     trace_id = "f096b681-b8d4-44eb-bc4a-1db0b5a8d556"
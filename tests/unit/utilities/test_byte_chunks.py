@@ -0,0 +1,22 @@
+import pyarrow as pa
+
+from phoenix.utilities.byte_chunks import ByteChunksReader
+
+
+def test_byte_chunks_reader_fills_reads_across_chunks() -> None:
+    reader = ByteChunksReader(iter([b"ab", b"", b"cde", b"f"]))
+    assert reader.read(4) == b"abcd"
+    assert reader.read(4) == b"ef"
+    assert reader.read(4) == b""
+
+
+def test_byte_chunks_reader_reads_arrow_streams_split_into_chunks() -> None:
+    table = pa.table({"a": list(range(100))})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=10):
+            writer.write_batch(batch)
+    data = sink.getvalue().to_pybytes()
+    chunks = (data[i : i + 7] for i in range(0, len(data), 7))
+    with pa.ipc.open_stream(ByteChunksReader(chunks)) as reader:
+        assert reader.read_all() == table